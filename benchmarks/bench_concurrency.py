@@ -0,0 +1,104 @@
+"""
+并发读写基准测试：对比默认引擎与调优后的引擎配置
+
+运行：python -m benchmarks.bench_concurrency
+模拟界面线程写入（完成复习）的同时，提醒线程与统计线程持续读取。
+输出读取延迟分位数和"database is locked"等错误次数。
+"""
+
+import contextlib
+import io
+import statistics
+import threading
+import time
+
+from benchmarks.common import seed_user, temp_database
+from src.database.engine import SQLiteEngineProfile
+from src.database.models import ReviewSchedule
+
+DURATION = 5.0  # 秒
+READERS = 3
+
+
+def _pending_schedule_ids(db, user_id):
+    session = db.get_session()
+    try:
+        return [
+            row[0]
+            for row in session.query(ReviewSchedule.id).filter(
+                ReviewSchedule.user_id == user_id, ~ReviewSchedule.completed
+            )
+        ]
+    finally:
+        session.close()
+
+
+def run(profile):
+    with temp_database(engine_profile=profile) as db:
+        user_id = seed_user(db, 3000)
+        pending = _pending_schedule_ids(db, user_id)
+        stop = threading.Event()
+        latencies = []
+        errors = []
+        writes = [0]
+
+        def writer():
+            for schedule_id in pending:
+                if stop.is_set():
+                    break
+                result = db.complete_review(schedule_id, user_id, 4, 80)
+                if result["success"]:
+                    writes[0] += 1
+                else:
+                    errors.append(result["msg"])
+
+        def reader():
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    db.get_review_stats(user_id)
+                    db.get_today_review_count(user_id)
+                except Exception as e:  # noqa: BLE001
+                    errors.append(str(e))
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        threads = [threading.Thread(target=writer)]
+        threads += [threading.Thread(target=reader) for _ in range(READERS)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for thread in threads:
+                thread.start()
+            time.sleep(DURATION)
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        latencies.sort()
+        return {
+            "writes": writes[0],
+            "reads": len(latencies),
+            "p50": statistics.median(latencies) if latencies else 0,
+            "p95": latencies[int(len(latencies) * 0.95)] if latencies else 0,
+            "max": latencies[-1] if latencies else 0,
+            "errors": len(errors),
+        }
+
+
+def main():
+    profiles = [
+        ("默认引擎", SQLiteEngineProfile.legacy()),
+        ("调优引擎", SQLiteEngineProfile()),
+    ]
+    print(
+        f"{'配置':<8} {'写入':>6} {'读取':>6} {'p50(ms)':>8} "
+        f"{'p95(ms)':>8} {'max(ms)':>8} {'错误':>5}"
+    )
+    for name, profile in profiles:
+        r = run(profile)
+        print(
+            f"{name:<8} {r['writes']:>6} {r['reads']:>6} {r['p50']:>8.2f} "
+            f"{r['p95']:>8.2f} {r['max']:>8.1f} {r['errors']:>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
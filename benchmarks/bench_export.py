@@ -0,0 +1,106 @@
+"""
+学习历史流式导出基准测试
+
+运行：python -m benchmarks.bench_export
+为一个用户生成 5 万个知识点、100 万条复习记录，在子进程中运行
+python -m src.cli export（JSONL 与列式两种格式），输出耗时、文件大小与子进程峰值内存。
+"""
+
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from benchmarks.common import temp_database
+from src.database.manager import DatabaseManager
+from src.database.models import KnowledgeItem, ReviewRecord, ReviewSchedule, User
+
+ITEMS = 50000
+RECORDS_PER_ITEM = 20
+CHUNK = 50000
+
+
+def seed(db):
+    now = datetime.now()
+    session = db.get_session()
+    try:
+        user = User(username="export", email="export@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+    finally:
+        session.close()
+
+    with db.engine.begin() as connection:
+        connection.execute(
+            insert(KnowledgeItem.__table__),
+            [
+                {"user_id": user_id, "title": f"知识点{i}", "content": f"第{i}条知识内容",
+                 "category": f"分类{i % 10}", "created_at": now, "is_active": True}
+                for i in range(ITEMS)
+            ],
+        )
+        connection.execute(
+            insert(ReviewSchedule.__table__),
+            [
+                {"knowledge_item_id": i + 1, "user_id": user_id, "completed": False,
+                 "scheduled_date": now + timedelta(days=1), "interval_index": 1}
+                for i in range(ITEMS)
+            ],
+        )
+    for start in range(0, ITEMS * RECORDS_PER_ITEM, CHUNK):
+        with db.engine.begin() as connection:
+            connection.execute(
+                insert(ReviewRecord.__table__),
+                [
+                    {"knowledge_item_id": n % ITEMS + 1, "user_id": user_id,
+                     "review_date": now - timedelta(minutes=n), "effectiveness": n % 5 + 1,
+                     "recall_score": n % 100}
+                    for n in range(start, start + CHUNK)
+                ],
+            )
+
+
+def seed_path(db_path):
+    db = DatabaseManager(db_path)
+    try:
+        seed(db)
+    finally:
+        db.engine.dispose()
+
+
+def main():
+    with temp_database() as db:
+        # 在独立进程中造数：Linux 下子进程的 ru_maxrss 从父进程继承，
+        # 父进程须保持较小内存，测得的才是导出进程自身的峰值
+        process = multiprocessing.get_context("spawn").Process(
+            target=seed_path, args=(db.db_path,)
+        )
+        process.start()
+        process.join()
+        print(f"知识点: {ITEMS}，复习记录: {ITEMS * RECORDS_PER_ITEM}")
+        out_dir = os.path.dirname(db.db_path)
+        for file_format, name in (("jsonl", "history.jsonl"), ("columnar", "history.gz")):
+            path = os.path.join(out_dir, name)
+            start = time.perf_counter()
+            process = subprocess.Popen(
+                [sys.executable, "-m", "src.cli", "--db", db.db_path, "export", path,
+                 "--user", "export", "--format", file_format],
+                stdout=subprocess.DEVNULL,
+            )
+            _, status, usage = os.wait4(process.pid, 0)
+            elapsed = time.perf_counter() - start
+            assert status == 0
+            # Linux 下 ru_maxrss 单位为 KB
+            peak_mb = usage.ru_maxrss / 1024
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            print(f"{file_format:>9}: {elapsed:6.1f} 秒，文件 {size_mb:7.1f} MB，"
+                  f"子进程峰值内存 {peak_mb:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+复习负荷预测基准测试
+
+运行：python -m benchmarks.bench_forecast
+为一个用户生成 5 万个知识点（每个一条未完成计划，到期时间分布在前2天到后10天），
+分别测量读取待复习计划与各调度算法下模拟未来 30 天的耗时（毫秒）。
+"""
+
+from datetime import datetime
+
+from benchmarks.common import seed_user, temp_database, timed
+from src.scheduler.algorithms import ALGORITHMS
+from src.scheduler.forecast import (
+    grade_distribution,
+    load_pending_states,
+    simulate_workload,
+)
+
+N_ITEMS = 50000
+DAYS = 30
+
+
+def main():
+    with temp_database() as db:
+        user_id = seed_user(db, N_ITEMS, records_per_item=1)
+        now = datetime.now()
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        states, due_hours = load_pending_states(db, user_id, start, now)
+        print(f"待复习计划: {len(due_hours)}")
+        print(f"读取计划:   {timed(load_pending_states, db, user_id, start, now):>8.1f} ms")
+
+        probs = grade_distribution([0] * 5)
+        for name, algorithm in ALGORITHMS.items():
+            elapsed = timed(simulate_workload, algorithm, states, due_hours, probs, DAYS)
+            expected = simulate_workload(algorithm, states, due_hours, probs, DAYS)
+            print(f"模拟 {name:<10} {elapsed:>6.1f} ms"
+                  f"（{DAYS} 天共 {expected.sum():.0f} 次，峰值 {expected.max():.0f} 次/天）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+知识点批量导入基准测试：逐条 add_knowledge vs 流式批量导入
+
+运行：python -m benchmarks.bench_import
+生成 5 万行的 CSV（含 1% 重复标题），分别用逐条 add_knowledge（抽样 2000 行
+后按比例折算）与 knowledge.importer.import_file 导入，输出吞吐（条/秒）。
+"""
+
+import contextlib
+import csv
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.common import temp_database
+from src.database.models import User
+from src.knowledge.importer import import_file, iter_records
+
+ROWS = 50000
+SAMPLE = 2000
+
+
+def write_csv(path):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "content", "category"])
+        for i in range(ROWS):
+            # 每 100 行重复一次前一行的标题
+            title = f"卡片{i - 1 if i % 100 == 99 else i}"
+            writer.writerow([title, f"第{i}张卡片的背面内容" * 3, f"牌组{i % 20}"])
+
+
+def create_user(db):
+    session = db.get_session()
+    try:
+        user = User(username="import", email="import@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        return user.id
+    finally:
+        session.close()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "cards.csv")
+        write_csv(path)
+        print(f"CSV 行数: {ROWS}")
+
+        with temp_database() as db:
+            user_id = create_user(db)
+            records = iter_records(path)
+            start = time.perf_counter()
+            # 屏蔽逐条写入的调试输出
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _, record in zip(range(SAMPLE), records):
+                    db.add_knowledge(user_id, record["title"], record["content"],
+                                     record["category"])
+            elapsed = time.perf_counter() - start
+            print(f"逐条 add_knowledge: {SAMPLE / elapsed:>10.0f} 条/秒"
+                  f"（折算 {ROWS} 行约 {ROWS / SAMPLE * elapsed:.0f} 秒）")
+
+        with temp_database() as db:
+            user_id = create_user(db)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = import_file(db, user_id, path)
+            elapsed = time.perf_counter() - start
+            print(f"批量导入:          {ROWS / elapsed:>10.0f} 条/秒"
+                  f"（{elapsed:.2f} 秒，{result['data']}）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+知识点复习状态批量计算基准测试
+
+运行：python -m benchmarks.bench_knowledge_status
+每个规模输出总耗时与单个知识点耗时，单个耗时应基本保持不变（线性扩展）。
+"""
+
+import contextlib
+import io
+
+from benchmarks.common import seed_user, temp_database, timed
+
+SIZES = [500, 1000, 2000, 4000, 8000]
+
+
+def main():
+    print(f"{'知识点数':>8} {'耗时(ms)':>10} {'每项(µs)':>10}")
+    for size in SIZES:
+        with temp_database() as db:
+            user_id = seed_user(db, size)
+            # 屏蔽调试输出，避免影响计时
+            with contextlib.redirect_stdout(io.StringIO()):
+                elapsed = timed(db.get_knowledge_with_review_status, user_id, repeat=3)
+            print(f"{size:>8} {elapsed:>10.1f} {elapsed * 1000 / size:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
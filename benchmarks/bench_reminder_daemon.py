@@ -0,0 +1,97 @@
+"""
+多用户提醒守护进程基准测试
+
+运行：python -m benchmarks.bench_reminder_daemon
+生成 1000 个用户、共 3 万条已到期的复习计划，用不做任何 I/O 的渠道运行一轮
+守护进程，输出不同分片数下的耗时、吞吐与查询次数；第二轮全部命中投递记录。
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from benchmarks.common import temp_database
+from src.database.models import KnowledgeItem, ReviewSchedule, User
+from src.scheduler.daemon import ReminderDaemon
+
+USERS = 1000
+DUE_PER_USER = 30
+
+
+class NullChannel:
+    def send(self, reminders):
+        return True
+
+
+def seed(db):
+    now = datetime.now()
+    session = db.get_session()
+    try:
+        session.bulk_insert_mappings(
+            User,
+            [
+                {"username": f"user{i}", "email": f"user{i}@example.com",
+                 "password_hash": "x", "enable_reminder": True, "reminder_channel": "app"}
+                for i in range(USERS)
+            ],
+        )
+        user_ids = [row[0] for row in session.query(User.id)]
+        session.bulk_insert_mappings(
+            KnowledgeItem,
+            [
+                {"user_id": user_id, "title": f"知识点{i}", "content": "内容",
+                 "is_active": True}
+                for user_id in user_ids
+                for i in range(DUE_PER_USER)
+            ],
+        )
+        session.bulk_insert_mappings(
+            ReviewSchedule,
+            [
+                {"knowledge_item_id": item_id, "user_id": user_id,
+                 "scheduled_date": now - timedelta(minutes=item_id % 120),
+                 "completed": False, "interval_index": 1}
+                for item_id, user_id in session.query(KnowledgeItem.id, KnowledgeItem.user_id)
+            ],
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+def run(db, workers):
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    daemon = ReminderDaemon(db, {"app": NullChannel()}, workers=workers)
+    event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        start = time.perf_counter()
+        stats = daemon.run_once()
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+        daemon.stop()
+    return stats, elapsed, len(statements)
+
+
+def main():
+    print(f"用户数: {USERS}，到期计划: {USERS * DUE_PER_USER}")
+    print(f"{'分片':>4} {'轮次':>6} {'发送':>8} {'跳过':>8} {'耗时(s)':>9} {'条/分钟':>10} {'查询数':>7}")
+    for workers in (1, 4):
+        with temp_database() as db:
+            seed(db)
+            for label in ("首轮", "去重"):
+                stats, elapsed, queries = run(db, workers)
+                rate = stats["due"] / elapsed * 60
+                print(
+                    f"{workers:>4} {label:>6} {stats['sent']:>8} {stats['skipped']:>8} "
+                    f"{elapsed:>9.2f} {rate:>10.0f} {queries:>7}"
+                )
+
+
+if __name__ == "__main__":
+    main()
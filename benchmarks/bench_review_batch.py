@@ -0,0 +1,64 @@
+"""
+批量完成复习基准测试
+
+运行：python -m benchmarks.bench_review_batch
+为一个用户生成 N_CARDS 个待复习计划，比较三种方式的单张耗时（毫秒）：
+逐张 complete_review、一次 complete_reviews_batch、写后缓冲 ReviewBuffer.add
+（界面线程实际等待的时间，数据库写入在后台线程中完成）。
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.common import seed_user, temp_database
+from src.database.models import ReviewSchedule
+from src.scheduler.review_buffer import ReviewBuffer
+
+N_CARDS = 300
+
+
+def pending_ids(db, user_id):
+    session = db.get_session()
+    try:
+        return [row.id for row in session.query(ReviewSchedule.id).filter(
+            ReviewSchedule.user_id == user_id, ~ReviewSchedule.completed)]
+    finally:
+        session.close()
+
+
+def main():
+    with temp_database() as db:
+        user_id = seed_user(db, N_CARDS, records_per_item=1)
+        ids = pending_ids(db, user_id)
+        start = time.perf_counter()
+        for schedule_id in ids:
+            db.complete_review(schedule_id, user_id, 4, 80)
+        single = (time.perf_counter() - start) * 1000 / len(ids)
+        print(f"逐张完成:     {single:>7.3f} ms/张")
+
+    with temp_database() as db:
+        user_id = seed_user(db, N_CARDS, records_per_item=1)
+        reviews = [{"schedule_id": schedule_id, "effectiveness": 4, "recall_score": 80}
+                   for schedule_id in pending_ids(db, user_id)]
+        start = time.perf_counter()
+        db.complete_reviews_batch(user_id, reviews)
+        batch = (time.perf_counter() - start) * 1000 / len(reviews)
+        print(f"整批完成:     {batch:>7.3f} ms/张")
+
+    with temp_database() as db, tempfile.TemporaryDirectory() as journal_dir:
+        user_id = seed_user(db, N_CARDS, records_per_item=1)
+        ids = pending_ids(db, user_id)
+        buffer = ReviewBuffer(db, user_id, journal_dir)
+        start = time.perf_counter()
+        for schedule_id in ids:
+            buffer.add(schedule_id, 4, 80)
+        buffered = (time.perf_counter() - start) * 1000 / len(ids)
+        buffer.close()
+        left = set(ids) & set(pending_ids(db, user_id))
+        print(f"写后缓冲提交: {buffered:>7.3f} ms/张（关闭后未写入 {len(left)} 个）")
+        assert not os.path.exists(buffer.journal_path)
+
+
+if __name__ == "__main__":
+    main()
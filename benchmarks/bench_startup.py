@@ -0,0 +1,87 @@
+"""
+冷启动导入时间基准测试（回归门禁）
+
+运行：python -m benchmarks.bench_startup [--runs 5] [--budget-ms 1200]
+在子进程中以 `python -X importtime` 导入启动路径上的模块，解析 stderr 中
+各顶层模块的累计耗时，取多次运行的中位数。出现以下情况时以非零状态退出：
+- 启动路径导入了被禁止的重量级模块（matplotlib，应在首次绘图时才导入）
+- 总导入耗时超过预算
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 与 run_app.py 启动图形界面时实际导入的模块一致
+STARTUP_MODULES = ["src.app", "src.auth.ui", "src.knowledge.ui", "src.analytics.ui"]
+FORBIDDEN_MODULES = ["matplotlib"]
+
+
+def measure_once(modules=STARTUP_MODULES):
+    """导入一次，返回 {顶层模块: 累计耗时(ms)} 与全部已导入模块名"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([ROOT_DIR, os.path.join(ROOT_DIR, "src")])
+    code = f"import {', '.join(modules)}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    top_level = {}
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imported.add(name.strip())
+        # 顶层导入没有缩进
+        if not name.startswith("  "):
+            top_level[name.strip()] = int(cumulative) / 1000
+    return top_level, imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="冷启动导入时间基准")
+    parser.add_argument("--runs", type=int, default=5, help="运行次数（取中位数）")
+    parser.add_argument("--budget-ms", type=float, default=1200, help="总导入耗时预算")
+    args = parser.parse_args(argv)
+
+    totals = []
+    per_module = {}
+    imported = set()
+    for _ in range(args.runs):
+        top_level, imported = measure_once()
+        totals.append(sum(top_level.values()))
+        for name, elapsed in top_level.items():
+            per_module.setdefault(name, []).append(elapsed)
+
+    print(f"{'顶层模块':<40} {'累计(ms)':>10}")
+    slowest = sorted(per_module.items(), key=lambda x: -statistics.median(x[1]))
+    for name, samples in slowest[:10]:
+        print(f"{name:<40} {statistics.median(samples):>10.1f}")
+    total = statistics.median(totals)
+    print(f"{'合计':<40} {total:>10.1f}  (预算 {args.budget_ms:.0f})")
+
+    failed = False
+    for forbidden in FORBIDDEN_MODULES:
+        if any(n == forbidden or n.startswith(forbidden + ".") for n in imported):
+            print(f"❌ 启动路径导入了 {forbidden}")
+            failed = True
+    if total > args.budget_ms:
+        print(f"❌ 导入耗时 {total:.1f}ms 超出预算 {args.budget_ms:.0f}ms")
+        failed = True
+    if not failed:
+        print("✅ 冷启动导入时间在预算内")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
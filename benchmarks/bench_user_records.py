@@ -0,0 +1,114 @@
+"""
+复习记录按用户查询基准测试：IN 子查询 vs 冗余 user_id 列
+
+运行：python -m benchmarks.bench_user_records
+生成 5 个用户共 10 万条复习记录，对同一份数据分别用旧写法
+（knowledge_item_id IN (子查询) / .has(user_id=...)）与新写法
+（ReviewRecord.user_id）执行统计查询，输出两者耗时。
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from benchmarks.common import seed_user, temp_database, timed
+from src.database.models import KnowledgeItem, ReviewRecord
+
+USERS = 5
+ITEMS_PER_USER = 10000
+RECORDS_PER_ITEM = 2  # 共 USERS * ITEMS_PER_USER * RECORDS_PER_ITEM 条记录
+
+
+def _user_filter(session, user_id, legacy):
+    """旧写法经知识点子查询定位用户，新写法直接比较 user_id"""
+    if legacy:
+        return ReviewRecord.knowledge_item_id.in_(
+            session.query(KnowledgeItem.id).filter(KnowledgeItem.user_id == user_id)
+        )
+    return ReviewRecord.user_id == user_id
+
+
+def distinct_days(db, user_id, legacy):
+    """连续天数所需的去重复习日期"""
+    session = db.get_session()
+    try:
+        day = func.date(ReviewRecord.review_date)
+        return (
+            session.query(day)
+            .filter(_user_filter(session, user_id, legacy))
+            .distinct()
+            .order_by(day.desc())
+            .all()
+        )
+    finally:
+        session.close()
+
+
+def recent_count(db, user_id, legacy):
+    """近30天复习次数"""
+    session = db.get_session()
+    try:
+        since = datetime.now() - timedelta(days=30)
+        return (
+            session.query(func.count(ReviewRecord.id))
+            .filter(
+                _user_filter(session, user_id, legacy),
+                ReviewRecord.review_date >= since,
+            )
+            .scalar()
+        )
+    finally:
+        session.close()
+
+
+def daily_summary(db, user_id, legacy):
+    """按日分组的复习次数与平均回忆分数（汇总表重建的数据源）"""
+    session = db.get_session()
+    try:
+        day = func.date(ReviewRecord.review_date)
+        return (
+            session.query(
+                day,
+                func.count(ReviewRecord.id),
+                func.round(func.avg(ReviewRecord.recall_score), 6),
+            )
+            .filter(_user_filter(session, user_id, legacy))
+            .group_by(day)
+            .all()
+        )
+    finally:
+        session.close()
+
+
+def main():
+    with temp_database() as db:
+        user_ids = [
+            seed_user(
+                db,
+                ITEMS_PER_USER,
+                records_per_item=RECORDS_PER_ITEM,
+                username=f"bench{i}",
+                seed=i,
+            )
+            for i in range(USERS)
+        ]
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+
+        user_id = user_ids[-1]
+        total = USERS * ITEMS_PER_USER * RECORDS_PER_ITEM
+        print(f"复习记录总数: {total}")
+        print(f"{'查询':<16} {'IN子查询(ms)':>14} {'user_id(ms)':>12} {'加速比':>8}")
+        for name, func_ in (
+            ("去重复习日期", distinct_days),
+            ("近30天次数", recent_count),
+            ("按日分组统计", daily_summary),
+        ):
+            assert func_(db, user_id, True) == func_(db, user_id, False)
+            before = timed(func_, db, user_id, True)
+            after = timed(func_, db, user_id, False)
+            print(f"{name:<16} {before:>14.1f} {after:>12.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+知识列表首屏渲染基准测试：虚拟化列表 vs 一次性创建全部卡片
+
+运行：python -m benchmarks.bench_virtual_list [--items 10000] [--eager]
+生成若干条知识点数据，测量从创建列表到首屏完成布局（update_idletasks）
+的耗时、实际创建的卡片数量以及进程常驻内存（VmRSS）的增量。
+--eager 额外测量旧实现（CTkScrollableFrame 中为每条数据创建卡片），
+数据量较大时可能需要数分钟。需要图形显示环境，无显示时直接退出。
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+
+def rss_mb():
+    """当前进程常驻内存（MB），非 Linux 返回 0"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def make_items(count):
+    return [
+        {
+            "id": i,
+            "title": f"知识点 {i}",
+            "content": "艾宾浩斯遗忘曲线描述了记忆随时间衰减的规律。" * 3,
+            "category": f"分类{i % 7}",
+            "created_at": "2025-01-01 08:00",
+            "review_status": "📅 计划中",
+            "is_today_review": i % 5 == 0,
+            "is_urgent": i % 11 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+def make_owner():
+    """KnowledgeCard 只依赖 owner 的配色与按钮回调"""
+    noop = lambda item: None  # noqa: E731
+    return SimpleNamespace(
+        colors=defaultdict(lambda: "#2E86AB"),
+        edit_item=noop,
+        delete_item=noop,
+        add_to_today_review=noop,
+    )
+
+
+def bench_virtual(root, items):
+    from src.common.virtual_list import VirtualList
+    from src.knowledge.ui import KnowledgeCard
+
+    owner = make_owner()
+    before = rss_mb()
+    start = time.perf_counter()
+    view = VirtualList(
+        root,
+        row_height=KnowledgeCard.ROW_HEIGHT,
+        create_row=lambda parent: KnowledgeCard(parent, owner),
+        bind_row=lambda card, item, index: card.bind_item(item),
+        key=lambda item: item["id"],
+    )
+    view.pack(fill="both", expand=True)
+    view.set_items(items)
+    root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    result = (elapsed, view.visible_rows(), rss_mb() - before)
+    view.destroy()
+    return result
+
+
+def bench_eager(root, items):
+    import customtkinter as ctk
+    from src.knowledge.ui import KnowledgeCard
+
+    owner = make_owner()
+    before = rss_mb()
+    start = time.perf_counter()
+    frame = ctk.CTkScrollableFrame(root)
+    frame.pack(fill="both", expand=True)
+    frame.grid_columnconfigure(0, weight=1)
+    for i, item in enumerate(items):
+        card = KnowledgeCard(frame, owner)
+        card.bind_item(item)
+        card.grid(row=i, column=0, sticky="ew", padx=10, pady=8)
+    root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    result = (elapsed, len(items), rss_mb() - before)
+    frame.destroy()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="知识列表首屏渲染基准")
+    parser.add_argument("--items", type=int, default=10000, help="数据条数")
+    parser.add_argument("--eager", action="store_true", help="同时测量一次性创建全部卡片")
+    args = parser.parse_args(argv)
+
+    try:
+        import customtkinter as ctk
+
+        root = ctk.CTk()
+    except Exception as e:  # tkinter.TclError: no display name
+        print(f"⚠️ 无法创建窗口，跳过基准测试: {e}")
+        return 0
+    root.geometry("900x700")
+
+    items = make_items(args.items)
+    print(f"{'实现':<12} {'首屏(ms)':>10} {'卡片数':>8} {'内存增量(MB)':>14}")
+    runs = [("virtual", bench_virtual)]
+    if args.eager:
+        runs.append(("eager", bench_eager))
+    for name, bench in runs:
+        elapsed, cards, rss_delta = bench(root, items)
+        print(f"{name:<12} {elapsed * 1000:>10.1f} {cards:>8} {rss_delta:>14.1f}")
+
+    root.destroy()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+基准测试公共工具：临时数据库与批量造数
+"""
+
+import os
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from src.database.manager import DatabaseManager
+from src.database.models import KnowledgeItem, ReviewRecord, ReviewSchedule, User
+
+
+@contextmanager
+def temp_database(**kwargs):
+    """创建位于临时目录中的文件数据库"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(os.path.join(tmp_dir, "bench.db"), **kwargs)
+        try:
+            yield db
+        finally:
+            db.engine.dispose()
+
+
+def seed_user(db, n_items, records_per_item=2, username="bench", seed=42):
+    """为一个用户批量生成知识点、复习计划和复习记录，返回用户ID"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    session = db.get_session()
+    try:
+        user = User(
+            username=username, email=f"{username}@example.com", password_hash="x"
+        )
+        session.add(user)
+        session.flush()
+
+        session.bulk_insert_mappings(
+            KnowledgeItem,
+            [
+                {
+                    "user_id": user.id,
+                    "title": f"{username}-知识点{i}",
+                    "content": f"第{i}条知识内容",
+                    "category": f"分类{i % 10}",
+                    "created_at": now - timedelta(days=rng.randint(0, 60)),
+                    "is_active": True,
+                }
+                for i in range(n_items)
+            ],
+        )
+        item_ids = [
+            row[0]
+            for row in session.query(KnowledgeItem.id).filter(
+                KnowledgeItem.user_id == user.id
+            )
+        ]
+
+        schedules = []
+        records = []
+        for item_id in item_ids:
+            for stage in range(records_per_item):
+                reviewed_at = now - timedelta(days=rng.randint(0, 60))
+                schedules.append(
+                    {
+                        "knowledge_item_id": item_id,
+                        "user_id": user.id,
+                        "scheduled_date": reviewed_at,
+                        "completed": True,
+                        "interval_index": stage,
+                    }
+                )
+                records.append(
+                    {
+                        "knowledge_item_id": item_id,
+                        "user_id": user.id,
+                        "review_date": reviewed_at,
+                        "effectiveness": rng.randint(1, 5),
+                        "recall_score": rng.uniform(0, 100),
+                    }
+                )
+            schedules.append(
+                {
+                    "knowledge_item_id": item_id,
+                    "user_id": user.id,
+                    "scheduled_date": now + timedelta(hours=rng.randint(-48, 240)),
+                    "completed": False,
+                    "interval_index": records_per_item,
+                }
+            )
+        session.bulk_insert_mappings(ReviewSchedule, schedules)
+        session.bulk_insert_mappings(ReviewRecord, records)
+        session.commit()
+        return user.id
+    finally:
+        session.close()
+
+
+def timed(func, *args, repeat=5, **kwargs):
+    """多次运行取最短耗时（毫秒）"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
@@ -4,6 +4,7 @@
 """
 import sys
 import os
+import importlib.util
 import logging
 
 # 添加项目根目录和src目录到Python路径
@@ -40,12 +41,17 @@ def main():
             'src.analytics.ui'#新增调用
         ]
         
+        # 只定位模块文件而不执行导入，避免启动时加载 matplotlib 等重量级依赖
         for module in required_modules:
             try:
-                __import__(module)
-                logger.debug(f"✅ 模块 {module} 可正常导入")
+                found = importlib.util.find_spec(module) is not None
             except ImportError as e:
-                logger.warning(f"⚠️ 模块 {module} 导入失败: {e}")
+                found = False
+                logger.warning(f"⚠️ 模块 {module} 查找失败: {e}")
+            if found:
+                logger.debug(f"✅ 模块 {module} 存在")
+            else:
+                logger.warning(f"⚠️ 模块 {module} 不存在")
         
         # 直接启动图形界面应用
         from src.app import ReviewAlarmApp
@@ -1,8 +1,18 @@
 """
 统计分析模块
 """
+import importlib
 
-from .service import AnalyticsService
-from .ui import AnalyticsFrame
+# 按需导入（PEP 562）：只用到 AnalyticsService 时不加载统计页界面
+_EXPORTS = {
+    "AnalyticsService": ".service",
+    "AnalyticsFrame": ".ui",
+}
 
 __all__ = ['AnalyticsService', 'AnalyticsFrame']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,124 @@
+"""
+统计图表缓存
+
+图表以 (用户ID, 图表类型, 数据指纹) 的 sha256 作为键，数据不变时直接返回
+上次渲染的PNG，不再调用 matplotlib。内存层为 LRU，磁盘层位于数据库文件旁的
+chart_cache 目录（内存数据库不启用磁盘层）。完成复习时按用户失效。
+"""
+import base64
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from src.database.events import ChangeType
+
+# 图表样式变化时递增，使旧的磁盘缓存自然失效
+CHART_VERSION = 1
+
+DATA_URI_PREFIX = "data:image/png;base64,"
+
+
+class ChartCache:
+    """两级（内存LRU + 磁盘）图表缓存，线程安全"""
+
+    def __init__(self, max_entries: int = 32, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (user_id, png)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(user_id: int, chart_type: str, fingerprint: str) -> str:
+        """生成内容寻址的缓存键"""
+        raw = f"{CHART_VERSION}|{user_id}|{chart_type}|{fingerprint}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _disk_path(self, user_id: int, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, str(user_id), f"{key}.png")
+
+    def get(self, user_id: int, key: str) -> Optional[str]:
+        """读取缓存，返回 data URI；未命中返回 None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return DATA_URI_PREFIX + base64.b64encode(entry[1]).decode()
+
+        path = self._disk_path(user_id, key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                png = f.read()
+        except OSError:
+            return None
+
+        self._remember(user_id, key, png)
+        return DATA_URI_PREFIX + base64.b64encode(png).decode()
+
+    def put(self, user_id: int, key: str, data_uri: str) -> None:
+        """写入缓存（内存层与磁盘层）"""
+        png = base64.b64decode(data_uri[len(DATA_URI_PREFIX):])
+        self._remember(user_id, key, png)
+
+        path = self._disk_path(user_id, key)
+        if path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(png)
+            os.replace(tmp_path, path)  # 原子替换，避免读到半个文件
+        except OSError as e:
+            print(f"⚠️ 图表缓存写入失败: {e}")
+
+    def _remember(self, user_id: int, key: str, png: bytes) -> None:
+        with self._lock:
+            self._memory[key] = (user_id, png)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """清除某个用户的全部图表缓存"""
+        with self._lock:
+            stale = [k for k, (owner, _) in self._memory.items() if owner == user_id]
+            for key in stale:
+                del self._memory[key]
+
+        if self.cache_dir:
+            shutil.rmtree(os.path.join(self.cache_dir, str(user_id)), ignore_errors=True)
+
+    def clear(self) -> None:
+        """清空全部缓存"""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def _create_chart_cache(db_manager) -> ChartCache:
+    db_path = getattr(db_manager, "db_path", ":memory:")
+    cache_dir = None
+    if db_path and db_path != ":memory:":
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(db_path)), "chart_cache")
+    cache = ChartCache(cache_dir=cache_dir)
+    db_manager.subscribe(
+        lambda event: cache.invalidate_user(event.user_id),
+        [ChangeType.REVIEW_COMPLETED],
+    )
+    return cache
+
+
+def get_chart_cache(db_manager) -> ChartCache:
+    """获取（必要时创建）数据库管理器对应的图表缓存，并注册复习完成失效
+
+    每个数据库管理器共享一个缓存，统计页重复打开时可直接命中。
+    """
+    return db_manager.get_shared("chart_cache", _create_chart_cache)
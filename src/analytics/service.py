@@ -6,19 +6,70 @@
 """
 统计分析服务
 """
-from typing import Dict, List
+from typing import Dict, List, Optional
 import base64
 import os
 from datetime import datetime, timedelta
+from functools import lru_cache
 from io import BytesIO
 
-import matplotlib.font_manager as fm
-import matplotlib.pyplot as plt
+from sqlalchemy import func
 
+from src.analytics.chart_cache import get_chart_cache
 from src.database.manager import DatabaseManager
-from src.database.models import KnowledgeItem, ReviewRecord, ReviewSchedule
+from src.database.models import (
+    DailyUserStat, KnowledgeItem, ReviewSchedule
+)
+
+# 中文字体候选路径（按平台）
+CHINESE_FONT_CANDIDATES = [
+    # macOS
+    "/System/Library/Fonts/PingFang.ttc",
+    "/System/Library/Fonts/Helvetica.ttc",
+    # Windows
+    "C:/Windows/Fonts/simhei.ttf",
+    "C:/Windows/Fonts/msyh.ttc",
+    "C:/Windows/Fonts/msyh.ttf",
+    # Linux
+    "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
+]
+
+
+@lru_cache(maxsize=None)
+def _pyplot():
+    """首次绘图时才导入 matplotlib（约占冷启动导入时间的一半）"""
+    import matplotlib
+
+    matplotlib.use("Agg")  # 使用非交互式后端
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+@lru_cache(maxsize=None)
+def find_chinese_font() -> Optional[str]:
+    """查找系统中可用的中文字体（进程内只探测一次）"""
+    for font_path in CHINESE_FONT_CANDIDATES:
+        if os.path.exists(font_path):
+            return font_path
+    return None
+
+
+@lru_cache(maxsize=None)
+def _chinese_font_properties():
+    """中文字体的 FontProperties（进程内只构建一次），不可用时返回 None"""
+    font_path = find_chinese_font()
+    if not font_path:
+        return None
+    try:
+        from matplotlib import font_manager
 
-plt.switch_backend("Agg")  # 使用非交互式后端
+        return font_manager.FontProperties(fname=font_path)
+    except Exception:
+        return None
 
 
 class AnalyticsService:
@@ -26,93 +77,17 @@ class AnalyticsService:
 
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
+        self.chart_cache = get_chart_cache(db_manager)
 
-        # 设置中文字体
-        self.font_path = self._find_chinese_font()
-        try:
-            self.chinese_font = (
-                fm.FontProperties(fname=self.font_path) if self.font_path else None
-            )
-        except Exception:
-            self.chinese_font = None
-
-    def _find_chinese_font(self) -> str:
-        """查找系统中可用的中文字体"""
-        candidates = [
-            # macOS
-            "/System/Library/Fonts/PingFang.ttc",
-            "/System/Library/Fonts/Helvetica.ttc",
-            # Windows
-            "C:/Windows/Fonts/simhei.ttf",
-            "C:/Windows/Fonts/msyh.ttc",
-            "C:/Windows/Fonts/msyh.ttf",
-            # Linux
-            "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-            "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
-            "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
-            "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
-        ]
-        for font_path in candidates:
-            if os.path.exists(font_path):
-                return font_path
-        return None
-
-        session = self.db_manager.get_session()
-        try:
-            # 总知识点数量
-            total_items = (session.query(KnowledgeItem).filter(
-                KnowledgeItem.user_id == user_id,
-                KnowledgeItem.is_active,
-            ).count())
+    @property
+    def font_path(self) -> Optional[str]:
+        """中文字体路径"""
+        return find_chinese_font()
 
-            # 今日复习数量
-            today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            today_reviews = (session.query(ReviewSchedule).filter(
-                ReviewSchedule.user_id == user_id,
-                ReviewSchedule.scheduled_date >= today_start,
-                ReviewSchedule.scheduled_date < today_start + timedelta(days=1),
-                ReviewSchedule.completed,
-            ).count())
-
-            # 已完成复习数量
-            completed_reviews = (session.query(ReviewRecord).filter(
-                ReviewRecord.knowledge_item_id.in_(
-                    session.query(KnowledgeItem.id).filter(
-                        KnowledgeItem.user_id == user_id)
-                )
-            ).count())
-
-            # 计算记忆保持率（基于最近30天的复习记录）
-            thirty_days_ago = datetime.now() - timedelta(days=30)
-            recent_records = (session.query(ReviewRecord).filter(
-                ReviewRecord.knowledge_item_id.in_(
-                    session.query(KnowledgeItem.id).filter(
-                        KnowledgeItem.user_id == user_id)
-                ),
-                ReviewRecord.review_date >= thirty_days_ago
-            ).all())
-
-            if recent_records:
-                avg_recall_score = sum(
-                    record.recall_score or 0 for record in recent_records) / len(recent_records)
-                retention_rate = avg_recall_score * 100
-            else:
-                retention_rate = 0
-
-            # 连续学习天数
-            streak_days = self._calculate_streak_days(session, user_id)
-
-            return {
-                "total_knowledge_items": total_items,
-                "today_review_count": today_reviews,
-                "completed_reviews": completed_reviews,
-                "retention_rate": round(retention_rate, 1),
-                "streak_days": streak_days,
-                "learning_efficiency": self._calculate_learning_efficiency(session, user_id),
-            }
-
-        finally:
-            session.close()
+    @property
+    def chinese_font(self):
+        """中文字体（首次访问时导入 matplotlib）"""
+        return _chinese_font_properties()
 
     def calculate_user_overview(self, user_id: int) -> dict:
         """统计用户总体学习概况"""
@@ -133,32 +108,21 @@ class AnalyticsService:
             ).count()
                              )
 
-            completed_reviews = (session.query(ReviewRecord)
-                                 .filter(
-                ReviewRecord.knowledge_item_id.in_(
-                    session.query(KnowledgeItem.id)
-                        .filter(KnowledgeItem.user_id == user_id)
-                )
-            ).count()
-                                 )
-
-            # 计算最近30天保持率
-            thirty_days_ago = datetime.now() - timedelta(days=30)
-            recent_records = (session.query(ReviewRecord)
-                              .filter(
-                ReviewRecord.knowledge_item_id.in_(
-                    session.query(KnowledgeItem.id)
-                        .filter(KnowledgeItem.user_id == user_id)
-                ),
-                ReviewRecord.review_date >= thirty_days_ago,
-            ).all()
-                              )
-
-            if recent_records:
-                avg_recall_score = sum(r.recall_score or 0 for r in recent_records) / len(recent_records)
-                retention_rate = avg_recall_score
-            else:
-                retention_rate = 0
+            # 复习次数与30天保持率均来自每日汇总表
+            completed_reviews = (session.query(
+                func.coalesce(func.sum(DailyUserStat.review_count), 0)
+            ).filter(DailyUserStat.user_id == user_id).scalar())
+
+            thirty_days_ago = (datetime.now() - timedelta(days=30)).date()
+            recent_count, recent_recall = (session.query(
+                func.coalesce(func.sum(DailyUserStat.review_count), 0),
+                func.coalesce(func.sum(DailyUserStat.recall_sum), 0),
+            ).filter(
+                DailyUserStat.user_id == user_id,
+                DailyUserStat.date >= thirty_days_ago,
+            ).one())
+
+            retention_rate = recent_recall / recent_count if recent_count else 0
 
             streak_days = self._calculate_streak_days(session, user_id)
 
@@ -177,8 +141,7 @@ class AnalyticsService:
     def get_user_stats(self, user_id):
         """获取用户总体统计（供测试和UI使用）"""
         try:
-            db = DatabaseManager()
-            stats = db.get_overall_stats(user_id)
+            stats = self.db_manager.get_overall_stats(user_id)
 
             default_stats = {
                 "total_knowledge_items": 0,
@@ -227,110 +190,63 @@ class AnalyticsService:
                 "ebbinghaus_distribution": {},
             }
 
-    def _calculate_streak_days (self, session, user_id: int) -> int:
-        """计算连续学习天数"""
-
-        # 获取用户的所有复习记录日期
-        review_dates = (session.query(ReviewRecord.review_date).filter(
-            ReviewRecord.knowledge_item_id.in_(
-                session.query(KnowledgeItem.id).filter(KnowledgeItem.user_id == user_id)
-            )
-        ).distinct().all())
-
-        if not review_dates:
-            return 0
-
-        # 转换为日期对象并排序
-        dates = sorted([date[0].date() for date in review_dates], reverse=True)
-
-        # 计算连续天数
-        streak = 0
-        current_date = datetime.now().date()
-
-        for date in dates:
-            if date == current_date - timedelta(days=streak):
-                streak += 1
-            else:
-                break
-
-        return streak
+    def _calculate_streak_days(self, session, user_id: int) -> int:
+        """计算连续学习天数（与整体统计共用数据库层的计算，复用调用方的会话）"""
+        return self.db_manager._streak_info(session, user_id)["current_streak"]
 
     def _calculate_learning_efficiency(self, session, user_id: int) -> float:
-        """计算学习效率"""
-
-        # 获取最近7天的复习记录
-        seven_days_ago = datetime.now() - timedelta(days=7)
-        recent_records = (session.query(ReviewRecord).filter(
-            ReviewRecord.knowledge_item_id.in_(
-                session.query(KnowledgeItem.id).filter(KnowledgeItem.user_id == user_id)
-            ),
-            ReviewRecord.review_date >= seven_days_ago
-        ).all())
-
-        if not recent_records:
+        """计算学习效率（最近7天，读取每日汇总表）"""
+        seven_days_ago = (datetime.now() - timedelta(days=7)).date()
+        review_count, efficiency_sum = (session.query(
+            func.coalesce(func.sum(DailyUserStat.review_count), 0),
+            func.coalesce(func.sum(DailyUserStat.efficiency_sum), 0),
+        ).filter(
+            DailyUserStat.user_id == user_id,
+            DailyUserStat.date >= seven_days_ago,
+        ).one())
+
+        if not review_count:
             return 0.0
 
-        # 基于回忆分数计算效率
-        total_efficiency = sum(
-            (record.recall_score or 0.5) * (record.effectiveness or 3) / 5
-            for record in recent_records
-        )
-
-        return round(total_efficiency / len(recent_records) * 100, 1)
+        return round(efficiency_sum / review_count * 100, 1)
 
     def create_learning_chart(self, user_id: int) -> str:
         """创建学习统计图表，返回base64编码的图片"""
-        session = self.db_manager.get_session()
-        try:
-
-            # 获取最近30天的学习数据
-            thirty_days_ago = datetime.now() - timedelta(days=30)
-
-            # 查询每日复习数量
-            daily_reviews = (session.query(
-                ReviewRecord.review_date,
-                ReviewRecord.recall_score
-            ).filter(
-                ReviewRecord.knowledge_item_id.in_(
-                    session.query(KnowledgeItem.id).filter(
-                        KnowledgeItem.user_id == user_id)
-                ),
-                ReviewRecord.review_date >= thirty_days_ago,
-            ).all())
+        # 最近30天的每日汇总（最多31行）
+        thirty_days_ago = datetime.now() - timedelta(days=30)
+        rows = self.db_manager.get_daily_user_stats(user_id, thirty_days_ago.date())
+
+        date_counts: Dict[datetime.date, int] = {}
+        date_scores: Dict[datetime.date, float] = {}
+        for row in rows:
+            if row.review_count:
+                date_counts[row.date] = row.review_count
+                date_scores[row.date] = round(row.recall_sum / row.review_count, 2)
+
+        # 生成连续日期范围
+        dates = [thirty_days_ago.date() + timedelta(days=i) for i in range(31)]
+        review_counts = [date_counts.get(date, 0) for date in dates]
+        avg_scores = [date_scores.get(date, 0) for date in dates]
+
+        # 数据指纹：日期范围与每日数值均不变时直接复用缓存图表
+        fingerprint = "|".join(
+            f"{date.isoformat()}:{count}:{score}"
+            for date, count, score in zip(dates, review_counts, avg_scores)
+        )
+        key = self.chart_cache.make_key(user_id, "learning_trend", fingerprint)
+        cached = self.chart_cache.get(user_id, key)
+        if cached is not None:
+            return cached
 
-            # 组织数据
-            date_counts: Dict[datetime.date, int] = {}
-            date_scores: Dict[datetime.date, List[float]] = {}
-           # date_counts = {}
-           # date_scores = {}
-
-            for record in daily_reviews:
-                date = record.review_date.date()
-                date_counts[date] = date_counts.get(date, 0) + 1
-                if record.recall_score:
-                    if date not in date_scores:
-                        date_scores[date] = []
-                    date_scores[date].append(record.recall_score)
-
-            # 生成连续日期范围
-            dates = [thirty_days_ago.date() + timedelta(days=i) for i in range(31)]
-            review_counts = [date_counts.get(date, 0) for date in dates]
-            avg_scores = [
-                round(sum(date_scores.get(date, [0])) /
-                      len(date_scores.get(date, [1])), 2)
-                if date in date_scores
-                else 0
-                for date in dates
-            ]
-
-            # 创建图表
-            return self._create_chart_image(dates, review_counts, avg_scores)
-
-        finally:
-            session.close()
+        # 创建图表
+        image = self._create_chart_image(dates, review_counts, avg_scores)
+        self.chart_cache.put(user_id, key, image)
+        return image
 
     def _create_chart_image(self, dates: List, review_counts: List, avg_scores: List) -> str:
         """创建图表并返回base64编码"""
+        plt = _pyplot()
+
         # 设置中文字体
         if self.chinese_font:
             plt.rcParams['font.sans-serif'] = [self.chinese_font.get_name()]
@@ -393,25 +309,21 @@ class AnalyticsService:
             session.close()
 
     def get_review_effectiveness(self, user_id: int) -> Dict[str, float]:
-        """获取复习效果分析"""
+        """获取复习效果分析（累加每日汇总中的评分直方图）"""
         session = self.db_manager.get_session()
         try:
-            effectiveness_data = (session.query(ReviewRecord.effectiveness).filter(
-                ReviewRecord.knowledge_item_id.in_(
-                    session.query(KnowledgeItem.id).filter(
-                        KnowledgeItem.user_id == user_id)
-                ),
-                ReviewRecord.effectiveness.isnot(None),
-            ).all())
+            histogram = (session.query(*[
+                func.coalesce(
+                    func.sum(getattr(DailyUserStat, f"effectiveness_{score}")), 0
+                )
+                for score in range(1, 6)
+            ]).filter(DailyUserStat.user_id == user_id).one())
 
-            if not effectiveness_data:
+            effectiveness_counts = dict(zip(range(1, 6), histogram))
+            total = sum(effectiveness_counts.values())
+            if not total:
                 return {}
 
-            effectiveness_counts: Dict[int, int] = {}  # effectiveness_counts = {}
-            for eff in effectiveness_data:
-                effectiveness_counts[eff[0]] = effectiveness_counts.get(eff[0], 0) + 1
-
-            total = len(effectiveness_data)
             return {
                 "优秀": effectiveness_counts.get(5, 0) / total * 100,
                 "良好": effectiveness_counts.get(4, 0) / total * 100,
@@ -423,3 +335,8 @@ class AnalyticsService:
         finally:
             session.close()
 
+    def get_review_forecast(self, user_id: int, days: int = 14) -> Optional[Dict]:
+        """未来 days 天每天预计的复习次数（见 scheduler.forecast）"""
+        from src.scheduler.forecast import get_review_forecast
+
+        return get_review_forecast(self.db_manager, user_id, days)
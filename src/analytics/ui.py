@@ -9,13 +9,15 @@
 
 import customtkinter as ctk
 from tkinter import messagebox
-import threading
 from PIL import Image, ImageTk
 import base64
 from io import BytesIO
 
+from src.common.executor import get_executor
 from .service import AnalyticsService
 
+FORECAST_DAYS = 14  # 复习预测选项卡显示的天数
+
 
 class AnalyticsFrame(ctk.CTkFrame):
     """统计分析界面"""
@@ -54,12 +56,14 @@ class AnalyticsFrame(ctk.CTkFrame):
         self.tabview.add("趋势分析")
         self.tabview.add("分类统计")
         self.tabview.add("复习效果")
+        self.tabview.add("复习预测")
 
         # 设置各选项卡内容
         self.setup_overview_tab()
         self.setup_trend_tab()
         self.setup_category_tab()
         self.setup_effectiveness_tab()
+        self.setup_forecast_tab()
 
     def setup_overview_tab(self):
         """设置学习概览选项卡"""
@@ -183,43 +187,57 @@ class AnalyticsFrame(ctk.CTkFrame):
         )
         self.effectiveness_label.pack(expand=True)
 
+    def setup_forecast_tab(self):
+        """设置复习预测选项卡"""
+        tab = self.tabview.tab("复习预测")
+
+        # 预测结果容器
+        self.forecast_frame = ctk.CTkFrame(tab)
+        self.forecast_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.forecast_label = ctk.CTkLabel(
+            self.forecast_frame,
+            text="预测数据加载中...",
+            font=ctk.CTkFont(size=16)
+        )
+        self.forecast_label.pack(expand=True)
+
     def load_data(self):
         """加载数据"""
         # 显示加载状态
         for card in self.stats_cards.values():
             card.configure(text="加载中...")
 
-        # 在新线程中加载数据
-        thread = threading.Thread(target=self._load_data_thread)
-        thread.daemon = True
-        thread.start()
+        # 在后台线程中加载数据，结果回到界面线程更新
+        get_executor().submit(
+            self,
+            self._load_data_thread,
+            key=(id(self), "analytics"),
+            on_success=lambda _: self._update_ui(),
+            on_error=lambda err: messagebox.showerror("错误", f"加载数据失败: {err}"),
+        )
 
     def _load_data_thread(self):
-        """在新线程中加载数据"""
-        try:
-            # 获取统计数据
-            self.stats_data = self.analytics_service.get_user_stats(
-                self.current_user.id)
+        """在后台线程中加载数据"""
+        # 获取统计数据
+        self.stats_data = self.analytics_service.get_user_stats(
+            self.current_user.id)
 
-            # 获取图表数据
-            self.chart_image = self.analytics_service.create_learning_chart(
-                self.current_user.id)
+        # 获取图表数据
+        self.chart_image = self.analytics_service.create_learning_chart(
+            self.current_user.id)
 
-            # 获取分类统计
-            self.category_stats = self.analytics_service.get_category_stats(
-                self.current_user.id)
+        # 获取分类统计
+        self.category_stats = self.analytics_service.get_category_stats(
+            self.current_user.id)
 
-            # 获取复习效果
-            self.effectiveness_stats = self.analytics_service.get_review_effectiveness(
-                self.current_user.id)
+        # 获取复习效果
+        self.effectiveness_stats = self.analytics_service.get_review_effectiveness(
+            self.current_user.id)
 
-            # 在主线程中更新UI
-            self.after(0, self._update_ui)
-
-        except Exception as err:  # e
-            self.after(0, lambda message=str(err)
-                       : messagebox.showerror("错误",  f"加载数据失败: {message}"))
-            # self.after(0, lambda: messagebox.showerror("错误", f"加载数据失败: {str(e)}"))
+        # 获取未来两周的复习负荷预测
+        self.forecast = self.analytics_service.get_review_forecast(
+            self.current_user.id, days=FORECAST_DAYS)
 
     def _update_ui(self):
         """更新UI显示"""
@@ -235,6 +253,9 @@ class AnalyticsFrame(ctk.CTkFrame):
         if self.effectiveness_stats:
             self._update_effectiveness_display()
 
+        if self.forecast:
+            self._update_forecast_display()
+
     def _update_stats_cards(self):
         """更新统计卡片"""
         display_config = {
@@ -372,3 +393,49 @@ class AnalyticsFrame(ctk.CTkFrame):
                     text=f"{percentage:.1f}%",
                     font=ctk.CTkFont(size=12)
                 ).pack(side="right", padx=10)
+
+    def _update_forecast_display(self):
+        """更新复习预测显示：每天预计的复习次数"""
+        # 清除原有内容
+        for widget in self.forecast_frame.winfo_children():
+            widget.destroy()
+
+        if not self.forecast["cards"]:
+            ctk.CTkLabel(
+                self.forecast_frame,
+                text="暂无待复习的知识点",
+                font=ctk.CTkFont(size=14)
+            ).pack(expand=True)
+            return
+
+        ctk.CTkLabel(
+            self.forecast_frame,
+            text=f"未来 {len(self.forecast['dates'])} 天预计复习约 "
+                 f"{self.forecast['total']:.0f} 次",
+            font=ctk.CTkFont(size=14, weight="bold")
+        ).pack(pady=(5, 0))
+
+        scrollable_frame = ctk.CTkScrollableFrame(self.forecast_frame)
+        scrollable_frame.pack(fill="both", expand=True)
+
+        peak = max(self.forecast["expected"]) or 1
+        for day, expected in zip(self.forecast["dates"], self.forecast["expected"]):
+            day_frame = ctk.CTkFrame(scrollable_frame)
+            day_frame.pack(fill="x", padx=5, pady=2)
+
+            ctk.CTkLabel(
+                day_frame,
+                text=day,
+                font=ctk.CTkFont(size=14)
+            ).pack(side="left", padx=10)
+
+            # 以峰值为满格
+            progress_bar = ctk.CTkProgressBar(day_frame)
+            progress_bar.pack(side="left", padx=10, fill="x", expand=True)
+            progress_bar.set(expected / peak)
+
+            ctk.CTkLabel(
+                day_frame,
+                text=f"{expected:.0f} 次",
+                font=ctk.CTkFont(size=12)
+            ).pack(side="right", padx=10)
@@ -9,6 +9,7 @@ import logging
 # 使用相对导入
 from database.manager import DatabaseManager
 from auth.ui import LoginFrame
+from .common.executor import get_executor
 
 
 try:
@@ -25,6 +26,13 @@ except ImportError as e:
     SCHEDULER_MODULE_AVAILABLE = False
     print(f"⚠️ 复习调度模块导入失败，将使用占位符: {e} - app.py:26")
 
+try:
+    from .scheduler.review_buffer import close_review_buffers
+    REVIEW_BUFFER_AVAILABLE = True
+except ImportError as e:
+    REVIEW_BUFFER_AVAILABLE = False
+    print(f"⚠️ 复习缓冲模块导入失败: {e} - app.py:29")
+
 try:
     from .scheduler.reminder import get_reminder_service
     REMINDER_MODULE_AVAILABLE = True
@@ -339,7 +347,7 @@ class ReviewAlarmApp:
 
         ctk.CTkLabel(
             interval_frame,
-            text="提醒检查间隔（秒）:",
+            text="计划同步间隔（到期提醒即时发送）:",
             font=ctk.CTkFont(size=14)
         ).pack(pady=5)
 
@@ -643,12 +651,21 @@ class ReviewAlarmApp:
             # 更新导航栏状态显示
             self.update_reminder_status_display()
 
+        # 写入尚在缓冲中的复习评分
+        if REVIEW_BUFFER_AVAILABLE:
+            close_review_buffers(self.db_manager)
+
         self.current_user = None
         self.show_login()
 
     def run(self):
         """运行应用"""
         self.root.mainloop()
+        # 写入尚在缓冲中的复习评分（未写入的会在下次启动时从日志回放）
+        if REVIEW_BUFFER_AVAILABLE:
+            close_review_buffers(self.db_manager)
+        # 丢弃尚未开始的后台查询，避免退出时继续访问数据库
+        get_executor().shutdown()
 
     def refresh_all_views(self):
         """全局刷新 今日复习 + 知识管理"""
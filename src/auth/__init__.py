@@ -1,8 +1,19 @@
 """
 认证模块
 """
+import importlib
 
-from .ui import LoginFrame, RegisterDialog
-from .service import AuthService
+# 界面类按需导入（PEP 562），AuthService 可在没有显示器的环境中使用
+_EXPORTS = {
+    "LoginFrame": ".ui",
+    "RegisterDialog": ".ui",
+    "AuthService": ".service",
+}
 
 __all__ = ["LoginFrame", "RegisterDialog", "AuthService"]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
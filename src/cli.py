@@ -0,0 +1,285 @@
+"""
+命令行入口（无界面）
+
+不导入 customtkinter / matplotlib，可在没有显示器的服务器上由 cron 调用：
+    python -m src.cli [--db PATH] [-v] <命令> ...
+
+命令：
+    import FILE --user U          从 CSV / JSONL / Anki 导出文件批量导入知识点
+    export FILE --user U          流式导出学习历史（JSONL / 列式，支持增量水位线）
+    stats --user U                学习概况
+    due-list (--user U | --all-users)   待复习计划
+    forecast --user U [--days N]  预测未来每天的复习次数
+    reminder-daemon               多用户提醒守护进程（见 scheduler.daemon）
+    vacuum                        整理数据库文件
+    rebuild-index                 重建知识点全文索引
+    rebuild-daily-stats           根据复习记录重建每日汇总表
+
+业务模块（含其调试输出）只在对应命令中导入；调试输出默认丢弃，-v 时写到标准错误。
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+from datetime import timedelta
+
+DEFAULT_DB = "src/database/review_alarm.db"
+
+# 与 knowledge.importer.FORMATS、database.exporter.FORMATS 一致（解析参数时不导入业务模块）
+FORMATS = ("csv", "jsonl", "json", "anki", "apkg")
+EXPORT_FORMATS = ("jsonl", "columnar")
+
+
+def resolve_user_id(db_manager, user):
+    """按用户名或用户ID查找用户，不存在时抛出 SystemExit"""
+    from src.database.models import User
+
+    session = db_manager.get_session()
+    try:
+        query = session.query(User.id)
+        if str(user).isdigit():
+            row = query.filter(User.id == int(user)).first()
+        else:
+            row = query.filter(User.username == user).first()
+    finally:
+        session.close()
+    if row is None:
+        raise SystemExit(f"❌ 用户不存在: {user}")
+    return row[0]
+
+
+def _print_json(data, out):
+    json.dump(data, out, ensure_ascii=False, indent=2, default=str)
+    out.write("\n")
+
+
+# ------------------------------
+# 命令实现
+# ------------------------------
+def cmd_import(db_manager, args, out):
+    from src.knowledge.importer import import_file
+
+    user_id = resolve_user_id(db_manager, args.user)
+
+    def report(processed, added):
+        print(f"\r已处理 {processed} 条，新增 {added} 条", end="", file=sys.stderr)
+
+    progress = report if sys.stderr.isatty() else None
+
+    try:
+        result = import_file(
+            db_manager, user_id, args.file, args.format,
+            batch_size=args.batch_size, progress=progress,
+        )
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+    if progress:
+        print(file=sys.stderr)
+    counts = result["data"]
+    if not result["success"]:
+        raise SystemExit(f"❌ {result['msg']}（已新增 {counts['added']} 个知识点）")
+    print(
+        f"✅ 导入完成：新增 {counts['added']} 个知识点，"
+        f"跳过重复 {counts['duplicates']} 个、无标题 {counts['invalid']} 个",
+        file=out,
+    )
+
+
+def cmd_export(db_manager, args, out):
+    from src.database.exporter import export_user_history
+
+    user_id = resolve_user_id(db_manager, args.user)
+    watermark = None
+    if args.since and os.path.exists(args.since):
+        with open(args.since, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("user_id") != user_id:
+            raise SystemExit(f"❌ 水位线文件 {args.since} 属于其他用户")
+        watermark = state["watermark"]
+
+    result = export_user_history(
+        db_manager, user_id, out if args.file == "-" else args.file,
+        file_format=args.format, watermark=watermark, batch_size=args.batch_size,
+    )
+    if args.since:
+        # 导出成功后才推进水位线，先写临时文件再替换
+        tmp_path = args.since + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"user_id": user_id, "watermark": result["watermark"]}, f)
+        os.replace(tmp_path, args.since)
+    if args.file != "-":
+        summary = "，".join(f"{table} {count} 行" for table, count in result["rows"].items())
+        print(f"✅ 已导出到 {args.file}：{summary}", file=out)
+
+
+def cmd_stats(db_manager, args, out):
+    from src.analytics.service import AnalyticsService
+    from src.scheduler.service import SchedulerService
+
+    user_id = resolve_user_id(db_manager, args.user)
+    stats = AnalyticsService(db_manager).calculate_user_overview(user_id)
+    stats["today"] = SchedulerService(db_manager).get_review_stats(user_id)
+    if args.json:
+        _print_json(stats, out)
+        return
+    labels = {
+        "total_knowledge_items": "知识点总数",
+        "today_review_count": "今日已复习",
+        "completed_reviews": "累计复习次数",
+        "retention_rate": "30天平均回忆分数",
+        "streak_days": "连续复习天数",
+        "learning_efficiency": "学习效率",
+    }
+    for key, label in labels.items():
+        print(f"{label}: {stats.get(key)}", file=out)
+    for key, value in (stats["today"] or {}).items():
+        print(f"今日 {key}: {value}", file=out)
+
+
+def cmd_due_list(db_manager, args, out):
+    if args.all_users:
+        reminders = db_manager.get_pending_reminders(
+            within=timedelta(hours=args.within_hours)
+        )
+        rows = [
+            (r["scheduled_date"], r["user_id"], r["knowledge_title"]) for r in reminders
+        ]
+    else:
+        from src.scheduler.service import SchedulerService
+
+        user_id = resolve_user_id(db_manager, args.user)
+        reviews = SchedulerService(db_manager).get_today_reviews(user_id)
+        rows = [
+            (r["scheduled_date"].strftime("%Y-%m-%d %H:%M"), user_id, r["title"])
+            for r in reviews
+        ]
+    if args.json:
+        _print_json(
+            [{"scheduled_date": d, "user_id": u, "title": t} for d, u, t in rows], out
+        )
+        return
+    for scheduled_date, user_id, title in rows:
+        print(f"{scheduled_date}\t{user_id}\t{title}", file=out)
+    print(f"共 {len(rows)} 个待复习计划", file=out)
+
+
+def cmd_forecast(db_manager, args, out):
+    from src.analytics.service import AnalyticsService
+
+    user_id = resolve_user_id(db_manager, args.user)
+    forecast = AnalyticsService(db_manager).get_review_forecast(user_id, args.days)
+    if args.json:
+        _print_json(forecast, out)
+        return
+    for day, expected in zip(forecast["dates"], forecast["expected"]):
+        print(f"{day}\t{expected:.1f}", file=out)
+    print(f"共 {forecast['cards']} 张卡片，{args.days} 天预计复习 {forecast['total']:.1f} 次"
+          f"（{forecast['algorithm']}）", file=out)
+
+
+def cmd_reminder_daemon(db_manager, args, out):
+    from src.scheduler import daemon
+
+    return daemon.run(args, db_manager, out)
+
+
+def cmd_vacuum(db_manager, args, out):
+    before, after = db_manager.vacuum()
+    print(f"✅ 数据库整理完成：{before / 1024:.0f} KB → {after / 1024:.0f} KB", file=out)
+
+
+def cmd_rebuild_index(db_manager, args, out):
+    count = db_manager.rebuild_search_index()
+    print(f"✅ 全文索引重建完成，共索引 {count} 个知识点", file=out)
+
+
+def cmd_rebuild_daily_stats(db_manager, args, out):
+    user_id = resolve_user_id(db_manager, args.user) if args.user else None
+    rows = db_manager.rebuild_daily_user_stats(user_id)
+    print(f"✅ 每日汇总重建完成，共写入 {rows} 行", file=out)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="复习闹钟命令行工具")
+    parser.add_argument("--db", default=DEFAULT_DB, help="数据库文件路径")
+    parser.add_argument("-v", "--verbose", action="store_true", help="把调试输出写到标准错误")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add(name, handler, help_text, aliases=()):
+        sub = subparsers.add_parser(name, help=help_text, aliases=list(aliases))
+        sub.set_defaults(handler=handler)
+        return sub
+
+    sub = add("import", cmd_import, "导入知识点")
+    sub.add_argument("file", help="CSV / JSONL / JSON / Anki 文本导出（.txt）/ .apkg 文件")
+    sub.add_argument("--user", required=True, help="用户名或用户ID")
+    sub.add_argument("--format", choices=FORMATS, default=None,
+                     help="文件格式（默认按扩展名判断）")
+    sub.add_argument("--batch-size", type=int, default=1000, help="每个事务写入的知识点数")
+
+    sub = add("export", cmd_export, "流式导出知识点、复习计划与复习记录")
+    sub.add_argument("file", help="输出文件，- 表示标准输出")
+    sub.add_argument("--user", required=True, help="用户名或用户ID")
+    sub.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl",
+                     help="jsonl 逐行记录；columnar 为 gzip 压缩的列式行组")
+    sub.add_argument("--since", metavar="STATE_FILE", default=None,
+                     help="增量导出：只导出该水位线文件之后的新行，完成后更新水位线")
+    sub.add_argument("--batch-size", type=int, default=5000, help="每批读取的行数")
+
+    sub = add("stats", cmd_stats, "学习概况")
+    sub.add_argument("--user", required=True, help="用户名或用户ID")
+    sub.add_argument("--json", action="store_true", help="输出 JSON")
+
+    sub = add("due-list", cmd_due_list, "待复习计划")
+    target = sub.add_mutually_exclusive_group(required=True)
+    target.add_argument("--user", help="用户名或用户ID（列出今日计划）")
+    target.add_argument("--all-users", action="store_true", help="所有开启提醒的用户")
+    sub.add_argument("--within-hours", type=float, default=0,
+                     help="--all-users 时包含未来若干小时内到期的计划")
+    sub.add_argument("--json", action="store_true", help="输出 JSON")
+
+    sub = add("forecast", cmd_forecast, "预测未来每天的复习次数")
+    sub.add_argument("--user", required=True, help="用户名或用户ID")
+    sub.add_argument("--days", type=int, default=30, help="预测天数（含今天）")
+    sub.add_argument("--json", action="store_true", help="输出 JSON")
+
+    sub = add("reminder-daemon", cmd_reminder_daemon, "多用户提醒守护进程")
+    from src.scheduler.daemon import add_arguments
+    add_arguments(sub)
+
+    add("vacuum", cmd_vacuum, "整理数据库文件并更新统计信息")
+    add("rebuild-index", cmd_rebuild_index, "重建知识点全文索引",
+        aliases=["rebuild-search-index"])
+    sub = add("rebuild-daily-stats", cmd_rebuild_daily_stats, "根据复习记录重建每日汇总表")
+    sub.add_argument("--user", "--user-id", dest="user", default=None,
+                     help="只重建指定用户（用户名或用户ID）")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    out = sys.stdout
+    # 业务模块的调试 print 不混入命令输出
+    debug = sys.stderr if args.verbose else open(os.devnull, "w")
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    try:
+        with contextlib.redirect_stdout(debug):
+            from src.database.manager import DatabaseManager
+
+            db_manager = DatabaseManager(args.db)
+            try:
+                return args.handler(db_manager, args, out) or 0
+            finally:
+                db_manager.engine.dispose()
+    finally:
+        if debug is not sys.stderr:
+            debug.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
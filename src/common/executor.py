@@ -0,0 +1,269 @@
+"""
+界面后台任务执行器
+
+界面线程只负责绘制：数据库查询提交到有界线程池执行，完成结果放入队列，
+由界面线程通过 after() 轮询取出并回调。同一 key 的新任务会作废尚未完成的
+旧任务（例如被新输入取代的搜索），旧任务的结果直接丢弃。
+
+其他线程（写操作所在的工作线程、复习缓冲的写入线程、提醒守护进程）发出的
+数据变更事件不能直接调用 Tk（包括 after()），用 post() 放入同一队列；
+watch() 过的组件存活期间界面线程持续低频轮询，取出后在界面线程回调。
+"""
+
+import queue
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+
+class TaskHandle:
+    """已提交任务的句柄"""
+
+    def __init__(self, owner, key, on_success, on_error, on_loading):
+        self.owner = owner
+        self.key = key
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_loading = on_loading
+        self.future = None
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """作废任务：未开始的不再执行，已开始的结果被丢弃"""
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+
+class UITaskExecutor:
+    """有界线程池 + 界面线程结果队列
+
+    回调（on_success/on_error/on_loading）都在界面线程执行；owner 为发起任务的
+    界面组件，用于调度 after() 轮询，组件销毁后结果不再回调。
+    """
+
+    def __init__(
+        self, max_workers: int = 4, poll_interval_ms: int = 30, idle_poll_interval_ms: int = 100
+    ):
+        self.poll_interval_ms = poll_interval_ms
+        self.idle_poll_interval_ms = idle_poll_interval_ms  # 只有 watch() 的组件时的轮询间隔
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ui-task"
+        )
+        self._results = queue.Queue()  # (句柄, 结果, 异常)
+        self._latest = {}  # key -> 最新句柄
+        self._pending = 0
+        self._futures = set()
+        self._poll_owner = None
+        self._watchers = weakref.WeakSet()  # 等待 post() 回调的组件
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        owner,
+        fn: Callable,
+        *args,
+        key=None,
+        on_success: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+        on_loading: Optional[Callable[[bool], None]] = None,
+        **kwargs,
+    ) -> TaskHandle:
+        """提交后台任务（需在界面线程调用）
+
+        key 相同的未完成任务会被作废；on_loading(True) 立即回调，
+        该 key 的最新任务结束时回调 on_loading(False)。
+        """
+        handle = TaskHandle(owner, key, on_success, on_error, on_loading)
+        if key is not None:
+            with self._lock:
+                stale = self._latest.get(key)
+                self._latest[key] = handle
+            if stale is not None:
+                stale.cancel()
+
+        if on_loading:
+            on_loading(True)
+
+        def run():
+            if handle.cancelled:
+                self._results.put((handle, None, None))
+                return
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._results.put((handle, None, e))
+            else:
+                self._results.put((handle, result, None))
+
+        def done(future):
+            with self._lock:
+                self._futures.discard(future)
+            # future.cancel() 成功时 run 不会执行，也要让结果队列知道任务结束
+            if future.cancelled():
+                self._results.put((handle, None, None))
+
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._pool.submit(run)
+        except RuntimeError:
+            # 执行器已关闭（程序退出中）
+            with self._lock:
+                self._pending -= 1
+            handle.cancel()
+            return handle
+        with self._lock:
+            self._futures.add(future)
+        handle.future = future
+        future.add_done_callback(done)
+        self._schedule_poll(owner)
+        return handle
+
+    def post(self, owner, callback: Callable, *args) -> None:
+        """从任意线程提交一个在界面线程执行的回调（owner 需已 watch()，销毁后丢弃）"""
+        handle = TaskHandle(owner, None, lambda _: callback(*args), None, None)
+        with self._lock:
+            self._pending += 1
+        self._results.put((handle, None, None))
+
+    def watch(self, owner) -> None:
+        """owner 存活期间保持轮询，以便执行其他线程 post() 的回调（界面线程调用）"""
+        with self._lock:
+            self._watchers.add(owner)
+        self._schedule_poll(owner, self.idle_poll_interval_ms)
+
+    def cancel(self, key) -> None:
+        """作废某个 key 下未完成的任务"""
+        with self._lock:
+            handle = self._latest.get(key)
+        if handle is not None:
+            handle.cancel()
+
+    def is_loading(self, key) -> bool:
+        """某个 key 下是否有未完成的任务"""
+        with self._lock:
+            handle = self._latest.get(key)
+        return handle is not None and not handle.cancelled
+
+    # ------------------------------
+    # 界面线程轮询
+    # ------------------------------
+    def _schedule_poll(self, owner, delay_ms: Optional[int] = None) -> None:
+        """在 owner 所在的顶层窗口上安排一次轮询
+
+        切换页面会销毁内容组件，Tk 随之删除其上未执行的 after 回调；轮询挂在
+        顶层窗口上才不会丢失。挂轮询的窗口已销毁时视为没有轮询，重新安排。
+        """
+        host = _poll_host(owner)
+        with self._lock:
+            if self._poll_owner is not None and _widget_alive(self._poll_owner):
+                return
+            self._poll_owner = host
+        try:
+            host.after(delay_ms or self.poll_interval_ms, self._poll)
+        except Exception:
+            with self._lock:
+                self._poll_owner = None
+
+    def _poll(self) -> None:
+        owner = self._poll_owner
+        with self._lock:
+            self._poll_owner = None
+        self.process_completions()
+        with self._lock:
+            pending = self._pending
+            watchers = [w for w in self._watchers if _widget_alive(w)]
+        if pending > 0:
+            self._schedule_poll(self._alive_owner(owner))
+        elif watchers:
+            self._schedule_poll(watchers[0], self.idle_poll_interval_ms)
+
+    def _alive_owner(self, owner):
+        """发起轮询的组件已销毁时，改用仍存活的任务所属组件"""
+        if _widget_alive(owner):
+            return owner
+        with self._lock:
+            handles = list(self._latest.values())
+        for handle in handles:
+            if _widget_alive(handle.owner):
+                return handle.owner
+        return owner
+
+    def process_completions(self) -> int:
+        """取出已完成任务并执行回调（界面线程），返回处理的任务数"""
+        processed = 0
+        while True:
+            try:
+                handle, result, error = self._results.get_nowait()
+            except queue.Empty:
+                return processed
+            processed += 1
+            with self._lock:
+                self._pending -= 1
+                is_latest = handle.key is None or self._latest.get(handle.key) is handle
+                if handle.key is not None and is_latest:
+                    del self._latest[handle.key]
+
+            if handle.cancelled or not _widget_alive(handle.owner):
+                if is_latest and handle.on_loading and _widget_alive(handle.owner):
+                    handle.on_loading(False)
+                continue
+
+            if handle.on_loading:
+                handle.on_loading(False)
+            try:
+                if error is not None:
+                    if handle.on_error:
+                        handle.on_error(error)
+                    else:
+                        print(f"❌ 后台任务失败: {error}")
+                elif handle.on_success:
+                    handle.on_success(result)
+            except Exception as e:
+                print(f"❌ 后台任务回调出错: {e}")
+
+    def wait_idle(self, timeout: Optional[float] = None) -> None:
+        """等待已提交任务全部执行完（测试与退出时使用）"""
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures, timeout)
+
+    def shutdown(self) -> None:
+        """关闭线程池，丢弃未开始的任务"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _poll_host(widget):
+    """承载轮询的组件：widget 所在的顶层窗口（取不到时为 widget 本身）"""
+    try:
+        return widget.winfo_toplevel()
+    except Exception:
+        return widget
+
+
+def _widget_alive(widget) -> bool:
+    if widget is None:
+        return False
+    try:
+        return bool(widget.winfo_exists())
+    except Exception:
+        return False
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> UITaskExecutor:
+    """获取全部界面共享的后台任务执行器"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = UITaskExecutor()
+        return _executor
@@ -0,0 +1,218 @@
+"""
+虚拟化列表组件
+
+只为可见区域（加上上下若干行的预渲染）创建行组件，滚动时回收离开窗口的行
+并重新绑定到新的数据项。行高固定，列表总高度由 行数 × 行高 计算，
+因此上万条数据也只占用几十个行组件。
+"""
+
+import tkinter as tk
+
+import customtkinter as ctk
+
+
+class VirtualList(ctk.CTkFrame):
+    """固定行高的虚拟化列表
+
+    create_row(parent) 创建一个可复用的行组件；
+    bind_row(row, item, index) 把数据项绑定到行组件（更新文字、按钮命令等）；
+    key(item) 返回数据项的唯一键，用于增量更新（update_item/remove/insert）。
+    """
+
+    def __init__(
+        self,
+        parent,
+        row_height,
+        create_row,
+        bind_row,
+        key=None,
+        overscan=3,
+        row_padding=8,
+        canvas_bg="#F8F9FA",
+        **kwargs,
+    ):
+        super().__init__(parent, **kwargs)
+        self.row_height = row_height
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.key = key or id
+        self.overscan = overscan
+        self.row_padding = row_padding
+
+        self.items = []
+        self._index = {}  # 键 -> 下标
+        self._visible = {}  # 下标 -> (行组件, 画布窗口ID)
+        self._pool = []  # 回收待复用的 (行组件, 画布窗口ID)
+        self._width = 1
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.canvas = tk.Canvas(
+            self,
+            bg=canvas_bg,
+            highlightthickness=0,
+            bd=0,
+            yscrollincrement=max(1, row_height // 4),
+        )
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.canvas.bind("<Enter>", self._bind_mousewheel)
+        self.canvas.bind("<Leave>", self._unbind_mousewheel)
+
+    # ------------------------------
+    # 数据操作
+    # ------------------------------
+    def set_items(self, items):
+        """替换全部数据并回到顶部"""
+        self.items = list(items)
+        self._reindex()
+        self.canvas.yview_moveto(0)
+        self._invalidate()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def get_item(self, key):
+        """按键取数据项，不存在返回 None"""
+        index = self._index.get(key)
+        return None if index is None else self.items[index]
+
+    def update_item(self, item):
+        """替换同键数据项；若当前可见则只重新绑定这一行"""
+        index = self._index.get(self.key(item))
+        if index is None:
+            return False
+        self.items[index] = item
+        if index in self._visible:
+            row, _ = self._visible[index]
+            self.bind_row(row, item, index)
+        return True
+
+    def remove(self, key):
+        """按键删除数据项"""
+        index = self._index.get(key)
+        if index is None:
+            return False
+        del self.items[index]
+        self._reindex()
+        self._invalidate()
+        return True
+
+    def insert(self, index, item):
+        """在指定位置插入数据项"""
+        self.items.insert(index, item)
+        self._reindex()
+        self._invalidate()
+
+    def _reindex(self):
+        self._index = {self.key(item): i for i, item in enumerate(self.items)}
+
+    # ------------------------------
+    # 渲染
+    # ------------------------------
+    def _invalidate(self):
+        """数据结构变化后回收全部可见行并重新渲染"""
+        for index in list(self._visible):
+            self._recycle(index)
+        self._update_scrollregion()
+        self._render()
+
+    def _update_scrollregion(self):
+        total_height = len(self.items) * self.row_height
+        self.canvas.configure(scrollregion=(0, 0, self._width, total_height))
+
+    def _visible_range(self):
+        """计算需要渲染的下标范围（含预渲染行）"""
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.row_height)
+        first = max(0, int(top // self.row_height) - self.overscan)
+        last = min(
+            len(self.items), int((top + height) // self.row_height) + 1 + self.overscan
+        )
+        return range(first, last)
+
+    def _recycle(self, index):
+        row, window = self._visible.pop(index)
+        # 移出滚动区域，等待复用
+        self.canvas.coords(window, 0, -10 * self.row_height)
+        self._pool.append((row, window))
+
+    def _render(self):
+        wanted = self._visible_range()
+        for index in list(self._visible):
+            if index not in wanted:
+                self._recycle(index)
+
+        for index in wanted:
+            if index in self._visible:
+                continue
+            y = index * self.row_height + self.row_padding // 2
+            if self._pool:
+                row, window = self._pool.pop()
+                self.canvas.coords(window, 0, y)
+            else:
+                row = self.create_row(self.canvas)
+                window = self.canvas.create_window(
+                    0,
+                    y,
+                    window=row,
+                    anchor="nw",
+                    width=self._width,
+                    height=self.row_height - self.row_padding,
+                )
+            self.bind_row(row, self.items[index], index)
+            self._visible[index] = (row, window)
+
+    def visible_rows(self):
+        """当前已渲染的行组件数量（含预渲染行）"""
+        return len(self._visible)
+
+    # ------------------------------
+    # 事件
+    # ------------------------------
+    def _on_configure(self, event):
+        if event.width != self._width:
+            self._width = event.width
+            for _, window in list(self._visible.values()) + self._pool:
+                self.canvas.itemconfigure(window, width=self._width)
+            self._update_scrollregion()
+        self._render()
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self._render()
+
+    def _on_mousewheel(self, event):
+        if getattr(event, "num", None) == 4:
+            delta = -1
+        elif getattr(event, "num", None) == 5:
+            delta = 1
+        else:
+            delta = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(delta * 3, "units")
+        self._render()
+
+    def _bind_mousewheel(self, event=None):
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind_all("<Button-4>", self._on_mousewheel)
+        self.canvas.bind_all("<Button-5>", self._on_mousewheel)
+
+    def _unbind_mousewheel(self, event=None):
+        # 指针移入行组件时画布也会收到 <Leave>，此时仍应保留滚轮绑定
+        try:
+            pointed = self.winfo_containing(*self.winfo_pointerxy())
+        except (KeyError, tk.TclError):
+            pointed = None
+        if pointed is not None and str(pointed).startswith(str(self.canvas)):
+            return
+        self.canvas.unbind_all("<MouseWheel>")
+        self.canvas.unbind_all("<Button-4>")
+        self.canvas.unbind_all("<Button-5>")
@@ -0,0 +1,81 @@
+"""数据变更事件：DatabaseManager 写操作提交后发出，供界面增量刷新"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Iterable, Optional
+
+
+class ChangeType(Enum):
+    """数据变更类型"""
+
+    KNOWLEDGE_ADDED = "knowledge_added"
+    KNOWLEDGE_UPDATED = "knowledge_updated"
+    KNOWLEDGE_DELETED = "knowledge_deleted"
+    KNOWLEDGE_IMPORTED = "knowledge_imported"  # 批量导入，knowledge_id 为空
+    REVIEW_COMPLETED = "review_completed"
+    REVIEW_FAILED = "review_failed"  # 缓冲中的评分被跳过或写入失败（未提交任何数据）
+    SCHEDULE_ADDED = "schedule_added"
+    SCHEDULE_RESCHEDULED = "schedule_rescheduled"
+    SCHEDULE_CANCELLED = "schedule_cancelled"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """一次已提交的数据变更
+
+    knowledge_id 为受影响的知识点；schedule_id 为受影响的复习计划
+    （取消计划时可能为空）；next_schedule_id、next_review_at 为完成复习后
+    新生成的计划及其时间（已掌握时为空）；message 为 REVIEW_FAILED 的原因。
+    """
+
+    type: ChangeType
+    user_id: int
+    knowledge_id: Optional[int] = None
+    schedule_id: Optional[int] = None
+    next_schedule_id: Optional[int] = None
+    next_review_at: Optional[datetime] = None
+    message: Optional[str] = None
+
+
+class ChangeNotifier:
+    """变更事件的订阅与分发（线程安全）
+
+    回调在发出事件的线程中同步执行，界面订阅者不能直接调用 Tk，
+    需经 UITaskExecutor.post 交给界面线程。
+    单个回调出错不影响其他订阅者，也不影响已提交的写操作。
+    """
+
+    def __init__(self):
+        self._subscribers = []  # [(callback, 类型集合或None)]
+        self._lock = threading.Lock()
+
+    def subscribe(
+        self,
+        callback: Callable[[ChangeEvent], None],
+        types: Optional[Iterable[ChangeType]] = None,
+    ) -> Callable[[], None]:
+        """订阅变更事件，types 为空表示全部类型；返回取消订阅函数"""
+        entry = (callback, frozenset(types) if types is not None else None)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    def emit(self, event: ChangeEvent) -> None:
+        """分发事件"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback, types in subscribers:
+            if types is not None and event.type not in types:
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"⚠️ 变更事件回调失败({event.type.value}): {e}")
@@ -0,0 +1,174 @@
+"""
+用户学习历史的流式导出
+
+按 knowledge_items、review_schedules、review_records 分批读取（yield_per，
+逐批取行，不构造 ORM 对象），边读边写，内存占用与数据量无关：
+- 行按用户索引的顺序输出，不按主键排序，避免 SQLite 先把全部行排进临时 B 树
+- 导出期间连接关闭内存映射并使用小页缓存，结束后恢复；常规连接的
+  大缓存与 mmap（见 engine.SQLiteEngineProfile）在顺序扫描全部历史时会
+  让常驻内存随文件大小增长
+三张表在同一个读事务中导出，得到一致的快照。
+
+输出格式：
+- jsonl：每行一条记录，"table" 字段标明所属表
+- columnar：gzip 压缩的列式行组，每行一个
+  {"table", "columns": [列名], "data": [[第1列的值...], [第2列的值...]]}，
+  同一列的值相邻存放，压缩率远高于逐行 JSON
+
+增量导出：水位线为 {表名: 已导出的最大主键}，只导出主键更大的新行。
+完成复习会新增 review_records 行（schedule_id 指向被完成的计划）与下一阶段
+的计划，已有计划的完成状态可由复习记录还原；编辑知识点、改期或取消计划
+不产生新行，不在增量导出中，需要时定期做一次全量导出。
+"""
+import contextlib
+import enum
+import gzip
+import json
+from datetime import date, datetime
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import select
+
+from .models import KnowledgeItem, ReviewRecord, ReviewSchedule
+
+FORMATS = ("jsonl", "columnar")
+
+# 导出顺序：被引用的表在前
+EXPORT_TABLES = (KnowledgeItem.__table__, ReviewSchedule.__table__, ReviewRecord.__table__)
+
+COLUMNAR_FORMAT = "review-alarm-columnar/1"
+
+# 导出期间连接使用的 PRAGMA（导出结束后恢复原值）
+EXPORT_PRAGMAS = {"mmap_size": 0, "cache_size": -8000}  # 约8MB页缓存
+
+
+def _to_json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+class JsonlWriter:
+    """逐行 JSON"""
+
+    def __init__(self, f):
+        self.f = f
+
+    def write_batch(self, table_name, columns, rows):
+        for row in rows:
+            record = {"table": table_name}
+            record.update(zip(columns, map(_to_json_value, row)))
+            self.f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class ColumnarWriter:
+    """gzip 压缩的列式行组，每批一个行组"""
+
+    def __init__(self, f):
+        self.f = f
+        self.f.write(json.dumps({"format": COLUMNAR_FORMAT}) + "\n")
+
+    def write_batch(self, table_name, columns, rows):
+        data = [[_to_json_value(value) for value in column] for column in zip(*rows)]
+        self.f.write(
+            json.dumps(
+                {"table": table_name, "columns": columns, "data": data},
+                ensure_ascii=False,
+            )
+            + "\n"
+        )
+
+
+def _open(target, file_format):
+    """target 为路径或已打开的文本流（如标准输出），后者导出结束后不关闭"""
+    if isinstance(target, str):
+        if file_format == "columnar":
+            return gzip.open(target, "wt", encoding="utf-8")
+        return open(target, "w", encoding="utf-8")
+    if file_format == "columnar":
+        return gzip.open(target.buffer, "wt", encoding="utf-8")
+    return contextlib.nullcontext(target)
+
+
+def _set_pragmas(connection, values):
+    for name, value in values.items():
+        if value is not None:  # 内存数据库不支持 mmap_size，查询结果为空
+            connection.exec_driver_sql(f"PRAGMA {name}={int(value)}")
+    connection.commit()
+
+
+def iter_batches(connection, table, user_id, since_id=0, batch_size=5000) -> Iterator:
+    """分批读取用户在 table 中主键大于 since_id 的行（不保证顺序）"""
+    statement = (
+        select(*table.c)
+        .where(table.c.user_id == user_id, table.c.id > since_id)
+        .execution_options(yield_per=batch_size)
+    )
+    yield from connection.execute(statement).partitions()
+
+
+def export_user_history(
+    db_manager,
+    user_id: int,
+    target,
+    file_format: str = "jsonl",
+    watermark: Optional[Dict[str, int]] = None,
+    batch_size: int = 5000,
+) -> Dict:
+    """导出用户的知识点、复习计划与复习记录
+
+    target 为文件路径或已打开的文本流。watermark 为上次导出返回的水位线，为空时全量导出。
+    返回 {"rows": {表名: 导出行数}, "watermark": {表名: 最大主键}}，
+    下次增量导出时传回 watermark。
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"不支持的导出格式: {file_format}")
+    watermark = dict(watermark or {})
+    rows = {}
+
+    with _open(target, file_format) as f, db_manager.engine.connect() as connection:
+        writer = ColumnarWriter(f) if file_format == "columnar" else JsonlWriter(f)
+        original = {
+            name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in EXPORT_PRAGMAS
+        }
+        try:
+            _set_pragmas(connection, EXPORT_PRAGMAS)
+            with connection.begin():
+                for table in EXPORT_TABLES:
+                    columns = [column.name for column in table.c]
+                    since_id = watermark.get(table.name, 0)
+                    count = 0
+                    for batch in iter_batches(
+                        connection, table, user_id, since_id, batch_size
+                    ):
+                        writer.write_batch(table.name, columns, batch)
+                        count += len(batch)
+                        watermark[table.name] = max(
+                            watermark.get(table.name, 0), max(row.id for row in batch)
+                        )
+                    rows[table.name] = count
+        finally:
+            _set_pragmas(connection, original)
+    return {"rows": rows, "watermark": watermark}
+
+
+def read_export(path: str) -> Iterator[Dict]:
+    """逐条读取导出文件（两种格式），产出带 "table" 字段的记录字典"""
+    with open(path, "rb") as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+    opener = gzip.open if compressed else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if "format" in record:
+                continue
+            if "columns" not in record:
+                yield record
+                continue
+            for values in zip(*record["data"]):
+                row = {"table": record["table"]}
+                row.update(zip(record["columns"], values))
+                yield row
@@ -0,0 +1,120 @@
+"""
+知识点全文索引（SQLite FTS5）
+
+knowledge_fts 是 knowledge_items 的外部内容（external content）FTS5 表，
+只保存倒排索引，正文仍从 knowledge_items 读取；增删改由触发器同步，
+所有写入路径（ORM、批量导入、手工 SQL）都会自动维护索引。
+
+分词器使用 trigram：按三字符切分，天然支持中文等无空格文本的子串匹配，
+且大小写不敏感。搜索词少于 3 个字符时无法使用索引，由调用方回退到 LIKE。
+"""
+from sqlalchemy import column, table, text
+
+FTS_TABLE = "knowledge_fts"
+# 供 ORM 查询 join 使用的轻量表对象（不参与 create_all）
+knowledge_fts = table(FTS_TABLE, column("rowid"), column("title"), column("content"))
+MIN_FTS_TERM_LENGTH = 3  # trigram 分词器可匹配的最短搜索词
+
+# bm25 列权重：标题 > 分类 > 正文
+BM25_WEIGHTS = (10.0, 1.0, 5.0)
+
+SNIPPET_OPEN = "【"
+SNIPPET_CLOSE = "】"
+
+CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, content, category,
+        content='knowledge_items', content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS knowledge_items_fts_insert
+    AFTER INSERT ON knowledge_items BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content, category)
+        VALUES (new.id, new.title, new.content, new.category);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS knowledge_items_fts_delete
+    AFTER DELETE ON knowledge_items BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content, category)
+        VALUES ('delete', old.id, old.title, old.content, old.category);
+    END
+    """,
+    # 只在被索引的列变化时更新，避免修改 is_active 等字段时重写索引
+    f"""
+    CREATE TRIGGER IF NOT EXISTS knowledge_items_fts_update
+    AFTER UPDATE OF title, content, category ON knowledge_items BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content, category)
+        VALUES ('delete', old.id, old.title, old.content, old.category);
+        INSERT INTO {FTS_TABLE}(rowid, title, content, category)
+        VALUES (new.id, new.title, new.content, new.category);
+    END
+    """,
+]
+
+DROP_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS knowledge_items_fts_insert",
+    "DROP TRIGGER IF EXISTS knowledge_items_fts_delete",
+    "DROP TRIGGER IF EXISTS knowledge_items_fts_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def fts_exists(connection) -> bool:
+    return (
+        connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        ).first()
+        is not None
+    )
+
+
+def ensure_knowledge_fts(connection) -> bool:
+    """创建全文索引表与同步触发器（可重复执行），新建时回填已有数据
+
+    SQLite 未编译 FTS5 或不支持 trigram 分词器（低于 3.34）时返回 False。
+    """
+    existed = fts_exists(connection)
+    try:
+        for statement in CREATE_STATEMENTS:
+            connection.execute(text(statement))
+    except Exception as e:
+        print(f"⚠️ 全文索引不可用，搜索将使用 LIKE: {e}")
+        return False
+    if not existed:
+        rebuild_knowledge_fts(connection)
+    return True
+
+
+def rebuild_knowledge_fts(connection) -> None:
+    """按 knowledge_items 当前内容重建全文索引"""
+    connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def match_phrase(term: str) -> str:
+    """把用户输入转成 FTS5 短语查询，避免其中的运算符被解析"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def highlight(text_value: str, term: str, context: int = 24) -> str:
+    """生成命中位置附近的高亮片段，命中词用【】标出"""
+    if not text_value or not term:
+        return text_value or ""
+    position = text_value.lower().find(term.lower())
+    if position < 0:
+        return text_value[: context * 2] + ("…" if len(text_value) > context * 2 else "")
+    start = max(0, position - context)
+    end = min(len(text_value), position + len(term) + context)
+    return (
+        ("…" if start > 0 else "")
+        + text_value[start:position]
+        + SNIPPET_OPEN
+        + text_value[position:position + len(term)]
+        + SNIPPET_CLOSE
+        + text_value[position + len(term):end]
+        + ("…" if end < len(text_value) else "")
+    )
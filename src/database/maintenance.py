@@ -0,0 +1,14 @@
+"""
+数据库维护命令（已并入 src.cli，保留此入口兼容原有的 cron 配置）
+
+用法：
+    python -m src.database.maintenance [--db PATH] rebuild-daily-stats [--user-id ID]
+    python -m src.database.maintenance [--db PATH] rebuild-search-index
+    python -m src.database.maintenance [--db PATH] vacuum
+"""
+import sys
+
+from src.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
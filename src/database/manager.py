@@ -1,29 +1,96 @@
 """数据库管理器：增强业务逻辑+艾宾浩斯核心算法"""
 
-from sqlalchemy import create_engine, func
+from sqlalchemy import and_, case, func, insert, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker
+from .engine import DEFAULT_ENGINE_PROFILE
+from .events import ChangeEvent, ChangeNotifier, ChangeType
+from .fts import ensure_knowledge_fts, rebuild_knowledge_fts
+from .migrate import upgrade_schema
 from .models import (
-    Base,
     User,
     KnowledgeItem,
     ReviewSchedule,
     ReviewRecord,
+    DailyUserStat,
     IntervalUnit,
+    ReminderDelivery,
 )
 from datetime import datetime, timedelta
+import threading
 
 
 class DatabaseManager:
-    def __init__(self, db_path="src/database/review_alarm.db"):
+    def __init__(self, db_path="src/database/review_alarm.db", engine_profile=None):
         self.db_path = db_path
-        self.engine = create_engine(f"sqlite:///{db_path}")
+        # 引擎调优配置（WAL、PRAGMA、连接池），见 engine.SQLiteEngineProfile
+        self.engine_profile = engine_profile or DEFAULT_ENGINE_PROFILE
+        self.engine = self.engine_profile.create_engine(db_path)
         self.Session = sessionmaker(bind=self.engine)
-        Base.metadata.create_all(self.engine)  # 自动创建表
+        # 新数据库建表并标记迁移版本，旧数据库升级到最新迁移（见 migrate.py）
+        upgrade_schema(self.engine)
+        # 知识点全文索引（FTS5 trigram），不可用时搜索回退到 LIKE
+        with self.engine.begin() as connection:
+            self.fts_enabled = ensure_knowledge_fts(connection)
+        self.events = ChangeNotifier()  # 写操作提交后发出变更事件
+        # 按数据库共享的对象（图表缓存、搜索管道等），见 get_shared
+        self._shared = {}
+        self._shared_lock = threading.RLock()
 
     def get_session(self):
         """获取数据库会话"""
         return self.Session()
 
+    def rebuild_search_index(self):
+        """重建知识点全文索引，返回索引的知识点数"""
+        if not self.fts_enabled:
+            raise RuntimeError("当前 SQLite 不支持 FTS5 trigram 全文索引")
+        with self.engine.begin() as connection:
+            rebuild_knowledge_fts(connection)
+        session = self.get_session()
+        try:
+            return session.query(func.count(KnowledgeItem.id)).scalar()
+        finally:
+            session.close()
+
+    def vacuum(self):
+        """整理数据库文件并更新查询规划统计，返回 (整理前字节数, 整理后字节数)"""
+
+        def size(connection):
+            page_count = connection.exec_driver_sql("PRAGMA page_count").scalar()
+            page_size = connection.exec_driver_sql("PRAGMA page_size").scalar()
+            return page_count * page_size
+
+        # VACUUM 不能在事务中执行
+        with self.engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as connection:
+            before = size(connection)
+            connection.exec_driver_sql("VACUUM")
+            connection.exec_driver_sql("ANALYZE")
+            connection.exec_driver_sql("PRAGMA optimize")
+            return before, size(connection)
+
+    def subscribe(self, callback, types=None):
+        """订阅数据变更事件（见 events.ChangeNotifier.subscribe），返回取消订阅函数"""
+        return self.events.subscribe(callback, types)
+
+    def emit_change(self, change_type, user_id, **kwargs):
+        """发出数据变更事件（须在事务提交之后调用）"""
+        self.events.emit(ChangeEvent(change_type, user_id, **kwargs))
+
+    def get_shared(self, key, factory):
+        """获取（必要时用 factory(self) 创建）挂在本管理器上的共享对象
+
+        共享对象通常订阅本管理器的变更事件，与管理器同生命周期，随管理器一起回收。
+        factory 在锁内调用（可重入），同一 key 只创建一次。
+        """
+        with self._shared_lock:
+            shared = self._shared.get(key)
+            if shared is None:
+                shared = self._shared[key] = factory(self)
+            return shared
+
     # ------------------------------
     # 知识管理相关（供knowledge模块调用）
     # ------------------------------
@@ -80,6 +147,12 @@ class DatabaseManager:
             )
             session.commit()
             print("✅ [ADD DEBUG] 数据库提交成功 - manager.py:82")
+            self.emit_change(
+                ChangeType.KNOWLEDGE_ADDED,
+                user_id,
+                knowledge_id=item.id,
+                schedule_id=first_schedule.id,
+            )
             return {
                 "success": True,
                 "data": {
@@ -94,140 +167,325 @@ class DatabaseManager:
         finally:
             session.close()
 
-    def get_knowledge_with_review_status(self, user_id):
-        """获取用户所有知识点（含复习状态）"""
+    def bulk_add_knowledge(self, user_id, records, batch_size=1000, progress=None):
+        """批量导入知识点并生成首次复习计划
+
+        records 为 {"title", "content", "category"} 字典的可迭代对象（可为生成器），
+        逐批消费，内存占用与导入总量无关。重复标题按预先载入的标题集合判断
+        （含本次导入中先出现的同名知识点），不逐条查询。每批知识点与复习计划
+        各一次 executemany，在同一事务中提交；中途失败时已提交的批次保留，
+        重新导入同一文件会把它们当作重复跳过。
+        progress(已处理条数, 已新增条数) 在每批提交后调用。
+        全部完成后发出一次 KNOWLEDGE_IMPORTED 事件。
+        """
+        from src.scheduler.ebbinghaus_config import EbbinghausConfig
+
+        first_interval_hours = EbbinghausConfig.get_interval_hours(0)
+        item_table = KnowledgeItem.__table__
+        schedule_table = ReviewSchedule.__table__
+
         session = self.get_session()
         try:
-            print(f"🔍 [DEBUG] 开始查询用户 {user_id} 的知识点 - manager.py:101")
+            titles = {
+                title.strip()
+                for (title,) in session.query(KnowledgeItem.title).filter(
+                    KnowledgeItem.user_id == user_id
+                )
+            }
+        finally:
+            session.close()
 
-            knowledges = (
-                session.query(KnowledgeItem)
-                .filter(KnowledgeItem.user_id == user_id, KnowledgeItem.is_active)
-                .order_by(KnowledgeItem.created_at.desc())
-                .all()
-            )
+        counts = {"added": 0, "duplicates": 0, "invalid": 0}
+        processed = 0
 
-            print(f"🔍 [DEBUG] 数据库查询结果: {len(knowledges)} 个知识点 - manager.py:110")
+        def bound(column, value):
+            # 同一批的常量列只做一次类型转换，逐行参数直接交给驱动 executemany
+            processor = column.type.bind_processor(self.engine.dialect)
+            return processor(value) if processor else value
 
-            result = []
-            today_start = datetime.now().replace(
-                hour=0, minute=0, second=0, microsecond=0
+        def insert_sql(table, columns):
+            return (
+                f"INSERT INTO {table.name} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})"
             )
-            today_end = today_start + timedelta(days=1)
-
-            print(f"🔍 [DEBUG] 今日时间范围: {today_start} 到 {today_end} - manager.py:118")
-            from src.scheduler.ebbinghaus_config import EbbinghausConfig
 
-            for item in knowledges:
-                print(f"🔍 [DEBUG] 处理知识点: {item.title} (ID: {item.id}) - manager.py:122")
-
-                # 检查复习计划
-                schedules = (
-                    session.query(ReviewSchedule)
-                    .filter(ReviewSchedule.knowledge_item_id == item.id)
-                    .all()
+        insert_items = insert_sql(
+            item_table,
+            ("title", "content", "category", "user_id", "created_at", "is_active",
+             "initial_interval", "initial_interval_unit"),
+        )
+        insert_schedules = insert_sql(
+            schedule_table,
+            ("knowledge_item_id", "user_id", "scheduled_date", "completed",
+             "interval_index", "current_interval", "current_interval_unit", "created_at"),
+        )
+
+        def flush(batch):
+            now = datetime.now()
+            scheduled_date = now + timedelta(hours=first_interval_hours)
+            item_constants = (
+                user_id,
+                bound(item_table.c.created_at, now),
+                bound(item_table.c.is_active, True),
+                item_table.c.initial_interval.default.arg,
+                bound(
+                    item_table.c.initial_interval_unit,
+                    item_table.c.initial_interval_unit.default.arg,
+                ),
+            )
+            schedule_constants = (
+                user_id,
+                bound(schedule_table.c.scheduled_date, scheduled_date),
+                bound(schedule_table.c.completed, False),
+                0,
+                first_interval_hours,
+                bound(schedule_table.c.current_interval_unit, IntervalUnit.HOUR),
+                bound(schedule_table.c.created_at, now),
+            )
+            with self.engine.begin() as connection:
+                connection.exec_driver_sql(
+                    insert_items, [row + item_constants for row in batch]
                 )
-                print(f"关联的复习计划数量: {len(schedules)} - manager.py:130")
-
-                for s in schedules:
-                    print(
-                        f"计划 {s.id}: 时间={s.scheduled_date}, 完成={s.completed} - manager.py:133")
-
-                # 检查是否今日复习
-                today_schedule = (
-                    session.query(ReviewSchedule)
-                    .filter(
-                        ReviewSchedule.knowledge_item_id == item.id,
-                        ~ReviewSchedule.completed,  # 修复：使用 == 而不是 is
-                        ReviewSchedule.scheduled_date >= today_start,
-                        ReviewSchedule.scheduled_date < today_end,
-                    )
-                    .first()
+                # 事务持有写锁，同一条 executemany 插入的 rowid 连续；
+                # 不用 RETURNING：SQLite 下按参数顺序返回主键会退化为逐行执行
+                last_id = connection.exec_driver_sql("SELECT last_insert_rowid()").scalar()
+                connection.exec_driver_sql(
+                    insert_schedules,
+                    [
+                        (item_id,) + schedule_constants
+                        for item_id in range(last_id - len(batch) + 1, last_id + 1)
+                    ],
                 )
+            counts["added"] += len(batch)
+            if progress:
+                progress(processed, counts["added"])
 
-                print(f"今日复习计划: {today_schedule} - manager.py:147")
-
-                # 检查是否完成所有阶段
-                last_schedule = (
-                    session.query(ReviewSchedule)
-                    .filter(ReviewSchedule.knowledge_item_id == item.id)
-                    .order_by(ReviewSchedule.interval_index.desc())
-                    .first()
+        batch = []
+        try:
+            for record in records:
+                processed += 1
+                title = (record.get("title") or "").strip()
+                if not title:
+                    counts["invalid"] += 1
+                    continue
+                if title in titles:
+                    counts["duplicates"] += 1
+                    continue
+                titles.add(title)
+                batch.append(
+                    (title, (record.get("content") or "").strip(), record.get("category") or None)
                 )
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+            print(f"✅ [IMPORT DEBUG] 批量导入完成: {counts} - manager.py:bulk_add_knowledge")
+            return {"success": True, "data": counts}
+        except Exception as e:
+            print(f"❌ [IMPORT DEBUG] 批量导入失败: {str(e)} - manager.py:bulk_add_knowledge")
+            return {"success": False, "msg": f"导入失败：{str(e)}", "data": counts}
+        finally:
+            if counts["added"]:
+                self.emit_change(ChangeType.KNOWLEDGE_IMPORTED, user_id)
 
-                is_completed_all = (
-                    last_schedule.interval_index == 6 and last_schedule.completed
-                    if last_schedule
-                    else False
-                )
+    def get_knowledge_with_review_status(self, user_id, knowledge_ids=None):
+        """获取用户所有知识点（含复习状态）
 
-                # 构建状态描述
-                if is_completed_all:
-                    status = "✅ 已掌握"
-                    next_stage_desc = None
-                    next_time_str = None
-                elif today_schedule:
-                    stage_desc = EbbinghausConfig.get_stage_description(
-                        today_schedule.interval_index
-                    )
-                    status = f"📅 今日复习（{stage_desc}）"
-                    next_stage_desc = stage_desc
-                    next_time_str = today_schedule.scheduled_date.strftime(
-                        "%Y-%m-%d %H:%M")
-                else:
-                    next_stage_desc = None
-                    next_time_str = None
-                    next_schedule = (
-                        session.query(ReviewSchedule)
-                        .filter(
-                            ReviewSchedule.knowledge_item_id == item.id,
-                            ~ReviewSchedule.completed,
-                        )
-                        .order_by(ReviewSchedule.scheduled_date)
-                        .first()
-                    )
-                    if next_schedule:
-                        stage_desc = EbbinghausConfig.get_stage_description(
-                            next_schedule.interval_index
-                        )
-                        next_time_str = next_schedule.scheduled_date.strftime(
-                            "%Y-%m-%d %H:%M")
-                        status = f"⏳ 待复习（{stage_desc}，{next_time_str}）"
-                        next_stage_desc = stage_desc
-                    else:
-                        status = "❌ 无复习计划"
+        复习状态由 _load_review_status 批量计算，查询次数与知识点数量无关。
+        传入 knowledge_ids 时只返回这些知识点（界面增量刷新用）。
+        """
+        session = self.get_session()
+        try:
+            print(f"🔍 [DEBUG] 开始查询用户 {user_id} 的知识点 - manager.py:101")
 
-                result.append(
-                    {
-                        "id": item.id,
-                        "title": item.title,
-                        "category": item.category,
-                        "created_at": item.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                        "last_reviewed": (
-                            item.review_records[-1].review_date.strftime("%Y-%m-%d")
-                            if item.review_records
-                            else "暂无"
-                        ),
-                        "review_status": status,
-                        "is_today_review": True if today_schedule else False,
-                        "next_stage_desc": next_stage_desc,
-                        "next_review_at": next_time_str,
-                    }
-                )
+            query = session.query(KnowledgeItem).filter(
+                KnowledgeItem.user_id == user_id, KnowledgeItem.is_active
+            )
+            if knowledge_ids is not None:
+                query = query.filter(KnowledgeItem.id.in_(knowledge_ids))
+            knowledges = query.order_by(KnowledgeItem.created_at.desc()).all()
 
-            print(f"🔍 [DEBUG] 最终返回 {len(result)} 个知识点 - manager.py:215")
+            print(f"🔍 [DEBUG] 数据库查询结果: {len(knowledges)} 个知识点 - manager.py:110")
+
+            status_map = self._load_review_status(session, user_id, knowledge_ids)
+            result = [
+                self._build_knowledge_status(item, status_map) for item in knowledges
+            ]
+
+            print(f"🔍 [DEBUG] 最终返回 {len(result)} 个知识点 - manager.py:117")
             return result
         except Exception as e:
-            print(f"❌ [DEBUG] 查询出错: {e} - manager.py:218")
+            print(f"❌ [DEBUG] 查询出错: {e} - manager.py:120")
             raise
         finally:
             session.close()
 
+    def _load_review_status(self, session, user_id, knowledge_ids=None):
+        """批量计算知识点复习状态（固定3次查询）
+
+        返回 {"display": {知识点ID: 计划}, "last": {知识点ID: 计划},
+        "last_reviewed": {知识点ID: 日期}}：
+        - display：今日待复习计划优先，否则为最早的待复习计划
+        - last：interval_index 最大的计划（用于判断是否已掌握）
+        - last_reviewed：最近一次复习时间
+        """
+        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        today_end = today_start + timedelta(days=1)
+
+        schedule_filters = [ReviewSchedule.user_id == user_id]
+        # 按知识点聚合最近复习时间，经 ix_review_records_item_date 逐项取最大值
+        record_filters = [KnowledgeItem.user_id == user_id]
+        if knowledge_ids is not None:
+            schedule_filters.append(ReviewSchedule.knowledge_item_id.in_(knowledge_ids))
+            record_filters.append(ReviewRecord.knowledge_item_id.in_(knowledge_ids))
+
+        # 每个知识点一个"展示计划"：今日待复习优先，其次按时间最早
+        is_today = and_(
+            ReviewSchedule.scheduled_date >= today_start,
+            ReviewSchedule.scheduled_date < today_end,
+        )
+        pending_rank = (
+            func.row_number()
+            .over(
+                partition_by=ReviewSchedule.knowledge_item_id,
+                order_by=(
+                    case((is_today, 0), else_=1),
+                    ReviewSchedule.scheduled_date,
+                    ReviewSchedule.id,
+                ),
+            )
+            .label("rn")
+        )
+        pending = (
+            session.query(
+                ReviewSchedule.knowledge_item_id,
+                ReviewSchedule.interval_index,
+                ReviewSchedule.scheduled_date,
+                pending_rank,
+            )
+            .filter(*schedule_filters, ~ReviewSchedule.completed)
+            .subquery()
+        )
+        display = {
+            row.knowledge_item_id: row
+            for row in session.query(
+                pending.c.knowledge_item_id,
+                pending.c.interval_index,
+                pending.c.scheduled_date,
+            ).filter(pending.c.rn == 1)
+        }
+
+        # 每个知识点阶段最高的计划
+        last_rank = (
+            func.row_number()
+            .over(
+                partition_by=ReviewSchedule.knowledge_item_id,
+                order_by=(ReviewSchedule.interval_index.desc(), ReviewSchedule.id),
+            )
+            .label("rn")
+        )
+        staged = (
+            session.query(
+                ReviewSchedule.knowledge_item_id,
+                ReviewSchedule.interval_index,
+                ReviewSchedule.completed,
+                last_rank,
+            )
+            .filter(*schedule_filters)
+            .subquery()
+        )
+        last = {
+            row.knowledge_item_id: row
+            for row in session.query(
+                staged.c.knowledge_item_id,
+                staged.c.interval_index,
+                staged.c.completed,
+            ).filter(staged.c.rn == 1)
+        }
+
+        last_reviewed = dict(
+            session.query(
+                ReviewRecord.knowledge_item_id, func.max(ReviewRecord.review_date)
+            )
+            .join(KnowledgeItem, ReviewRecord.knowledge_item_id == KnowledgeItem.id)
+            .filter(*record_filters)
+            .group_by(ReviewRecord.knowledge_item_id)
+            .all()
+        )
+
+        return {
+            "display": display,
+            "last": last,
+            "last_reviewed": last_reviewed,
+            "today_start": today_start,
+            "today_end": today_end,
+        }
+
+    @staticmethod
+    def _build_knowledge_status(item, status_map):
+        """根据批量状态构建单个知识点的返回字典"""
+        from src.scheduler.ebbinghaus_config import EbbinghausConfig
+
+        display = status_map["display"].get(item.id)
+        last_schedule = status_map["last"].get(item.id)
+        last_review_date = status_map["last_reviewed"].get(item.id)
+
+        today_schedule = None
+        if display is not None and (
+            status_map["today_start"]
+            <= display.scheduled_date
+            < status_map["today_end"]
+        ):
+            today_schedule = display
+
+        # 最后阶段复习通过后不再生成计划，最新计划即为已完成的最后阶段
+        is_completed_all = (
+            last_schedule.interval_index >= EbbinghausConfig.get_last_stage()
+            and bool(last_schedule.completed)
+            if last_schedule
+            else False
+        )
+
+        # 构建状态描述
+        next_stage_desc = None
+        next_time_str = None
+        if is_completed_all:
+            status = "✅ 已掌握"
+        elif today_schedule:
+            stage_desc = EbbinghausConfig.get_stage_description(
+                today_schedule.interval_index
+            )
+            status = f"📅 今日复习（{stage_desc}）"
+            next_stage_desc = stage_desc
+            next_time_str = today_schedule.scheduled_date.strftime("%Y-%m-%d %H:%M")
+        elif display is not None:
+            stage_desc = EbbinghausConfig.get_stage_description(display.interval_index)
+            next_time_str = display.scheduled_date.strftime("%Y-%m-%d %H:%M")
+            status = f"⏳ 待复习（{stage_desc}，{next_time_str}）"
+            next_stage_desc = stage_desc
+        else:
+            status = "❌ 无复习计划"
+
+        return {
+            "id": item.id,
+            "title": item.title,
+            "category": item.category,
+            "created_at": item.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "last_reviewed": (
+                last_review_date.strftime("%Y-%m-%d") if last_review_date else "暂无"
+            ),
+            "review_status": status,
+            "is_today_review": True if today_schedule else False,
+            "next_stage_desc": next_stage_desc,
+            "next_review_at": next_time_str,
+        }
+
     # ------------------------------
     # 今日复习相关（供scheduler/knowledge模块调用）
     # ------------------------------
-    def get_today_reviews(self, user_id):
-        """获取用户今日待复习计划"""
+    def get_today_reviews(self, user_id, knowledge_ids=None):
+        """获取用户今日待复习计划（可限定知识点，供界面增量刷新）"""
         session = self.get_session()
         try:
             today_start = datetime.now().replace(
@@ -237,7 +495,7 @@ class DatabaseManager:
 
             print(f"🔍 [TODAY DEBUG] 查询用户 {user_id} 的今日复习计划 - manager.py:235")
 
-            schedules = (
+            query = (
                 session.query(ReviewSchedule, KnowledgeItem)
                 .join(
                     KnowledgeItem, ReviewSchedule.knowledge_item_id == KnowledgeItem.id
@@ -248,9 +506,11 @@ class DatabaseManager:
                     ReviewSchedule.scheduled_date >= today_start,
                     ReviewSchedule.scheduled_date < today_end,
                 )
-                .order_by(ReviewSchedule.scheduled_date)
-                .all()
             )
+            if knowledge_ids is not None:
+                query = query.filter(ReviewSchedule.knowledge_item_id.in_(knowledge_ids))
+            # 计划ID作为次序键，界面增量插入时可得到相同顺序
+            schedules = query.order_by(ReviewSchedule.scheduled_date, ReviewSchedule.id).all()
 
             print(f"🔍 [TODAY DEBUG] 找到 {len(schedules)} 个今日复习计划 - manager.py:252")
 
@@ -269,6 +529,7 @@ class DatabaseManager:
                         "knowledge_id": item.id,
                         "title": item.title,
                         "content": item.content,
+                        "category": item.category,
                         "scheduled_time": schedule.scheduled_date.strftime("%H:%M"),
                         "stage_label": stage_label,
                         "stage_desc": stage_desc,
@@ -329,52 +590,69 @@ class DatabaseManager:
         """获取今日复习统计"""
         session = self.get_session()
         try:
-            from datetime import datetime, timedelta
-
-            # 今日统计
-            today_start = datetime.now().replace(
-                hour=0, minute=0, second=0, microsecond=0
-            )
-            today_end = today_start + timedelta(days=1)
-
-            total_today = (
-                session.query(ReviewSchedule)
-                .filter(
-                    ReviewSchedule.user_id == user_id,
-                    ReviewSchedule.scheduled_date >= today_start,
-                    ReviewSchedule.scheduled_date < today_end,
-                )
-                .count()
-            )
+            return self._review_stats(session, user_id)
+        finally:
+            session.close()
 
-            completed_today = (
-                session.query(ReviewSchedule)
-                .filter(
-                    ReviewSchedule.user_id == user_id,
-                    ReviewSchedule.completed,  # 修复：使用 == 而不是 is
-                    ReviewSchedule.scheduled_date >= today_start,
-                    ReviewSchedule.scheduled_date < today_end,
-                )
-                .count()
+    def _review_stats(self, session, user_id):
+        """今日计划数、今日完成数、逾期数：单次条件聚合查询
+
+        WHERE 条件拆成两段索引范围（未完成且早于今日结束 / 今日已完成），
+        都落在 (user_id, completed, scheduled_date) 组合索引上，不回表。
+        """
+        now = datetime.now()
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        today_end = today_start + timedelta(days=1)
+
+        in_today = and_(
+            ReviewSchedule.scheduled_date >= today_start,
+            ReviewSchedule.scheduled_date < today_end,
+        )
+        total_today, completed_today, overdue_count = (
+            session.query(
+                func.sum(case((in_today, 1), else_=0)),
+                func.sum(case((and_(in_today, ReviewSchedule.completed), 1), else_=0)),
+                func.sum(
+                    case(
+                        (
+                            and_(
+                                ~ReviewSchedule.completed,
+                                ReviewSchedule.scheduled_date < now,
+                            ),
+                            1,
+                        ),
+                        else_=0,
+                    )
+                ),
             )
-
-            overdue_count = self.get_overdue_reviews_count(user_id)
-
-            return {
-                "total_today": total_today,
-                "completed_today": completed_today,
-                "overdue_count": overdue_count,
-                "completion_rate": round(
-                    (completed_today / total_today * 100) if total_today > 0 else 0, 1
+            .filter(
+                ReviewSchedule.user_id == user_id,
+                or_(
+                    and_(
+                        ~ReviewSchedule.completed,
+                        ReviewSchedule.scheduled_date < today_end,
+                    ),
+                    and_(ReviewSchedule.completed, in_today),
                 ),
-            }
-        finally:
-            session.close()
+            )
+            .one()
+        )
+        total_today = total_today or 0
+        completed_today = completed_today or 0
+
+        return {
+            "total_today": total_today,
+            "completed_today": completed_today,
+            "overdue_count": overdue_count or 0,
+            "completion_rate": round(
+                (completed_today / total_today * 100) if total_today > 0 else 0, 1
+            ),
+        }
 
     def complete_review(
         self, schedule_id, user_id, effectiveness, recall_score, notes=None
     ):
-        """完成复习+生成下次计划（艾宾浩斯核心）"""
+        """完成复习+按用户的调度算法生成下次计划"""
         session = self.get_session()
         try:
             # 验证复习计划
@@ -396,10 +674,22 @@ class DatabaseManager:
             if not (0 <= recall_score <= 100):
                 return {"success": False, "msg": "回忆分数需在0-100之间"}
 
+            # 到期直方图（未缓存时在计划标记完成之前统计，包含当前计划）
+            from src.scheduler.load_balancer import get_load_balancer
+
+            balancer = get_load_balancer(self)
+            histogram = balancer.histogram(session, user_id)
+            # 已删除（软删除）知识点的计划不计入直方图
+            counted = bool(schedule.knowledge_item.is_active)
+            old_date = schedule.scheduled_date if counted else None
+
             # 创建复习记录
+            review_date = datetime.now()
             record = ReviewRecord(
                 knowledge_item_id=schedule.knowledge_item_id,
+                user_id=user_id,
                 schedule_id=schedule_id,
+                review_date=review_date,
                 effectiveness=effectiveness,
                 recall_score=recall_score,
                 notes=notes,
@@ -409,31 +699,51 @@ class DatabaseManager:
             # 标记当前计划完成
             schedule.completed = True
 
-            # 艾宾浩斯间隔调整规则
-            from src.scheduler.ebbinghaus_config import EbbinghausConfig
+            # 按用户选择的调度算法计算阶段与间隔（见 scheduler.algorithms）
+            from src.scheduler.algorithms import get_algorithm
 
-            current_index = schedule.interval_index
             item = schedule.knowledge_item
+            algorithm = get_algorithm(schedule.user.scheduling_algorithm)
+            # 计划创建时间即上次复习时间；逾期复习时实际间隔更长
+            elapsed = review_date - (schedule.created_at or review_date)
+            state = algorithm.next_interval(
+                effectiveness,
+                stage=schedule.interval_index or 0,
+                interval=schedule.current_interval or 0,
+                elapsed=elapsed.total_seconds() / 3600,
+                ease=schedule.ease_factor,
+                stability=schedule.stability,
+                difficulty=schedule.difficulty,
+            )
+            next_index = state["stage"]
 
-            # 根据效果调整阶段
-            if effectiveness >= 4:
-                next_index = current_index + 1
-            elif effectiveness >= 2:
-                next_index = current_index
-            else:
-                next_index = max(0, current_index - 1)
+            # 同步更新每日汇总
+            mastered = state["mastered"]
+            self._bump_daily_stats(
+                session, user_id, review_date, effectiveness, recall_score, mastered
+            )
 
-            # 限制最大阶段（避免越界）
-            if next_index >= EbbinghausConfig.get_total_stages():
+            # 完成全部阶段：不再生成计划
+            if mastered:
                 session.commit()
+                balancer.move(user_id, old_date, None)
+                self.emit_change(
+                    ChangeType.REVIEW_COMPLETED,
+                    user_id,
+                    knowledge_id=item.id,
+                    schedule_id=schedule_id,
+                )
                 return {
                     "success": True,
                     "msg": "已完成所有艾宾浩斯阶段，知识点标记为已掌握",
                 }
 
-            # 计算下次间隔（使用艾宾浩斯标准间隔）
-            next_interval_hours = EbbinghausConfig.get_interval_hours(next_index)
-            next_review_date = EbbinghausConfig.get_next_review_date(next_index)
+            # 在目标间隔附近挑选到期数最少的一天（见 scheduler.load_balancer），
+            # 记录实际间隔，SM-2 下次按实际间隔放大
+            next_review_date = balancer.choose_date(
+                histogram, review_date, state["interval"], schedule.user.daily_review_cap
+            )
+            next_interval_hours = (next_review_date - review_date).total_seconds() / 3600
 
             # 生成下次复习计划
             next_schedule = ReviewSchedule(
@@ -443,9 +753,22 @@ class DatabaseManager:
                 interval_index=next_index,
                 current_interval=next_interval_hours,
                 current_interval_unit=IntervalUnit.HOUR,
+                ease_factor=state["ease"],
+                stability=state["stability"],
+                difficulty=state["difficulty"],
+                created_at=review_date,
             )
             session.add(next_schedule)
             session.commit()
+            balancer.move(user_id, old_date, next_review_date if counted else None)
+            self.emit_change(
+                ChangeType.REVIEW_COMPLETED,
+                user_id,
+                knowledge_id=item.id,
+                schedule_id=schedule_id,
+                next_schedule_id=next_schedule.id,
+                next_review_at=next_review_date,
+            )
 
             return {
                 "success": True,
@@ -461,6 +784,319 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def complete_reviews_batch(self, user_id, reviews):
+        """在一个事务中完成多个复习（快速连续评分、写后缓冲回放）
+
+        reviews 为 {"schedule_id", "effectiveness", "recall_score", "notes"（可选）,
+        "review_date"（可选，默认现在）} 字典列表，规则与 complete_review 相同：
+        计划一次查询载入，下次间隔由调度算法对整批一次计算（next_intervals），
+        复习记录与下次计划各一次 executemany，每日汇总按日期合并累加。
+        计划不存在、已完成（含同一批中重复的计划）或评分越界的条目跳过，
+        因此重复提交同一批是安全的。提交后为每个完成的计划发出 REVIEW_COMPLETED。
+        返回 {"success", "msg", "data": {"completed", "mastered",
+        "next_schedule_ids": {计划ID: 下次计划ID}, "skipped": [{"schedule_id", "msg"}]}}。
+        """
+        import numpy as np
+
+        from src.scheduler.algorithms import get_algorithm, make_states
+        from src.scheduler.load_balancer import get_load_balancer
+
+        schedule_table = ReviewSchedule.__table__
+        balancer = get_load_balancer(self)
+        skipped = []
+        session = self.get_session()
+        try:
+            histogram = balancer.histogram(session, user_id)
+            ids = {review["schedule_id"] for review in reviews}
+            schedules = {
+                row.id: row
+                for row in session.query(
+                    ReviewSchedule.id, ReviewSchedule.knowledge_item_id,
+                    ReviewSchedule.scheduled_date, ReviewSchedule.created_at,
+                    ReviewSchedule.interval_index, ReviewSchedule.current_interval,
+                    ReviewSchedule.ease_factor, ReviewSchedule.stability,
+                    ReviewSchedule.difficulty, KnowledgeItem.is_active,
+                ).join(
+                    KnowledgeItem, KnowledgeItem.id == ReviewSchedule.knowledge_item_id
+                ).filter(
+                    ReviewSchedule.id.in_(ids),
+                    ReviewSchedule.user_id == user_id,
+                    ~ReviewSchedule.completed,
+                )
+            }
+            algorithm_name, daily_cap = (
+                session.query(User.scheduling_algorithm, User.daily_review_cap)
+                .filter(User.id == user_id)
+                .one()
+            )
+
+            accepted = []
+            now = datetime.now()
+            for review in reviews:
+                schedule_id = review["schedule_id"]
+                if schedule_id not in schedules:
+                    skipped.append({"schedule_id": schedule_id, "msg": "复习计划不存在或已完成"})
+                elif not 1 <= review["effectiveness"] <= 5:
+                    skipped.append({"schedule_id": schedule_id, "msg": "效果评分需在1-5分之间"})
+                elif not 0 <= review["recall_score"] <= 100:
+                    skipped.append({"schedule_id": schedule_id, "msg": "回忆分数需在0-100之间"})
+                else:
+                    accepted.append((schedules.pop(schedule_id), review))
+            if not accepted:
+                return {
+                    "success": True,
+                    "msg": "没有可完成的复习",
+                    "data": {"completed": 0, "mastered": 0, "next_schedule_ids": {},
+                             "skipped": skipped},
+                }
+
+            # 整批计算下次间隔
+            review_dates = [review.get("review_date") or now for _, review in accepted]
+
+            def column(name):
+                return [getattr(schedule, name) for schedule, _ in accepted]
+
+            states = make_states(
+                len(accepted),
+                stage=[stage or 0 for stage in column("interval_index")],
+                interval=[interval or 0 for interval in column("current_interval")],
+                elapsed=[
+                    (date - (created_at or date)).total_seconds() / 3600
+                    for date, created_at in zip(review_dates, column("created_at"))
+                ],
+                # None -> NaN（尚无算法状态）
+                ease=np.array(column("ease_factor"), dtype=float),
+                stability=np.array(column("stability"), dtype=float),
+                difficulty=np.array(column("difficulty"), dtype=float),
+            )
+            grades = np.array([review["effectiveness"] for _, review in accepted])
+            intervals, new_states = get_algorithm(algorithm_name).next_intervals(
+                states, grades
+            )
+
+            records, next_schedules, daily, next_dates = [], [], {}, {}
+            for i, ((schedule, review), review_date) in enumerate(zip(accepted, review_dates)):
+                mastered = bool(new_states["mastered"][i])
+                records.append({
+                    "knowledge_item_id": schedule.knowledge_item_id,
+                    "user_id": user_id,
+                    "schedule_id": schedule.id,
+                    "review_date": review_date,
+                    "effectiveness": review["effectiveness"],
+                    "recall_score": review["recall_score"],
+                    "notes": review.get("notes"),
+                })
+                delta = self._daily_stat_delta(
+                    review["effectiveness"], review["recall_score"], mastered
+                )
+                day_total = daily.setdefault(review_date.date(), dict.fromkeys(delta, 0))
+                for key, value in delta.items():
+                    day_total[key] += value
+                # 已删除知识点的计划不计入直方图
+                old_date = schedule.scheduled_date if schedule.is_active else None
+                if mastered:
+                    balancer.move(user_id, old_date, None, histogram)
+                    continue
+                # 逐张挑选日期，前面的卡片计入直方图后再排后面的
+                next_date = balancer.choose_date(
+                    histogram, review_date, float(intervals[i]), daily_cap
+                )
+                balancer.move(
+                    user_id, old_date, next_date if schedule.is_active else None, histogram
+                )
+                next_schedules.append({
+                    "knowledge_item_id": schedule.knowledge_item_id,
+                    "user_id": user_id,
+                    "scheduled_date": next_date,
+                    "completed": False,
+                    "interval_index": int(new_states["stage"][i]),
+                    "current_interval": (next_date - review_date).total_seconds() / 3600,
+                    "current_interval_unit": IntervalUnit.HOUR,
+                    "ease_factor": self._state_value(new_states["ease"][i]),
+                    "stability": self._state_value(new_states["stability"][i]),
+                    "difficulty": self._state_value(new_states["difficulty"][i]),
+                    "created_at": review_date,
+                    "_schedule_id": schedule.id,
+                })
+                next_dates[schedule.id] = next_date
+
+            completed_ids = [schedule.id for schedule, _ in accepted]
+            session.execute(
+                schedule_table.update()
+                .where(schedule_table.c.id.in_(completed_ids))
+                .values(completed=True)
+            )
+            session.execute(insert(ReviewRecord.__table__), records)
+            next_schedule_ids = {}
+            if next_schedules:
+                origins = [row.pop("_schedule_id") for row in next_schedules]
+                session.execute(insert(schedule_table), next_schedules)
+                # 事务持有写锁，同一条 executemany 插入的 rowid 连续
+                last_id = session.execute(select(func.last_insert_rowid())).scalar()
+                first_id = last_id - len(next_schedules) + 1
+                next_schedule_ids = dict(zip(origins, range(first_id, last_id + 1)))
+            for day, delta in daily.items():
+                self._add_daily_stats(session, user_id, day, delta)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            balancer.invalidate_user(user_id)
+            print(f"❌ 批量完成复习失败: {e} - manager.py:complete_reviews_batch")
+            return {"success": False, "msg": f"提交失败：{str(e)}"}
+        finally:
+            session.close()
+
+        for schedule, _ in accepted:
+            self.emit_change(
+                ChangeType.REVIEW_COMPLETED,
+                user_id,
+                knowledge_id=schedule.knowledge_item_id,
+                schedule_id=schedule.id,
+                next_schedule_id=next_schedule_ids.get(schedule.id),
+                next_review_at=next_dates.get(schedule.id),
+            )
+        return {
+            "success": True,
+            "msg": f"已完成 {len(accepted)} 个复习",
+            "data": {
+                "completed": len(accepted),
+                "mastered": len(accepted) - len(next_schedule_ids),
+                "next_schedule_ids": next_schedule_ids,
+                "skipped": skipped,
+            },
+        }
+
+    @staticmethod
+    def _state_value(value):
+        """算法状态数组的元素转为可写入数据库的值（NaN 为空）"""
+        value = float(value)
+        return None if value != value else value
+
+    @staticmethod
+    def _efficiency_of(effectiveness, recall_score):
+        """单条复习记录对学习效率的贡献（与统计页算法一致）"""
+        return (recall_score or 0.5) * (effectiveness or 3) / 5
+
+    @classmethod
+    def _daily_stat_delta(cls, effectiveness, recall_score, mastered):
+        """一次复习对每日汇总各计数列的增量"""
+        values = {
+            "review_count": 1,
+            "recall_sum": recall_score,
+            "efficiency_sum": cls._efficiency_of(effectiveness, recall_score),
+            "mastered_count": 1 if mastered else 0,
+        }
+        for score in range(1, 6):
+            values[f"effectiveness_{score}"] = 1 if effectiveness == score else 0
+        return values
+
+    def _bump_daily_stats(
+        self, session, user_id, review_date, effectiveness, recall_score, mastered
+    ):
+        """在当前事务中累加用户当日汇总（不存在则插入）"""
+        self._add_daily_stats(
+            session, user_id, review_date.date(),
+            self._daily_stat_delta(effectiveness, recall_score, mastered),
+        )
+
+    @staticmethod
+    def _add_daily_stats(session, user_id, day, delta):
+        """把计数增量累加到用户某天的汇总行"""
+        values = dict(delta, user_id=user_id, date=day)
+        stmt = sqlite_insert(DailyUserStat).values(**values)
+        counters = [key for key in values if key not in ("user_id", "date")]
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "date"],
+            set_={
+                key: getattr(DailyUserStat, key) + getattr(stmt.excluded, key)
+                for key in counters
+            },
+        )
+        session.execute(stmt)
+
+    def rebuild_daily_user_stats(self, user_id=None):
+        """根据复习记录全量重建每日汇总，返回写入的行数"""
+        from src.scheduler.ebbinghaus_config import EbbinghausConfig
+
+        last_stage = EbbinghausConfig.get_last_stage()
+        session = self.get_session()
+        try:
+            delete_query = session.query(DailyUserStat)
+            if user_id is not None:
+                delete_query = delete_query.filter(DailyUserStat.user_id == user_id)
+            delete_query.delete(synchronize_session=False)
+
+            review_day = func.date(ReviewRecord.review_date)
+            columns = [
+                ReviewRecord.user_id,
+                review_day,
+                func.count(ReviewRecord.id),
+                func.sum(ReviewRecord.recall_score),
+                func.sum(
+                    func.coalesce(func.nullif(ReviewRecord.recall_score, 0), 0.5)
+                    * func.coalesce(ReviewRecord.effectiveness, 3)
+                    / 5.0
+                ),
+            ]
+            columns += [
+                func.sum(case((ReviewRecord.effectiveness == score, 1), else_=0))
+                for score in range(1, 6)
+            ]
+            columns.append(
+                func.sum(
+                    case(
+                        (
+                            and_(
+                                ReviewSchedule.interval_index >= last_stage,
+                                ReviewRecord.effectiveness >= 4,
+                            ),
+                            1,
+                        ),
+                        else_=0,
+                    )
+                )
+            )
+            source = (
+                session.query(*columns)
+                .outerjoin(ReviewSchedule, ReviewRecord.schedule_id == ReviewSchedule.id)
+                .group_by(ReviewRecord.user_id, review_day)
+            )
+            if user_id is not None:
+                source = source.filter(ReviewRecord.user_id == user_id)
+
+            target_columns = [
+                "user_id",
+                "date",
+                "review_count",
+                "recall_sum",
+                "efficiency_sum",
+            ]
+            target_columns += [f"effectiveness_{score}" for score in range(1, 6)]
+            target_columns.append("mastered_count")
+            result = session.execute(
+                insert(DailyUserStat).from_select(target_columns, source.statement)
+            )
+            session.commit()
+            return result.rowcount
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def get_daily_user_stats(self, user_id, start_date=None):
+        """读取用户每日汇总（按日期升序），start_date 为 date 对象"""
+        session = self.get_session()
+        try:
+            query = session.query(DailyUserStat).filter(DailyUserStat.user_id == user_id)
+            if start_date is not None:
+                query = query.filter(DailyUserStat.date >= start_date)
+            rows = query.order_by(DailyUserStat.date).all()
+            session.expunge_all()
+            return rows
+        finally:
+            session.close()
+
     def update_review_schedule_time(self, schedule_id: int, new_time: datetime) -> bool:
         """更新复习计划的安排时间"""
         session = self.get_session()
@@ -472,6 +1108,12 @@ class DatabaseManager:
             if schedule:
                 schedule.scheduled_date = new_time
                 session.commit()
+                self.emit_change(
+                    ChangeType.SCHEDULE_RESCHEDULED,
+                    schedule.user_id,
+                    knowledge_id=schedule.knowledge_item_id,
+                    schedule_id=schedule_id,
+                )
                 print(
                     f"✅ [DELAY DEBUG] 已更新复习计划 {schedule_id} 时间为 {new_time} - manager.py:472")
                 return True
@@ -522,6 +1164,9 @@ class DatabaseManager:
 
             session.commit()
             session.close()
+            self.emit_change(
+                ChangeType.SCHEDULE_CANCELLED, user_id, knowledge_id=knowledge_item_id
+            )
 
             print(
                 f"✅ [CANCEL DEBUG] 已成功取消知识点 {knowledge_item_id} 的复习计划 - manager.py:519")
@@ -557,74 +1202,117 @@ class DatabaseManager:
         """获取艾宾浩斯阶段分布（详细版）"""
         session = self.get_session()
         try:
-            from src.scheduler.ebbinghaus_config import EbbinghausConfig
-
-            # 获取未完成的复习计划按阶段分组
-            stage_stats = (
-                session.query(
-                    ReviewSchedule.interval_index, func.count(ReviewSchedule.id)
-                )
-                .filter(ReviewSchedule.user_id == user_id, ~ReviewSchedule.completed)
-                .group_by(ReviewSchedule.interval_index)
-                .all()
-            )
-
-            distribution = {}
-            total_stages = EbbinghausConfig.get_total_stages()
+            return self._ebbinghaus_distribution(session, user_id)
+        finally:
+            session.close()
 
-            # 初始化所有阶段
-            for stage in range(total_stages):
-                distribution[stage] = {
-                    "count": 0,
-                    "label": EbbinghausConfig.get_stage_label(stage),
-                    "description": EbbinghausConfig.get_stage_description(stage),
-                }
+    def _ebbinghaus_distribution(self, session, user_id):
+        """在给定会话中统计未完成复习计划的阶段分布"""
+        from src.scheduler.ebbinghaus_config import EbbinghausConfig
+
+        # 获取未完成的复习计划按阶段分组
+        stage_stats = (
+            session.query(ReviewSchedule.interval_index, func.count(ReviewSchedule.id))
+            .filter(ReviewSchedule.user_id == user_id, ~ReviewSchedule.completed)
+            .group_by(ReviewSchedule.interval_index)
+            .all()
+        )
+
+        distribution = {}
+        total_stages = EbbinghausConfig.get_total_stages()
+
+        # 初始化所有阶段
+        for stage in range(total_stages):
+            distribution[stage] = {
+                "count": 0,
+                "label": EbbinghausConfig.get_stage_label(stage),
+                "description": EbbinghausConfig.get_stage_description(stage),
+            }
 
-            # 填充实际数据
-            for stage, count in stage_stats:
-                if stage in distribution:
-                    distribution[stage]["count"] = count
+        # 填充实际数据
+        for stage, count in stage_stats:
+            if stage in distribution:
+                distribution[stage]["count"] = count
 
-            return distribution
-        finally:
-            session.close()
+        return distribution
 
     def get_daily_review_stats(self, user_id, days=7):
-        """获取近N天复习效果统计"""
+        """获取近N天复习效果统计（读取每日汇总表）"""
+        start_date = (datetime.now() - timedelta(days=days)).date()
+        rows = self.get_daily_user_stats(user_id, start_date)
+
+        # 格式化数据：日期、平均分数、复习次数
+        result = []
+        for row in rows:
+            if not row.review_count:
+                continue
+            result.append(
+                {
+                    "date": row.date.strftime("%Y-%m-%d"),
+                    "avg_recall_score": round(row.recall_sum / row.review_count, 1),
+                    "review_count": row.review_count,
+                }
+            )
+        return result
+
+    def _streak_info(self, session, user_id):
+        """基于每日汇总表计算连续复习天数（gaps-and-islands，单次查询）
+
+        日期减去按日期排序的行号，连续日期得到相同的差值（同一"岛"）。
+        返回 {"current_streak": 截至今日的连续天数（今日未复习为0）,
+        "longest_streak": 历史最长连续天数, "last_active_date": 最近复习日期或None}
+        """
+        days = (
+            session.query(
+                DailyUserStat.date.label("day"),
+                (
+                    func.julianday(DailyUserStat.date)
+                    - func.row_number().over(order_by=DailyUserStat.date)
+                ).label("island"),
+            )
+            .filter(DailyUserStat.user_id == user_id, DailyUserStat.review_count > 0)
+            .subquery()
+        )
+        islands = (
+            session.query(
+                func.max(days.c.day).label("end_day"),
+                func.count().label("length"),
+            )
+            .group_by(days.c.island)
+            .subquery()
+        )
+        latest = (
+            session.query(
+                islands.c.end_day,
+                islands.c.length,
+                func.max(islands.c.length).over().label("longest"),
+            )
+            .order_by(islands.c.end_day.desc())
+            .first()
+        )
+
+        if latest is None:
+            return {"current_streak": 0, "longest_streak": 0, "last_active_date": None}
+        return {
+            "current_streak": (
+                latest.length if latest.end_day == datetime.now().date() else 0
+            ),
+            "longest_streak": latest.longest,
+            "last_active_date": latest.end_day,
+        }
+
+    def get_streak_info(self, user_id):
+        """获取连续复习天数信息（见 _streak_info）"""
         session = self.get_session()
         try:
-            start_date = datetime.now() - timedelta(days=days)
-            stats = (
-                session.query(
-                    func.date(ReviewRecord.review_date),
-                    func.avg(ReviewRecord.recall_score),
-                    func.count(ReviewRecord.id),
-                )
-                .join(KnowledgeItem, ReviewRecord.knowledge_item_id == KnowledgeItem.id)
-                .filter(
-                    KnowledgeItem.user_id == user_id,
-                    ReviewRecord.review_date >= start_date,
-                )
-                .group_by(func.date(ReviewRecord.review_date))
-                .all()
-            )
-
-            # 格式化数据：日期、平均分数、复习次数
-            result = []
-            for date_str, avg_score, count in stats:
-                result.append(
-                    {
-                        "date": date_str,
-                        "avg_recall_score": round(avg_score, 1) if avg_score else 0,
-                        "review_count": count,
-                    }
-                )
-            return result
+            return self._streak_info(session, user_id)
         finally:
             session.close()
 
     def get_overall_stats(self, user_id):
         """获取整体统计概览"""
+        from src.scheduler.ebbinghaus_config import EbbinghausConfig
+
         session = self.get_session()
         try:
             # 知识点统计
@@ -634,75 +1322,60 @@ class DatabaseManager:
                 .count()
             )
 
-            # 已掌握知识点（完成所有7阶段）
-            mastered_ids = (
-                session.query(ReviewSchedule.knowledge_item_id)
+            # 已掌握知识点（最后阶段复习通过，与每日汇总的 mastered_count 规则一致）
+            mastered_count = (
+                session.query(func.count(func.distinct(ReviewSchedule.knowledge_item_id)))
+                .join(ReviewRecord, ReviewRecord.schedule_id == ReviewSchedule.id)
                 .filter(
-                    ReviewSchedule.user_id == user_id,
-                    ReviewSchedule.interval_index == 6,
+                    ReviewRecord.user_id == user_id,
+                    ReviewSchedule.interval_index >= EbbinghausConfig.get_last_stage(),
                     ReviewSchedule.completed,
+                    ReviewRecord.effectiveness >= 4,
                 )
-                .distinct()
-                .all()
+                .scalar()
             )
-            mastered_count = len(mastered_ids)
 
-            # 30天复习完成率
+            # 30天复习完成率（单次条件聚合）
             thirty_days_ago = datetime.now() - timedelta(days=30)
-            total_scheduled = (
-                session.query(ReviewSchedule)
-                .filter(
-                    ReviewSchedule.user_id == user_id,
-                    ReviewSchedule.scheduled_date >= thirty_days_ago,
+            total_scheduled, completed_scheduled = (
+                session.query(
+                    func.count(ReviewSchedule.id),
+                    func.sum(case((ReviewSchedule.completed, 1), else_=0)),
                 )
-                .count()
-            )
-            completed_scheduled = (
-                session.query(ReviewSchedule)
                 .filter(
                     ReviewSchedule.user_id == user_id,
                     ReviewSchedule.scheduled_date >= thirty_days_ago,
-                    ReviewSchedule.completed,
                 )
-                .count()
+                .one()
             )
+            completed_scheduled = completed_scheduled or 0
             completion_rate = (
                 (completed_scheduled / total_scheduled) * 100
                 if total_scheduled > 0
                 else 0
             )
 
-            # 连续复习天数
-            completed_dates = (
-                session.query(func.date(ReviewRecord.review_date))
-                .filter(ReviewRecord.knowledge_item.has(user_id=user_id))
-                .distinct()
-                .order_by(func.date(ReviewRecord.review_date).desc())
-                .all()
-            )
-            streak_days = 0
-            if completed_dates:
-                current_date = datetime.now().date()
-                for idx, (date_str,) in enumerate(completed_dates):
-                    record_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                    if (current_date - record_date).days == idx:
-                        streak_days += 1
-                    else:
-                        break
+            # 连续复习天数（与统计页共用同一算法）
+            streak = self._streak_info(session, user_id)
 
-            # 今日复习统计
-            today_stats = self.get_review_stats(user_id)
+            # 今日复习统计（复用同一会话）
+            today_stats = self._review_stats(session, user_id)
 
             return {
                 "total_knowledge": total_knowledge,
                 "mastered_knowledge": mastered_count,
                 "completion_rate_30d": round(completion_rate, 1),
-                "streak_days": streak_days,
+                "streak_days": streak["current_streak"],
+                "longest_streak": streak["longest_streak"],
                 "last_review_date": (
-                    completed_dates[0][0] if completed_dates else "暂无"
+                    streak["last_active_date"].strftime("%Y-%m-%d")
+                    if streak["last_active_date"]
+                    else "暂无"
                 ),
                 "today_stats": today_stats,
-                "ebbinghaus_distribution": self.get_ebbinghaus_distribution(user_id),
+                "ebbinghaus_distribution": self._ebbinghaus_distribution(
+                    session, user_id
+                ),
             }
         finally:
             session.close()
@@ -710,13 +1383,32 @@ class DatabaseManager:
     # ------------------------------
     # 提醒相关（供scheduler模块调用）
     # ------------------------------
-    def get_pending_reminders(self):
-        """获取1小时内需要提醒的计划"""
+    def get_pending_reminders(
+        self, within=timedelta(hours=1), after=None, limit=None, now=None, backoff=None
+    ):
+        """获取 within 时间内需要提醒的计划（跨用户，只含开启提醒的用户）
+
+        按 (计划时间, 计划ID) 排序，走 (completed, scheduled_date) 索引；
+        after 为上一批最后一条的 (计划时间, 计划ID)，配合 limit 做键集分页，
+        每批只需一次查询。给出 backoff（ReminderBackoff）时，在同一查询中按
+        用户渠道的投递记录排除 now 时仍在退避窗口内的计划，分页不再经过
+        已提醒过的逾期计划。
+        """
+        now = now or datetime.now()
         session = self.get_session()
         try:
-            soon = datetime.now() + timedelta(hours=1)
-            plans = (
-                session.query(ReviewSchedule, KnowledgeItem, User)
+            soon = now + within
+            query = (
+                session.query(
+                    ReviewSchedule.id,
+                    ReviewSchedule.user_id,
+                    ReviewSchedule.knowledge_item_id,
+                    ReviewSchedule.scheduled_date,
+                    ReviewSchedule.interval_index,
+                    KnowledgeItem.title,
+                    User.email,
+                    User.reminder_channel,
+                )
                 .join(
                     KnowledgeItem, ReviewSchedule.knowledge_item_id == KnowledgeItem.id
                 )
@@ -726,28 +1418,160 @@ class DatabaseManager:
                     ReviewSchedule.scheduled_date <= soon,
                     User.enable_reminder,
                 )
-                .all()
             )
+            if after is not None:
+                last_date, last_id = after
+                # 单独的 >= 条件让 SQLite 把下界也用于索引范围扫描
+                query = query.filter(
+                    ReviewSchedule.scheduled_date >= last_date,
+                    or_(
+                        ReviewSchedule.scheduled_date > last_date,
+                        and_(
+                            ReviewSchedule.scheduled_date == last_date,
+                            ReviewSchedule.id > last_id,
+                        ),
+                    )
+                )
+            if backoff is not None:
+                query = self._filter_reminder_backoff(query, backoff, now)
+            query = query.order_by(ReviewSchedule.scheduled_date, ReviewSchedule.id)
+            if limit is not None:
+                query = query.limit(limit)
 
             result = []
-            for schedule, item, user in plans:
+            for row in query.all():
                 result.append(
                     {
-                        "schedule_id": schedule.id,
-                        "user_id": user.id,
-                        "user_email": user.email,
-                        "knowledge_title": item.title,
-                        "scheduled_date": schedule.scheduled_date.strftime(
+                        "schedule_id": row.id,
+                        "user_id": row.user_id,
+                        "knowledge_id": row.knowledge_item_id,
+                        "user_email": row.email,
+                        "knowledge_title": row.title,
+                        "scheduled_date": row.scheduled_date.strftime(
                             "%Y-%m-%d %H:%M"
                         ),
-                        "reminder_channel": user.reminder_channel,
-                        "interval_index": schedule.interval_index,
+                        "scheduled_at": row.scheduled_date,
+                        "reminder_channel": row.reminder_channel,
+                        "interval_index": row.interval_index,
                     }
                 )
             return result
         finally:
             session.close()
 
+    @staticmethod
+    def _filter_reminder_backoff(query, backoff, now):
+        """按投递记录过滤退避窗口（规则同 ReminderBackoff.next_due）
+
+        投递记录按 (计划ID, 渠道) 唯一索引逐条查找；渠道键与 delivery_channel 一致。
+        """
+        from src.scheduler.reminder_policy import DESKTOP_CHANNEL, DESKTOP_CHANNELS
+
+        channel = case(
+            (
+                or_(User.reminder_channel.is_(None),
+                    User.reminder_channel.in_(DESKTOP_CHANNELS)),
+                DESKTOP_CHANNEL,
+            ),
+            else_=User.reminder_channel,
+        )
+        steps, cutoff = backoff.resend_cutoffs(now)
+        if steps:
+            cutoff = case(
+                *[(ReminderDelivery.attempts == attempts, at) for attempts, at in steps],
+                else_=cutoff,
+            )
+        resend = ReminderDelivery.last_sent_at <= cutoff
+        if backoff.max_attempts is not None:
+            resend = and_(resend, ReminderDelivery.attempts < backoff.max_attempts)
+        return query.outerjoin(
+            ReminderDelivery,
+            and_(
+                ReminderDelivery.schedule_id == ReviewSchedule.id,
+                ReminderDelivery.channel == channel,
+            ),
+        ).filter(
+            or_(
+                ReminderDelivery.id.is_(None),  # 从未提醒
+                ReminderDelivery.scheduled_for != ReviewSchedule.scheduled_date,  # 已改期
+                resend,
+            )
+        )
+
+    def get_reminder_deliveries(self, user_id, channel, schedule_ids=None):
+        """查询提醒投递记录，返回 {计划ID: 行(scheduled_for, last_sent_at, attempts)}
+
+        user_id 为 None 时不按用户过滤（跨用户提醒按计划ID批量查询）。
+        """
+        session = self.get_session()
+        try:
+            query = session.query(
+                ReminderDelivery.schedule_id,
+                ReminderDelivery.scheduled_for,
+                ReminderDelivery.last_sent_at,
+                ReminderDelivery.attempts,
+            ).filter(ReminderDelivery.channel == channel)
+            if user_id is not None:
+                query = query.filter(ReminderDelivery.user_id == user_id)
+            if schedule_ids is not None:
+                query = query.filter(ReminderDelivery.schedule_id.in_(schedule_ids))
+            return {row.schedule_id: row for row in query.all()}
+        finally:
+            session.close()
+
+    def record_reminder_deliveries(
+        self, user_id, channel, scheduled, sent_at=None, user_ids=None
+    ):
+        """记录已发送的提醒，scheduled 为 {计划ID: 提醒针对的计划时间}
+
+        同一计划同一渠道只有一行：计划时间与上次相同时累加次数，
+        否则（计划已改期）重新从 1 计数。跨用户批量记录时通过
+        user_ids 给出 {计划ID: 用户ID}。返回写入的行数。
+        """
+        if not scheduled:
+            return 0
+        sent_at = sent_at or datetime.now()
+        stmt = sqlite_insert(ReminderDelivery).values(
+            [
+                {
+                    "schedule_id": schedule_id,
+                    "channel": channel,
+                    "user_id": user_ids[schedule_id] if user_ids else user_id,
+                    "scheduled_for": scheduled_for,
+                    "first_sent_at": sent_at,
+                    "last_sent_at": sent_at,
+                    "attempts": 1,
+                }
+                for schedule_id, scheduled_for in scheduled.items()
+            ]
+        )
+        # SET 中引用的列均为更新前的值
+        same_time = ReminderDelivery.scheduled_for == stmt.excluded.scheduled_for
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["schedule_id", "channel"],
+            set_={
+                "scheduled_for": stmt.excluded.scheduled_for,
+                "last_sent_at": stmt.excluded.last_sent_at,
+                "first_sent_at": case(
+                    (same_time, ReminderDelivery.first_sent_at),
+                    else_=stmt.excluded.first_sent_at,
+                ),
+                "attempts": case(
+                    (same_time, ReminderDelivery.attempts + 1), else_=1
+                ),
+            },
+        )
+        session = self.get_session()
+        try:
+            session.execute(stmt)
+            session.commit()
+            return len(scheduled)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
     def add_to_today_review(self, knowledge_id, user_id):
         """手动将知识点加入今日复习"""
         session = self.get_session()
@@ -778,6 +1602,12 @@ class DatabaseManager:
 
             session.add(today_schedule)
             session.commit()
+            self.emit_change(
+                ChangeType.SCHEDULE_ADDED,
+                user_id,
+                knowledge_id=knowledge_id,
+                schedule_id=today_schedule.id,
+            )
 
             return {
                 "success": True,
@@ -791,6 +1621,59 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def get_scheduling_algorithm(self, user_id):
+        """用户选择的调度算法名称（未设置时为艾宾浩斯）"""
+        from src.scheduler.algorithms import DEFAULT_ALGORITHM
+
+        session = self.get_session()
+        try:
+            name = (
+                session.query(User.scheduling_algorithm)
+                .filter(User.id == user_id)
+                .scalar()
+            )
+            return name or DEFAULT_ALGORITHM
+        finally:
+            session.close()
+
+    def set_scheduling_algorithm(self, user_id, name):
+        """切换调度算法：只影响之后完成的复习，已安排的计划不变"""
+        from src.scheduler.algorithms import ALGORITHMS
+
+        if name not in ALGORITHMS:
+            return {"success": False, "msg": f"未知的调度算法：{name}"}
+        session = self.get_session()
+        try:
+            user = session.query(User).filter(User.id == user_id).first()
+            if not user:
+                return {"success": False, "msg": "用户不存在"}
+            user.scheduling_algorithm = name
+            session.commit()
+            return {"success": True, "msg": f"已切换为{ALGORITHMS[name].label}"}
+        except Exception as e:
+            session.rollback()
+            return {"success": False, "msg": f"切换调度算法失败：{str(e)}"}
+        finally:
+            session.close()
+
+    def set_daily_review_cap(self, user_id, cap):
+        """设置每日复习上限（None 或 0 表示不限），只影响之后生成的计划"""
+        if cap is not None and cap < 0:
+            return {"success": False, "msg": "每日复习上限不能为负数"}
+        session = self.get_session()
+        try:
+            user = session.query(User).filter(User.id == user_id).first()
+            if not user:
+                return {"success": False, "msg": "用户不存在"}
+            user.daily_review_cap = cap or None
+            session.commit()
+            return {"success": True, "msg": f"每日复习上限：{cap or '不限'}"}
+        except Exception as e:
+            session.rollback()
+            return {"success": False, "msg": f"设置每日复习上限失败：{str(e)}"}
+        finally:
+            session.close()
+
     def get_user_knowledge_items(self, user_id):
         return self.get_knowledge_with_review_status(user_id)
 
@@ -0,0 +1,60 @@
+"""数据库结构版本：启动时建表或把旧数据库升级到最新迁移
+
+- 空数据库：create_all 直接建出完整结构，并标记为最新迁移版本（stamp head）
+- 已有数据库且版本不是最新（含从未标记过版本的旧数据库）：补建缺失的表后
+  执行 alembic upgrade head。迁移脚本均可重复执行，未标记版本的数据库从
+  0001 开始回放也是安全的
+- 已是最新版本：只读一次 alembic_version，不导入 alembic
+"""
+import os
+
+from sqlalchemy import inspect
+
+from .models import Base
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+
+def head_revision() -> str:
+    """最新迁移版本（版本号即 versions 目录下脚本文件名的前缀 0001、0002……）"""
+    revisions = [
+        name.split("_", 1)[0]
+        for name in os.listdir(os.path.join(MIGRATIONS_DIR, "versions"))
+        if name.endswith(".py") and name[:4].isdigit()
+    ]
+    return max(revisions)
+
+
+def current_revision(connection):
+    """数据库记录的迁移版本，未标记时为 None"""
+    if "alembic_version" not in inspect(connection).get_table_names():
+        return None
+    return connection.exec_driver_sql("SELECT version_num FROM alembic_version").scalar()
+
+
+def _run_alembic(connection, command_name):
+    """在给定连接上执行 alembic 命令（upgrade / stamp 到 head）"""
+    from alembic import command
+    from alembic.config import Config
+
+    # 不读取 alembic.ini：其中的日志配置会覆盖应用的日志设置
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    config.attributes["connection"] = connection
+    getattr(command, command_name)(config, "head")
+
+
+def upgrade_schema(engine):
+    """建表或升级到最新版本，返回 "created" / "upgraded" / None（已是最新）"""
+    with engine.begin() as connection:
+        tables = set(inspect(connection).get_table_names())
+        if not tables & set(Base.metadata.tables):
+            Base.metadata.create_all(connection)
+            _run_alembic(connection, "stamp")
+            return "created"
+        if current_revision(connection) == head_revision():
+            return None
+        # 先补建旧版本没有的表，再由迁移补齐列、索引并回填数据
+        Base.metadata.create_all(connection)
+        _run_alembic(connection, "upgrade")
+        return "upgraded"
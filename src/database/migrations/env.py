@@ -0,0 +1,71 @@
+"""Alembic 迁移环境
+
+全新数据库由 DatabaseManager 的 create_all 直接创建完整结构并标记为最新版本；
+迁移脚本用于升级旧版本创建的数据库（DatabaseManager 启动时自动执行，见
+src.database.migrate），均可重复执行。
+"""
+import os
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+
+from src.database.models import Base
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def _database_url():
+    """优先使用环境变量 REVIEW_ALARM_DB 指定的数据库文件"""
+    db_path = os.environ.get("REVIEW_ALARM_DB")
+    if db_path:
+        return f"sqlite:///{db_path}"
+    return config.get_main_option("sqlalchemy.url")
+
+
+def run_migrations_offline():
+    """离线模式：只输出SQL"""
+    context.configure(
+        url=_database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """在线模式：可复用调用方传入的连接（如测试）"""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_engine(_database_url())
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,47 @@
+"""复习计划/记录热点查询的组合索引
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_knowledge_items_user_created", "knowledge_items", ["user_id", "created_at"]),
+    (
+        "ix_review_schedules_user_completed_date",
+        "review_schedules",
+        ["user_id", "completed", "scheduled_date"],
+    ),
+    (
+        "ix_review_schedules_completed_date",
+        "review_schedules",
+        ["completed", "scheduled_date"],
+    ),
+    (
+        "ix_review_schedules_item_stage",
+        "review_schedules",
+        ["knowledge_item_id", "interval_index"],
+    ),
+    (
+        "ix_review_records_item_date",
+        "review_records",
+        ["knowledge_item_id", "review_date"],
+    ),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+    op.execute("ANALYZE")
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,65 @@
+"""每日复习汇总表 daily_user_stats 并回填历史数据
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# 最后一个艾宾浩斯阶段的下标（与 EbbinghausConfig.INTERVALS_HOURS 长度对应）
+LAST_STAGE = 7
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "daily_user_stats" not in inspector.get_table_names():
+        op.create_table(
+            "daily_user_stats",
+            sa.Column(
+                "user_id", sa.Integer, sa.ForeignKey("users.id"), primary_key=True
+            ),
+            sa.Column("date", sa.Date, primary_key=True),
+            sa.Column("review_count", sa.Integer, nullable=False),
+            sa.Column("recall_sum", sa.Float, nullable=False),
+            sa.Column("efficiency_sum", sa.Float, nullable=False),
+            sa.Column("effectiveness_1", sa.Integer, nullable=False),
+            sa.Column("effectiveness_2", sa.Integer, nullable=False),
+            sa.Column("effectiveness_3", sa.Integer, nullable=False),
+            sa.Column("effectiveness_4", sa.Integer, nullable=False),
+            sa.Column("effectiveness_5", sa.Integer, nullable=False),
+            sa.Column("mastered_count", sa.Integer, nullable=False),
+        )
+
+    # 用历史复习记录回填（与 DatabaseManager.rebuild_daily_user_stats 一致）
+    op.execute("DELETE FROM daily_user_stats")
+    op.execute(
+        f"""
+        INSERT INTO daily_user_stats (
+            user_id, date, review_count, recall_sum, efficiency_sum,
+            effectiveness_1, effectiveness_2, effectiveness_3,
+            effectiveness_4, effectiveness_5, mastered_count
+        )
+        SELECT k.user_id, date(r.review_date), count(r.id), sum(r.recall_score),
+               sum(coalesce(nullif(r.recall_score, 0), 0.5)
+                   * coalesce(r.effectiveness, 3) / 5.0),
+               sum(r.effectiveness = 1), sum(r.effectiveness = 2),
+               sum(r.effectiveness = 3), sum(r.effectiveness = 4),
+               sum(r.effectiveness = 5),
+               sum(coalesce(s.interval_index >= {LAST_STAGE}, 0)
+                   AND r.effectiveness >= 4)
+        FROM review_records r
+        JOIN knowledge_items k ON r.knowledge_item_id = k.id
+        LEFT JOIN review_schedules s ON r.schedule_id = s.id
+        GROUP BY k.user_id, date(r.review_date)
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("daily_user_stats")
@@ -0,0 +1,60 @@
+"""复习记录冗余 user_id 列及 (user_id, review_date) 索引
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("review_records")}
+
+    if "user_id" not in columns:
+        with op.batch_alter_table("review_records") as batch_op:
+            batch_op.add_column(sa.Column("user_id", sa.Integer, nullable=True))
+
+    # 从所属知识点回填用户ID
+    op.execute(
+        """
+        UPDATE review_records
+        SET user_id = (
+            SELECT knowledge_items.user_id FROM knowledge_items
+            WHERE knowledge_items.id = review_records.knowledge_item_id
+        )
+        WHERE user_id IS NULL
+        """
+    )
+
+    if "user_id" not in columns:
+        # SQLite 不能直接修改列约束，batch 模式会重建表
+        with op.batch_alter_table(
+            "review_records", table_kwargs={"sqlite_autoincrement": True}
+        ) as batch_op:
+            batch_op.alter_column("user_id", existing_type=sa.Integer, nullable=False)
+            batch_op.create_foreign_key(
+                "fk_review_records_user_id", "users", ["user_id"], ["id"]
+            )
+
+    op.create_index(
+        "ix_review_records_user_date",
+        "review_records",
+        ["user_id", "review_date"],
+        if_not_exists=True,
+    )
+    op.execute("ANALYZE review_records")
+
+
+def downgrade():
+    op.drop_index(
+        "ix_review_records_user_date", table_name="review_records", if_exists=True
+    )
+    with op.batch_alter_table("review_records") as batch_op:
+        batch_op.drop_column("user_id")
@@ -0,0 +1,24 @@
+"""知识点全文索引 knowledge_fts（FTS5 trigram）及同步触发器
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+from src.database.fts import DROP_STATEMENTS, ensure_knowledge_fts
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 表与触发器均为 IF NOT EXISTS，新建索引表时按现有知识点回填
+    ensure_knowledge_fts(op.get_bind())
+
+
+def downgrade():
+    for statement in DROP_STATEMENTS:
+        op.execute(statement)
@@ -0,0 +1,50 @@
+"""复习提醒投递记录表 reminder_deliveries
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "reminder_deliveries" not in inspector.get_table_names():
+        op.create_table(
+            "reminder_deliveries",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column(
+                "schedule_id",
+                sa.Integer,
+                sa.ForeignKey("review_schedules.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("channel", sa.String(20), nullable=False),
+            sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("scheduled_for", sa.DateTime, nullable=False),
+            sa.Column("first_sent_at", sa.DateTime, nullable=False),
+            sa.Column("last_sent_at", sa.DateTime, nullable=False),
+            sa.Column("attempts", sa.Integer, nullable=False),
+            sa.UniqueConstraint(
+                "schedule_id", "channel", name="uq_reminder_deliveries_schedule_channel"
+            ),
+        )
+    op.create_index(
+        "ix_reminder_deliveries_user",
+        "reminder_deliveries",
+        ["user_id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_reminder_deliveries_user", table_name="reminder_deliveries", if_exists=True
+    )
+    op.drop_table("reminder_deliveries")
@@ -0,0 +1,41 @@
+"""按用户选择调度算法：users.scheduling_algorithm 与复习计划的记忆状态列
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def new_columns():
+    """只追加可空列：SQLite 的 ADD COLUMN 无需重建表（每次返回新的 Column 对象）"""
+    return {
+        "users": [sa.Column("scheduling_algorithm", sa.String(20))],
+        "review_schedules": [
+            sa.Column("ease_factor", sa.Float),
+            sa.Column("stability", sa.Float),
+            sa.Column("difficulty", sa.Float),
+        ],
+    }
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table_name, columns in new_columns().items():
+        existing = {column["name"] for column in inspector.get_columns(table_name)}
+        for column in columns:
+            if column.name not in existing:
+                op.add_column(table_name, column)
+
+
+def downgrade():
+    for table_name, columns in new_columns().items():
+        with op.batch_alter_table(table_name) as batch_op:
+            for column in columns:
+                batch_op.drop_column(column.name)
@@ -0,0 +1,25 @@
+"""每日复习上限：users.daily_review_cap
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    existing = {column["name"] for column in inspector.get_columns("users")}
+    if "daily_review_cap" not in existing:
+        op.add_column("users", sa.Column("daily_review_cap", sa.Integer))
+
+
+def downgrade():
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("daily_review_cap")
@@ -0,0 +1,39 @@
+"""review_schedules.current_interval 改为浮点数（艾宾浩斯前几个阶段不足1小时）
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def _column_type():
+    inspector = sa.inspect(op.get_bind())
+    for column in inspector.get_columns("review_schedules"):
+        if column["name"] == "current_interval":
+            return column["type"]
+    return None
+
+
+def upgrade():
+    # SQLite 不能直接修改列类型，batch 模式会重建表（索引随之重建）；
+    # 已有的小数值按 INTEGER 亲和性原样保存为 REAL，无需转换数据
+    if isinstance(_column_type(), sa.Integer):
+        with op.batch_alter_table("review_schedules") as batch_op:
+            batch_op.alter_column(
+                "current_interval", existing_type=sa.Integer, type_=sa.Float
+            )
+
+
+def downgrade():
+    if isinstance(_column_type(), sa.Float):
+        with op.batch_alter_table("review_schedules") as batch_op:
+            batch_op.alter_column(
+                "current_interval", existing_type=sa.Float, type_=sa.Integer
+            )
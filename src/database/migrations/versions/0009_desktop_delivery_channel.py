@@ -0,0 +1,45 @@
+"""桌面通知的投递记录合并到同一渠道键（app）
+
+图形界面的提醒服务按 system 记录、守护进程按 app 记录，同一计划会被两者各提醒
+一次。同一计划两行都在时保留最近一次提醒的那一行。
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        """
+        DELETE FROM reminder_deliveries
+        WHERE channel = 'system' AND EXISTS (
+            SELECT 1 FROM reminder_deliveries AS app
+            WHERE app.schedule_id = reminder_deliveries.schedule_id
+              AND app.channel = 'app'
+              AND app.last_sent_at >= reminder_deliveries.last_sent_at
+        )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM reminder_deliveries
+        WHERE channel = 'app' AND EXISTS (
+            SELECT 1 FROM reminder_deliveries AS system
+            WHERE system.schedule_id = reminder_deliveries.schedule_id
+              AND system.channel = 'system'
+        )
+        """
+    )
+    op.execute("UPDATE reminder_deliveries SET channel = 'app' WHERE channel = 'system'")
+
+
+def downgrade():
+    # 合并后无法区分原渠道；旧版本按 system 读取时只会多提醒一次
+    pass
@@ -1,6 +1,7 @@
 """数据模型：扩展艾宾浩斯字段+关联关系"""
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, Enum
+    Column, Integer, String, Text, Date, DateTime, Boolean, ForeignKey, Float, Enum,
+    Index, UniqueConstraint
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -28,6 +29,10 @@ class User(Base):
     # 新增提醒配置
     enable_reminder = Column(Boolean, default=True)
     reminder_channel = Column(String(20), default="app")  # app/email
+    # 间隔重复算法（scheduler.algorithms.ALGORITHMS 的键，为空时使用艾宾浩斯）
+    scheduling_algorithm = Column(String(20), default="ebbinghaus")
+    # 每日复习上限（为空表示不限），超出时新计划顺延，见 scheduler.load_balancer
+    daily_review_cap = Column(Integer)
 
     # 关联复习计划
     review_schedules = relationship(
@@ -60,6 +65,11 @@ class KnowledgeItem(Base):
         backref="knowledge_item",
         cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # 知识列表：按用户过滤并按创建时间排序
+        Index("ix_knowledge_items_user_created", "user_id", "created_at"),
+    )
+
 
 class ReviewSchedule(Base):
     __tablename__ = "review_schedules"
@@ -71,14 +81,30 @@ class ReviewSchedule(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     scheduled_date = Column(DateTime, nullable=False)
     completed = Column(Boolean, default=False)
-    interval_index = Column(Integer, default=0)  # 艾宾浩斯阶段（0-6）
-    current_interval = Column(Integer)
+    interval_index = Column(Integer, default=0)  # 艾宾浩斯阶段（0-7）
+    current_interval = Column(Float)  # 间隔时长，单位见 current_interval_unit（可为小数小时）
     current_interval_unit = Column(Enum(IntervalUnit))
     created_at = Column(DateTime, default=datetime.now)
+    # 调度算法的记忆状态（生成本计划时的值）：SM-2 难度系数、FSRS 稳定性（天）与难度
+    ease_factor = Column(Float)
+    stability = Column(Float)
+    difficulty = Column(Float)
 
     # 关联复习记录
     review_record = relationship("ReviewRecord", backref="schedule", uselist=False)
 
+    __table_args__ = (
+        # 今日复习/逾期/统计：user_id + completed 等值，scheduled_date 范围
+        Index(
+            "ix_review_schedules_user_completed_date",
+            "user_id", "completed", "scheduled_date"),
+        # 跨用户提醒查询：completed 等值，scheduled_date 范围
+        Index("ix_review_schedules_completed_date", "completed", "scheduled_date"),
+        # 单个知识点的阶段查询
+        Index(
+            "ix_review_schedules_item_stage", "knowledge_item_id", "interval_index"),
+    )
+
 
 class ReviewRecord(Base):
     __tablename__ = "review_records"
@@ -87,10 +113,56 @@ class ReviewRecord(Base):
         Integer,
         ForeignKey("knowledge_items.id"),
         nullable=False)
+    # 冗余存储所属用户，统计查询无需再经 knowledge_items 关联
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     schedule_id = Column(Integer, ForeignKey("review_schedules.id"))
     review_date = Column(DateTime, default=datetime.now)
     effectiveness = Column(Integer, nullable=False)  # 1-5分
     recall_score = Column(Float, nullable=False)  # 0-100
     notes = Column(Text)
 
-    __table_args__ = {"sqlite_autoincrement": True}
+    __table_args__ = (
+        Index("ix_review_records_item_date", "knowledge_item_id", "review_date"),
+        # 按用户的时间范围统计（连续天数、最近复习、汇总重建）
+        Index("ix_review_records_user_date", "user_id", "review_date"),
+        {"sqlite_autoincrement": True},
+    )
+
+
+class DailyUserStat(Base):
+    """用户每日复习汇总（由 complete_review 增量维护，可全量重建）"""
+    __tablename__ = "daily_user_stats"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    recall_sum = Column(Float, nullable=False, default=0)  # 回忆分数之和
+    efficiency_sum = Column(Float, nullable=False, default=0)  # 学习效率分子之和
+    # 效果评分直方图（1-5分各自的次数）
+    effectiveness_1 = Column(Integer, nullable=False, default=0)
+    effectiveness_2 = Column(Integer, nullable=False, default=0)
+    effectiveness_3 = Column(Integer, nullable=False, default=0)
+    effectiveness_4 = Column(Integer, nullable=False, default=0)
+    effectiveness_5 = Column(Integer, nullable=False, default=0)
+    mastered_count = Column(Integer, nullable=False, default=0)  # 当日完成全部阶段的知识点
+
+
+class ReminderDelivery(Base):
+    """复习提醒投递记录：每个计划在每个渠道上一行，用于去重与逾期重复提醒"""
+    __tablename__ = "reminder_deliveries"
+    id = Column(Integer, primary_key=True)
+    schedule_id = Column(
+        Integer,
+        ForeignKey("review_schedules.id", ondelete="CASCADE"),
+        nullable=False)
+    channel = Column(String(20), nullable=False)  # app（桌面通知）/email，见 delivery_channel
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    scheduled_for = Column(DateTime, nullable=False)  # 提醒针对的计划时间，改期后重新计数
+    first_sent_at = Column(DateTime, nullable=False)
+    last_sent_at = Column(DateTime, nullable=False)
+    attempts = Column(Integer, nullable=False, default=1)  # 同一计划时间已提醒次数
+
+    __table_args__ = (
+        UniqueConstraint(
+            "schedule_id", "channel", name="uq_reminder_deliveries_schedule_channel"),
+        Index("ix_reminder_deliveries_user", "user_id"),
+    )
@@ -1,8 +1,18 @@
 """
 知识管理模块
 """
+import importlib
 
-from .ui import KnowledgeManagementFrame
-from .service import KnowledgeService
+# PEP 562 延迟导入：首次访问 KnowledgeManagementFrame 时才加载界面模块
+_EXPORTS = {
+    "KnowledgeManagementFrame": ".ui",
+    "KnowledgeService": ".service",
+}
 
 __all__ = ['KnowledgeManagementFrame', 'KnowledgeService']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
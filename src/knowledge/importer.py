@@ -0,0 +1,142 @@
+"""
+知识点批量导入
+
+从其他工具导出的文件中逐条读取知识点（生成器，不整体载入内存），交给
+DatabaseManager.bulk_add_knowledge 批量写入。支持的格式：
+
+- csv：表头含 title、content，可选 category
+- jsonl：每行一个 {"title", "content", "category"} 对象
+- json：上述对象组成的数组（整体解析，大文件请用 jsonl）
+- anki：Anki「纯文本笔记」导出（制表符分隔，# 开头的行为文件头），
+  第一列为正面（标题），第二列为背面（内容），可选第三列标签作为分类
+- apkg：Anki 牌组包（zip 内的 collection.anki2 / collection.anki21）
+"""
+import csv
+import html
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import zipfile
+from typing import Dict, Iterator, Optional
+
+FORMATS = ("csv", "jsonl", "json", "anki", "apkg")
+
+# 扩展名 -> 格式
+_EXTENSIONS = {"csv": "csv", "jsonl": "jsonl", "json": "json", "txt": "anki", "apkg": "apkg"}
+
+_BREAK_RE = re.compile(r"<br\s*/?>|</div>|</p>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def detect_format(path: str) -> str:
+    """按扩展名判断文件格式"""
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError(f"无法识别的导入格式: {path}")
+    return _EXTENSIONS[extension]
+
+
+def iter_records(path: str, file_format: Optional[str] = None) -> Iterator[Dict]:
+    """逐条读取文件中的知识点"""
+    file_format = file_format or detect_format(path)
+    readers = {
+        "csv": _read_csv,
+        "jsonl": _read_jsonl,
+        "json": _read_json,
+        "anki": _read_anki_text,
+        "apkg": _read_apkg,
+    }
+    if file_format not in readers:
+        raise ValueError(f"不支持的导入格式: {file_format}")
+    return readers[file_format](path)
+
+
+def import_file(db_manager, user_id, path, file_format=None, batch_size=1000, progress=None):
+    """读取文件并批量导入，返回 bulk_add_knowledge 的结果"""
+    return db_manager.bulk_add_knowledge(
+        user_id, iter_records(path, file_format), batch_size=batch_size, progress=progress
+    )
+
+
+def strip_html(text: str) -> str:
+    """把 Anki 字段中的 HTML 转为纯文本"""
+    text = _TAG_RE.sub("", _BREAK_RE.sub("\n", text))
+    return html.unescape(text).strip()
+
+
+def _read_csv(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def _read_jsonl(path):
+    with open(path, encoding="utf-8-sig") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _read_json(path):
+    with open(path, encoding="utf-8-sig") as f:
+        yield from json.load(f)
+
+
+def _read_anki_text(path):
+    separator = "\t"
+    is_html = True
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        # 文件头：#separator:tab、#html:true 等
+        lines = iter(f)
+        pending = []
+        for line in lines:
+            if not line.startswith("#"):
+                pending.append(line)
+                break
+            key, _, value = line[1:].strip().partition(":")
+            if key == "separator":
+                separator = {"tab": "\t", "comma": ",", "semicolon": ";",
+                             "space": " ", "pipe": "|"}.get(value.lower(), value[:1] or "\t")
+            elif key == "html":
+                is_html = value.lower() == "true"
+
+        def rows():
+            yield from pending
+            yield from lines
+
+        for fields in csv.reader(rows(), delimiter=separator):
+            if not fields:
+                continue
+            if is_html:
+                fields = [strip_html(field) for field in fields]
+            tags = fields[2].split() if len(fields) > 2 else []
+            yield {
+                "title": fields[0],
+                "content": fields[1] if len(fields) > 1 else "",
+                "category": tags[0] if tags else None,
+            }
+
+
+def _read_apkg(path):
+    with zipfile.ZipFile(path) as archive:
+        names = set(archive.namelist())
+        name = next(
+            (n for n in ("collection.anki21", "collection.anki2") if n in names), None
+        )
+        if name is None:
+            raise ValueError("不支持的 Anki 牌组包（需要 collection.anki2 或 collection.anki21）")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            collection = archive.extract(name, tmp_dir)
+            connection = sqlite3.connect(collection)
+            try:
+                for fields, tags in connection.execute("SELECT flds, tags FROM notes ORDER BY id"):
+                    fields = [strip_html(field) for field in fields.split("\x1f")]
+                    tags = tags.split()
+                    yield {
+                        "title": fields[0],
+                        "content": fields[1] if len(fields) > 1 else "",
+                        "category": tags[0] if tags else None,
+                    }
+            finally:
+                connection.close()
@@ -0,0 +1,219 @@
+"""
+知识点搜索管道
+
+- 结果缓存：按 (用户ID, 搜索词) 缓存结果字典，LRU 淘汰
+- 前缀细化：新搜索词包含某个已缓存的搜索词时，已缓存结果是新结果的超集，
+  直接在内存中过滤，不再查询数据库。边输入边搜索时通常只有首次查询会扫描表。
+  细化结果沿用被细化结果的顺序（即较短搜索词的 bm25 或创建时间顺序）
+- 取消：同一用户发起新搜索后，仍在执行的旧查询通过 SQLite 进度回调中断
+- 不少于 3 个字符的搜索词走 FTS5 全文索引（bm25 排序），结果附带命中片段高亮；
+  更短的搜索词或索引不可用时回退到 LIKE 扫描（按创建时间倒序）。全文搜索只返回
+  相关度最高的 MAX_RANKED_RESULTS 条；达到上限的结果可能被截断，缓存时标记为
+  不完整，不用于细化，更长的搜索词重新查询数据库
+- 知识点增删改事件到达时清除该用户的缓存
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from sqlalchemy import literal_column, text
+
+from src.database.events import ChangeType
+from src.database.fts import (
+    BM25_WEIGHTS,
+    FTS_TABLE,
+    MIN_FTS_TERM_LENGTH,
+    highlight,
+    knowledge_fts,
+    match_phrase,
+)
+from src.database.models import KnowledgeItem
+
+KNOWLEDGE_CHANGES = [
+    ChangeType.KNOWLEDGE_ADDED,
+    ChangeType.KNOWLEDGE_UPDATED,
+    ChangeType.KNOWLEDGE_DELETED,
+    ChangeType.KNOWLEDGE_IMPORTED,
+]
+
+SEARCH_FIELDS = ("title", "content", "category")
+
+
+class SearchCancelled(Exception):
+    """搜索被更新的搜索词取代"""
+
+
+class KnowledgeSearch:
+    """带缓存、前缀细化与取消的知识点搜索（线程安全）"""
+
+    # 每执行多少条 SQLite 虚拟机指令检查一次是否被取消
+    PROGRESS_STEPS = 1000
+    # 全文搜索按相关度返回的最大条数
+    MAX_RANKED_RESULTS = 200
+
+    def __init__(self, db_manager, max_entries: int = 64):
+        self.db_manager = db_manager
+        self.max_entries = max_entries
+        # (用户ID, 搜索词) -> (结果, 是否完整)
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._generation: Dict[int, int] = {}  # 用户ID -> 最新搜索序号
+        self._epoch: Dict[int, int] = {}  # 用户ID -> 缓存失效次数
+        self._lock = threading.Lock()
+        self.db_scans = 0  # 实际查询数据库的次数（测试与基准使用）
+
+    def search(self, user_id: int, term: str) -> List[Dict]:
+        """搜索知识点，返回结果字典列表
+
+        全文搜索按 bm25 相关度排序，最多 MAX_RANKED_RESULTS 条；LIKE 回退按创建
+        时间倒序、不限条数；细化结果沿用被细化结果的顺序。
+        被同一用户更新的搜索取代时抛出 SearchCancelled。
+        """
+        term = term.strip()
+        with self._lock:
+            generation = self._generation.get(user_id, 0) + 1
+            self._generation[user_id] = generation
+            epoch = self._epoch.get(user_id, 0)
+            cached = self._cache.get((user_id, term))
+            if cached is not None:
+                self._cache.move_to_end((user_id, term))
+                return list(cached[0])
+            superset = self._find_superset(user_id, term)
+
+        if superset is not None:
+            needle = term.lower()
+            results = [
+                dict(item, snippet=highlight(item["content"], term))
+                for item in superset
+                if _matches(item, needle)
+            ]
+            complete = True
+        else:
+            results, complete = self._query(user_id, term, generation)
+
+        self._remember(user_id, term, results, complete, epoch)
+        return list(results)
+
+    def _find_superset(self, user_id: int, term: str) -> Optional[List[Dict]]:
+        """找到被新搜索词包含的最长已缓存搜索词，返回其结果（需持有锁）
+
+        LIKE 结果只用于细化同样走 LIKE 的短搜索词，保证全文索引可用后
+        结果按 bm25 排序。
+        """
+        best = None
+        use_fts = self._use_fts(term)
+        for (cached_user, cached_term), (_, complete) in self._cache.items():
+            if cached_user != user_id or cached_term.lower() not in term.lower():
+                continue
+            if not complete or (use_fts and not self._use_fts(cached_term)):
+                continue
+            if best is None or len(cached_term) > len(best):
+                best = cached_term
+        return None if best is None else self._cache[(user_id, best)][0]
+
+    def _query(self, user_id: int, term: str, generation: int):
+        """查询数据库，返回 (结果, 是否完整)"""
+        session = self.db_manager.get_session()
+        # 进度回调返回非零时 SQLite 中断当前语句
+        dbapi_connection = session.connection().connection.dbapi_connection
+        dbapi_connection.set_progress_handler(
+            lambda: self._generation.get(user_id) != generation, self.PROGRESS_STEPS
+        )
+        try:
+            query = session.query(
+                KnowledgeItem.id,
+                KnowledgeItem.title,
+                KnowledgeItem.content,
+                KnowledgeItem.category,
+                KnowledgeItem.created_at,
+            ).filter(KnowledgeItem.user_id == user_id, KnowledgeItem.is_active)
+            if self._use_fts(term):
+                weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+                query = (
+                    query.join(knowledge_fts, knowledge_fts.c.rowid == KnowledgeItem.id)
+                    .filter(text(f"{FTS_TABLE} MATCH :phrase"))
+                    .params(phrase=match_phrase(term))
+                    .order_by(literal_column(f"bm25({FTS_TABLE}, {weights})"))
+                    .limit(self.MAX_RANKED_RESULTS)
+                )
+            else:
+                if term:
+                    query = query.filter(
+                        KnowledgeItem.title.ilike(f"%{term}%")
+                        | KnowledgeItem.content.ilike(f"%{term}%")
+                        | KnowledgeItem.category.ilike(f"%{term}%")
+                    )
+                query = query.order_by(KnowledgeItem.created_at.desc())
+            try:
+                rows = query.all()
+            except Exception:
+                if self._generation.get(user_id) != generation:
+                    raise SearchCancelled(term)
+                raise
+            with self._lock:
+                self.db_scans += 1
+            # 高亮片段在内存中生成：FTS5 snippet() 需重新分词正文，比查询本身慢数倍
+            results = [_row_to_dict(row, term) for row in rows]
+            complete = not self._use_fts(term) or len(rows) < self.MAX_RANKED_RESULTS
+            return results, complete
+        finally:
+            dbapi_connection.set_progress_handler(None, 0)
+            session.close()
+
+    def _use_fts(self, term: str) -> bool:
+        return getattr(self.db_manager, "fts_enabled", False) and (
+            len(term) >= MIN_FTS_TERM_LENGTH
+        )
+
+    def _remember(self, user_id, term, results, complete, epoch) -> None:
+        with self._lock:
+            if self._epoch.get(user_id, 0) != epoch:
+                return  # 查询期间数据已变更，结果不可复用
+            self._cache[(user_id, term)] = (results, complete)
+            self._cache.move_to_end((user_id, term))
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """清除某个用户的全部搜索缓存"""
+        with self._lock:
+            self._epoch[user_id] = self._epoch.get(user_id, 0) + 1
+            for key in [k for k in self._cache if k[0] == user_id]:
+                del self._cache[key]
+
+
+def _matches(item: Dict, needle: str) -> bool:
+    return any(needle in (item.get(field) or "").lower() for field in SEARCH_FIELDS)
+
+
+def _row_to_dict(row, term: str) -> Dict:
+    """与界面 _convert_to_dict 的字段保持一致，另含 snippet 高亮片段"""
+    created_at = row.created_at
+    if hasattr(created_at, "strftime"):
+        created_at = created_at.strftime("%Y-%m-%d %H:%M")
+    return {
+        "id": row.id,
+        "title": row.title,
+        "category": row.category,
+        "content": row.content,
+        "created_at": created_at or "未知时间",
+        "review_status": "⏳ 状态未知",
+        "is_today_review": False,
+        "is_urgent": False,
+        "snippet": highlight(row.content, term),
+    }
+
+
+def _create_knowledge_search(db_manager) -> KnowledgeSearch:
+    search = KnowledgeSearch(db_manager)
+    db_manager.subscribe(
+        lambda event: search.invalidate_user(event.user_id), KNOWLEDGE_CHANGES
+    )
+    return search
+
+
+def get_knowledge_search(db_manager) -> KnowledgeSearch:
+    """获取（必要时创建）数据库管理器对应的搜索管道
+
+    每个数据库管理器共享一个搜索管道，知识点变更时按用户失效。
+    """
+    return db_manager.get_shared("knowledge_search", _create_knowledge_search)
@@ -3,12 +3,15 @@
 # @Author: Muncy
 # @File : service.py
 # @Software: PyCharm
+from src.database.events import ChangeType
 from src.database.models import KnowledgeItem
+from src.knowledge.search import SearchCancelled, get_knowledge_search
 
 
 class KnowledgeService:
     def __init__(self, db_manager):
         self.db_manager = db_manager
+        self.search = get_knowledge_search(db_manager)
 
     def get_user_knowledge(self, user_id):
         """获取用户知识点列表（包含复习状态）- 新方法"""
@@ -24,34 +27,22 @@ class KnowledgeService:
 
     # 保持原有的所有方法不变...
     def search_knowledge_items(self, user_id, search_term):
-        """搜索知识点"""
-        session = self.db_manager.get_session()
+        """搜索知识点，返回结果字典列表
+
+        经搜索管道执行：结果按 (用户, 搜索词) 缓存，输入变长时在内存中细化已缓存结果。
+        不少于 3 个字符的搜索词按相关度排序，最多返回 KnowledgeSearch.MAX_RANKED_RESULTS 条。
+        被同一用户更新的搜索取代时抛出 SearchCancelled。
+        """
         try:
             print(f"🔍 在数据库中搜索: '{search_term}' - service.py:25")
-
-            # 构建查询：修复 E712 错误（将 is True 改为直接判断）
-            query = session.query(KnowledgeItem).filter(
-                KnowledgeItem.user_id == user_id,
-                KnowledgeItem.is_active  # 原错误：KnowledgeItem.is_active is True
-            )
-
-            # 添加搜索条件
-            if search_term:
-                search_filter = (
-                    KnowledgeItem.title.ilike(f"%{search_term}%") |
-                    KnowledgeItem.content.ilike(f"%{search_term}%") |
-                    KnowledgeItem.category.ilike(f"%{search_term}%")
-                )
-                query = query.filter(search_filter)
-
-            items = query.order_by(KnowledgeItem.created_at.desc()).all()
+            items = self.search.search(user_id, search_term)
             print(f"📊 搜索到 {len(items)} 个结果 - service.py:43")
             return items
+        except SearchCancelled:
+            raise
         except Exception as e:
             print(f"❌ 搜索出错: {e} - service.py:46")
             return []
-        finally:
-            session.close()
 
     def get_user_knowledge_items(self, user_id):
         """获取用户的知识点列表"""
@@ -85,6 +76,9 @@ class KnowledgeService:
             session.commit()
             session.refresh(knowledge_item)
             print(f"✅ 添加知识点成功: {title} - service.py:82")
+            self.db_manager.emit_change(
+                ChangeType.KNOWLEDGE_ADDED, user_id, knowledge_id=knowledge_item.id
+            )
             return knowledge_item
         except Exception as e:
             session.rollback()
@@ -93,6 +87,16 @@ class KnowledgeService:
         finally:
             session.close()
 
+    def import_knowledge_file(self, user_id, path, file_format=None, progress=None):
+        """从 CSV / JSONL / Anki 导出文件批量导入知识点（见 knowledge.importer）"""
+        from src.knowledge.importer import import_file
+
+        result = import_file(
+            self.db_manager, user_id, path, file_format=file_format, progress=progress
+        )
+        print(f"📥 批量导入结果: {result} - service.py:import_knowledge_file")
+        return result
+
     def update_knowledge_item(self, item_id, title=None, content=None, category=None):
         """更新知识点"""
         session = self.db_manager.get_session()
@@ -111,6 +115,9 @@ class KnowledgeService:
 
             session.commit()
             print(f"✅ 更新知识点成功: {item.title} - service.py:107")
+            self.db_manager.emit_change(
+                ChangeType.KNOWLEDGE_UPDATED, item.user_id, knowledge_id=item.id
+            )
             return item
         except Exception as e:
             session.rollback()
@@ -130,6 +137,9 @@ class KnowledgeService:
                 item.is_active = False
                 session.commit()
                 print(f"✅ 删除知识点成功: {item.title} - service.py:125")
+                self.db_manager.emit_change(
+                    ChangeType.KNOWLEDGE_DELETED, item.user_id, knowledge_id=item.id
+                )
                 return True
             return False
         except Exception as e:
@@ -9,6 +9,10 @@
 
 import customtkinter as ctk
 from tkinter import messagebox
+from src.common.executor import get_executor
+from src.database.events import ChangeType
+from src.common.virtual_list import VirtualList
+from src.knowledge.search import SearchCancelled
 from src.knowledge.service import KnowledgeService
 from src.scheduler.service import SchedulerService
 
@@ -16,6 +20,8 @@ from src.scheduler.service import SchedulerService
 class KnowledgeManagementFrame(ctk.CTkFrame):
     """知识管理界面 - 支持今日复习联动"""
 
+    SEARCH_DEBOUNCE_MS = 250  # 停止输入多久后才执行搜索
+
     def __init__(self, parent, current_user, db_manager):
         super().__init__(parent)
         self.current_user = current_user
@@ -23,6 +29,13 @@ class KnowledgeManagementFrame(ctk.CTkFrame):
         self.db_manager = db_manager
         self.scheduler_service = SchedulerService(db_manager)
         self.show_only_today = False  # 今日复习筛选状态
+        self._dirty_ids = set()  # 待刷新的知识点ID
+        self._flush_job = None
+        # 查询全部在后台线程执行，界面线程只负责绑定结果
+        self.executor = get_executor()
+        self._list_key = (id(self), "items")  # 列表加载与搜索共用，新请求作废旧请求
+        self._count_key = (id(self), "today_count")
+        self._search_job = None
 
         # 颜色配置
         self.colors = {
@@ -39,7 +52,90 @@ class KnowledgeManagementFrame(ctk.CTkFrame):
 
         self.create_widgets()
         self.load_knowledge_items()
-        self.update_today_review_count()
+
+        # 订阅数据变更：只重建受影响的卡片，不再整页刷新（事件经执行器队列回到界面线程）
+        self.executor.watch(self)
+        self._unsubscribe = db_manager.subscribe(self._on_data_changed)
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _on_destroy(self, event):
+        """界面销毁时取消订阅"""
+        if event.widget is self and self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if event.widget is self and self._search_job is not None:
+            self.after_cancel(self._search_job)
+            self._search_job = None
+
+    def _on_data_changed(self, event):
+        """数据变更回调（在写操作所在线程执行），不能调用 Tk，交给界面线程处理"""
+        if event.user_id != self.current_user.id:
+            return
+        self.executor.post(self, self._handle_change, event)
+
+    def _handle_change(self, event):
+        """处理数据变更（界面线程）"""
+        if event.type is ChangeType.KNOWLEDGE_IMPORTED:
+            # 批量导入：整页刷新
+            self.load_knowledge_items()
+        elif event.knowledge_id is not None:
+            self._mark_dirty(event.knowledge_id)
+
+    def _mark_dirty(self, knowledge_id):
+        """记录待刷新的知识点，同一轮事件合并为一次刷新"""
+        self._dirty_ids.add(knowledge_id)
+        if self._flush_job is None:
+            self._flush_job = self.after_idle(self._flush_dirty)
+
+    def _flush_dirty(self):
+        """只查询并重建受影响的知识点卡片"""
+        self._flush_job = None
+        dirty_ids, self._dirty_ids = self._dirty_ids, set()
+        if not dirty_ids or not self.winfo_exists():
+            return
+
+        # 当前显示的是空状态占位，或整页加载尚未返回，直接整页刷新
+        if not len(self.list_view) or self.executor.is_loading(self._list_key):
+            self.load_knowledge_items()
+            return
+
+        self.executor.submit(
+            self,
+            self.db_manager.get_knowledge_with_review_status,
+            self.current_user.id,
+            knowledge_ids=list(dirty_ids),
+            on_success=lambda items: self._apply_dirty(dirty_ids, items),
+            on_error=self._on_flush_error,
+        )
+
+    def _on_flush_error(self, error):
+        print(f"❌ 增量刷新失败: {error}，回退到整页刷新 - ui.py:_flush_dirty")
+        self.load_knowledge_items()
+
+    def _apply_dirty(self, dirty_ids, items):
+        """把增量查询结果合并到列表（界面线程）"""
+        fresh = {item['id']: item for item in items}
+
+        searching = bool(self.search_entry.get().strip())
+        for knowledge_id in dirty_ids:
+            item = fresh.get(knowledge_id)
+            visible = item is not None and (
+                not self.show_only_today or item.get('is_today_review', False)
+            )
+            if knowledge_id in self.list_view:
+                if visible:
+                    self.list_view.update_item(item)
+                else:
+                    self.list_view.remove(knowledge_id)
+            elif visible and not searching:
+                # 新知识点按创建时间倒序排在最前
+                self.list_view.insert(0, item)
+
+        if not len(self.list_view):
+            self.load_knowledge_items()  # 显示空状态
+            return
+        if not self.show_only_today:
+            self.update_today_review_count()
 
     def create_widgets(self):
         """创建界面组件 - 纵向紧凑布局"""
@@ -126,19 +222,38 @@ class KnowledgeManagementFrame(ctk.CTkFrame):
         self.create_list_frame()
 
     def create_list_frame(self):
-        """创建知识列表框架"""
+        """创建知识列表框架（虚拟化列表 + 空状态提示）"""
         # 清空容器
         for widget in self.list_container.winfo_children():
             widget.destroy()
 
-        # 滚动框架
-        self.scrollable_frame = ctk.CTkScrollableFrame(
+        # 只渲染可见区域的卡片，滚动时复用
+        self.list_view = VirtualList(
             self.list_container,
+            row_height=KnowledgeCard.ROW_HEIGHT,
+            create_row=lambda parent: KnowledgeCard(parent, self),
+            bind_row=lambda card, item, index: card.bind_item(item),
+            key=lambda item: item['id'],
+            canvas_bg=self.colors['light'],
             fg_color=self.colors['light'],
             corner_radius=12
         )
-        self.scrollable_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-        self.scrollable_frame.grid_columnconfigure(0, weight=1)
+        self.list_view.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+
+        # 空状态
+        self.empty_frame = ctk.CTkFrame(
+            self.list_container,
+            fg_color="transparent",
+            corner_radius=12
+        )
+        self.empty_frame.grid_columnconfigure(0, weight=1)
+        self.empty_label = ctk.CTkLabel(
+            self.empty_frame,
+            text="",
+            font=ctk.CTkFont(size=16),
+            text_color=self.colors['dark']
+        )
+        self.empty_label.grid(row=0, column=0, pady=10)
 
     def toggle_today_filter(self):
         """切换今日复习筛选"""
@@ -164,32 +279,48 @@ class KnowledgeManagementFrame(ctk.CTkFrame):
         self.load_knowledge_items()
 
     def update_today_review_count(self):
-        """更新今日复习计数"""
-        try:
-            today_count = self.db_manager.get_today_review_count(self.current_user.id)
-            overdue_count = self.db_manager.get_overdue_reviews_count(self.current_user.id)
+        """更新今日复习计数（后台查询）"""
+        self.executor.submit(
+            self,
+            self._query_today_counts,
+            key=self._count_key,
+            on_success=self._show_today_counts,
+            on_error=self._on_today_count_error,
+        )
 
-            if overdue_count > 0:
-                self.today_review_label.configure(
-                    text=f"⚠️ 今日需复习：{today_count}项（{overdue_count}项逾期）",
-                    text_color=self.colors['danger']
-                )
-            elif today_count > 0:
-                self.today_review_label.configure(
-                    text=f"📖 今日需复习：{today_count}项",
-                    text_color=self.colors['primary']
-                )
-            else:
-                self.today_review_label.configure(
-                    text="🎉 今日无复习任务",
-                    text_color=self.colors['success']
-                )
-        except Exception as e:
-            print(f"更新今日复习计数失败: {e} - ui.py:181")
+    def _query_today_counts(self):
+        """后台线程：查询今日与逾期复习数"""
+        return (
+            self.db_manager.get_today_review_count(self.current_user.id),
+            self.db_manager.get_overdue_reviews_count(self.current_user.id),
+        )
+
+    def _show_today_counts(self, counts):
+        today_count, overdue_count = counts
+        if self.show_only_today:
+            return  # 筛选模式下标签显示筛选状态
+        if overdue_count > 0:
             self.today_review_label.configure(
-                text="❌ 加载失败",
+                text=f"⚠️ 今日需复习：{today_count}项（{overdue_count}项逾期）",
                 text_color=self.colors['danger']
             )
+        elif today_count > 0:
+            self.today_review_label.configure(
+                text=f"📖 今日需复习：{today_count}项",
+                text_color=self.colors['primary']
+            )
+        else:
+            self.today_review_label.configure(
+                text="🎉 今日无复习任务",
+                text_color=self.colors['success']
+            )
+
+    def _on_today_count_error(self, error):
+        print(f"更新今日复习计数失败: {error} - ui.py:181")
+        self.today_review_label.configure(
+            text="❌ 加载失败",
+            text_color=self.colors['danger']
+        )
 
     def load_knowledge_items(self, items=None):
         """加载知识项列表 - 支持今日复习筛选"""
@@ -201,14 +332,42 @@ class KnowledgeManagementFrame(ctk.CTkFrame):
 
         if items is None:
             print("📝 从数据库查询知识点... - ui.py:196")
-            try:
-                items = self.knowledge_service.get_user_knowledge(self.current_user.id)
-                items = [self._ensure_dict_format(item) for item in items]
-            except Exception as e:
-                print(f"❌ 获取知识点失败: {e}，回退到基本方法 - ui.py:201")
-                items = self.knowledge_service.get_user_knowledge_items(self.current_user.id)
-                items = [self._convert_to_dict(item) for item in items]
+            self.executor.submit(
+                self,
+                self._query_knowledge_items,
+                key=self._list_key,
+                on_success=self._show_items,
+                on_error=self._on_load_error,
+                on_loading=self._set_list_loading,
+            )
+            return
 
+        self.executor.cancel(self._list_key)  # 直接给出的结果优先于未返回的查询
+        self._show_items(items)
+
+    def _query_knowledge_items(self):
+        """后台线程：查询知识点及复习状态"""
+        try:
+            items = self.knowledge_service.get_user_knowledge(self.current_user.id)
+            return [self._ensure_dict_format(item) for item in items]
+        except Exception as e:
+            print(f"❌ 获取知识点失败: {e}，回退到基本方法 - ui.py:201")
+            items = self.knowledge_service.get_user_knowledge_items(self.current_user.id)
+            return [self._convert_to_dict(item) for item in items]
+
+    def _on_load_error(self, error):
+        print(f"❌ 加载知识点失败: {error} - ui.py:_on_load_error")
+        messagebox.showerror("错误", f"加载知识点失败: {str(error)}")
+
+    def _set_list_loading(self, loading):
+        """列表为空时用占位提示显示加载状态"""
+        if loading and not len(self.list_view):
+            self.list_view.grid_remove()
+            self.empty_label.configure(text="⏳ 加载中...")
+            self.empty_frame.grid(row=0, column=0, sticky="nsew", pady=50)
+
+    def _show_items(self, items):
+        """把知识点绑定到列表（界面线程）"""
         # 应用今日复习筛选
         if self.show_only_today:
             items = [item for item in items if item.get('is_today_review', False)]
@@ -216,200 +375,23 @@ class KnowledgeManagementFrame(ctk.CTkFrame):
 
         print(f"📊 获取到 {len(items)} 个知识点 - ui.py:210")
 
-        # 清空现有内容
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
         if not items:
             # 显示空状态
             empty_text = "📝 暂无知识点\n点击\"添加知识点\"开始创建您的知识库"
             if self.show_only_today:
                 empty_text = "🎉 太棒了！\n所有今日复习任务已完成！"
 
-            empty_frame = ctk.CTkFrame(
-                self.scrollable_frame,
-                fg_color="transparent",
-                corner_radius=12
-            )
-            empty_frame.grid(row=0, column=0, sticky="nsew", pady=50)
-            empty_frame.grid_columnconfigure(0, weight=1)
-
-            empty_label = ctk.CTkLabel(
-                empty_frame,
-                text=empty_text,
-                font=ctk.CTkFont(size=16),
-                text_color=self.colors['dark']
-            )
-            empty_label.grid(row=0, column=0, pady=10)
+            self.list_view.set_items([])
+            self.list_view.grid_remove()
+            self.empty_label.configure(text=empty_text)
+            self.empty_frame.grid(row=0, column=0, sticky="nsew", pady=50)
             return
 
-        print(f"🎯 创建 {len(items)} 个知识点卡片 - ui.py:239")
-        for i, item in enumerate(items):
-            self.create_knowledge_card(item, i)
-
-    def create_knowledge_card(self, item, index):
-        """创建美观的知识卡片"""
-        item = self._ensure_dict_format(item)
-        is_today_review = item.get('is_today_review', False)
-        is_urgent = item.get('is_urgent', False)
-
-        # 卡片框架
-        card = ctk.CTkFrame(
-            self.scrollable_frame,
-            fg_color="white",
-            border_color=self.colors['today'] if is_today_review else "#E0E0E0",
-            border_width=2 if is_today_review else 1,
-            corner_radius=12
-        )
-        card.grid(row=index, column=0, sticky="ew", padx=10, pady=8)
-        card.grid_columnconfigure(1, weight=1)
-
-        # 紧急状态指示器
-        if is_urgent:
-            urgency_indicator = ctk.CTkFrame(
-                card,
-                fg_color=self.colors['danger'],
-                width=6,
-                corner_radius=3
-            )
-            urgency_indicator.grid(row=0, column=0, rowspan=3, sticky="ns", padx=(10, 5), pady=10)
-
-        # 内容区域
-        content_frame = ctk.CTkFrame(card, fg_color="transparent")
-        content_frame.grid(row=0, column=1, sticky="ew", padx=10, pady=12)
-        content_frame.grid_columnconfigure(0, weight=1)
-
-        # 标题和状态
-        title_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-        title_frame.grid(row=0, column=0, sticky="ew", pady=(0, 8))
-        title_frame.grid_columnconfigure(0, weight=1)
-
-        title_label = ctk.CTkLabel(
-            title_frame,
-            text=f"📖 {item.get('title', '无标题')}",
-            font=ctk.CTkFont(size=16, weight="bold"),
-            text_color=self.colors['dark'],
-            anchor="w"
-        )
-        title_label.grid(row=0, column=0, sticky="w")
-
-        # 状态标签
-        status_text = item.get('review_status', '未知状态')
-        status_color = self.colors['today'] if is_today_review else self.colors['primary']
-
-        status_label = ctk.CTkLabel(
-            title_frame,
-            text=status_text,
-            font=ctk.CTkFont(size=11, weight="bold"),
-            text_color="white",
-            fg_color=status_color,
-            corner_radius=8,
-            padx=8,
-            pady=2
-        )
-        status_label.grid(row=0, column=1, sticky="e", padx=(10, 0))
-
-        # 元信息
-        meta_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-        meta_frame.grid(row=1, column=0, sticky="ew", pady=(0, 10))
-
-        # 分类
-        if item.get('category'):
-            category_label = ctk.CTkLabel(
-                meta_frame,
-                text=f"🏷️ {item.get('category')}",
-                font=ctk.CTkFont(size=12),
-                text_color=self.colors['secondary']
-            )
-            category_label.grid(row=0, column=0, sticky="w")
-
-        # 时间信息
-        time_label = ctk.CTkLabel(
-            meta_frame,
-            text=f"⏰ {item.get('created_at', '未知时间')}",
-            font=ctk.CTkFont(size=11),
-            text_color="#666666"
-        )
-        time_label.grid(row=0, column=1, sticky="w", padx=(20, 0))
-
-        # 下一阶段 & 时间
-        next_stage = item.get("next_stage_desc")
-        next_review_at = item.get("next_review_at")
-        if next_stage and next_review_at:
-            ctk.CTkLabel(
-                meta_frame,
-                text=f"➡️ 下一阶段：{next_stage}",
-                font=ctk.CTkFont(size=11),
-                text_color=self.colors['primary']
-            ).grid(row=2, column=0, sticky="w", pady=(5, 0))
-            ctk.CTkLabel(
-                meta_frame,
-                text=f"🕒 复习时间：{next_review_at}",
-                font=ctk.CTkFont(size=11),
-                text_color="#666666"
-            ).grid(row=2, column=1, sticky="w", padx=(20, 0))
-        # 内容预览
-        content_preview = item.get('content', '')
-        if content_preview:
-            if len(content_preview) > 120:
-                content_preview = content_preview[:120] + "..."
-
-            content_label = ctk.CTkLabel(
-                content_frame,
-                text=content_preview,
-                font=ctk.CTkFont(size=12),
-                text_color="#555555",
-                wraplength=400,
-                justify="left"
-            )
-            content_label.grid(row=2, column=0, sticky="w", pady=(0, 12))
-
-        # 操作按钮区域
-        button_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-        button_frame.grid(row=3, column=0, sticky="ew")
-
-        # 按钮样式
-        btn_style = {
-            'width': 80,
-            'height': 30,
-            'font': ctk.CTkFont(size=11, weight="bold"),
-            'corner_radius': 8
-        }
-
-        # 编辑按钮
-        edit_btn = ctk.CTkButton(
-            button_frame,
-            text="✏️ 编辑",
-            command=lambda: self.edit_item(item),
-            fg_color=self.colors['primary'],
-            hover_color='#1B6B93',
-            **btn_style
-        )
-        edit_btn.pack(side="left", padx=(0, 8))
-
-        # 删除按钮
-        delete_btn = ctk.CTkButton(
-            button_frame,
-            text="🗑️ 删除",
-            command=lambda: self.delete_item(item),
-            fg_color=self.colors['danger'],
-            hover_color='#A63225',
-            **btn_style
-        )
-        delete_btn.pack(side="left", padx=(0, 8))
+        self.empty_frame.grid_remove()
+        self.list_view.grid()
+        print(f"🎯 绑定 {len(items)} 个知识点到虚拟列表 - ui.py:239")
+        self.list_view.set_items([self._ensure_dict_format(item) for item in items])
 
-        # ⭐ 加入今日复习按钮（仅对非今日复习知识点显示）
-        if not is_today_review:
-            add_today_btn = ctk.CTkButton(
-                button_frame,
-                text="⭐ 加入今日",
-                command=lambda: self.add_to_today_review(item),
-                fg_color=self.colors['warning'],
-                hover_color='#D97B00',
-                text_color="white",
-                **btn_style
-            )
-            add_today_btn.pack(side="left")
     def _ensure_dict_format(self, item):
         """确保项目是字典格式"""
         if hasattr(item, 'get'):
@@ -452,7 +434,7 @@ class KnowledgeManagementFrame(ctk.CTkFrame):
                     f"✅ 已将知识点 '{item.get('title', '无标题')}' 加入今日复习计划",
                     icon="info"
                 )
-                self.load_knowledge_items()
+                # 卡片由 SCHEDULE_ADDED 事件增量刷新
             else:
                 messagebox.showerror("错误", result["msg"])
 
@@ -467,7 +449,7 @@ class KnowledgeManagementFrame(ctk.CTkFrame):
             self,
             self.current_user,
             self.knowledge_service,
-            self.load_knowledge_items,
+            None,  # 列表由 KNOWLEDGE_ADDED 事件增量刷新
             None
         )
 
@@ -489,7 +471,7 @@ class KnowledgeManagementFrame(ctk.CTkFrame):
             self,
             self.current_user,
             self.knowledge_service,
-            self.load_knowledge_items,
+            None,  # 卡片由 KNOWLEDGE_UPDATED 事件增量刷新
             adapted_item,
         )
 
@@ -502,8 +484,8 @@ class KnowledgeManagementFrame(ctk.CTkFrame):
                 f"确定要删除知识点 '{title}' 吗？\n此操作不可恢复！",
                 icon="warning"
         ):
+            # 卡片由 KNOWLEDGE_DELETED 事件移除
             if self.knowledge_service.delete_knowledge_item(item['id']):
-                self.load_knowledge_items()
                 messagebox.showinfo("成功", "✅ 知识点已删除")
 
     '''def review_item(self, item):
@@ -542,30 +524,256 @@ class KnowledgeManagementFrame(ctk.CTkFrame):
             print(f"详细错误信息: {e} - ui.py:533")
 '''
     def on_search(self, event=None):
-        """搜索功能"""
+        """输入防抖：连续输入时只在停顿后搜索一次"""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self.SEARCH_DEBOUNCE_MS, self._run_search)
+
+    def _run_search(self):
+        """搜索功能（后台查询，新输入作废未返回的旧搜索）"""
+        self._search_job = None
         search_term = self.search_entry.get().strip()
         print(f"🔍 执行搜索: '{search_term}' 用户ID: {self.current_user.id} - ui.py:538")
 
-        try:
-            if search_term:
-                print("📝 调用搜索服务... - ui.py:542")
-                items = self.knowledge_service.search_knowledge_items(
-                    self.current_user.id, search_term
-                )
-                print(f"📊 搜索返回 {len(items)} 个结果 - ui.py:546")
+        if not search_term:
+            print("🔄 搜索词为空，显示所有知识点 - ui.py:555")
+            self.load_knowledge_items()
+            return
+
+        print("📝 调用搜索服务... - ui.py:542")
+        self.executor.submit(
+            self,
+            self._query_search,
+            search_term,
+            key=self._list_key,
+            on_success=self._show_search_results,
+            on_error=self._on_search_error,
+            on_loading=self._set_list_loading,
+        )
 
-                items = [self._convert_to_dict(item) for item in items]
+    def _query_search(self, search_term):
+        """后台线程：执行搜索"""
+        items = self.knowledge_service.search_knowledge_items(
+            self.current_user.id, search_term
+        )
+        print(f"📊 搜索返回 {len(items)} 个结果 - ui.py:546")
+        return items
 
-                if self.show_only_today:
-                    items = [item for item in items if item.get('is_today_review', False)]
+    def _show_search_results(self, items):
+        if self.show_only_today:
+            items = [item for item in items if item.get('is_today_review', False)]
+        self._show_items(items)
 
-                self.load_knowledge_items(items)
-            else:
-                print("🔄 搜索词为空，显示所有知识点 - ui.py:555")
-                self.load_knowledge_items()
-        except Exception as e:
-            print(f"❌ 搜索过程中出错: {e} - ui.py:558")
-            messagebox.showerror("错误", f"搜索失败: {str(e)}")
+    def _on_search_error(self, error):
+        if isinstance(error, SearchCancelled):
+            return  # 已被更新的搜索取代
+        print(f"❌ 搜索过程中出错: {error} - ui.py:558")
+        messagebox.showerror("错误", f"搜索失败: {str(error)}")
+
+
+class KnowledgeCard(ctk.CTkFrame):
+    """可复用的知识卡片：组件只创建一次，bind_item 时更新内容"""
+
+    ROW_HEIGHT = 210  # 虚拟列表固定行高（含间距）
+    PREVIEW_LENGTH = 80  # 固定行高下的内容预览长度
+
+    def __init__(self, parent, owner):
+        colors = owner.colors
+        super().__init__(
+            parent,
+            fg_color="white",
+            border_color="#E0E0E0",
+            border_width=1,
+            corner_radius=12
+        )
+        self.owner = owner
+        self.colors = colors
+        self.item = None
+        self.grid_columnconfigure(1, weight=1)
+
+        # 紧急状态指示器
+        self.urgency_indicator = ctk.CTkFrame(
+            self,
+            fg_color=colors['danger'],
+            width=6,
+            corner_radius=3
+        )
+        self.urgency_indicator.grid(row=0, column=0, rowspan=3, sticky="ns", padx=(10, 5), pady=10)
+
+        # 内容区域
+        content_frame = ctk.CTkFrame(self, fg_color="transparent")
+        content_frame.grid(row=0, column=1, sticky="ew", padx=10, pady=12)
+        content_frame.grid_columnconfigure(0, weight=1)
+
+        # 标题和状态
+        title_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        title_frame.grid(row=0, column=0, sticky="ew", pady=(0, 8))
+        title_frame.grid_columnconfigure(0, weight=1)
+
+        self.title_label = ctk.CTkLabel(
+            title_frame,
+            text="",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=colors['dark'],
+            anchor="w"
+        )
+        self.title_label.grid(row=0, column=0, sticky="w")
+
+        self.status_label = ctk.CTkLabel(
+            title_frame,
+            text="",
+            font=ctk.CTkFont(size=11, weight="bold"),
+            text_color="white",
+            corner_radius=8,
+            padx=8,
+            pady=2
+        )
+        self.status_label.grid(row=0, column=1, sticky="e", padx=(10, 0))
+
+        # 元信息
+        meta_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        meta_frame.grid(row=1, column=0, sticky="ew", pady=(0, 10))
+
+        self.category_label = ctk.CTkLabel(
+            meta_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=colors['secondary']
+        )
+        self.category_label.grid(row=0, column=0, sticky="w")
+
+        self.time_label = ctk.CTkLabel(
+            meta_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color="#666666"
+        )
+        self.time_label.grid(row=0, column=1, sticky="w", padx=(20, 0))
+
+        # 下一阶段 & 时间
+        self.next_stage_label = ctk.CTkLabel(
+            meta_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color=colors['primary']
+        )
+        self.next_stage_label.grid(row=2, column=0, sticky="w", pady=(5, 0))
+        self.next_time_label = ctk.CTkLabel(
+            meta_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color="#666666"
+        )
+        self.next_time_label.grid(row=2, column=1, sticky="w", padx=(20, 0))
+
+        # 内容预览
+        self.content_label = ctk.CTkLabel(
+            content_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color="#555555",
+            wraplength=400,
+            justify="left"
+        )
+        self.content_label.grid(row=2, column=0, sticky="w", pady=(0, 12))
+
+        # 操作按钮区域
+        button_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        button_frame.grid(row=3, column=0, sticky="ew")
+
+        # 按钮样式
+        btn_style = {
+            'width': 80,
+            'height': 30,
+            'font': ctk.CTkFont(size=11, weight="bold"),
+            'corner_radius': 8
+        }
+
+        # 编辑按钮
+        ctk.CTkButton(
+            button_frame,
+            text="✏️ 编辑",
+            command=lambda: self.owner.edit_item(self.item),
+            fg_color=colors['primary'],
+            hover_color='#1B6B93',
+            **btn_style
+        ).pack(side="left", padx=(0, 8))
+
+        # 删除按钮
+        ctk.CTkButton(
+            button_frame,
+            text="🗑️ 删除",
+            command=lambda: self.owner.delete_item(self.item),
+            fg_color=colors['danger'],
+            hover_color='#A63225',
+            **btn_style
+        ).pack(side="left", padx=(0, 8))
+
+        # ⭐ 加入今日复习按钮（仅对非今日复习知识点显示）
+        self.add_today_btn = ctk.CTkButton(
+            button_frame,
+            text="⭐ 加入今日",
+            command=lambda: self.owner.add_to_today_review(self.item),
+            fg_color=colors['warning'],
+            hover_color='#D97B00',
+            text_color="white",
+            **btn_style
+        )
+        self.add_today_btn.pack(side="left")
+
+    def bind_item(self, item):
+        """把知识点数据绑定到卡片"""
+        self.item = item
+        colors = self.colors
+        is_today_review = item.get('is_today_review', False)
+
+        self.configure(
+            border_color=colors['today'] if is_today_review else "#E0E0E0",
+            border_width=2 if is_today_review else 1
+        )
+        if item.get('is_urgent', False):
+            self.urgency_indicator.grid()
+        else:
+            self.urgency_indicator.grid_remove()
+
+        self.title_label.configure(text=f"📖 {item.get('title', '无标题')}")
+        self.status_label.configure(
+            text=item.get('review_status', '未知状态'),
+            fg_color=colors['today'] if is_today_review else colors['primary']
+        )
+
+        if item.get('category'):
+            self.category_label.configure(text=f"🏷️ {item.get('category')}")
+            self.category_label.grid()
+        else:
+            self.category_label.grid_remove()
+        self.time_label.configure(text=f"⏰ {item.get('created_at', '未知时间')}")
+
+        next_stage = item.get("next_stage_desc")
+        next_review_at = item.get("next_review_at")
+        if next_stage and next_review_at:
+            self.next_stage_label.configure(text=f"➡️ 下一阶段：{next_stage}")
+            self.next_time_label.configure(text=f"🕒 复习时间：{next_review_at}")
+            self.next_stage_label.grid()
+            self.next_time_label.grid()
+        else:
+            self.next_stage_label.grid_remove()
+            self.next_time_label.grid_remove()
+
+        # 搜索结果优先显示命中位置附近的高亮片段
+        content_preview = item.get('snippet') or item.get('content', '')
+        if content_preview:
+            if len(content_preview) > self.PREVIEW_LENGTH:
+                content_preview = content_preview[:self.PREVIEW_LENGTH] + "..."
+            self.content_label.configure(text=content_preview)
+            self.content_label.grid()
+        else:
+            self.content_label.grid_remove()
+
+        if is_today_review:
+            self.add_today_btn.pack_forget()
+        else:
+            self.add_today_btn.pack(side="left")
 
 
 class KnowledgeItemDialog(ctk.CTkToplevel):
@@ -1,15 +1,23 @@
 """
 调度算法模块
 """
+import importlib
 
-# 注释掉不存在的导入
-# from .algorithms import EbbinghausScheduler
-from .service import SchedulerService
-from .ui import ReviewSchedulerFrame, ReviewDialog
+# 按需导入（PEP 562）：命令行、守护进程只用到 service 时不加载界面与 customtkinter
+_EXPORTS = {
+    "SchedulerService": ".service",
+    "ReviewSchedulerFrame": ".ui",
+    "ReviewDialog": ".ui",
+}
 
 __all__ = [
-    # "EbbinghausScheduler",
     "SchedulerService",
     "ReviewSchedulerFrame",
     "ReviewDialog",
 ]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
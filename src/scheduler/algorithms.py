@@ -4,66 +4,241 @@
 # @File : algorithms.py.py
 # @Software: PyCharm
 """
-记忆算法 - 成员C实现
+记忆算法：可按用户选择的间隔重复调度算法
+
+每个算法实现批量接口 next_intervals(states, grades)，在 NumPy 数组上一次计算
+一批卡片的下次间隔与记忆状态，供完成复习、批量改期与复习负荷模拟共用；
+单张卡片经 next_interval 包装成长度为 1 的数组计算，保证两条路径结果一致。
+
+卡片状态 states 为 {字段: 数组}：
+- stage：复习阶段（ReviewSchedule.interval_index）
+- interval：上一次间隔（小时，ReviewSchedule.current_interval）
+- elapsed：距上次复习实际经过的小时数（逾期复习时大于 interval）
+- ease：SM-2 难度系数（ReviewSchedule.ease_factor，NaN 表示尚未计算）
+- stability / difficulty：FSRS 记忆稳定性（天）与难度（1-10），NaN 同上
+grades 为效果评分（1-5分，与复习对话框一致）。
+
+复习阶段对所有算法采用同一规则（4分以上进阶、2-3分保持、1分退回），
+阶段标签、“已掌握”判定与每日汇总重建因此与算法无关；算法只决定间隔。
 """
-'''
-from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.scheduler.ebbinghaus_config import EbbinghausConfig
+
+DEFAULT_ALGORITHM = "ebbinghaus"
+
+
+def make_states(n: int, **values) -> Dict[str, np.ndarray]:
+    """构造 n 张卡片的状态数组，未给出的字段为默认值（新卡片）"""
+    states = {
+        "stage": np.zeros(n, dtype=np.int64),
+        "interval": np.zeros(n),
+        "elapsed": np.zeros(n),
+        "ease": np.full(n, np.nan),
+        "stability": np.full(n, np.nan),
+        "difficulty": np.full(n, np.nan),
+    }
+    for name, value in values.items():
+        if value is not None:
+            dtype = states[name].dtype
+            states[name] = np.broadcast_to(np.asarray(value, dtype=dtype), (n,)).copy()
+    return states
+
+
+class SchedulingAlgorithm:
+    """调度算法基类"""
+
+    name = ""
+    label = ""
+
+    def next_intervals(
+        self, states: Dict[str, np.ndarray], grades: np.ndarray
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """批量计算下次间隔（小时）与复习后的新状态
+
+        返回 (intervals, new_states)；new_states["interval"] 即 intervals，
+        new_states["mastered"] 标记完成全部阶段、不再安排复习的卡片。
+        """
+        grades = np.asarray(grades, dtype=np.int64)
+        stages = next_stages(states["stage"], grades)
+        new_states = dict(states, stage=stages, elapsed=np.zeros(len(grades)))
+        intervals = self._intervals(states, grades, stages, new_states)
+        new_states["interval"] = intervals
+        new_states["mastered"] = stages >= EbbinghausConfig.get_total_stages()
+        return intervals, new_states
+
+    def next_interval(
+        self,
+        grade: int,
+        stage: int = 0,
+        interval: float = 0.0,
+        elapsed: float = 0.0,
+        ease: Optional[float] = None,
+        stability: Optional[float] = None,
+        difficulty: Optional[float] = None,
+    ) -> Dict:
+        """单张卡片的 next_intervals，返回 {字段: 标量}（NaN 状态返回 None）"""
+        states = make_states(
+            1, stage=stage, interval=interval, elapsed=elapsed,
+            ease=ease, stability=stability, difficulty=difficulty,
+        )
+        _, new_states = self.next_intervals(states, np.array([grade]))
+        result = {}
+        for key, values in new_states.items():
+            value = values[0].item()
+            result[key] = None if isinstance(value, float) and np.isnan(value) else value
+        return result
+
+    def _intervals(self, states, grades, stages, new_states) -> np.ndarray:
+        """子类实现：计算间隔（小时），并把算法自身的状态写入 new_states"""
+        raise NotImplementedError
+
+
+def next_stages(stages: np.ndarray, grades: np.ndarray) -> np.ndarray:
+    """复习阶段规则：4分以上进阶，2-3分保持，1分退回一个阶段（不低于0）"""
+    stages = np.asarray(stages, dtype=np.int64)
+    return np.where(
+        grades >= 4, stages + 1, np.where(grades >= 2, stages, np.maximum(stages - 1, 0))
+    )
+
+
+class EbbinghausAlgorithm(SchedulingAlgorithm):
+    """固定间隔表（EbbinghausConfig.INTERVALS_HOURS），与原 complete_review 规则一致"""
+
+    name = "ebbinghaus"
+    label = "艾宾浩斯固定间隔"
 
+    def __init__(self):
+        self.table = np.asarray(EbbinghausConfig.INTERVALS_HOURS, dtype=float)
 
-class EbbinghausScheduler:
-    """艾宾浩斯遗忘曲线调度器"""
+    def _intervals(self, states, grades, stages, new_states):
+        return self.table[np.minimum(stages, len(self.table) - 1)]
 
-    # 标准艾宾浩斯复习间隔（小时）
-    REVIEW_INTERVALS = [1, 24, 24 * 2, 24 * 4, 24 * 7, 24 * 15, 24 * 30, 24 * 60]
 
-    def calculate_review_schedule(
-        self, first_study_time: datetime, recall_score: float = 1.0
-    ) -> List[datetime]:
-        """计算复习时间表"""
-        base_intervals = self.REVIEW_INTERVALS
+class SM2Algorithm(SchedulingAlgorithm):
+    """SuperMemo SM-2：按难度系数（EF）放大间隔
 
-        # 根据回忆分数调整间隔
-        adjusted_intervals = self.adjust_intervals_by_performance(
-            base_intervals, recall_score
+    效果评分 1-5 直接作为 SM-2 质量分，3分及以上为通过。通过时间隔依次为
+    1天、6天，之后为上次间隔乘以 EF；未通过时间隔回到1天，EF 照常调整。
+    """
+
+    name = "sm2"
+    label = "SM-2"
+
+    INITIAL_EASE = 2.5
+    MIN_EASE = 1.3
+    FIRST_INTERVAL_DAYS = 1.0
+    SECOND_INTERVAL_DAYS = 6.0
+
+    def _intervals(self, states, grades, stages, new_states):
+        ease = np.where(np.isnan(states["ease"]), self.INITIAL_EASE, states["ease"])
+        lapse = 5 - grades
+        ease = np.maximum(ease + 0.1 - lapse * (0.08 + lapse * 0.02), self.MIN_EASE)
+        new_states["ease"] = ease
+
+        last_days = states["interval"] / 24
+        days = np.where(
+            last_days < self.FIRST_INTERVAL_DAYS,
+            self.FIRST_INTERVAL_DAYS,
+            np.where(
+                last_days < self.SECOND_INTERVAL_DAYS,
+                self.SECOND_INTERVAL_DAYS,
+                last_days * ease,
+            ),
         )
+        days = np.where(grades >= 3, days, self.FIRST_INTERVAL_DAYS)
+        return days * 24
+
+
+class FSRSAlgorithm(SchedulingAlgorithm):
+    """FSRS（v4.5 公式与默认参数）：按记忆稳定性与目标记忆保持率安排间隔
+
+    效果评分映射为 FSRS 评级：1-2分 Again、3分 Hard、4分 Good、5分 Easy。
+    遗忘曲线 R(t, S) = (1 + FACTOR * t / S) ^ DECAY，间隔取 R 降到
+    desired_retention 的时间。
+    """
+
+    name = "fsrs"
+    label = "FSRS"
+
+    WEIGHTS = (
+        0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031, 1.6474,
+        0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755,
+    )
+    DECAY = -0.5
+    FACTOR = 19 / 81
+    # 效果评分 -> FSRS 评级（下标为效果评分）
+    RATINGS = np.array([1, 1, 1, 2, 3, 4])
+
+    def __init__(self, desired_retention: float = 0.9, maximum_interval_days: float = 36500):
+        self.w = np.asarray(self.WEIGHTS)
+        self.desired_retention = desired_retention
+        self.maximum_interval_days = maximum_interval_days
+
+    def _initial_difficulty(self, ratings):
+        return np.clip(self.w[4] - (ratings - 3) * self.w[5], 1, 10)
 
-        return [
-            first_study_time + timedelta(hours=interval)
-            for interval in adjusted_intervals
-        ]
-
-    def adjust_intervals_by_performance(
-        self, intervals: List[int], recall_score: float
-    ) -> List[int]:
-        """根据回忆分数调整间隔"""
-        adjustment_factor = self.get_adjustment_factor(recall_score)
-        return [int(interval * adjustment_factor) for interval in intervals]
-
-    def get_adjustment_factor(self, recall_score: float) -> float:
-        """获取调整系数"""
-        if recall_score >= 0.9:  # 记忆很好
-            return 1.5
-        elif recall_score >= 0.7:  # 记忆良好
-            return 1.2
-        elif recall_score >= 0.5:  # 记忆一般
-            return 1.0
-        elif recall_score >= 0.3:  # 记忆较差
-            return 0.8
-        else:  # 记忆很差
-            return 0.6
-
-    def get_next_review_time(
-        self, last_review_time: datetime, current_stage: int, recall_score: float
-    ) -> datetime:
-        """获取下一次复习时间"""
-        if current_stage >= len(self.REVIEW_INTERVALS):
-            current_stage = len(self.REVIEW_INTERVALS) - 1
-
-        base_interval = self.REVIEW_INTERVALS[current_stage]
-        adjusted_interval = int(
-            base_interval * self.get_adjustment_factor(recall_score)
+    def _intervals(self, states, grades, stages, new_states):
+        w = self.w
+        ratings = self.RATINGS[np.clip(grades, 1, 5)]
+        stability = states["stability"]
+        difficulty = states["difficulty"]
+        new = np.isnan(stability) | np.isnan(difficulty)
+        # 新卡片（含切换算法前安排的计划）没有 FSRS 状态，先填占位值，最后整体替换
+        stability = np.where(new, 1.0, stability)
+        difficulty = np.where(new, 5.0, difficulty)
+
+        elapsed_days = np.maximum(states["elapsed"], 0) / 24
+        retrievability = (1 + self.FACTOR * elapsed_days / stability) ** self.DECAY
+
+        # 难度：向评级方向调整，并向“Good”的初始难度均值回归
+        next_difficulty = difficulty - w[6] * (ratings - 3)
+        next_difficulty = w[7] * self._initial_difficulty(3) + (1 - w[7]) * next_difficulty
+        next_difficulty = np.clip(next_difficulty, 1, 10)
+
+        hard_penalty = np.where(ratings == 2, w[15], 1.0)
+        easy_bonus = np.where(ratings == 4, w[16], 1.0)
+        recall_stability = stability * (
+            1
+            + np.exp(w[8])
+            * (11 - difficulty)
+            * stability ** -w[9]
+            * (np.exp(w[10] * (1 - retrievability)) - 1)
+            * hard_penalty
+            * easy_bonus
+        )
+        forget_stability = (
+            w[11]
+            * difficulty ** -w[12]
+            * ((stability + 1) ** w[13] - 1)
+            * np.exp(w[14] * (1 - retrievability))
+        )
+        next_stability = np.where(ratings > 1, recall_stability, forget_stability)
+
+        # 新卡片：初始稳定性与难度由首次评级决定
+        next_stability = np.where(new, w[ratings - 1], next_stability)
+        next_difficulty = np.where(new, self._initial_difficulty(ratings), next_difficulty)
+        new_states["stability"] = next_stability
+        new_states["difficulty"] = next_difficulty
+
+        days = next_stability / self.FACTOR * (
+            self.desired_retention ** (1 / self.DECAY) - 1
         )
+        return np.clip(days, 1, self.maximum_interval_days) * 24
+
+
+ALGORITHMS = {
+    algorithm.name: algorithm
+    for algorithm in (EbbinghausAlgorithm(), SM2Algorithm(), FSRSAlgorithm())
+}
+
 
-        return last_review_time + timedelta(hours=adjusted_interval)
-'''
+def get_algorithm(name: Optional[str]) -> SchedulingAlgorithm:
+    """按名称获取算法；未设置（旧用户）时使用艾宾浩斯固定间隔"""
+    if not name:
+        return ALGORITHMS[DEFAULT_ALGORITHM]
+    if name not in ALGORITHMS:
+        raise ValueError(f"未知的调度算法: {name}")
+    return ALGORITHMS[name]
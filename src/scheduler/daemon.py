@@ -0,0 +1,325 @@
+"""
+多用户提醒守护进程（无界面）
+
+共享安装中为所有开启提醒的用户发送复习提醒，不依赖登录会话：
+- 读取：DatabaseManager.get_pending_reminders 按 (计划时间, 计划ID) 键集分页，
+  每批一次查询，与用户数无关
+- 去重：同一查询按投递记录（reminder_deliveries）排除仍在 ReminderBackoff
+  退避窗口内的提醒，长期逾期、已提醒过的计划不占用分页。桌面通知与图形界面的
+  提醒服务共用投递记录的渠道键（delivery_channel），不会重复提醒
+- 分片：按 user_id % workers 把每批提醒分给单线程的分片执行器，同一用户
+  总在同一线程中处理；未完成的分批数有上限，读取速度受发送速度约束
+- 扇出：按用户的 reminder_channel 交给对应渠道，同一用户同一批的提醒合并为一条
+- 记录：发送成功的提醒按批写入投递记录
+
+用法：
+    python -m src.scheduler.daemon [--db PATH] [--workers N] [--interval 秒] [--once]
+"""
+import argparse
+import logging
+import smtplib
+import sys
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import Dict, List, Optional
+
+from src.scheduler.ebbinghaus_config import EbbinghausConfig
+from src.scheduler.reminder_policy import ReminderBackoff, delivery_channel
+
+logger = logging.getLogger(__name__)
+
+# 用户未设置提醒渠道时使用（与 User.reminder_channel 默认值一致）
+DEFAULT_CHANNEL = "app"
+
+STAT_KEYS = (
+    "due", "sent", "failed", "unsupported", "notifications", "batches",
+)
+
+
+def format_reminder_summary(reminders: List[Dict]) -> tuple:
+    """把同一用户的多条提醒合并为 (标题, 内容)"""
+    max_items = 5
+    if len(reminders) == 1:
+        title = "📚 智能复习提醒"
+    else:
+        title = f"📚 智能复习提醒：{len(reminders)} 个复习计划到期"
+    lines = [
+        f"• 【{EbbinghausConfig.get_stage_label(r['interval_index'] or 0)}】"
+        f"{r['knowledge_title']}（{r['scheduled_date']}）"
+        for r in reminders[:max_items]
+    ]
+    if len(reminders) > max_items:
+        lines.append(f"…等共 {len(reminders)} 项")
+    return title, "\n".join(lines) + "\n请及时复习以巩固记忆～"
+
+
+class ReminderChannel:
+    """提醒渠道：send() 为一个用户发送一条（合并的）提醒，成功返回 True"""
+
+    name = "channel"
+
+    def send(self, reminders: List[Dict]) -> bool:
+        raise NotImplementedError
+
+
+class NotifierChannel(ReminderChannel):
+    """本机桌面通知（SystemNotifier）"""
+
+    name = "app"
+
+    def __init__(self, notifier, timeout: int = 10):
+        self.notifier = notifier
+        self.timeout = timeout
+
+    def send(self, reminders: List[Dict]) -> bool:
+        title, message = format_reminder_summary(reminders)
+        return self.notifier.notify(title, message, timeout=self.timeout)
+
+
+class EmailChannel(ReminderChannel):
+    """邮件提醒（SMTP）"""
+
+    name = "email"
+
+    def __init__(self, host: str, port: int = 587, sender: str = "",
+                 username: Optional[str] = None, password: Optional[str] = None,
+                 use_tls: bool = True, timeout: int = 10):
+        self.host = host
+        self.port = port
+        self.sender = sender or username or ""
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+
+    def send(self, reminders: List[Dict]) -> bool:
+        recipient = reminders[0].get("user_email")
+        if not recipient:
+            return False
+        title, body = format_reminder_summary(reminders)
+        message = EmailMessage()
+        message["Subject"] = title
+        message["From"] = self.sender
+        message["To"] = recipient
+        message.set_content(body)
+
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            smtp.send_message(message)
+        return True
+
+
+class ReminderDaemon:
+    """为全部开启提醒的用户批量发送到期提醒"""
+
+    def __init__(
+        self,
+        db_manager,
+        channels: Dict[str, ReminderChannel],
+        workers: int = 4,
+        batch_size: int = 1000,
+        poll_seconds: int = 60,
+        backoff: Optional[ReminderBackoff] = None,
+    ):
+        self.db_manager = db_manager
+        self.channels = channels
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.backoff = backoff or ReminderBackoff()
+        # 每个分片一个单线程执行器：同一用户的提醒按顺序处理
+        self._shards = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"reminder-shard-{i}")
+            for i in range(self.workers)
+        ]
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_stats: Dict[str, int] = {}
+
+    def run_once(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """处理当前全部到期提醒，返回统计
+
+        统计项：due 到期数（不含退避窗口内的）、sent 已发送、failed 发送失败、
+        unsupported 渠道未配置、notifications 实际发出的通知数、batches 查询批数。
+        """
+        now = now or datetime.now()
+        stats = Counter()
+        in_flight = []
+        after = None
+        while True:
+            batch = self.db_manager.get_pending_reminders(
+                within=timedelta(0), after=after, limit=self.batch_size, now=now,
+                backoff=self.backoff,
+            )
+            stats["batches"] += 1
+            if not batch:
+                break
+            stats["due"] += len(batch)
+            after = (batch[-1]["scheduled_at"], batch[-1]["schedule_id"])
+
+            shards = defaultdict(list)
+            for reminder in batch:
+                shards[reminder["user_id"] % self.workers].append(reminder)
+            for shard, reminders in shards.items():
+                in_flight.append(self._shards[shard].submit(self._process, reminders, now))
+
+            # 背压：未完成的分批过多时先等待最早的完成
+            while len(in_flight) > self.workers * 2:
+                stats.update(in_flight.pop(0).result())
+            if len(batch) < self.batch_size:
+                break
+
+        for future in in_flight:
+            stats.update(future.result())
+        self.last_stats = {key: stats[key] for key in STAT_KEYS}
+        if stats["due"]:
+            logger.info(f"提醒守护进程完成一轮: {self.last_stats}")
+        return self.last_stats
+
+    def _process(self, reminders: List[Dict], now: datetime) -> Counter:
+        """发送一个分片的一批提醒（在分片线程中执行，退避已由查询过滤）"""
+        stats = Counter()
+        by_channel = defaultdict(list)
+        for reminder in reminders:
+            by_channel[reminder["reminder_channel"] or DEFAULT_CHANNEL].append(reminder)
+
+        for channel_name, items in by_channel.items():
+            channel = self.channels.get(channel_name)
+            if channel is None:
+                stats["unsupported"] += len(items)
+                continue
+
+            by_user = defaultdict(list)
+            for reminder in items:
+                by_user[reminder["user_id"]].append(reminder)
+
+            sent = []
+            for user_id, user_reminders in by_user.items():
+                try:
+                    success = channel.send(user_reminders)
+                except Exception as e:
+                    logger.error(f"用户 {user_id} 的 {channel_name} 提醒发送失败: {e}")
+                    success = False
+                if success:
+                    sent.extend(user_reminders)
+                    stats["notifications"] += 1
+                else:
+                    stats["failed"] += len(user_reminders)
+
+            if sent:
+                self.db_manager.record_reminder_deliveries(
+                    None,
+                    delivery_channel(channel_name),
+                    {r["schedule_id"]: r["scheduled_at"] for r in sent},
+                    sent_at=now,
+                    user_ids={r["schedule_id"]: r["user_id"] for r in sent},
+                )
+                stats["sent"] += len(sent)
+        return stats
+
+    # ------------------------------
+    # 后台运行
+    # ------------------------------
+    def start(self) -> None:
+        """在后台线程中每 poll_seconds 秒处理一轮"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run_forever, daemon=True, name="ReminderDaemon"
+        )
+        self._thread.start()
+
+    def run_forever(self) -> None:
+        logger.info(f"提醒守护进程启动：{self.workers} 个分片，每批 {self.batch_size} 条")
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"提醒守护进程本轮失败: {e}")
+            self._stop.wait(self.poll_seconds)
+        logger.info("提醒守护进程已停止")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=10)
+        for shard in self._shards:
+            shard.shutdown(wait=True)
+
+
+def build_channels(args) -> Dict[str, ReminderChannel]:
+    """按命令行参数配置提醒渠道"""
+    from src.scheduler.reminder import SystemNotifier
+
+    notifier_channel = NotifierChannel(SystemNotifier())
+    channels = {"app": notifier_channel, "system": notifier_channel}
+    if args.smtp_host:
+        channels["email"] = EmailChannel(
+            args.smtp_host,
+            port=args.smtp_port,
+            sender=args.smtp_sender,
+            username=args.smtp_user,
+            password=args.smtp_password,
+            use_tls=not args.smtp_no_tls,
+        )
+    return channels
+
+
+def add_arguments(parser) -> None:
+    parser.add_argument("--workers", type=int, default=4, help="分片线程数")
+    parser.add_argument("--batch-size", type=int, default=1000, help="每批查询的提醒数")
+    parser.add_argument("--interval", type=int, default=60, help="轮询间隔（秒）")
+    parser.add_argument("--once", action="store_true", help="只处理一轮后退出")
+    parser.add_argument("--smtp-host", default=None, help="SMTP 服务器（配置后启用邮件提醒）")
+    parser.add_argument("--smtp-port", type=int, default=587)
+    parser.add_argument("--smtp-sender", default="")
+    parser.add_argument("--smtp-user", default=None)
+    parser.add_argument("--smtp-password", default=None)
+    parser.add_argument("--smtp-no-tls", action="store_true")
+
+
+def run(args, db_manager=None, out=None) -> int:
+    """按命令行参数运行守护进程（src.cli 传入已打开的数据库与输出流）"""
+    if db_manager is None:
+        from src.database.manager import DatabaseManager
+
+        db_manager = DatabaseManager(args.db)
+    daemon = ReminderDaemon(
+        db_manager,
+        build_channels(args),
+        workers=args.workers,
+        batch_size=args.batch_size,
+        poll_seconds=args.interval,
+    )
+    try:
+        if args.once:
+            print(f"✅ 提醒处理完成: {daemon.run_once()}", file=out or sys.stdout)
+        else:
+            daemon.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="复习闹钟多用户提醒守护进程")
+    parser.add_argument("--db", default="src/database/review_alarm.db", help="数据库文件路径")
+    add_arguments(parser)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
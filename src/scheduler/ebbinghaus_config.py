@@ -82,3 +82,8 @@ class EbbinghausConfig:
     def get_total_stages(cls):
         """获取总阶段数"""
         return len(cls.INTERVALS_HOURS)
+
+    @classmethod
+    def get_last_stage(cls):
+        """最后一个阶段的下标：在该阶段复习通过（4分以上）即为已掌握"""
+        return cls.get_total_stages() - 1
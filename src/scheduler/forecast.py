@@ -0,0 +1,164 @@
+"""
+复习负荷预测：未来每天预计有多少个复习
+
+从用户未完成的复习计划出发，按用户的调度算法（见 scheduler.algorithms）模拟
+之后的 complete_review：每一轮把窗口内到期的卡片全部“复习”一次，评分按用户
+历史效果评分分布随机抽取，用 next_intervals 一次算出整批卡片的下次间隔；
+间隔超出预测窗口或已掌握的卡片退出模拟，直到窗口内没有待复习的卡片。
+每轮只处理仍在窗口内的卡片，轮数约等于单张卡片在窗口内的复习次数。
+
+- 逾期计划按今天复习计
+- 假设用户在到期当天完成复习，评分与卡片阶段无关
+- 卡片较少时重复模拟多次取平均，得到平滑的期望值
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+from sqlalchemy import String, func, select, type_coerce
+
+from src.database.models import DailyUserStat, ReviewSchedule, User
+from src.scheduler.algorithms import get_algorithm, make_states
+
+# 没有复习历史时使用的效果评分分布（1-5分）
+DEFAULT_GRADE_PROBS = (0.05, 0.10, 0.25, 0.35, 0.25)
+
+# 小卡组重复模拟，使每次预测共模拟约这么多张卡片
+SIMULATED_CARDS = 20000
+MAX_RUNS = 32
+
+# 模拟中同一张卡片两次复习至少间隔1小时：艾宾浩斯首阶段间隔为0，
+# 不设下限时持续低分的卡片会在同一时刻无限重复；轮数因此不超过 days * 24
+MIN_INTERVAL_HOURS = 1.0
+
+
+def grade_distribution(histogram) -> np.ndarray:
+    """效果评分直方图（1-5分的次数）归一化为概率，没有历史时用默认分布"""
+    counts = np.asarray(histogram, dtype=float)
+    if counts.sum() <= 0:
+        counts = np.asarray(DEFAULT_GRADE_PROBS)
+    return counts / counts.sum()
+
+
+def simulate_workload(
+    algorithm,
+    states: Dict[str, np.ndarray],
+    due_hours: np.ndarray,
+    grade_probs,
+    days: int,
+    runs: int = 1,
+    seed: Optional[int] = 0,
+) -> np.ndarray:
+    """模拟未来 days 天的复习，返回每天期望的复习次数（长度为 days）
+
+    due_hours 为各卡片到期时刻距预测起点（今天零点）的小时数；
+    states 为到期时的卡片状态（elapsed 为届时距上次复习的小时数）。
+    """
+    rng = np.random.default_rng(seed)
+    horizon = days * 24
+    cumulative = np.cumsum(grade_probs)
+    cumulative[-1] = 1.0
+    histogram = np.zeros(days)
+
+    due = np.tile(np.asarray(due_hours, dtype=float), runs)
+    states = {key: np.tile(values, runs) for key, values in states.items()}
+    active = due < horizon
+    while active.any():
+        due = due[active]
+        states = {key: values[active] for key, values in states.items()}
+        histogram += np.bincount((due // 24).astype(np.int64), minlength=days)[:days]
+
+        grades = np.searchsorted(cumulative, rng.random(len(due)), side="right") + 1
+        intervals, new_states = algorithm.next_intervals(states, grades)
+        intervals = np.maximum(intervals, MIN_INTERVAL_HOURS)
+        due = due + intervals
+        active = (due < horizon) & ~new_states.pop("mastered")
+        new_states["interval"] = intervals
+        new_states["elapsed"] = intervals  # 下次按时复习
+        states = new_states
+    return histogram / runs
+
+
+def load_pending_states(db_manager, user_id: int, start: datetime, now: datetime):
+    """读取用户未完成的复习计划（与今日复习、提醒的范围一致），返回 (states, due_hours)
+
+    日期列按 SQLite 中存储的字符串取出，由 NumPy 整列解析，不逐行构造 datetime。
+    """
+    table = ReviewSchedule.__table__
+    statement = (
+        select(
+            type_coerce(table.c.scheduled_date, String),
+            type_coerce(table.c.created_at, String),
+            table.c.interval_index,
+            table.c.current_interval,
+            table.c.ease_factor,
+            table.c.stability,
+            table.c.difficulty,
+        )
+        .where(table.c.user_id == user_id, ~table.c.completed)
+    )
+    with db_manager.engine.connect() as connection:
+        rows = connection.execute(statement).all()
+    scheduled, created, stage, interval, ease, stability, difficulty = (
+        zip(*rows) if rows else [()] * 7
+    )
+
+    def hours(dates):
+        delta = np.array(dates, dtype="datetime64[us]") - np.datetime64(start, "us")
+        return delta / np.timedelta64(1, "h")
+
+    def floats(values):
+        return np.array(values, dtype=float)
+
+    # 逾期计划按现在复习；届时距上次复习（计划创建时）的小时数
+    due_hours = np.maximum(hours(scheduled), (now - start).total_seconds() / 3600)
+    elapsed = np.nan_to_num(due_hours - hours(created))
+    states = make_states(
+        len(rows),
+        stage=np.nan_to_num(floats(stage)).astype(np.int64),
+        interval=np.nan_to_num(floats(interval)),
+        elapsed=elapsed,
+        ease=floats(ease),
+        stability=floats(stability),
+        difficulty=floats(difficulty),
+    )
+    return states, due_hours
+
+
+def get_review_forecast(
+    db_manager, user_id: int, days: int = 30, runs: Optional[int] = None, seed: int = 0
+) -> Dict:
+    """预测用户未来 days 天（含今天）每天的复习次数
+
+    返回 {"algorithm", "cards", "dates": [ISO 日期], "expected": [每天期望次数], "total"}。
+    runs 为重复模拟次数，默认按卡片数自动选择。
+    """
+    now = datetime.now()
+    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    with db_manager.engine.connect() as connection:
+        algorithm_name = connection.execute(
+            select(User.scheduling_algorithm).where(User.id == user_id)
+        ).scalar()
+        histogram = connection.execute(
+            select(*[
+                func.coalesce(func.sum(getattr(DailyUserStat, f"effectiveness_{score}")), 0)
+                for score in range(1, 6)
+            ]).where(DailyUserStat.user_id == user_id)
+        ).one()
+    algorithm = get_algorithm(algorithm_name)
+    states, due_hours = load_pending_states(db_manager, user_id, start, now)
+
+    cards = len(due_hours)
+    if runs is None:
+        runs = min(MAX_RUNS, max(1, SIMULATED_CARDS // max(cards, 1)))
+    expected = simulate_workload(
+        algorithm, states, due_hours, grade_distribution(histogram), days, runs, seed
+    )
+    return {
+        "algorithm": algorithm.name,
+        "cards": cards,
+        "dates": [(start + timedelta(days=i)).date().isoformat() for i in range(days)],
+        "expected": [round(float(value), 1) for value in expected],
+        "total": round(float(expected.sum()), 1),
+    }
@@ -0,0 +1,139 @@
+"""
+复习负荷均衡：生成下次复习计划时在目标日期附近挑选最空闲的一天
+
+同一批学习的知识点间隔相同，会在同一天集中到期。完成复习时，间隔达到
+MIN_FUZZ_INTERVAL_HOURS 的计划可在目标日期前后 fuzz 天内移动（fuzz 约为间隔的
+FUZZ_RATIO，至少1天、至多 MAX_FUZZ_DAYS 天），选到期数最少的一天，同样少时取
+离目标最近的一天；时刻不变，只按整天移动。较短的间隔（艾宾浩斯当天的几个阶段）不调整。
+设置了每日上限且窗口内每天都已达上限时，顺延到窗口之后第一个未满的日期。
+
+每个用户的到期直方图 {日期: 有效知识点的未完成计划数} 缓存在内存中：首次使用时
+按索引分组统计一次，之后完成复习时原地把旧计划的日期减一、新计划的日期加一；
+其他写操作（新增、导入、删除、改期、取消）发出变更事件时整份失效，下次使用时重建。
+"""
+import threading
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import func
+
+from src.database.events import ChangeType
+from src.database.models import KnowledgeItem, ReviewSchedule
+
+MIN_FUZZ_INTERVAL_HOURS = 48
+FUZZ_RATIO = 0.1
+MAX_FUZZ_DAYS = 7
+MAX_SPILL_DAYS = 365  # 顺延的最大天数，超出时放弃上限
+
+
+class LoadBalancer:
+    """按用户缓存到期直方图，为新计划挑选日期（线程安全）"""
+
+    def __init__(self, fuzz_ratio: float = FUZZ_RATIO, max_fuzz_days: int = MAX_FUZZ_DAYS):
+        self.fuzz_ratio = fuzz_ratio
+        self.max_fuzz_days = max_fuzz_days
+        self._histograms: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, session, user_id: int) -> Counter:
+        """用户的到期直方图，未缓存时在 session 中统计（不触发自动 flush）"""
+        with self._lock:
+            histogram = self._histograms.get(user_id)
+        if histogram is not None:
+            return histogram
+        with session.no_autoflush:
+            rows = (
+                session.query(func.date(ReviewSchedule.scheduled_date), func.count())
+                .join(KnowledgeItem, KnowledgeItem.id == ReviewSchedule.knowledge_item_id)
+                .filter(
+                    ReviewSchedule.user_id == user_id,
+                    ~ReviewSchedule.completed,
+                    KnowledgeItem.is_active,
+                )
+                .group_by(func.date(ReviewSchedule.scheduled_date))
+                .all()
+            )
+        histogram = Counter({date.fromisoformat(day): count for day, count in rows})
+        with self._lock:
+            return self._histograms.setdefault(user_id, histogram)
+
+    def choose_date(
+        self,
+        histogram: Counter,
+        review_date: datetime,
+        interval_hours: float,
+        daily_cap: Optional[int] = None,
+    ) -> datetime:
+        """按目标间隔挑选下次复习时间"""
+        target = review_date + timedelta(hours=interval_hours)
+        if interval_hours < MIN_FUZZ_INTERVAL_HOURS:
+            return target
+
+        fuzz = round(interval_hours / 24 * self.fuzz_ratio)
+        fuzz = min(max(fuzz, 1), self.max_fuzz_days)
+        # 不早于复习次日
+        earliest = (review_date.date() - target.date()).days + 1
+        offsets = range(max(-fuzz, earliest), fuzz + 1)
+        with self._lock:
+            offset = min(
+                offsets,
+                key=lambda k: (histogram[target.date() + timedelta(days=k)], abs(k), k),
+            )
+            if daily_cap and histogram[target.date() + timedelta(days=offset)] >= daily_cap:
+                # 窗口内每天都已满：顺延
+                for spill in range(fuzz + 1, fuzz + 1 + MAX_SPILL_DAYS):
+                    if histogram[target.date() + timedelta(days=spill)] < daily_cap:
+                        offset = spill
+                        break
+        return target + timedelta(days=offset)
+
+    def move(
+        self,
+        user_id: int,
+        old_date: Optional[datetime],
+        new_date: Optional[datetime],
+        histogram: Optional[Counter] = None,
+    ):
+        """旧计划离开直方图，新计划加入
+
+        histogram 为空时更新缓存中的直方图（未缓存的用户忽略）。批量完成时
+        在提交前更新 histogram() 取得的直方图，失败时须 invalidate_user。
+        """
+        with self._lock:
+            if histogram is None:
+                histogram = self._histograms.get(user_id)
+            if histogram is None:
+                return
+            if old_date is not None:
+                histogram[old_date.date()] -= 1
+            if new_date is not None:
+                histogram[new_date.date()] += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._histograms.pop(user_id, None)
+
+
+# 新增、移除或移动未完成计划的写操作（完成复习由 complete_review 原地更新）
+SCHEDULE_CHANGES = [
+    ChangeType.KNOWLEDGE_ADDED,
+    ChangeType.KNOWLEDGE_IMPORTED,
+    ChangeType.KNOWLEDGE_DELETED,  # 软删除：计划仍在，但不再计入直方图
+    ChangeType.SCHEDULE_ADDED,
+    ChangeType.SCHEDULE_RESCHEDULED,
+    ChangeType.SCHEDULE_CANCELLED,
+]
+
+
+def _create_load_balancer(db_manager) -> LoadBalancer:
+    balancer = LoadBalancer()
+    db_manager.subscribe(
+        lambda event: balancer.invalidate_user(event.user_id), SCHEDULE_CHANGES
+    )
+    return balancer
+
+
+def get_load_balancer(db_manager) -> LoadBalancer:
+    """获取（必要时创建）数据库管理器对应的负荷均衡器（每个管理器共享一个）"""
+    return db_manager.get_shared("load_balancer", _create_load_balancer)
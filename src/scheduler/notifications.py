@@ -0,0 +1,255 @@
+"""
+通知异步分发
+
+提醒线程只把通知放入有界队列并立即返回，由后台工作线程依次尝试通知后端
+（plyer、notify-send、zenity 等）。成功过的后端会被记住并优先使用，失败或超时
+的后端在 reprobe_seconds 内不再尝试，避免每条通知都重新走一遍失败的方案。
+每条通知有总超时，超时的后端调用被放弃（线程留在后台自行结束）。
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationBackend:
+    """通知后端：send() 成功显示通知时返回 True
+
+    modal 为 True 的后端是模态对话框，用户关闭前不会返回；调用在短暂观察期内
+    未报错即视为已显示，不占用工作线程。
+    """
+
+    name = "backend"
+    modal = False
+
+    def send(self, title: str, message: str, timeout: float) -> bool:
+        raise NotImplementedError
+
+
+class FunctionBackend(NotificationBackend):
+    """把通知函数 func(title, message, timeout) -> bool 包装成后端"""
+
+    def __init__(self, name: str, func: Callable, modal: bool = False):
+        self.name = name
+        self.func = func
+        self.modal = modal
+
+    def send(self, title: str, message: str, timeout: float) -> bool:
+        return bool(self.func(title, message, timeout))
+
+
+class FakeBackend(NotificationBackend):
+    """测试用后端：记录收到的通知，可模拟失败与耗时"""
+
+    def __init__(self, name: str = "fake", succeed: bool = True, delay: float = 0.0):
+        self.name = name
+        self.succeed = succeed
+        self.delay = delay
+        self.calls = 0
+        self.sent = []  # (标题, 内容, 发送时间)
+
+    def send(self, title: str, message: str, timeout: float) -> bool:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if not self.succeed:
+            return False
+        self.sent.append((title, message, datetime.now()))
+        return True
+
+
+class NotificationDispatcher:
+    """有界队列 + 工作线程的通知分发器（线程安全）"""
+
+    # 模态对话框的观察期（秒）
+    MODAL_GRACE_SECONDS = 1.0
+
+    def __init__(
+        self,
+        backends: List[NotificationBackend],
+        max_queue: int = 100,
+        workers: int = 1,
+        default_timeout: float = 10.0,
+        reprobe_seconds: float = 3600.0,
+    ):
+        self.backends = list(backends)
+        self.workers = workers
+        self.default_timeout = default_timeout
+        self.reprobe_seconds = reprobe_seconds
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._preferred = None  # 最近一次成功的后端名
+        self._failed_at: Dict[str, float] = {}  # 后端名 -> 最近失败时间（monotonic）
+        self._stats = {
+            "submitted": 0, "sent": 0, "failed": 0, "dropped": 0, "timed_out": 0,
+        }
+        self._latency_count = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def submit(
+        self,
+        title: str,
+        message: str,
+        timeout: Optional[float] = None,
+        backends: Optional[List[NotificationBackend]] = None,
+    ) -> Future:
+        """放入发送队列，返回结果为是否发送成功的 Future
+
+        backends 指定时只尝试这些后端（不参与成功后端的缓存）。
+        队列已满时丢弃通知，Future 立即返回 False。
+        """
+        future = Future()
+        self._ensure_workers()
+        job = (title, message, timeout or self.default_timeout, backends,
+               time.monotonic(), future)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            self._count("dropped")
+            logger.warning(f"通知队列已满，丢弃通知: {title}")
+            future.set_result(False)
+            return future
+        self._count("submitted")
+        return future
+
+    def notify(self, title: str, message: str, timeout: Optional[float] = None) -> bool:
+        """发送并等待结果"""
+        return self.submit(title, message, timeout).result()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """等待队列中的通知全部处理完（测试与退出时使用）"""
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(
+                lambda: self._queue.unfinished_tasks == 0, timeout
+            )
+
+    def metrics(self) -> Dict:
+        """队列深度、发送计数与排队+发送延迟"""
+        with self._lock:
+            count = self._latency_count
+            return dict(
+                self._stats,
+                queue_depth=self._queue.qsize(),
+                avg_latency_ms=round(self._latency_total / count * 1000, 1) if count else 0.0,
+                max_latency_ms=round(self._latency_max * 1000, 1),
+                preferred_backend=self._preferred,
+            )
+
+    def shutdown(self) -> None:
+        """处理完已排队的通知后停止工作线程"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+
+    # ------------------------------
+    # 工作线程
+    # ------------------------------
+    def _ensure_workers(self) -> None:
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._work, daemon=True,
+                    name=f"notify-{len(self._threads)}",
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                title, message, timeout, backends, submitted_at, future = job
+                try:
+                    success = self._send(title, message, timeout, backends)
+                except Exception as e:
+                    logger.error(f"通知发送异常: {e}")
+                    success = False
+                latency = time.monotonic() - submitted_at
+                with self._lock:
+                    self._stats["sent" if success else "failed"] += 1
+                    self._latency_count += 1
+                    self._latency_total += latency
+                    self._latency_max = max(self._latency_max, latency)
+                # 回调在工作线程中执行
+                future.set_result(success)
+            finally:
+                self._queue.task_done()
+
+    def _send(self, title, message, timeout, backends) -> bool:
+        """在总超时内依次尝试后端，直到有一个成功"""
+        cache = backends is None
+        deadline = time.monotonic() + timeout
+        timed_out = False
+        for backend in (self._candidates() if cache else backends):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            success = self._call(backend, title, message, remaining)
+            if success:
+                if cache:
+                    with self._lock:
+                        self._preferred = backend.name
+                        self._failed_at.pop(backend.name, None)
+                return True
+            timed_out = timed_out or success is None
+            if cache:
+                with self._lock:
+                    self._failed_at[backend.name] = time.monotonic()
+                    if self._preferred == backend.name:
+                        self._preferred = None
+        if timed_out:
+            self._count("timed_out")
+            logger.warning(f"通知超时（{timeout}秒）: {title}")
+        return False
+
+    def _candidates(self) -> List[NotificationBackend]:
+        """成功过的后端优先，跳过近期失败的后端；全部失败过时重新探测"""
+        now = time.monotonic()
+        with self._lock:
+            preferred = self._preferred
+            recently_failed = {
+                name for name, failed_at in self._failed_at.items()
+                if now - failed_at < self.reprobe_seconds
+            }
+        candidates = [b for b in self.backends if b.name not in recently_failed]
+        candidates.sort(key=lambda b: b.name != preferred)
+        return candidates or list(self.backends)
+
+    def _call(self, backend, title, message, timeout) -> Optional[bool]:
+        """在独立线程中调用后端，超时即放弃并返回 None"""
+        result = {}
+
+        def run():
+            try:
+                result["success"] = backend.send(title, message, timeout)
+            except Exception as e:
+                logger.error(f"  {backend.name} 通知失败: {e}")
+                result["success"] = False
+
+        thread = threading.Thread(target=run, daemon=True, name=f"notify-{backend.name}")
+        thread.start()
+        if backend.modal:
+            thread.join(min(timeout, self.MODAL_GRACE_SECONDS))
+            # 仍在运行说明对话框正在显示
+            return bool(result.get("success", thread.is_alive()))
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning(f"  {backend.name} 通知超时（{timeout:.1f}秒）")
+            return None
+        return bool(result.get("success"))
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
@@ -3,14 +3,24 @@
 支持跨平台系统通知和App弹窗提醒
 """
 
+import heapq
 import platform
 import subprocess
 import logging
 import threading
 import time
+from concurrent.futures import Future
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 
+from src.database.events import ChangeType
+from src.scheduler.notifications import (
+    FunctionBackend,
+    NotificationBackend,
+    NotificationDispatcher,
+)
+from src.scheduler.reminder_policy import ReminderBackoff, delivery_channel
+
 # 尝试导入 plyer，如果不可用则使用备用方案
 try:
     from plyer import notification
@@ -23,249 +33,223 @@ logger = logging.getLogger(__name__)
 
 
 class SystemNotifier:
-    """跨平台系统通知器"""
+    """跨平台系统通知器
+
+    各通知方案按平台组成后端链，交给 NotificationDispatcher 在后台线程发送：
+    记住本机可用的方案，失败或超时的方案不再每次重试。
+    """
 
-    def __init__(self):
+    def __init__(self, backends: Optional[List[NotificationBackend]] = None,
+                 max_queue: int = 100, workers: int = 1):
         self.system_name = platform.system()
         logger.info(f"初始化系统通知器，检测到系统: {self.system_name}")
+        self.dispatcher = NotificationDispatcher(
+            backends if backends is not None else self.default_backends(),
+            max_queue=max_queue,
+            workers=workers,
+        )
+
+    def default_backends(self) -> List[NotificationBackend]:
+        """当前系统的通知方案（按优先级）"""
+        tk_dialog = FunctionBackend("tkinter", self._tk_dialog_notify, modal=True)
+        console = FunctionBackend("console", self._console_notify)
+        plyer_toast = FunctionBackend("plyer", self._plyer_notify)
+
+        if self.system_name == "Darwin":  # macOS
+            return [FunctionBackend("terminal-notifier", self._mac_notify)]
+        if self.system_name == "Windows":
+            return [
+                FunctionBackend("ctypes", self._ctypes_notify, modal=True),
+                plyer_toast,
+                FunctionBackend("win10toast", self._win10toast_notify),
+                tk_dialog,
+                console,
+            ]
+        if self.system_name == "Linux":
+            return [
+                plyer_toast,
+                FunctionBackend("notify-send", self._notify_send),
+                FunctionBackend("zenity", self._zenity_notify, modal=True),
+                tk_dialog,
+                console,
+            ]
+        logger.warning(f"不支持的操作系统: {self.system_name}，使用备用通知方案")
+        return [tk_dialog, console]
+
+    def submit(self, title: str, message: str, timeout: int = 10,
+               backends: Optional[List[NotificationBackend]] = None) -> Future:
+        """异步发送系统通知，返回结果为是否成功的 Future"""
+        logger.info(f"🔔 通知入队: {title}")
+        return self.dispatcher.submit(title, message, timeout, backends)
 
     def notify(self, title: str, message: str, timeout: int = 10) -> bool:
         """
-        显示系统通知
+        显示系统通知（等待发送结果）
         """
-        logger.info("🔔 尝试发送系统通知")
-        logger.info(f"  系统: {self.system_name}")
-        logger.info(f"  标题: {title}")
-        logger.info(f"  内容: {message}")
         try:
-            if self.system_name == "Darwin":  # macOS
-                logger.info("🖥️  使用 macOS 通知方案")
-                result = self._mac_notify(title, message)
-                logger.info(f"  macOS 通知结果: {'✅ 成功' if result else '❌ 失败'}")
-                return result
-
-            elif self.system_name == "Windows":
-                logger.info("🪟 使用 Windows 通知方案")
-                result = self._windows_notify(title, message, timeout)
-                logger.info(f"  Windows 通知结果: {'✅ 成功' if result else '❌ 失败'}")
-                return result
-
-            elif self.system_name == "Linux":
-                logger.info("🐧 使用 Linux 通知方案")
-                result = self._linux_notify(title, message, timeout)
-                logger.info(f"  Linux 通知结果: {'✅ 成功' if result else '❌ 失败'}")
-                return result
-
-            else:
-                logger.warning(f"不支持的操作系统: {self.system_name}")
-                result = self._fallback_notify(title, message)
-                logger.info(f"  备用方案结果: {'✅ 成功' if result else '❌ 失败'}")
-                return result
-
+            result = self.submit(title, message, timeout).result()
+            logger.info(f"  {self.system_name} 通知结果: {'✅ 成功' if result else '❌ 失败'}")
+            return result
         except Exception as e:
             logger.error(f"显示系统通知失败: {e}")
             return False
 
-    def _mac_notify(self, title: str, message: str) -> bool:
-        """macOS 系统通知 - 使用 terminal-notifier"""
-        try:
-            # 清理消息中的特殊字符
-            message_clean = message.replace('"', "'").replace('\n', ' ')
-
-            # 使用与测试脚本相同的 AppleScript 格式
-            script = f'''
-            display notification "{message_clean}" with title "📚 智能复习提醒" sound name "default"
-            '''
+    def metrics(self) -> Dict[str, Any]:
+        """通知队列深度、发送计数与延迟"""
+        return self.dispatcher.metrics()
 
-            logger.info(f"  执行 AppleScript: {script.strip()}")
-            result = subprocess.run([
-                "terminal-notifier",
-                "-title", title,
-                "-message", message_clean,
-                "-sound", "default",
-                "-group", "review-alarm"  # 添加分组标识
-            ], capture_output=True, timeout=10)
-
-            if result.returncode == 0:
-                logger.info("   macOS 通知结果: ✅ 成功")
-                return True
-            else:
-                logger.error(f"   macOS 通知失败: {result.stderr}")
-                return False
-
-        except Exception as e:
-            logger.error(f"  macOS 通知异常: {e}")
+    def _mac_notify(self, title: str, message: str, timeout: float) -> bool:
+        """macOS 系统通知 - 使用 terminal-notifier"""
+        # 清理消息中的特殊字符
+        message_clean = message.replace('"', "'").replace('\n', ' ')
+
+        result = subprocess.run([
+            "terminal-notifier",
+            "-title", title,
+            "-message", message_clean,
+            "-sound", "default",
+            "-group", "review-alarm"  # 添加分组标识
+        ], capture_output=True, timeout=timeout)
+
+        if result.returncode == 0:
+            return True
+        logger.error(f"  terminal-notifier 失败: {result.stderr}")
+        return False
+
+    def _ctypes_notify(self, title: str, message: str, timeout: float) -> bool:
+        """Windows 消息框（最可靠，模态）"""
+        import ctypes
+        # 使用 MB_SYSTEMMODAL 让对话框置顶
+        ctypes.windll.user32.MessageBoxW(0, message, title, 0x1000)
+        return True
+
+    def _plyer_notify(self, title: str, message: str, timeout: float) -> bool:
+        """plyer 桌面通知（Windows 使用 toast）"""
+        if not PLYER_AVAILABLE:
             return False
+        notification.notify(
+            title=title,
+            message=message,
+            timeout=int(timeout),
+            app_name="智能复习闹钟",
+            toast=self.system_name == "Windows"
+        )
+        return True
 
-    def _windows_notify(self, title: str, message: str, timeout: int) -> bool:
-        """Windows 系统通知 - 增强版"""
+    def _win10toast_notify(self, title: str, message: str, timeout: float) -> bool:
+        """Windows 10 toast 通知（win10toast 可选依赖）"""
         try:
-            logger.info("  尝试 Windows 通知...")
-
-            # 方法1: 使用 ctypes 显示消息框（最可靠）
-            try:
-                import ctypes
-                logger.info("  使用 ctypes 消息框")
-                # 使用 MB_SYSTEMMODAL 让对话框置顶
-                ctypes.windll.user32.MessageBoxW(
-                    0, message, title, 0x1000)  # MB_SYSTEMMODAL
-                logger.info("  ctypes 消息框显示成功")
-                return True
-            except Exception as e:
-                logger.error(f"  ctypes 消息框失败: {e}")
-
-            # 方法2: 使用 plyer
-            if PLYER_AVAILABLE:
-                try:
-                    logger.info("  使用 plyer 通知")
-                    notification.notify(
-                        title=title,
-                        message=message,
-                        timeout=timeout,
-                        app_name="智能复习闹钟",
-                        toast=True
-                    )
-                    logger.info("  plyer 通知发送成功")
-                    return True
-                except Exception as e:
-                    logger.error(f"  plyer 通知失败: {e}")
-
-            # 方法3: 使用 win10toast（如果可用）
-            try:
-                from win10toast import ToastNotifier
-                logger.info("  使用 win10toast")
-                toaster = ToastNotifier()
-                toaster.show_toast(title, message, duration=timeout, threaded=True)
-                logger.info("  win10toast 通知发送成功")
-                return True
-            except ImportError:
-                logger.info("  win10toast 不可用")
-            except Exception as e:
-                logger.error(f"  win10toast 失败: {e}")
-
-            logger.error("  所有 Windows 通知方法都失败了")
-            return self._fallback_notify(title, message)
-
-        except Exception as e:
-            logger.error(f"  Windows 通知失败: {e}")
+            from win10toast import ToastNotifier
+        except ImportError:
+            logger.info("  win10toast 不可用")
             return False
+        ToastNotifier().show_toast(title, message, duration=int(timeout), threaded=True)
+        return True
 
-    def _linux_notify(self, title: str, message: str, timeout: int) -> bool:
-        """Linux 系统通知（使用 notify-send）- 增强版"""
+    def _notify_send(self, title: str, message: str, timeout: float) -> bool:
+        """Linux notify-send 命令"""
         try:
-            logger.info("  尝试 Linux 通知...")
-
-            # 方法1: 使用 plyer
-            if PLYER_AVAILABLE:
-                try:
-                    logger.info("  使用 plyer 通知")
-                    notification.notify(
-                        title=title,
-                        message=message,
-                        timeout=timeout,
-                        app_name="智能复习闹钟"
-                    )
-                    logger.info("  plyer 通知发送成功")
-                    return True
-                except Exception as e:
-                    logger.error(f"  plyer 通知失败: {e}")
-
-            # 方法2: 使用 notify-send 命令
-            try:
-                logger.info("  使用 notify-send 命令")
-                result = subprocess.run([
-                    "notify-send",
-                    title,
-                    message,
-                    f"--expire-time={timeout * 1000}",
-                    "--urgency=normal",
-                    "--app-name=智能复习闹钟",
-                    "--icon=dialog-information"
-                ], capture_output=True, timeout=5)
-                if result.returncode == 0:
-                    logger.info("  notify-send 执行成功")
-                    return True
-                else:
-                    logger.error(f"  notify-send 失败: {result.stderr}")
-            except FileNotFoundError:
-                logger.warning("  未找到 notify-send 命令")
-            except Exception as e:
-                logger.error(f"  notify-send 异常: {e}")
-
-            # 方法3: 使用 zenity（Gnome 桌面）
-            try:
-                logger.info("  尝试使用 zenity")
-                result = subprocess.run([
-                    "zenity",
-                    "--info",
-                    f"--text={message}",
-                    f"--title={title}",
-                    f"--timeout={timeout}"
-                ], capture_output=True, timeout=5)
-                if result.returncode == 0:
-                    logger.info("  zenity 执行成功")
-                    return True
-            except FileNotFoundError:
-                logger.info("  zenity 不可用")
-            except Exception as e:
-                logger.error(f"  zenity 异常: {e}")
-
-            logger.error("  所有 Linux 通知方法都失败了")
-            return self._fallback_notify(title, message)
-
-        except Exception as e:
-            logger.error(f"  Linux 通知失败: {e}")
+            result = subprocess.run([
+                "notify-send",
+                title,
+                message,
+                f"--expire-time={int(timeout * 1000)}",
+                "--urgency=normal",
+                "--app-name=智能复习闹钟",
+                "--icon=dialog-information"
+            ], capture_output=True, timeout=timeout)
+        except FileNotFoundError:
+            logger.warning("  未找到 notify-send 命令")
             return False
+        if result.returncode != 0:
+            logger.error(f"  notify-send 失败: {result.stderr}")
+        return result.returncode == 0
 
-    def _fallback_notify(self, title: str, message: str) -> bool:
-        """备用通知方案 - 增强版"""
+    def _zenity_notify(self, title: str, message: str, timeout: float) -> bool:
+        """zenity 对话框（Gnome 桌面，模态）"""
         try:
-            logger.info("  使用备用通知方案")
+            result = subprocess.run([
+                "zenity",
+                "--info",
+                f"--text={message}",
+                f"--title={title}",
+                f"--timeout={int(timeout)}"
+            ], capture_output=True)
+        except FileNotFoundError:
+            logger.info("  zenity 不可用")
+            return False
+        return result.returncode == 0
 
-            # 方法1: 使用 tkinter 对话框
-            try:
-                import tkinter as tk
-                from tkinter import messagebox
+    def _tk_dialog_notify(self, title: str, message: str, timeout: float) -> bool:
+        """备用方案：tkinter 对话框（模态）"""
+        import tkinter as tk
+        from tkinter import messagebox
 
-                # 创建隐藏的根窗口
-                root = tk.Tk()
-                root.withdraw()
-                root.attributes('-topmost', True)  # 置顶
+        # 创建隐藏的根窗口
+        root = tk.Tk()
+        root.withdraw()
+        root.attributes('-topmost', True)  # 置顶
 
-                messagebox.showinfo(title, message)
-                root.destroy()
-                logger.info("  tkinter 对话框显示成功")
-                return True
-            except Exception as e:
-                logger.error(f"  tkinter 对话框失败: {e}")
-
-            # 方法2: 使用控制台输出
-            print(f"\n{'='*50} - reminder.py:242")
-            print(f"🔔 {title} - reminder.py:243")
-            print(f"{message} - reminder.py:244")
-            print(f"{'='*50}\n - reminder.py:245")
-            logger.info("  已输出到控制台")
-            return True
+        messagebox.showinfo(title, message)
+        root.destroy()
+        return True
 
-        except Exception as e:
-            logger.error(f"  备用通知方案失败: {e}")
-            # 最终备用：简单的打印
-            print(f"🔔 {title}: {message} - reminder.py:252")
-            return True
+    def _console_notify(self, title: str, message: str, timeout: float) -> bool:
+        """最终备用方案：控制台输出"""
+        print(f"\n{'='*50} - reminder.py:242")
+        print(f"🔔 {title} - reminder.py:243")
+        print(f"{message} - reminder.py:244")
+        print(f"{'='*50}\n - reminder.py:245")
+        return True
 
 
 class ReminderService:
-    """复习提醒服务 - 整合系统通知和App弹窗"""
+    """复习提醒服务 - 整合系统通知和App弹窗
+
+    后台线程维护当前用户未完成复习计划的最小堆（按下次提醒时间），在 Condition
+    上休眠到最近一个提醒时间，到期后准时发送提醒。完成复习、新增知识点、调整
+    计划时间等变更事件会唤醒线程，只重新查询受影响知识点的计划；空闲时不查询
+    数据库。reminder_interval 为全量同步间隔，用于发现其他进程写入的计划。
+
+    已发送的提醒记录在 reminder_deliveries 表中（按计划与渠道去重），逾期未完成
+    的计划按 backoff 策略重复提醒；同时到期的计划达到 coalesce_threshold 个时
+    合并为一条汇总通知。通知交给 SystemNotifier 的分发队列异步发送，提醒线程
+    不等待通知后端；发送结果在分发线程中记录，失败的计划回到堆中稍后重试。
+    """
+
+    # 单次休眠上限（秒），防止系统时间跳变后长时间不醒
+    MAX_SLEEP_SECONDS = 600
+    # 通知发送失败后重试的间隔（秒）
+    RETRY_SECONDS = 300
+    # 汇总通知中列出的计划数
+    SUMMARY_MAX_ITEMS = 5
 
     def __init__(self, db_manager):
         self.db_manager = db_manager
         self.system_notifier = SystemNotifier()
-        self.reminder_interval = 30  # 每30秒检查一次提醒（测试用）
+        self.reminder_interval = 300  # 全量同步间隔（秒）
+        self.reminder_channel = "system"  # 发送通知使用的提醒渠道
+        self.backoff = ReminderBackoff()  # 逾期计划的重复提醒间隔
+        self.coalesce_threshold = 3  # 同时到期达到该数量时合并提醒，0 表示不合并
         self.is_running = False
         self.reminder_thread = None
         self.logger = logging.getLogger(__name__)
         self.current_user_id = None
 
+        self._wakeup = threading.Condition()
+        self._dirty_knowledge = set()  # 待重新加载计划的知识点ID（受 _wakeup 保护）
+        self._resync_requested = False
+        self._retries = {}  # 发送失败待重试的计划 {计划ID: (重试时间, 计划时间, 知识点ID)}
+        self._in_flight = set()  # 已提交、尚未得到发送结果的计划ID（受 _wakeup 保护）
+        self._app_backend = FunctionBackend(
+            "app", lambda title, message, timeout: self._send_app_notification(title, message)
+        )
+        self._unsubscribe = None
+        # 以下状态只在提醒线程中访问
+        self._heap = []  # (提醒时间, 计划ID)，计划变更后旧条目惰性丢弃
+        self._entries = {}  # 计划ID -> (提醒时间, 计划时间, 知识点ID)
+        self._next_resync = 0.0
+
     def start_reminder(self, user_id: Optional[int] = None) -> Dict[str, Any]:
         """启动提醒服务（后台线程）"""
         if self.is_running:
@@ -273,6 +257,8 @@ class ReminderService:
 
         self.is_running = True
         self.current_user_id = user_id
+        self._resync_requested = True
+        self._unsubscribe = self.db_manager.subscribe(self._on_data_changed)
 
         # 启动后台线程
         self.reminder_thread = threading.Thread(
@@ -282,12 +268,17 @@ class ReminderService:
         )
         self.reminder_thread.start()
 
-        self.logger.info(f"提醒服务已启动，用户ID: {user_id}，检查间隔: {self.reminder_interval}秒")
+        self.logger.info(f"提醒服务已启动，用户ID: {user_id}，同步间隔: {self.reminder_interval}秒")
         return {"success": True, "msg": "提醒服务已启动"}
 
     def stop_reminder(self) -> Dict[str, Any]:
         """停止提醒服务"""
-        self.is_running = False
+        with self._wakeup:
+            self.is_running = False
+            self._wakeup.notify_all()
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
         if self.reminder_thread and self.reminder_thread.is_alive():
             self.reminder_thread.join(timeout=5.0)
 
@@ -299,30 +290,167 @@ class ReminderService:
         if interval_seconds < 10:
             return {"success": False, "msg": "间隔时间不能少于10秒"}
 
-        self.reminder_interval = interval_seconds
-        self.logger.info(f"提醒检查间隔已设置为: {interval_seconds}秒")
+        with self._wakeup:
+            self.reminder_interval = interval_seconds
+            self._next_resync = time.monotonic() + interval_seconds
+            self._wakeup.notify_all()
+        self.logger.info(f"提醒同步间隔已设置为: {interval_seconds}秒")
         return {"success": True, "msg": f"提醒间隔已设置为{interval_seconds}秒"}
 
+    def _on_data_changed(self, event):
+        """数据变更回调（在写操作线程中执行）：只登记并唤醒提醒线程"""
+        if event.user_id != self.current_user_id:
+            return
+        if event.type is ChangeType.KNOWLEDGE_IMPORTED:
+            self.request_resync()
+            return
+        if event.knowledge_id is None:
+            return
+        with self._wakeup:
+            self._dirty_knowledge.add(event.knowledge_id)
+            self._wakeup.notify_all()
+
+    def request_resync(self):
+        """要求提醒线程重新加载全部计划"""
+        with self._wakeup:
+            self._resync_requested = True
+            self._wakeup.notify_all()
+
     def _reminder_loop(self):
-        """提醒循环：定时检查并发送提醒"""
+        """提醒循环：休眠到最近的提醒时间，到期即发送提醒"""
         self.logger.info("提醒服务循环开始运行")
 
         while self.is_running:
             try:
-                self._check_and_send_reminders()
-                # 等待指定间隔
-                for _ in range(self.reminder_interval):
-                    if not self.is_running:
-                        break
-                    time.sleep(1)
+                with self._wakeup:
+                    dirty, self._dirty_knowledge = self._dirty_knowledge, set()
+                    retries, self._retries = self._retries, {}
+                    resync = self._resync_requested or time.monotonic() >= self._next_resync
+                    self._resync_requested = False
+
+                if resync:
+                    self._resync()
+                elif dirty:
+                    self._reload_knowledge(dirty)
+                for schedule_id, (retry_at, scheduled_date, knowledge_id) in retries.items():
+                    self._schedule(schedule_id, retry_at, scheduled_date, knowledge_id)
+
+                due = self._pop_due(datetime.now())
+                if due:
+                    self._send_due_reminders(due)
+                    continue
+
+                with self._wakeup:
+                    if self.is_running and not (
+                        self._dirty_knowledge or self._resync_requested or self._retries
+                    ):
+                        self._wakeup.wait(self._seconds_until_next())
             except Exception as e:
                 self.logger.error(f"提醒循环异常: {e}")
-                time.sleep(60)  # 出错后等待1分钟
+                with self._wakeup:
+                    self._wakeup.wait(60)  # 出错后等待1分钟（停止服务时立即返回）
 
         self.logger.info("提醒服务循环结束")
 
+    def _seconds_until_next(self) -> float:
+        """距离最近一个提醒时间（或下次全量同步）的秒数"""
+        timeout = min(self.MAX_SLEEP_SECONDS, self._next_resync - time.monotonic())
+        if self._heap:
+            until_due = (self._heap[0][0] - datetime.now()).total_seconds()
+            timeout = min(timeout, until_due)
+        return max(0.0, timeout)
+
+    def _query_schedules(self, knowledge_ids=None):
+        """查询当前用户未完成的复习计划 (计划ID, 计划时间, 知识点ID)"""
+        from src.database.models import ReviewSchedule
+
+        session = self.db_manager.get_session()
+        try:
+            query = session.query(
+                ReviewSchedule.id,
+                ReviewSchedule.scheduled_date,
+                ReviewSchedule.knowledge_item_id,
+            ).filter(
+                ReviewSchedule.user_id == self.current_user_id,
+                ~ReviewSchedule.completed,
+            )
+            if knowledge_ids is not None:
+                query = query.filter(ReviewSchedule.knowledge_item_id.in_(knowledge_ids))
+            return query.all()
+        finally:
+            session.close()
+
+    def _get_deliveries(self, schedule_ids=None):
+        """当前用户在提醒渠道上的投递记录 {计划ID: 投递状态}（与守护进程共用）"""
+        return self.db_manager.get_reminder_deliveries(
+            self.current_user_id, delivery_channel(self.reminder_channel), schedule_ids
+        )
+
+    def _resync(self):
+        """全量重新加载当前用户的计划与投递记录并重建堆"""
+        schedules = self._query_schedules() if self.current_user_id else []
+        deliveries = self._get_deliveries() if schedules else {}
+        self._entries = {}
+        self._heap = []
+        for schedule_id, scheduled_date, knowledge_id in schedules:
+            self._track(
+                schedule_id, scheduled_date, knowledge_id, deliveries.get(schedule_id)
+            )
+        heapq.heapify(self._heap)
+        self._next_resync = time.monotonic() + self.reminder_interval
+        self.logger.debug(f"提醒计划已同步，共 {len(self._entries)} 个")
+
+    def _reload_knowledge(self, knowledge_ids):
+        """只重新加载受影响知识点的计划"""
+        for schedule_id, (_, _, knowledge_id) in list(self._entries.items()):
+            if knowledge_id in knowledge_ids:
+                del self._entries[schedule_id]  # 堆中旧条目在弹出时丢弃
+        schedules = self._query_schedules(knowledge_ids)
+        if not schedules:
+            return
+        deliveries = self._get_deliveries([schedule_id for schedule_id, _, _ in schedules])
+        for schedule_id, scheduled_date, knowledge_id in schedules:
+            self._track(
+                schedule_id, scheduled_date, knowledge_id,
+                deliveries.get(schedule_id), push=True,
+            )
+
+    def _track(self, schedule_id, scheduled_date, knowledge_id, delivery=None, push=False):
+        """按投递状态计算下次提醒时间并加入堆；不再需要提醒的计划不加入"""
+        remind_at = self.backoff.next_due(scheduled_date, delivery)
+        if remind_at is not None:
+            self._schedule(schedule_id, remind_at, scheduled_date, knowledge_id, push)
+
+    def _schedule(self, schedule_id, remind_at, scheduled_date, knowledge_id, push=True):
+        self._entries[schedule_id] = (remind_at, scheduled_date, knowledge_id)
+        if push:
+            heapq.heappush(self._heap, (remind_at, schedule_id))
+        else:
+            self._heap.append((remind_at, schedule_id))
+
+    def _pop_due(self, now: datetime) -> Dict[int, tuple]:
+        """弹出所有已到提醒时间的计划，返回 {计划ID: (计划时间, 知识点ID)}"""
+        due = {}
+        while self._heap and self._heap[0][0] <= now:
+            remind_at, schedule_id = heapq.heappop(self._heap)
+            entry = self._entries.get(schedule_id)
+            if entry is None or entry[0] != remind_at:
+                continue  # 已完成、已取消或已改期
+            del self._entries[schedule_id]
+            due[schedule_id] = entry[1:]
+        return due
+
+    def _send_due_reminders(self, due: Dict[int, tuple]):
+        """为同时到期的计划查询详情（一次查询）并发送提醒，再按投递结果重新入堆"""
+        pending_reviews = self._get_pending_reviews(self.current_user_id, list(due))
+        self.logger.info(f"{len(pending_reviews)} 个复习计划到期")
+        for schedule_id, remind_at in self._deliver(pending_reviews).items():
+            if schedule_id in due and remind_at is not None:
+                scheduled_date, knowledge_id = due[schedule_id]
+                self._schedule(schedule_id, remind_at, scheduled_date, knowledge_id)
+
     def _check_and_send_reminders(self):
-        """检查待提醒计划并发送"""
+        """检查待提醒计划并发送（已在退避窗口内提醒过的计划跳过）"""
         try:
             if not self.current_user_id:
                 self.logger.debug("未设置用户ID，跳过提醒检查")
@@ -335,17 +463,90 @@ class ReminderService:
                 return
 
             self.logger.info(f"找到 {len(pending_reviews)} 个待复习计划")
-
-            # 为每个待复习项发送提醒
-            for review in pending_reviews:
-                self.logger.info(f"准备发送提醒: {review['title']}")
-                self._send_reminder_notification(review)
+            self._deliver(pending_reviews)
 
         except Exception as e:
             self.logger.error(f"检查提醒失败: {e}")
 
-    def _get_pending_reviews(self, user_id: int) -> List[Dict[str, Any]]:
-        """获取待复习的计划 - 改进版：正确识别延迟后的复习计划"""
+    def _deliver(self, reviews: List[Dict[str, Any]]) -> Dict[int, Optional[datetime]]:
+        """按投递记录去重后提交提醒，返回 {计划ID: 下次提醒时间}
+
+        仍在退避窗口内或正在发送的计划不重复提交；同时提交的计划达到
+        coalesce_threshold 个时合并为一条汇总通知。下次提醒时间按发送成功计算，
+        发送失败时由 _on_delivered 安排 RETRY_SECONDS 后重试；None 表示不再提醒。
+        """
+        if not reviews:
+            return {}
+        now = datetime.now()
+        deliveries = self._get_deliveries([review['schedule_id'] for review in reviews])
+
+        next_times = {}
+        to_send = []
+        with self._wakeup:
+            for review in reviews:
+                schedule_id = review['schedule_id']
+                delivery = deliveries.get(schedule_id)
+                remind_at = self.backoff.next_due(review['scheduled_date'], delivery)
+                if schedule_id in self._in_flight:
+                    remind_at = self._next_after_sent(review, delivery, now)
+                elif remind_at is not None and remind_at <= now:
+                    self._in_flight.add(schedule_id)
+                    to_send.append(review)
+                    remind_at = self._next_after_sent(review, delivery, now)
+                next_times[schedule_id] = remind_at
+
+        if not to_send:
+            return next_times
+        if self.coalesce_threshold and len(to_send) >= self.coalesce_threshold:
+            groups = [(to_send, self._send_summary_notification(to_send))]
+        else:
+            groups = []
+            for review in to_send:
+                self.logger.info(f"准备发送提醒: {review['title']}")
+                groups.append(([review], self._send_reminder_notification(review)))
+        for group, future in groups:
+            future.add_done_callback(
+                lambda f, group=group: self._on_delivered(group, f, now)
+            )
+        return next_times
+
+    def _next_after_sent(self, review, delivery, sent_at) -> Optional[datetime]:
+        sent = self.backoff.after_sent(review['scheduled_date'], delivery, sent_at)
+        return self.backoff.next_due(review['scheduled_date'], sent)
+
+    def _on_delivered(self, reviews: List[Dict[str, Any]], future: Future, sent_at: datetime):
+        """通知发送完成回调（在分发线程中执行）：成功则记录投递，失败则安排重试"""
+        success = not future.cancelled() and future.exception() is None and future.result()
+        try:
+            if success:
+                self.db_manager.record_reminder_deliveries(
+                    self.current_user_id,
+                    delivery_channel(self.reminder_channel),
+                    {review['schedule_id']: review['scheduled_date'] for review in reviews},
+                    sent_at=sent_at,
+                )
+        except Exception as e:
+            # 记录失败（如计划刚被删除）时只在内存中退避，全量同步后以数据库为准
+            self.logger.error(f"记录提醒投递失败: {e}")
+        finally:
+            retry_at = datetime.now() + timedelta(seconds=self.RETRY_SECONDS)
+            with self._wakeup:
+                for review in reviews:
+                    self._in_flight.discard(review['schedule_id'])
+                    if not success:
+                        self._retries[review['schedule_id']] = (
+                            retry_at, review['scheduled_date'], review['knowledge_id']
+                        )
+                if not success:
+                    self._wakeup.notify_all()
+
+    def _get_pending_reviews(
+        self, user_id: int, schedule_ids: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """获取待复习的计划 - 改进版：正确识别延迟后的复习计划
+
+        传入 schedule_ids 时只查询这些计划。
+        """
         try:
             session = self.db_manager.get_session()
 
@@ -355,7 +556,7 @@ class ReminderService:
             # 查询待复习的计划（计划时间已到且未完成）
             from src.database.models import ReviewSchedule, KnowledgeItem
 
-            pending_reviews = (
+            query = (
                 session.query(ReviewSchedule, KnowledgeItem)
                 .join(KnowledgeItem, ReviewSchedule.knowledge_item_id == KnowledgeItem.id)
                 .filter(
@@ -363,9 +564,10 @@ class ReminderService:
                     ReviewSchedule.scheduled_date <= now,
                     ~ReviewSchedule.completed
                 )
-                .order_by(ReviewSchedule.scheduled_date.asc())
-                .all()
             )
+            if schedule_ids is not None:
+                query = query.filter(ReviewSchedule.id.in_(schedule_ids))
+            pending_reviews = query.order_by(ReviewSchedule.scheduled_date.asc()).all()
 
             result = []
             for schedule, knowledge in pending_reviews:
@@ -379,7 +581,7 @@ class ReminderService:
                     'content': knowledge.content[:100] + '...' if len(knowledge.content) > 100 else knowledge.content,
                     'scheduled_date': schedule.scheduled_date,
                     'stage_label': self._get_stage_label(schedule.interval_index),
-                    'reminder_channel': 'system',  # 默认使用系统通知
+                    'reminder_channel': self.reminder_channel,
                     'is_delayed': is_delayed,
                     'original_stage': schedule.interval_index
                 })
@@ -436,8 +638,8 @@ class ReminderService:
         }
         return stages.get(interval_index, f"第{interval_index + 1}阶段")
 
-    def _send_reminder_notification(self, review: Dict[str, Any]):
-        """发送复习提醒通知 - 改进版：包含延迟信息"""
+    def _send_reminder_notification(self, review: Dict[str, Any]) -> Future:
+        """发送复习提醒通知 - 改进版：包含延迟信息，返回发送结果的 Future"""
         try:
             title = "📚 智能复习提醒"
 
@@ -460,21 +662,59 @@ class ReminderService:
 
             message += "\n请及时复习以巩固记忆～"
 
-            # 根据提醒渠道发送
-            if review.get("reminder_channel") == "app" and PLYER_AVAILABLE:
-                success = self._send_app_notification(title, message)
-            else:
-                # 默认使用系统通知
-                success = self.system_notifier.notify(title, message, timeout=15)
-
-            if success:
-                delay_status = "（延迟）" if review.get('is_delayed') else ""
-                self.logger.info(f"✅ 已发送复习提醒{delay_status}: {review['title']}")
-            else:
-                self.logger.warning(f"❌ 发送复习提醒失败: {review['title']}")
+            delay_status = "（延迟）" if review.get('is_delayed') else ""
+            return self._dispatch(
+                title, message, review.get("reminder_channel"),
+                f"复习提醒{delay_status}: {review['title']}",
+            )
 
         except Exception as e:
             self.logger.error(f"发送提醒通知失败: {e}")
+            return _completed(False)
+
+    def _send_summary_notification(self, reviews: List[Dict[str, Any]]) -> Future:
+        """同时到期的多个计划合并为一条汇总通知，返回发送结果的 Future"""
+        try:
+            title = f"📚 智能复习提醒：{len(reviews)} 个复习计划到期"
+            lines = [
+                f"• 【{review['stage_label']}】{review['title']}"
+                for review in reviews[:self.SUMMARY_MAX_ITEMS]
+            ]
+            if len(reviews) > self.SUMMARY_MAX_ITEMS:
+                lines.append(f"…等共 {len(reviews)} 项")
+            delayed = sum(1 for review in reviews if review.get('is_delayed'))
+            if delayed:
+                lines.append(f"⚠️ 其中 {delayed} 项已延迟，请尽快完成！")
+            message = "\n".join(lines) + "\n请及时复习以巩固记忆～"
+
+            return self._dispatch(
+                title, message, reviews[0].get("reminder_channel"),
+                f"汇总复习提醒: {len(reviews)} 项",
+            )
+
+        except Exception as e:
+            self.logger.error(f"发送汇总提醒失败: {e}")
+            return _completed(False)
+
+    def _dispatch(self, title: str, message: str, channel: Optional[str],
+                  description: str) -> Future:
+        """根据提醒渠道提交通知，发送结果写入日志"""
+        if channel == "app" and PLYER_AVAILABLE:
+            future = self.system_notifier.submit(
+                title, message, timeout=15, backends=[self._app_backend]
+            )
+        else:
+            # 默认使用系统通知
+            future = self.system_notifier.submit(title, message, timeout=15)
+
+        def log_result(f):
+            if f.result():
+                self.logger.info(f"✅ 已发送{description}")
+            else:
+                self.logger.warning(f"❌ {description} 发送失败")
+
+        future.add_done_callback(log_result)
+        return future
 
     def _send_app_notification(self, title: str, message: str) -> bool:
         """发送App桌面通知（使用plyer）"""
@@ -523,11 +763,20 @@ class ReminderService:
             "is_running": self.is_running,
             "interval_seconds": self.reminder_interval,
             "user_id": self.current_user_id,
+            "scheduled_count": len(self._entries),
+            "notifications": self.system_notifier.metrics(),
             "system": platform.system(),
             "plyer_available": PLYER_AVAILABLE
         }
 
 
+def _completed(result) -> Future:
+    """已完成的 Future（通知未能提交时使用）"""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
 # 全局提醒服务实例
 _global_reminder_service = None
 
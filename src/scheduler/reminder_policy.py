@@ -0,0 +1,84 @@
+"""
+提醒去重与重复提醒策略
+
+每个复习计划在每个提醒渠道上的发送情况持久化在 reminder_deliveries 表中
+（见 models.ReminderDelivery）。计划到期后首次提醒立即发送；若计划一直未完成，
+按退避间隔重复提醒，而不是每次检查都重发。计划改期后重新计数。
+
+图形界面的提醒服务与多用户守护进程发出的都是本机桌面通知（用户渠道 app/system），
+在投递记录中共用同一个渠道键（delivery_channel），彼此的退避窗口同样生效，
+同一计划不会被两者各提醒一次。
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import Optional
+
+# 与 reminder_deliveries 表对应的投递状态（数据库行对象具有相同属性，可直接传入）
+Delivery = namedtuple("Delivery", ["scheduled_for", "last_sent_at", "attempts"])
+
+DESKTOP_CHANNEL = "app"  # 桌面通知在投递记录中的渠道键
+DESKTOP_CHANNELS = ("app", "system")
+
+
+def delivery_channel(channel: Optional[str]) -> str:
+    """提醒渠道在投递记录中的键：桌面通知的各渠道合并为 DESKTOP_CHANNEL"""
+    if channel is None or channel in DESKTOP_CHANNELS:
+        return DESKTOP_CHANNEL
+    return channel
+
+
+class ReminderBackoff:
+    """逾期计划的重复提醒间隔
+
+    第 n 次提醒之后等待 initial * factor^(n-1)，不超过 max_interval；
+    max_attempts 为同一计划时间最多提醒的次数，None 表示不限。
+    """
+
+    def __init__(
+        self,
+        initial: timedelta = timedelta(hours=1),
+        factor: float = 4.0,
+        max_interval: timedelta = timedelta(hours=24),
+        max_attempts: Optional[int] = None,
+    ):
+        self.initial = initial
+        self.factor = factor
+        self.max_interval = max_interval
+        self.max_attempts = max_attempts
+
+    def delay_after(self, attempts: int) -> timedelta:
+        """已提醒 attempts 次后，距离下次提醒的间隔"""
+        delay = self.initial * (self.factor ** max(0, attempts - 1))
+        return min(delay, self.max_interval)
+
+    def next_due(self, scheduled_date: datetime, delivery=None) -> Optional[datetime]:
+        """计划下次应提醒的时间；不再提醒时返回 None
+
+        delivery 为该计划在当前渠道上的投递状态（未提醒过为 None）。
+        """
+        if delivery is None or delivery.scheduled_for != scheduled_date:
+            return scheduled_date  # 从未提醒或已改期：到期即提醒
+        if self.max_attempts is not None and delivery.attempts >= self.max_attempts:
+            return None
+        return delivery.last_sent_at + self.delay_after(delivery.attempts)
+
+    def resend_cutoffs(self, now: datetime):
+        """按已提醒次数给出再次提醒的界限，供数据库查询过滤退避窗口
+
+        上次提醒不晚于界限（now 减去对应间隔）的计划才再次提醒。返回
+        ([(次数, 界限), ...], 其余次数的界限)；间隔不再变化后合并为后者。
+        """
+        steps = []
+        for attempts in range(1, 65):
+            delay = self.delay_after(attempts)
+            if delay >= self.max_interval or delay == self.delay_after(attempts + 1):
+                return steps, now - delay
+            steps.append((attempts, now - delay))
+        return steps, now - self.delay_after(65)
+
+    def after_sent(self, scheduled_date: datetime, delivery, sent_at: datetime) -> Delivery:
+        """发送一次提醒后的投递状态（与 record_reminder_deliveries 的计数规则一致）"""
+        attempts = 1
+        if delivery is not None and delivery.scheduled_for == scheduled_date:
+            attempts = delivery.attempts + 1
+        return Delivery(scheduled_date, sent_at, attempts)
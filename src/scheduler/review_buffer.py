@@ -0,0 +1,312 @@
+"""
+复习评分的写后缓冲：评分先追加到日志文件，后台线程成批写入数据库
+
+快速连续复习时逐张调用 complete_review，每张卡片都要单独开会话、查询、
+提交一次事务。ReviewBuffer.add 只把评分（含评分时刻）作为一行 JSON 追加到
+用户的日志文件并刷到操作系统，然后立即返回；后台线程在攒够 max_batch 条或
+首条评分等待超过 flush_delay 秒时，用 complete_reviews_batch 在一个事务中写入。
+
+崩溃安全：
+- 日志只保存尚未写入数据库的评分；批量提交成功后改写日志（临时文件 + 替换），
+  只保留提交期间新到的评分
+- 创建缓冲时只把日志中遗留的评分读回待写队列（不访问数据库），由 recover()
+  或后台线程写入。提交成功但日志尚未改写时崩溃，回放的计划已完成，会被
+  complete_reviews_batch 跳过，不会重复计分
+- 日志末尾写了一半的行（进程在写入中途退出）丢弃
+- durable=True 时每条评分额外 fsync，断电也不丢；默认只刷到操作系统，
+  与数据库 synchronous=NORMAL 的持久性一致
+
+评分提交后界面已移除卡片，写入结果通过变更事件告知界面：成功的为
+REVIEW_COMPLETED（含下次复习时间）；被跳过的评分（回放的除外）和整批写入
+失败（schedule_id 为空，稍后自动重试，连续失败只通知一次）为 REVIEW_FAILED。
+"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.database.events import ChangeType
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH = 50
+FLUSH_DELAY = 2.0  # 秒
+RETRY_DELAY = 5.0  # 写入数据库失败后的重试间隔（秒）
+
+
+def default_journal_dir(db_manager) -> Optional[str]:
+    """日志目录：数据库文件旁的 review_journal（内存数据库不写日志）"""
+    db_path = getattr(db_manager, "db_path", ":memory:")
+    if not db_path or db_path == ":memory:":
+        return None
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), "review_journal")
+
+
+def read_journal(path: str) -> List[Dict]:
+    """读取日志中的评分，跳过末尾不完整的行"""
+    reviews = []
+    if not os.path.exists(path):
+        return reviews
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                review = json.loads(line)
+            except ValueError:
+                logger.warning("丢弃复习日志中不完整的行: %r", line)
+                continue
+            review["review_date"] = datetime.fromisoformat(review["review_date"])
+            reviews.append(review)
+    return reviews
+
+
+class ReviewBuffer:
+    """单个用户的复习评分写后缓冲（线程安全）"""
+
+    def __init__(
+        self,
+        db_manager,
+        user_id: int,
+        journal_dir: Optional[str] = None,
+        max_batch: int = MAX_BATCH,
+        flush_delay: float = FLUSH_DELAY,
+        durable: bool = False,
+    ):
+        self.db_manager = db_manager
+        self.user_id = user_id
+        self.max_batch = max_batch
+        self.flush_delay = flush_delay
+        self.durable = durable
+        self.journal_path = (
+            os.path.join(journal_dir, f"user_{user_id}.jsonl") if journal_dir else None
+        )
+        self._pending = []
+        self._first_pending_at = None
+        self._retry_at = 0.0  # 写入失败后，此时刻（monotonic）之前不再重试
+        self._failing = False  # 上次写入失败（已通知界面）
+        self._flush_lock = threading.Lock()  # 同一时刻只有一个批量提交
+        self._cond = threading.Condition()
+        self._closed = False
+        self._journal = None
+
+        self._thread = None  # 有待写评分时才运行，空闲时退出
+
+        if self.journal_path:
+            os.makedirs(journal_dir, exist_ok=True)
+            replayed = read_journal(self.journal_path)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+            if replayed:
+                for review in replayed:
+                    review["replayed"] = True
+                with self._cond:
+                    self._pending = replayed
+                    self._first_pending_at = time.monotonic()
+                    # 去掉写了一半的行，之后的评分才能接着追加
+                    self._rewrite_journal()
+                    self._start_thread()
+
+    def recover(self) -> int:
+        """立即写入从日志读回的评分（界面在后台任务中调用），返回完成的复习数"""
+        result = self.flush()
+        if result is None or not result["success"]:
+            return 0
+        logger.info("已回放复习日志：完成 %s 个，跳过 %s 个", result["data"]["completed"],
+                    len(result["data"]["skipped"]))
+        return result["data"]["completed"]
+
+    def add(self, schedule_id: int, effectiveness: int, recall_score: float, notes=None):
+        """记录一次评分（写入日志后立即返回），评分越界时抛出 ValueError"""
+        if not 1 <= effectiveness <= 5:
+            raise ValueError("效果评分需在1-5分之间")
+        if not 0 <= recall_score <= 100:
+            raise ValueError("回忆分数需在0-100之间")
+        review = {
+            "schedule_id": schedule_id,
+            "effectiveness": effectiveness,
+            "recall_score": recall_score,
+            "notes": notes,
+            "review_date": datetime.now(),
+        }
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("复习缓冲已关闭")
+            if self._journal:
+                line = dict(review, review_date=review["review_date"].isoformat())
+                self._journal.write(json.dumps(line, ensure_ascii=False) + "\n")
+                self._journal.flush()
+                if self.durable:
+                    os.fsync(self._journal.fileno())
+            self._pending.append(review)
+            if self._first_pending_at is None:
+                self._first_pending_at = time.monotonic()
+            self._start_thread()
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+
+    def _start_thread(self):
+        """有待写评分时启动后台线程（调用方持有 _cond）"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, daemon=True, name=f"ReviewBuffer-{self.user_id}"
+            )
+            self._thread.start()
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def pending_schedule_ids(self) -> set:
+        """已评分但尚未写入数据库的计划ID（界面据此隐藏这些卡片）"""
+        with self._cond:
+            return {review["schedule_id"] for review in self._pending}
+
+    def flush(self) -> Optional[Dict]:
+        """立即把缓冲中的评分写入数据库，返回 complete_reviews_batch 的结果"""
+        with self._flush_lock:
+            with self._cond:
+                batch = self._pending
+                if not batch:
+                    return None
+                self._pending = []
+                self._first_pending_at = None
+
+            try:
+                result = self.db_manager.complete_reviews_batch(self.user_id, batch)
+            except Exception as e:
+                result = {"success": False, "msg": f"提交失败：{str(e)}"}
+
+            with self._cond:
+                failing, self._failing = self._failing, not result["success"]
+                if not result["success"]:
+                    # 放回队首，稍后重试；日志中仍有这些评分
+                    self._pending[:0] = batch
+                    self._first_pending_at = time.monotonic()
+                    self._retry_at = time.monotonic() + RETRY_DELAY
+                elif self._journal:
+                    self._rewrite_journal()
+
+            if not result["success"]:
+                logger.error("复习缓冲写入失败: %s", result["msg"])
+                if not failing:
+                    self._notify_failed(None, f"{len(batch)} 个复习暂未保存，稍后重试（{result['msg']}）")
+                return result
+            replayed = {review["schedule_id"] for review in batch if review.get("replayed")}
+            for skip in result["data"]["skipped"]:
+                if skip["schedule_id"] not in replayed:
+                    self._notify_failed(skip["schedule_id"], skip["msg"])
+            return result
+
+    def _notify_failed(self, schedule_id: Optional[int], message: str):
+        self.db_manager.emit_change(
+            ChangeType.REVIEW_FAILED, self.user_id, schedule_id=schedule_id, message=message
+        )
+
+    def _rewrite_journal(self):
+        """日志只保留尚未提交的评分（调用方持有 _cond）"""
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for review in self._pending:
+                line = dict(review, review_date=review["review_date"].isoformat())
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal.close()
+        os.replace(tmp_path, self.journal_path)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    flush_at = self._flush_at()
+                    if flush_at is None:
+                        # 全部写入：线程退出，下次 add 时重新启动
+                        self._thread = None
+                        return
+                    if time.monotonic() >= flush_at:
+                        break
+                    self._cond.wait(flush_at - time.monotonic())
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("复习缓冲写入失败: %s", e)
+
+    def _flush_at(self) -> Optional[float]:
+        """下次批量提交的时刻（monotonic），没有待写评分时为 None（调用方持有 _cond）"""
+        if not self._pending:
+            return None
+        flush_at = self._first_pending_at + self.flush_delay
+        if len(self._pending) >= self.max_batch:
+            flush_at = self._first_pending_at
+        return max(flush_at, self._retry_at)
+
+    def close(self) -> Optional[Dict]:
+        """停止后台线程并写入剩余评分"""
+        with self._cond:
+            if self._closed:
+                return None
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        result = self.flush()
+        if self._journal:
+            self._journal.close()
+            if result is None or result["success"]:
+                with self._cond:
+                    if not self._pending and os.path.exists(self.journal_path):
+                        os.remove(self.journal_path)
+        return result
+
+
+class ReviewBufferPool:
+    """一个数据库管理器上各用户的复习缓冲"""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self._buffers: Dict[int, ReviewBuffer] = {}
+        self._lock = threading.Lock()
+
+    def find(self, user_id: int) -> Optional[ReviewBuffer]:
+        """已创建的复习缓冲，尚未创建时为 None"""
+        with self._lock:
+            buffer = self._buffers.get(user_id)
+        return buffer if buffer is not None and not buffer._closed else None
+
+    def get(self, user_id: int) -> ReviewBuffer:
+        """获取（必要时创建并读回日志）用户的复习缓冲"""
+        with self._lock:
+            buffer = self._buffers.get(user_id)
+            if buffer is None or buffer._closed:
+                buffer = ReviewBuffer(
+                    self.db_manager, user_id, default_journal_dir(self.db_manager)
+                )
+                self._buffers[user_id] = buffer
+            return buffer
+
+    def close_all(self) -> None:
+        """写入并关闭全部缓冲"""
+        with self._lock:
+            buffers, self._buffers = list(self._buffers.values()), {}
+        for buffer in buffers:
+            buffer.close()
+
+
+def get_review_buffer(db_manager, user_id: int) -> ReviewBuffer:
+    """获取（必要时创建并读回日志）用户的复习缓冲（每个管理器、每个用户一个）"""
+    return db_manager.get_shared("review_buffers", ReviewBufferPool).get(user_id)
+
+
+def find_review_buffer(db_manager, user_id: int) -> Optional[ReviewBuffer]:
+    """用户已创建的复习缓冲（不创建、不读日志，可在界面线程调用）"""
+    return db_manager.get_shared("review_buffers", ReviewBufferPool).find(user_id)
+
+
+def close_review_buffers(db_manager) -> None:
+    """写入并关闭数据库管理器的全部复习缓冲（退出登录或关闭程序时调用）"""
+    db_manager.get_shared("review_buffers", ReviewBufferPool).close_all()
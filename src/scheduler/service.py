@@ -4,6 +4,7 @@
 
 
 from src.database.models import ReviewSchedule
+from src.scheduler.review_buffer import find_review_buffer, get_review_buffer
 from datetime import datetime, timedelta
 
 class SchedulerService:
@@ -69,6 +70,40 @@ class SchedulerService:
             print(f"❌ 完成复习失败: {e} - service.py:66")
             return {"success": False, "msg": f"完成复习失败: {str(e)}"}
 
+    def submit_review(
+            self,
+            schedule_id,
+            user_id,
+            effectiveness,
+            recall_score,
+            notes=None):
+        """提交评分到写后缓冲（立即返回，后台成批写入数据库，见 scheduler.review_buffer）"""
+        try:
+            get_review_buffer(self.db_manager, user_id).add(
+                schedule_id, effectiveness, recall_score, notes
+            )
+            return {"success": True, "msg": "复习已记录"}
+        except (ValueError, RuntimeError) as e:
+            return {"success": False, "msg": str(e)}
+        except Exception as e:
+            print(f"❌ 提交复习失败: {e} - service.py:submit_review")
+            return {"success": False, "msg": f"提交复习失败: {str(e)}"}
+
+    def complete_reviews_batch(self, user_id, reviews):
+        """在一个事务中完成多个复习"""
+        result = self.db_manager.complete_reviews_batch(user_id, reviews)
+        print(f"✅ {result['msg']} - service.py:complete_reviews_batch")
+        return result
+
+    def recover_reviews(self, user_id):
+        """写入上次未保存的评分（读日志并提交数据库，在后台任务中调用），返回完成的复习数"""
+        return get_review_buffer(self.db_manager, user_id).recover()
+
+    def get_pending_review_ids(self, user_id):
+        """已评分但尚未写入数据库的计划ID（不创建缓冲，可在界面线程调用）"""
+        buffer = find_review_buffer(self.db_manager, user_id)
+        return buffer.pending_schedule_ids() if buffer else set()
+
     def get_review_stats(self, user_id):
         """获取复习统计"""
         try:
@@ -138,6 +173,22 @@ class SchedulerService:
             print(f"❌ 加入今日复习失败: {e} - service.py:135")
             return {"success": False, "msg": f"加入今日复习失败: {str(e)}"}
 
+    def get_scheduling_algorithm(self, user_id):
+        """获取用户的调度算法名称"""
+        return self.db_manager.get_scheduling_algorithm(user_id)
+
+    def set_scheduling_algorithm(self, user_id, name):
+        """切换用户的调度算法（ebbinghaus / sm2 / fsrs）"""
+        result = self.db_manager.set_scheduling_algorithm(user_id, name)
+        print(f"🧮 切换调度算法: {result['msg']} - service.py:set_scheduling_algorithm")
+        return result
+
+    def set_daily_review_cap(self, user_id, cap):
+        """设置每日复习上限（见 scheduler.load_balancer）"""
+        result = self.db_manager.set_daily_review_cap(user_id, cap)
+        print(f"📏 {result['msg']} - service.py:set_daily_review_cap")
+        return result
+
     def get_overall_stats(self, user_id):
         """获取整体统计"""
         try:
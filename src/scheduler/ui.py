@@ -7,9 +7,16 @@
 复习调度界面 - lixinru
 """
 
+import bisect
+from datetime import datetime
+from types import SimpleNamespace
+
 import customtkinter as ctk
 from tkinter import messagebox
 from .service import SchedulerService
+from src.common.executor import get_executor
+from src.common.virtual_list import VirtualList
+from src.database.events import ChangeType
 from src.database.models import KnowledgeItem
 
 
@@ -311,7 +318,8 @@ class ReviewDialog(ctk.CTkToplevel):
 
 
 
-            result = self.scheduler_service.complete_review(
+            # 评分先写入缓冲日志，后台成批提交；界面不等待数据库
+            result = self.scheduler_service.submit_review(
                 schedule_id,
                 self.current_user.id,
                 effectiveness,
@@ -321,33 +329,14 @@ class ReviewDialog(ctk.CTkToplevel):
             if result.get("success", False):
                 messagebox.showinfo("成功", "🎉 复习完成！")
 
-                # 1️⃣ 同步刷新今日复习界面
+                # 提交后由 REVIEW_COMPLETED 事件增量刷新今日复习与知识管理界面，
+                # 回调先把卡片从列表中移除
                 if callable(self.refresh_callback):
                     try:
                         self.refresh_callback()
                     except Exception as e:
                         print(f"⚠️ 回调函数执行失败: {e} - ui.py:after_complete")
 
-                # 2️⃣ 同步刷新知识管理界面
-                try:
-                    # 延迟导入防止循环依赖
-                    from src.knowledge.ui import KnowledgeManagementFrame
-
-                    # 获取应用主窗口的所有子组件
-                    root_widget = self.master
-                    while root_widget.master:
-                        root_widget = root_widget.master  # 找到主App窗口
-
-                    # 遍历Frame查找KnowledgeManagementFrame实例
-                    for child in root_widget.winfo_children():
-                        for subwidget in child.winfo_children():
-                            if isinstance(subwidget, KnowledgeManagementFrame):
-                                subwidget.load_knowledge_items()
-                                print("🔄 已自动刷新知识管理界面 - ui.py:complete_review")
-                                break
-                except Exception as e:
-                    print(f"⚠️ 无法刷新知识管理界面: {e} - ui.py:complete_review")
-
                 self.destroy()
 
             else:
@@ -441,9 +430,13 @@ class ReviewSchedulerFrame(ctk.CTkFrame):
             'completed': '#4ECDC4'
         }
 
-        # 跟踪当前显示的组件
-        self.current_widgets = []
-        self.empty_label = None
+        # 增量刷新状态
+        self._dirty_ids = set()  # 待刷新的知识点ID
+        # 查询全部在后台线程执行，界面线程只负责绑定结果
+        self.executor = get_executor()
+        self._list_key = (id(self), "today_reviews")
+        self._flush_job = None
+        self._submitted = {}  # 已评分、等待写入结果的计划ID -> 标题
 
         print(f"🎯 今日复习界面初始化完成  用户ID: {self.current_user.id} - ui.py:326")
 
@@ -453,6 +446,113 @@ class ReviewSchedulerFrame(ctk.CTkFrame):
         self.load_today_reviews()
         print("🎯 今日复习界面数据加载完成 - ui.py:332")
 
+        # 订阅数据变更：只增删受影响的复习卡片（事件经执行器队列回到界面线程）
+        self.executor.watch(self)
+        self._unsubscribe = db_manager.subscribe(self._on_data_changed)
+        # 后台写入上次未保存的评分（读日志、提交数据库），完成后刷新列表
+        self.executor.submit(
+            self,
+            self.scheduler_service.recover_reviews,
+            self.current_user.id,
+            on_success=lambda completed: self.load_today_reviews(),
+        )
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _on_destroy(self, event):
+        """界面销毁时取消订阅"""
+        if event.widget is self and self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def _on_data_changed(self, event):
+        """数据变更回调（在写操作所在线程执行），不能调用 Tk，交给界面线程处理"""
+        if event.user_id != self.current_user.id:
+            return
+        self.executor.post(self, self._handle_change, event)
+
+    def _handle_change(self, event):
+        """处理数据变更（界面线程）"""
+        if event.type is ChangeType.REVIEW_FAILED:
+            self._on_review_failed(event)
+        elif event.type is ChangeType.REVIEW_COMPLETED and event.schedule_id in self._submitted:
+            self._show_review_saved(self._submitted.pop(event.schedule_id), event.next_review_at)
+
+        if event.type is ChangeType.KNOWLEDGE_IMPORTED:
+            # 批量导入：整页刷新
+            self.load_today_reviews()
+        elif event.knowledge_id is not None:
+            self._mark_dirty(event.knowledge_id)
+
+    def _mark_dirty(self, knowledge_id):
+        """记录待刷新的知识点，同一轮事件合并为一次刷新"""
+        self._dirty_ids.add(knowledge_id)
+        if self._flush_job is None:
+            self._flush_job = self.after_idle(self._flush_dirty)
+
+    def _flush_dirty(self):
+        """只重新查询受影响知识点的今日计划，并替换对应卡片"""
+        self._flush_job = None
+        dirty_ids, self._dirty_ids = self._dirty_ids, set()
+        if not dirty_ids or not self.winfo_exists():
+            return
+
+        # 当前显示的是空状态占位，或整页加载尚未返回，直接整页刷新
+        if not len(self.list_view) or self.executor.is_loading(self._list_key):
+            self.load_today_reviews()
+            return
+
+        self.executor.submit(
+            self,
+            self.db_manager.get_today_reviews,
+            self.current_user.id,
+            knowledge_ids=list(dirty_ids),
+            on_success=lambda reviews: self._apply_dirty(dirty_ids, reviews),
+            on_error=self._on_flush_error,
+        )
+
+    def _on_flush_error(self, error):
+        print(f"❌ 增量刷新失败: {error}，回退到整页刷新 - ui.py:_flush_dirty")
+        self.load_today_reviews()
+
+    def _apply_dirty(self, dirty_ids, reviews):
+        """把增量查询结果合并到列表（界面线程）"""
+        # 移除受影响知识点的旧计划，新的今日计划按计划时间插入（与整页加载顺序一致）
+        stale = [
+            review['schedule_id'] for review in self.list_view.items
+            if self._knowledge_id_of(review) in dirty_ids
+        ]
+        for schedule_id in stale:
+            self.list_view.remove(schedule_id)
+        pending = self.scheduler_service.get_pending_review_ids(self.current_user.id)
+        for review in reviews:
+            if review['schedule_id'] not in pending:
+                order = [self._review_order(item) for item in self.list_view.items]
+                index = bisect.bisect_right(order, self._review_order(review))
+                self.list_view.insert(index, review)
+
+        if not len(self.list_view):
+            self.load_today_reviews()  # 显示空状态
+            return
+        self._update_list_stats()
+
+    @staticmethod
+    def _review_order(review):
+        """列表排序键：计划时间、计划ID（与 get_today_reviews 的排序一致）"""
+        scheduled = review.get('scheduled_date')
+        if not isinstance(scheduled, datetime):
+            scheduled = datetime.min
+        return scheduled, review.get('schedule_id') or 0
+
+    def _update_list_stats(self):
+        """按列表中的计划更新统计信息"""
+        items = self.list_view.items
+        completed = sum(1 for review in items if self._get_completed_status(review))
+        self._update_stats_label(completed, len(items))
+
+    @staticmethod
+    def _knowledge_id_of(review):
+        return review.get('knowledge_item_id') or review.get('knowledge_id')
+
     def create_widgets(self):
         """创建界面组件 - 采用知识管理页面样式"""
         # 配置网格布局
@@ -487,6 +587,15 @@ class ReviewSchedulerFrame(ctk.CTkFrame):
         )
         self.stats_label.grid(row=0, column=1, sticky="w", padx=15)
 
+        # 评分写入结果（下次复习时间）
+        self.feedback_label = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color=self.colors['success']
+        )
+        self.feedback_label.grid(row=1, column=0, columnspan=3, sticky="w")
+
         # 刷新按钮
         refresh_btn = ctk.CTkButton(
             header_frame,
@@ -510,132 +619,137 @@ class ReviewSchedulerFrame(ctk.CTkFrame):
         self.create_list_frame()
 
     def create_list_frame(self):
-        """创建复习列表框架"""
+        """创建复习列表框架（虚拟化列表 + 空状态提示）"""
         # 清空容器
         for widget in self.list_container.winfo_children():
             widget.destroy()
 
-        # 滚动框架
-        self.scrollable_frame = ctk.CTkScrollableFrame(
+        # 只渲染可见区域的卡片，滚动时复用
+        self.list_view = VirtualList(
             self.list_container,
+            row_height=ReviewCard.ROW_HEIGHT,
+            create_row=lambda parent: ReviewCard(parent, self),
+            bind_row=lambda card, review, index: card.bind_review(review),
+            key=lambda review: review['schedule_id'],
+            canvas_bg=self.colors['light'],
             fg_color=self.colors['light'],
             corner_radius=12
         )
-        self.scrollable_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-        self.scrollable_frame.grid_columnconfigure(0, weight=1)
+        self.list_view.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
 
-    def clear_widgets(self):
-        """安全地清除所有组件"""
-        try:
-            # 清除当前跟踪的组件
-            for widget in self.current_widgets:
-                try:
-                    widget.destroy()
-                except Exception:
-                    continue
-            self.current_widgets = []
-
-            # 清除空状态标签
-            if self.empty_label:
-                try:
-                    self.empty_label.destroy()
-                except Exception:
-                    pass
-                self.empty_label = None
-
-            # 清除滚动框架中的所有子组件
-            for widget in self.scrollable_frame.winfo_children():
-                try:
-                    widget.destroy()
-                except Exception:
-                    continue
-        except Exception as e:
-            print(f"清除组件时出错: {e} - ui.py:431")
+        # 空状态
+        self.empty_frame = ctk.CTkFrame(
+            self.list_container,
+            fg_color="transparent",
+            corner_radius=12
+        )
+        self.empty_frame.grid_columnconfigure(0, weight=1)
+        self.empty_label = ctk.CTkLabel(
+            self.empty_frame,
+            text="🎉 太棒了！\n所有今日复习任务已完成！",
+            font=ctk.CTkFont(size=16),
+            text_color=self.colors['dark']
+        )
+        self.empty_label.grid(row=0, column=0, pady=10)
 
     def load_today_reviews(self):
-        """加载今日复习计划"""
+        """加载今日复习计划（后台查询，结果回到界面线程绑定）"""
         print("🔄 今日复习界面开始加载数据 - ui.py:435")
-        # 安全地清除现有内容
-        self.clear_widgets()
-
-        try:
-            print(f"🔍 调用调度器服务获取今日复习计划，用户ID: {self.current_user.id} - ui.py:440")
+        self.executor.submit(
+            self,
+            self._query_today_reviews,
+            key=self._list_key,
+            on_success=self._show_today_reviews,
+            on_error=self._on_load_error,
+            on_loading=self._set_loading,
+        )
 
-            # 尝试不同的方法名来获取今日复习计划
+    def _query_today_reviews(self):
+        """后台线程：获取今日复习计划"""
+        print(f"🔍 调用调度器服务获取今日复习计划，用户ID: {self.current_user.id} - ui.py:440")
+
+        # 尝试不同的方法名来获取今日复习计划
+        today_reviews = []
+
+        # 方法1: 尝试 get_today_review_plans
+        if hasattr(self.scheduler_service, 'get_today_review_plans'):
+            today_reviews = self.scheduler_service.get_today_review_plans(
+                self.current_user.id)
+            print("✅ 使用 get_today_review_plans 方法 - ui.py:449")
+        # 方法2: 尝试 get_today_reviews
+        elif hasattr(self.scheduler_service, 'get_today_reviews'):
+            today_reviews = self.scheduler_service.get_today_reviews(
+                self.current_user.id)
+            print("✅ 使用 get_today_reviews 方法 - ui.py:454")
+        else:
+            print("❌ 调度器服务中没有找到获取今日复习计划的方法 - ui.py:456")
             today_reviews = []
 
-            # 方法1: 尝试 get_today_review_plans
-            if hasattr(self.scheduler_service, 'get_today_review_plans'):
-                today_reviews = self.scheduler_service.get_today_review_plans(
-                    self.current_user.id)
-                print("✅ 使用 get_today_review_plans 方法 - ui.py:449")
-            # 方法2: 尝试 get_today_reviews
-            elif hasattr(self.scheduler_service, 'get_today_reviews'):
-                today_reviews = self.scheduler_service.get_today_reviews(
-                    self.current_user.id)
-                print("✅ 使用 get_today_reviews 方法 - ui.py:454")
-            else:
-                print("❌ 调度器服务中没有找到获取今日复习计划的方法 - ui.py:456")
-                today_reviews = []
-
-            print(f"📊 今日复习界面收到 {len(today_reviews)} 个复习计划 - ui.py:459")
+        print(f"📊 今日复习界面收到 {len(today_reviews)} 个复习计划 - ui.py:459")
+        return today_reviews
 
-            if not today_reviews:
-                # 创建空状态提示 - 采用知识管理页面样式
-                empty_frame = ctk.CTkFrame(
-                    self.scrollable_frame,
-                    fg_color="transparent",
-                    corner_radius=12
-                )
-                empty_frame.grid(row=0, column=0, sticky="nsew", pady=50)
-                empty_frame.grid_columnconfigure(0, weight=1)
-
-                self.empty_label = ctk.CTkLabel(
-                    empty_frame,
-                    text="🎉 太棒了！\n所有今日复习任务已完成！",
-                    font=ctk.CTkFont(size=16),
-                    text_color=self.colors['dark']
-                )
-                self.empty_label.grid(row=0, column=0, pady=10)
+    def _on_load_error(self, error):
+        print(f"❌ 加载复习计划失败: {str(error)} - ui.py:515")
+        messagebox.showerror("错误", f"加载复习计划失败: {str(error)}")
 
-                self.stats_label.configure(
-                    text="🎉 今日无复习任务",
-                    text_color=self.colors['success']
-                )
-                return
+    def _set_loading(self, loading):
+        """显示加载状态"""
+        if loading:
+            self.stats_label.configure(
+                text="今日复习：加载中...",
+                text_color=self.colors['dark']
+            )
 
-            # 更新统计信息
-            completed = sum(
-                1 for review in today_reviews if self._get_completed_status(review))
-            total = len(today_reviews)
-
-            # 根据完成情况设置统计信息颜色
-            if completed == total:
-                stats_color = self.colors['success']
-                stats_text = f"🎉 全部完成: {completed}/{total}"
-            elif completed > 0:
-                stats_color = self.colors['primary']
-                stats_text = f"📊 进度: {completed}/{total}"
-            else:
-                stats_color = self.colors['warning']
-                stats_text = f"⏳ 待开始: {completed}/{total}"
+    def _show_today_reviews(self, today_reviews):
+        """把今日复习计划绑定到列表（界面线程）"""
+        # 已评分、尚在缓冲中的计划不再显示
+        pending = self.scheduler_service.get_pending_review_ids(self.current_user.id)
+        today_reviews = [
+            review for review in today_reviews
+            if self._ensure_dict_format(review).get('schedule_id') not in pending
+        ]
+        if not today_reviews:
+            # 显示空状态提示
+            self.list_view.set_items([])
+            self.list_view.grid_remove()
+            self.empty_frame.grid(row=0, column=0, sticky="nsew", pady=50)
 
             self.stats_label.configure(
-                text=stats_text,
-                text_color=stats_color
+                text="🎉 今日无复习任务",
+                text_color=self.colors['success']
             )
+            return
 
-            # 显示复习项目
-            for i, review in enumerate(today_reviews):
-                review_item = self.create_review_item(review, i)
-                if review_item:
-                    self.current_widgets.append(review_item)
+        # 更新统计信息
+        completed = sum(
+            1 for review in today_reviews if self._get_completed_status(review))
+        self._update_stats_label(completed, len(today_reviews))
 
-            print(f"✅ 成功创建 {len(self.current_widgets)} 个复习项目 - ui.py:512")
+        # 显示复习项目（虚拟列表只创建可见区域的卡片）
+        self.empty_frame.grid_remove()
+        self.list_view.grid()
+        self.list_view.set_items(
+            [self._ensure_dict_format(review) for review in today_reviews]
+        )
 
-        except Exception as e:
-            print(f"❌ 加载复习计划失败: {str(e)} - ui.py:515")
-            messagebox.showerror("错误", f"加载复习计划失败: {str(e)}")
+        print(f"✅ 成功绑定 {len(today_reviews)} 个复习项目 - ui.py:512")
+
+    def _update_stats_label(self, completed, total):
+        """根据完成情况更新统计信息及颜色"""
+        if completed == total:
+            stats_color = self.colors['success']
+            stats_text = f"🎉 全部完成: {completed}/{total}"
+        elif completed > 0:
+            stats_color = self.colors['primary']
+            stats_text = f"📊 进度: {completed}/{total}"
+        else:
+            stats_color = self.colors['warning']
+            stats_text = f"⏳ 待开始: {completed}/{total}"
+
+        self.stats_label.configure(
+            text=stats_text,
+            text_color=stats_color
+        )
 
     def _get_completed_status(self, review):
         """安全地获取完成状态"""
@@ -646,197 +760,6 @@ class ReviewSchedulerFrame(ctk.CTkFrame):
         else:
             return False
 
-    def create_review_item(self, review, index):
-        """创建复习项目UI - 采用知识管理页面卡片样式"""
-        print(f"🔧 创建复习项目: {type(review)} - ui.py:529")
-
-        try:
-            # 确保review是字典格式
-            review = self._ensure_dict_format(review)
-
-            session = self.db_manager.get_session()
-            try:
-                # 获取知识点ID - 尝试不同的字段名
-                knowledge_item_id = (review.get('knowledge_item_id') or
-                                     review.get('knowledge_id'))
-
-                if not knowledge_item_id:
-                    print("❌ 无法获取知识点ID - ui.py:542")
-                    return None
-
-                # 获取知识点信息
-                knowledge_item = (
-                    session.query(KnowledgeItem)
-                        .filter(KnowledgeItem.id == knowledge_item_id)
-                        .first()
-                )
-
-                if not knowledge_item:
-                    print(f"❌ 找不到知识点: ID {knowledge_item_id} - ui.py:553")
-                    return None
-
-                is_completed = review.get('completed', False)
-                is_urgent = not is_completed  # 未完成的视为紧急
-
-                # 复习项目卡片 - 采用知识管理页面样式
-                card = ctk.CTkFrame(
-                    self.scrollable_frame,
-                    fg_color="white",
-                    border_color=self.colors['today'] if not is_completed else "#E0E0E0",
-                    border_width=2 if not is_completed else 1,
-                    corner_radius=12
-                )
-                card.grid(row=index, column=0, sticky="ew", padx=10, pady=8)
-                card.grid_columnconfigure(1, weight=1)
-
-                # 紧急状态指示器（未完成时显示）
-                if is_urgent:
-                    urgency_indicator = ctk.CTkFrame(
-                        card,
-                        fg_color=self.colors['danger'],
-                        width=6,
-                        corner_radius=3
-                    )
-                    urgency_indicator.grid(row=0, column=0, rowspan=3, sticky="ns", padx=(10, 5), pady=10)
-
-                # 内容区域
-                content_frame = ctk.CTkFrame(card, fg_color="transparent")
-                content_frame.grid(row=0, column=1, sticky="ew", padx=10, pady=12)
-                content_frame.grid_columnconfigure(0, weight=1)
-
-                # 标题和状态
-                title_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-                title_frame.grid(row=0, column=0, sticky="ew", pady=(0, 8))
-                title_frame.grid_columnconfigure(0, weight=1)
-
-                title_label = ctk.CTkLabel(
-                    title_frame,
-                    text=f"📖 {knowledge_item.title}",
-                    font=ctk.CTkFont(size=16, weight="bold"),
-                    text_color=self.colors['dark'],
-                    anchor="w"
-                )
-                title_label.grid(row=0, column=0, sticky="w")
-
-                # 状态标签
-                if is_completed:
-                    status_text = "✅ 已完成"
-                    status_color = self.colors['completed']
-                else:
-                    # 使用字典访问方式获取阶段信息
-                    interval_index = review.get('interval_index', 0)
-                    status_text = f"第 {interval_index + 1} 次复习"
-                    # 如果有阶段标签，使用阶段标签
-                    status_text = review.get('stage_label', status_text)
-                    status_color = self.colors['today']
-
-                status_label = ctk.CTkLabel(
-                    title_frame,
-                    text=status_text,
-                    font=ctk.CTkFont(size=11, weight="bold"),
-                    text_color="white",
-                    fg_color=status_color,
-                    corner_radius=8,
-                    padx=8,
-                    pady=2
-                )
-                status_label.grid(row=0, column=1, sticky="e", padx=(10, 0))
-
-                # 元信息
-                meta_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-                meta_frame.grid(row=1, column=0, sticky="ew", pady=(0, 10))
-
-                # 分类
-                if knowledge_item.category:
-                    category_label = ctk.CTkLabel(
-                        meta_frame,
-                        text=f"🏷️ {knowledge_item.category}",
-                        font=ctk.CTkFont(size=12),
-                        text_color=self.colors['secondary']
-                    )
-                    category_label.grid(row=0, column=0, sticky="w")
-
-                # 时间信息
-                scheduled_date = review.get('scheduled_date', '')
-                if hasattr(scheduled_date, 'strftime'):
-                    time_str = scheduled_date.strftime('%H:%M')
-                elif isinstance(scheduled_date, str) and ' ' in scheduled_date:
-                    time_str = scheduled_date.split(' ')[1][:5]  # 提取时间部分
-                else:
-                    time_str = '未知时间'
-
-                time_label = ctk.CTkLabel(
-                    meta_frame,
-                    text=f"⏰ {time_str}",
-                    font=ctk.CTkFont(size=11),
-                    text_color="#666666"
-                )
-                time_label.grid(row=0, column=1, sticky="w", padx=(20, 0))
-
-                # 内容预览
-                content_preview = knowledge_item.content
-                if content_preview:
-                    if len(content_preview) > 120:
-                        content_preview = content_preview[:120] + "..."
-
-                    content_label = ctk.CTkLabel(
-                        content_frame,
-                        text=content_preview,
-                        font=ctk.CTkFont(size=12),
-                        text_color="#555555",
-                        wraplength=400,
-                        justify="left"
-                    )
-                    content_label.grid(row=2, column=0, sticky="w", pady=(0, 12))
-
-                # 操作按钮区域
-                button_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-                button_frame.grid(row=3, column=0, sticky="ew")
-
-                # 按钮样式
-                btn_style = {
-                    'width': 80,
-                    'height': 30,
-                    'font': ctk.CTkFont(size=11, weight="bold"),
-                    'corner_radius': 8
-                }
-
-                if not is_completed:
-                    # 开始复习按钮
-                    review_btn = ctk.CTkButton(
-                        button_frame,
-                        text="🎯 开始复习",
-                        command=lambda r=review: self.start_review(r),
-                        fg_color=self.colors['today'],
-                        hover_color='#E55A4D',
-                        **btn_style
-                    )
-                    review_btn.pack(side="left", padx=(0, 8))
-                else:
-                    # 查看详情按钮
-                    detail_btn = ctk.CTkButton(
-                        button_frame,
-                        text="👀 查看详情",
-                        command=lambda: self.show_item_detail(knowledge_item),
-                        fg_color=self.colors['primary'],
-                        hover_color='#1B6B93',
-                        **btn_style
-                    )
-                    detail_btn.pack(side="left", padx=(0, 8))
-
-                print(f"✅ 成功创建复习项目: {knowledge_item.title} - ui.py:705")
-                return card
-
-            except Exception as e:
-                print(f"❌ 创建复习项目时出错: {e} - ui.py:709")
-                return None
-            finally:
-                session.close()
-
-        except Exception as e:
-            print(f"❌ 处理复习项目时出错: {e} - ui.py:715")
-            return None
-
     def show_item_detail(self, knowledge_item):
         """显示知识点详情"""
         try:
@@ -895,8 +818,231 @@ class ReviewSchedulerFrame(ctk.CTkFrame):
                 self.current_user,
                 self.scheduler_service,
                 self.db_manager,
-                self.master.refresh_all_views if hasattr(self.master,
-                                                             "refresh_all_views") else self.load_today_reviews,
+                lambda: self._on_review_submitted(review),
                 )
         except Exception as e:
-            messagebox.showerror("错误", f"打开复习对话框失败: {str(e)}")
\ No newline at end of file
+            messagebox.showerror("错误", f"打开复习对话框失败: {str(e)}")
+
+    def _on_review_submitted(self, review):
+        """评分已进入缓冲：立即移除卡片，写入数据库后由数据变更事件补上下一阶段的计划"""
+        review = self._ensure_dict_format(review)
+        schedule_id = review.get('schedule_id')
+        self._submitted[schedule_id] = review.get('title') or '知识点'
+        if self.list_view.remove(schedule_id) and not len(self.list_view):
+            self._show_today_reviews([])
+        elif len(self.list_view):
+            self._update_list_stats()
+
+    def _show_review_saved(self, title, next_review_at):
+        """评分已写入数据库：显示下次复习时间"""
+        if next_review_at is None:
+            text = f"🏆 《{title}》已掌握，不再安排复习"
+        else:
+            text = f"✅ 《{title}》已保存，下次复习：{next_review_at.strftime('%Y-%m-%d %H:%M')}"
+        self.feedback_label.configure(text=text, text_color=self.colors['success'])
+
+    def _on_review_failed(self, event):
+        """评分被跳过或暂未写入：提示用户并重新加载列表（跳过的卡片重新出现）"""
+        if event.schedule_id is None:
+            # 整批写入失败：评分仍在缓冲中，稍后自动重试
+            text = f"⚠️ {event.message}"
+        else:
+            title = self._submitted.pop(event.schedule_id, '知识点')
+            text = f"⚠️ 《{title}》的复习未保存：{event.message}"
+            messagebox.showwarning("复习未保存", text)
+        self.feedback_label.configure(text=text, text_color=self.colors['danger'])
+        self.load_today_reviews()
+
+
+class ReviewCard(ctk.CTkFrame):
+    """可复用的复习卡片：组件只创建一次，bind_review 时更新内容"""
+
+    ROW_HEIGHT = 190  # 虚拟列表固定行高（含间距）
+    PREVIEW_LENGTH = 80  # 固定行高下的内容预览长度
+
+    def __init__(self, parent, owner):
+        colors = owner.colors
+        super().__init__(
+            parent,
+            fg_color="white",
+            border_color=colors['today'],
+            border_width=2,
+            corner_radius=12
+        )
+        self.owner = owner
+        self.colors = colors
+        self.review = None
+        self.grid_columnconfigure(1, weight=1)
+
+        # 紧急状态指示器（未完成时显示）
+        self.urgency_indicator = ctk.CTkFrame(
+            self,
+            fg_color=colors['danger'],
+            width=6,
+            corner_radius=3
+        )
+        self.urgency_indicator.grid(row=0, column=0, rowspan=3, sticky="ns", padx=(10, 5), pady=10)
+
+        # 内容区域
+        content_frame = ctk.CTkFrame(self, fg_color="transparent")
+        content_frame.grid(row=0, column=1, sticky="ew", padx=10, pady=12)
+        content_frame.grid_columnconfigure(0, weight=1)
+
+        # 标题和状态
+        title_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        title_frame.grid(row=0, column=0, sticky="ew", pady=(0, 8))
+        title_frame.grid_columnconfigure(0, weight=1)
+
+        self.title_label = ctk.CTkLabel(
+            title_frame,
+            text="",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=colors['dark'],
+            anchor="w"
+        )
+        self.title_label.grid(row=0, column=0, sticky="w")
+
+        self.status_label = ctk.CTkLabel(
+            title_frame,
+            text="",
+            font=ctk.CTkFont(size=11, weight="bold"),
+            text_color="white",
+            corner_radius=8,
+            padx=8,
+            pady=2
+        )
+        self.status_label.grid(row=0, column=1, sticky="e", padx=(10, 0))
+
+        # 元信息
+        meta_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        meta_frame.grid(row=1, column=0, sticky="ew", pady=(0, 10))
+
+        self.category_label = ctk.CTkLabel(
+            meta_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=colors['secondary']
+        )
+        self.category_label.grid(row=0, column=0, sticky="w")
+
+        self.time_label = ctk.CTkLabel(
+            meta_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color="#666666"
+        )
+        self.time_label.grid(row=0, column=1, sticky="w", padx=(20, 0))
+
+        # 内容预览
+        self.content_label = ctk.CTkLabel(
+            content_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color="#555555",
+            wraplength=400,
+            justify="left"
+        )
+        self.content_label.grid(row=2, column=0, sticky="w", pady=(0, 12))
+
+        # 操作按钮区域
+        button_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        button_frame.grid(row=3, column=0, sticky="ew")
+
+        # 按钮样式
+        btn_style = {
+            'width': 80,
+            'height': 30,
+            'font': ctk.CTkFont(size=11, weight="bold"),
+            'corner_radius': 8
+        }
+
+        # 开始复习按钮
+        self.review_btn = ctk.CTkButton(
+            button_frame,
+            text="🎯 开始复习",
+            command=lambda: self.owner.start_review(self.review),
+            fg_color=colors['today'],
+            hover_color='#E55A4D',
+            **btn_style
+        )
+        self.review_btn.pack(side="left", padx=(0, 8))
+
+        # 查看详情按钮（已完成时显示）
+        self.detail_btn = ctk.CTkButton(
+            button_frame,
+            text="👀 查看详情",
+            command=self._show_detail,
+            fg_color=colors['primary'],
+            hover_color='#1B6B93',
+            **btn_style
+        )
+
+    def bind_review(self, review):
+        """把复习计划数据绑定到卡片"""
+        self.review = review
+        colors = self.colors
+        is_completed = review.get('completed', False)
+
+        self.configure(
+            border_color=colors['today'] if not is_completed else "#E0E0E0",
+            border_width=2 if not is_completed else 1
+        )
+        if is_completed:
+            self.urgency_indicator.grid_remove()
+        else:
+            self.urgency_indicator.grid()
+
+        self.title_label.configure(text=f"📖 {review.get('title', '无标题')}")
+
+        # 状态标签
+        if is_completed:
+            status_text = "✅ 已完成"
+            status_color = colors['completed']
+        else:
+            interval_index = review.get('interval_index', 0)
+            status_text = review.get('stage_label', f"第 {interval_index + 1} 次复习")
+            status_color = colors['today']
+        self.status_label.configure(text=status_text, fg_color=status_color)
+
+        if review.get('category'):
+            self.category_label.configure(text=f"🏷️ {review.get('category')}")
+            self.category_label.grid()
+        else:
+            self.category_label.grid_remove()
+
+        # 时间信息
+        scheduled_date = review.get('scheduled_date', '')
+        if hasattr(scheduled_date, 'strftime'):
+            time_str = scheduled_date.strftime('%H:%M')
+        elif isinstance(scheduled_date, str) and ' ' in scheduled_date:
+            time_str = scheduled_date.split(' ')[1][:5]  # 提取时间部分
+        else:
+            time_str = '未知时间'
+        self.time_label.configure(text=f"⏰ {time_str}")
+
+        content_preview = review.get('content', '')
+        if content_preview:
+            if len(content_preview) > self.PREVIEW_LENGTH:
+                content_preview = content_preview[:self.PREVIEW_LENGTH] + "..."
+            self.content_label.configure(text=content_preview)
+            self.content_label.grid()
+        else:
+            self.content_label.grid_remove()
+
+        if is_completed:
+            self.review_btn.pack_forget()
+            self.detail_btn.pack(side="left", padx=(0, 8))
+        else:
+            self.detail_btn.pack_forget()
+            self.review_btn.pack(side="left", padx=(0, 8))
+
+    def _show_detail(self):
+        """用复习计划中已带出的知识点字段打开详情，无需再次查询"""
+        review = self.review
+        self.owner.show_item_detail(SimpleNamespace(
+            id=self.owner._knowledge_id_of(review),
+            title=review.get('title', '无标题'),
+            content=review.get('content', ''),
+            category=review.get('category', ''),
+            created_at=review.get('created_at'),
+        ))
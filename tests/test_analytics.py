@@ -54,10 +54,28 @@ class TestAnalyticsService:
         chart_data = analytics_service.create_learning_chart(test_user.id)
         assert chart_data.startswith("data:image/png;base64,")
 
-    def test_calculate_streak_days(self, analytics_service):
-        """测试连续学习天数计算"""
-        # 这里可以添加更详细的测试用例
-        assert True
+    def test_calculate_streak_days(self, analytics_service, monkeypatch):
+        """测试连续学习天数计算，概况统计只打开一个会话"""
+        from datetime import datetime, timedelta
+
+        from src.database.models import DailyUserStat
+
+        db_manager = analytics_service.db_manager
+        session = db_manager.get_session()
+        today = datetime.now().date()
+        for offset in (0, 1, 3):
+            session.add(DailyUserStat(
+                user_id=1, date=today - timedelta(days=offset), review_count=1))
+        session.commit()
+        session.close()
+
+        opened = []
+        get_session = db_manager.get_session
+        monkeypatch.setattr(
+            db_manager, "get_session", lambda: opened.append(1) or get_session())
+        overview = analytics_service.calculate_user_overview(1)
+        assert overview["streak_days"] == 2
+        assert len(opened) == 1
 
 
 def test_analytics_imports():
@@ -68,3 +86,109 @@ def test_analytics_imports():
         assert True
     except ImportError as exc:
         assert False, f'导入失败: {exc}'
+
+
+class TestChartCache:
+    """统计图表缓存测试"""
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建带测试用户的内存数据库"""
+        db_manager = DatabaseManager(":memory:")
+        session = db_manager.get_session()
+        user = User(username="chart", email="chart@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        self.user_id = user.id
+        session.close()
+        return db_manager
+
+    def _count_renders(self, service, monkeypatch):
+        """统计 matplotlib 实际渲染次数"""
+        renders = []
+        original = service._create_chart_image
+
+        def counting(*args):
+            renders.append(args)
+            return original(*args)
+
+        monkeypatch.setattr(service, "_create_chart_image", counting)
+        return renders
+
+    def test_cache_released_with_manager(self):
+        """测试缓存挂在数据库管理器上，随管理器一起回收"""
+        import gc
+        import weakref
+
+        from src.analytics.chart_cache import get_chart_cache
+
+        db_manager = DatabaseManager(":memory:")
+        cache = get_chart_cache(db_manager)
+        assert get_chart_cache(db_manager) is cache
+        manager_ref, cache_ref = weakref.ref(db_manager), weakref.ref(cache)
+        db_manager.engine.dispose()
+        del db_manager, cache
+        gc.collect()
+        assert manager_ref() is None and cache_ref() is None
+
+    def test_repeat_render_hits_cache(self, db_manager, monkeypatch):
+        """测试数据未变化时重复打开不再渲染，且缓存跨服务实例共享"""
+        service = AnalyticsService(db_manager)
+        renders = self._count_renders(service, monkeypatch)
+        first = service.create_learning_chart(self.user_id)
+        assert service.create_learning_chart(self.user_id) == first
+        assert len(renders) == 1
+
+        other = AnalyticsService(db_manager)
+        other_renders = self._count_renders(other, monkeypatch)
+        assert other.create_learning_chart(self.user_id) == first
+        assert other_renders == []
+
+    def test_complete_review_invalidates(self, db_manager, monkeypatch):
+        """测试完成复习后重新渲染"""
+        service = AnalyticsService(db_manager)
+        renders = self._count_renders(service, monkeypatch)
+        service.create_learning_chart(self.user_id)
+
+        added = db_manager.add_knowledge(self.user_id, "知识", "内容")
+        db_manager.complete_review(added["data"]["first_schedule_id"], self.user_id, 4, 80)
+        assert service.chart_cache._memory == {}
+
+        service.create_learning_chart(self.user_id)
+        assert len(renders) == 2
+
+
+def test_chart_cache_disk_tier(tmp_path):
+    """测试磁盘层在新进程（新缓存实例）中命中，并可按用户失效"""
+    from src.analytics.chart_cache import DATA_URI_PREFIX, ChartCache
+    import base64
+
+    image = DATA_URI_PREFIX + base64.b64encode(b"\x89PNG fake").decode()
+    key = ChartCache.make_key(1, "learning_trend", "fp")
+    ChartCache(cache_dir=str(tmp_path)).put(1, key, image)
+
+    fresh = ChartCache(cache_dir=str(tmp_path))
+    assert fresh.get(1, key) == image
+    fresh.invalidate_user(1)
+    assert ChartCache(cache_dir=str(tmp_path)).get(1, key) is None
+    assert ChartCache.make_key(1, "learning_trend", "fp2") != key
+
+
+def test_matplotlib_imported_lazily():
+    """测试创建分析服务不导入 matplotlib，首次绘图时才导入"""
+    import subprocess
+
+    root_dir = os.path.join(os.path.dirname(__file__), '..')
+    code = (
+        "import sys\n"
+        "from src.analytics.service import AnalyticsService\n"
+        "from src.database.manager import DatabaseManager\n"
+        "service = AnalyticsService(DatabaseManager(':memory:'))\n"
+        "assert 'matplotlib' not in sys.modules, 'matplotlib imported eagerly'\n"
+        "service.create_learning_chart(1)\n"
+        "assert 'matplotlib.pyplot' in sys.modules\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=root_dir, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
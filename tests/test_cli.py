@@ -0,0 +1,106 @@
+"""
+命令行入口测试
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.cli import main
+from src.database.manager import DatabaseManager
+from src.database.models import User
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestCli:
+    """命令行测试类"""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        """创建含一个用户的数据库文件"""
+        path = str(tmp_path / "cli.db")
+        db_manager = DatabaseManager(path)
+        session = db_manager.get_session()
+        session.add(User(username="alice", email="alice@example.com", password_hash="x"))
+        session.commit()
+        session.close()
+        db_manager.engine.dispose()
+        return path
+
+    def test_import_stats_and_export(self, db_path, tmp_path, capsys):
+        """导入、统计、导出只输出命令结果，不混入调试输出"""
+        source = tmp_path / "notes.csv"
+        source.write_text("title,content,category\n牛顿定律,F=ma,物理\n欧姆定律,U=IR,物理\n",
+                          encoding="utf-8")
+        assert main(["--db", db_path, "import", str(source), "--user", "alice"]) == 0
+        assert capsys.readouterr().out.strip() == (
+            "✅ 导入完成：新增 2 个知识点，跳过重复 0 个、无标题 0 个"
+        )
+
+        main(["--db", db_path, "stats", "--user", "alice", "--json"])
+        stats = json.loads(capsys.readouterr().out)
+        assert stats["total_knowledge_items"] == 2
+
+        main(["--db", db_path, "export", "-", "--user", "alice"])
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        titles = [row["title"] for row in rows if row["table"] == "knowledge_items"]
+        assert sorted(titles) == ["欧姆定律", "牛顿定律"]
+
+        # 增量导出：第二次没有新行
+        state = str(tmp_path / "state.json")
+        export = ["--db", db_path, "export", str(tmp_path / "out.gz"), "--user", "alice",
+                  "--format", "columnar", "--since", state]
+        main(export)
+        assert "knowledge_items 2 行" in capsys.readouterr().out
+        main(export)
+        assert "knowledge_items 0 行" in capsys.readouterr().out
+
+    def test_due_list_all_users(self, db_path, capsys):
+        """--all-users 列出全部开启提醒用户的到期计划"""
+        db_manager = DatabaseManager(db_path)
+        user_id = db_manager.get_session().query(User.id).scalar()
+        db_manager.add_knowledge(user_id, "到期知识点", "内容")  # 首次复习立即到期
+        db_manager.engine.dispose()
+
+        main(["--db", db_path, "due-list", "--all-users"])
+        lines = capsys.readouterr().out.splitlines()
+        assert "到期知识点" in lines[0]
+        assert lines[-1] == "共 1 个待复习计划"
+
+    def test_forecast(self, db_path, capsys):
+        """forecast 输出每天预计的复习次数"""
+        db_manager = DatabaseManager(db_path)
+        user_id = db_manager.get_session().query(User.id).scalar()
+        db_manager.add_knowledge(user_id, "预测知识点", "内容")
+        db_manager.engine.dispose()
+        capsys.readouterr()
+
+        main(["--db", db_path, "forecast", "--user", "alice", "--days", "7", "--json"])
+        forecast = json.loads(capsys.readouterr().out)
+        assert forecast["cards"] == 1
+        assert len(forecast["expected"]) == 7 and forecast["expected"][0] >= 1
+
+    def test_unknown_user(self, db_path):
+        with pytest.raises(SystemExit, match="用户不存在"):
+            main(["--db", db_path, "stats", "--user", "nobody"])
+
+    def test_headless_startup(self, db_path):
+        """命令行进程不加载图形界面与绘图库"""
+        code = (
+            "import sys; from src.cli import main; "
+            f"main(['--db', {db_path!r}, 'vacuum']); "
+            "print(sorted({m.split('.')[0] for m in sys.modules} & "
+            "{'customtkinter', 'tkinter', 'matplotlib', 'numpy'}))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+            timeout=60,
+        )
+        assert result.returncode == 0, result.stderr
+        lines = result.stdout.splitlines()
+        assert lines[0].startswith("✅ 数据库整理完成")
+        assert lines[-1] == "[]"
@@ -0,0 +1,151 @@
+"""
+公共组件测试
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.common.executor import UITaskExecutor  # noqa: E402
+
+
+class FakeWidget:
+    """模拟界面组件：记录 after() 调度，由测试手动触发"""
+
+    def __init__(self):
+        self.scheduled = []
+        self.alive = True
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def winfo_exists(self):
+        return self.alive
+
+
+class TestUITaskExecutor:
+    """界面后台任务执行器测试"""
+
+    @pytest.fixture
+    def executor(self):
+        executor = UITaskExecutor(max_workers=2)
+        yield executor
+        executor.shutdown()
+
+    def _drain(self, executor):
+        executor.wait_idle(5)
+        return executor.process_completions()
+
+    def test_results_delivered_via_queue(self, executor):
+        """测试任务在后台线程执行，回调只在处理队列时（界面线程）执行"""
+        owner = FakeWidget()
+        results, loading, threads = [], [], []
+
+        def work(x):
+            threads.append(threading.current_thread())
+            return x * 2
+
+        executor.submit(
+            owner, work, 21, on_success=results.append, on_loading=loading.append
+        )
+        assert loading == [True]
+        assert len(owner.scheduled) == 1  # 已安排轮询
+
+        executor.wait_idle(5)
+        assert results == []  # 未轮询前不回调
+        owner.scheduled.pop()()  # 执行轮询
+        assert results == [42]
+        assert loading == [True, False]
+        assert threads[0] is not threading.current_thread()
+        assert owner.scheduled == []  # 无待处理任务时停止轮询
+
+    def test_superseded_request_is_dropped(self, executor):
+        """测试同一 key 的新请求作废旧请求，只回调最新结果"""
+        owner = FakeWidget()
+        gate = threading.Event()
+        results, loading = [], []
+
+        executor.submit(owner, lambda: gate.wait(5) and "old", key="search",
+                        on_success=results.append, on_loading=loading.append)
+        executor.submit(owner, lambda: "new", key="search",
+                        on_success=results.append, on_loading=loading.append)
+        assert executor.is_loading("search")
+        gate.set()
+
+        assert self._drain(executor) == 2
+        assert results == ["new"]
+        assert loading == [True, True, False]
+        assert not executor.is_loading("search")
+
+    def test_errors_and_destroyed_owner(self, executor):
+        """测试异常交给 on_error；组件销毁后不再回调"""
+        owner = FakeWidget()
+        errors, results = [], []
+
+        def fail():
+            raise ValueError("boom")
+
+        executor.submit(owner, fail, on_success=results.append, on_error=errors.append)
+        self._drain(executor)
+        assert [str(e) for e in errors] == ["boom"]
+
+        gone = FakeWidget()
+        executor.submit(gone, lambda: 1, on_success=results.append)
+        gone.alive = False
+        self._drain(executor)
+        assert results == []
+
+    def test_post_from_other_thread(self, executor):
+        """测试其他线程 post() 的回调只在界面线程轮询时执行，且不在该线程调用 after()"""
+        owner = FakeWidget()
+        executor.watch(owner)
+        assert len(owner.scheduled) == 1
+        poll = owner.scheduled.pop()
+
+        calls = []
+        writer = threading.Thread(
+            target=executor.post,
+            args=(owner, lambda event: calls.append((event, threading.current_thread())), "changed"),
+        )
+        writer.start()
+        writer.join()
+        assert calls == []
+        assert owner.scheduled == []  # 写线程没有调用 after()
+
+        poll()
+        assert calls == [("changed", threading.current_thread())]
+        assert len(owner.scheduled) == 1  # 组件存活期间保持轮询
+
+        owner.alive = False
+        executor.post(owner, calls.append, "late")
+        owner.scheduled.pop()()
+        assert len(calls) == 1  # 组件销毁后丢弃
+        assert owner.scheduled == []  # 不再轮询
+
+    def test_poll_survives_owner_destroyed(self, executor):
+        """测试挂轮询的组件销毁（待执行的 after 随之删除）后，新组件的任务仍能回调"""
+        gone = FakeWidget()
+        executor.submit(gone, lambda: 1)
+        assert len(gone.scheduled) == 1
+        gone.alive = False  # 切换页面：组件销毁，轮询永远不会执行
+        gone.scheduled.clear()
+        executor.wait_idle(5)
+
+        owner = FakeWidget()
+        results = []
+        executor.submit(owner, lambda: 2, on_success=results.append)
+        assert len(owner.scheduled) == 1
+        executor.wait_idle(5)
+        owner.scheduled.pop()()
+        assert results == [2]
+
+    def test_poll_scheduled_on_toplevel(self, executor):
+        """测试轮询安排在组件所在的顶层窗口上"""
+        root = FakeWidget()
+        frame = FakeWidget()
+        frame.winfo_toplevel = lambda: root
+        executor.submit(frame, lambda: 1)
+        assert frame.scheduled == [] and len(root.scheduled) == 1
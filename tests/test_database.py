@@ -0,0 +1,874 @@
+"""
+数据库管理器测试
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from src.database.manager import DatabaseManager
+from src.database.models import DailyUserStat, ReviewRecord, ReviewSchedule, User
+
+
+class TestDatabaseManager:
+    """数据库管理器测试类"""
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建内存数据库"""
+        return DatabaseManager(":memory:")
+
+    @pytest.fixture
+    def user_id(self, db_manager):
+        """创建测试用户并返回ID"""
+        session = db_manager.get_session()
+        user = User(username="tester", email="tester@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+        session.close()
+        return user_id
+
+    def _count_queries(self, db_manager, func, *args):
+        """统计执行 func 时发出的 SQL 语句数量"""
+        statements = []
+
+        def before_execute(conn, cursor, statement, *_):
+            statements.append(statement)
+
+        event.listen(db_manager.engine, "before_cursor_execute", before_execute)
+        try:
+            result = func(*args)
+        finally:
+            event.remove(db_manager.engine, "before_cursor_execute", before_execute)
+        return result, len(statements)
+
+    def test_knowledge_status_shape(self, db_manager, user_id):
+        """测试知识点状态字段与状态描述"""
+        added = db_manager.add_knowledge(user_id, "今日知识", "内容")
+        db_manager.add_knowledge(user_id, "未来知识", "内容")
+        db_manager.add_knowledge(user_id, "无计划", "内容")
+
+        session = db_manager.get_session()
+        future = session.query(ReviewSchedule).filter(
+            ReviewSchedule.knowledge_item_id != added["data"]["knowledge_id"]
+        )
+        schedules = future.order_by(ReviewSchedule.id).all()
+        schedules[0].scheduled_date = datetime.now() + timedelta(days=3)
+        session.delete(schedules[1])
+        session.commit()
+        session.close()
+
+        items = {i["title"]: i for i in db_manager.get_knowledge_with_review_status(user_id)}
+
+        assert set(items["今日知识"]) == {
+            "id",
+            "title",
+            "category",
+            "created_at",
+            "last_reviewed",
+            "review_status",
+            "is_today_review",
+            "next_stage_desc",
+            "next_review_at",
+        }
+        assert items["今日知识"]["is_today_review"] is True
+        assert items["今日知识"]["review_status"].startswith("📅 今日复习")
+        assert items["未来知识"]["review_status"].startswith("⏳ 待复习")
+        assert items["未来知识"]["is_today_review"] is False
+        assert items["无计划"]["review_status"] == "❌ 无复习计划"
+        assert items["无计划"]["last_reviewed"] == "暂无"
+
+    def test_knowledge_status_last_reviewed(self, db_manager, user_id):
+        """测试完成复习后的最近复习日期"""
+        added = db_manager.add_knowledge(user_id, "复习过", "内容")
+        result = db_manager.complete_review(
+            added["data"]["first_schedule_id"], user_id, 4, 80
+        )
+        assert result["success"]
+
+        items = db_manager.get_knowledge_with_review_status(user_id)
+        assert items[0]["last_reviewed"] == datetime.now().strftime("%Y-%m-%d")
+
+        session = db_manager.get_session()
+        record = session.query(ReviewRecord).one()
+        assert record.user_id == user_id
+        session.close()
+
+    def test_knowledge_status_constant_queries(self, db_manager, user_id):
+        """测试查询次数不随知识点数量增长"""
+        db_manager.add_knowledge(user_id, "知识0", "内容")
+        _, small = self._count_queries(
+            db_manager, db_manager.get_knowledge_with_review_status, user_id
+        )
+
+        for i in range(1, 30):
+            db_manager.add_knowledge(user_id, f"知识{i}", "内容")
+        items, large = self._count_queries(
+            db_manager, db_manager.get_knowledge_with_review_status, user_id
+        )
+
+        assert len(items) == 30
+        assert small == large
+
+
+class TestQueryPlans:
+    """热点查询执行计划回归测试：不得全表扫描复习计划/记录表"""
+
+    SCANNED_TABLES = ("review_schedules", "review_records")
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建带测试数据的内存数据库"""
+        db_manager = DatabaseManager(":memory:")
+        session = db_manager.get_session()
+        user = User(username="planner", email="planner@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        self.user_id = user.id
+        session.close()
+        for i in range(3):
+            db_manager.add_knowledge(self.user_id, f"知识{i}", "内容")
+        return db_manager
+
+    def _capture(self, db_manager, func, *args):
+        """捕获执行 func 时发出的 SELECT 语句及参数"""
+        captured = []
+
+        def before_execute(conn, cursor, statement, parameters, *_):
+            if statement.lstrip().upper().startswith("SELECT"):
+                captured.append((statement, parameters))
+
+        event.listen(db_manager.engine, "before_cursor_execute", before_execute)
+        try:
+            func(*args)
+        finally:
+            event.remove(db_manager.engine, "before_cursor_execute", before_execute)
+        return captured
+
+    def _full_scans(self, db_manager, statements):
+        """返回执行计划中对热点表的全表扫描"""
+        scans = []
+        with db_manager.engine.connect() as conn:
+            for statement, parameters in statements:
+                plan = conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                ).fetchall()
+                for row in plan:
+                    detail = row[-1]
+                    if any(
+                        detail.startswith(f"SCAN {table}")
+                        for table in self.SCANNED_TABLES
+                    ):
+                        scans.append((detail, statement))
+        return scans
+
+    @pytest.mark.parametrize(
+        "method",
+        [
+            "get_today_reviews",
+            "get_today_review_count",
+            "get_overdue_reviews_count",
+            "get_review_stats",
+            "get_knowledge_with_review_status",
+            "get_overall_stats",
+        ],
+    )
+    def test_user_hot_queries_use_indexes(self, db_manager, method):
+        """测试按用户查询的热点方法使用索引"""
+        statements = self._capture(
+            db_manager, getattr(db_manager, method), self.user_id
+        )
+        assert statements
+        assert self._full_scans(db_manager, statements) == []
+
+    def test_pending_reminders_use_indexes(self, db_manager):
+        """测试跨用户提醒查询（含按投递记录过滤退避窗口）使用索引"""
+        from functools import partial
+
+        from src.scheduler.reminder_policy import ReminderBackoff
+
+        statements = self._capture(db_manager, db_manager.get_pending_reminders)
+        statements += self._capture(
+            db_manager, partial(db_manager.get_pending_reminders, backoff=ReminderBackoff())
+        )
+        assert statements
+        assert self._full_scans(db_manager, statements) == []
+
+
+def test_alembic_upgrade_adds_indexes(tmp_path):
+    """测试迁移脚本为旧数据库补建索引，并可重复执行"""
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import create_engine, inspect
+
+    db_path = tmp_path / "legacy.db"
+    DatabaseManager(str(db_path)).engine.dispose()
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE alembic_version")  # 未标记版本的旧数据库
+        for name in ("ix_review_schedules_user_completed_date",):
+            conn.exec_driver_sql(f"DROP INDEX {name}")
+        conn.exec_driver_sql("DROP TABLE reminder_deliveries")
+        conn.exec_driver_sql("ALTER TABLE review_schedules DROP COLUMN stability")
+        conn.exec_driver_sql("ALTER TABLE users DROP COLUMN daily_review_cap")
+
+    config = Config(os.path.join(os.path.dirname(__file__), "..", "alembic.ini"))
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.upgrade(config, "head")
+        command.upgrade(config, "head")
+
+    index_names = {
+        index["name"] for index in inspect(engine).get_indexes("review_schedules")
+    }
+    table_names = inspect(engine).get_table_names()
+    schedule_columns = {c["name"] for c in inspect(engine).get_columns("review_schedules")}
+    user_columns = {c["name"] for c in inspect(engine).get_columns("users")}
+    engine.dispose()
+    assert "ix_review_schedules_user_completed_date" in index_names
+    assert "reminder_deliveries" in table_names
+    assert "stability" in schedule_columns
+    assert "daily_review_cap" in user_columns
+
+
+def test_alembic_upgrade_backfills_record_user_id(tmp_path):
+    """测试迁移脚本为旧版复习记录表补充并回填 user_id"""
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import create_engine, inspect
+
+    db_path = tmp_path / "legacy.db"
+    db_manager = DatabaseManager(str(db_path))
+    session = db_manager.get_session()
+    user = User(username="legacy", email="legacy@example.com", password_hash="x")
+    session.add(user)
+    session.commit()
+    user_id = user.id
+    session.close()
+    added = db_manager.add_knowledge(user_id, "旧知识", "内容")
+    db_manager.engine.dispose()
+
+    # 模拟旧版本创建的复习记录表（无 user_id 列）
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE alembic_version")  # 未标记版本的旧数据库
+        conn.exec_driver_sql("DROP TABLE review_records")
+        conn.exec_driver_sql(
+            """
+            CREATE TABLE review_records (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                knowledge_item_id INTEGER NOT NULL REFERENCES knowledge_items (id),
+                schedule_id INTEGER REFERENCES review_schedules (id),
+                review_date DATETIME,
+                effectiveness INTEGER NOT NULL,
+                recall_score FLOAT NOT NULL,
+                notes TEXT
+            )
+            """
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO review_records (knowledge_item_id, review_date, "
+            "effectiveness, recall_score) VALUES (?, '2026-01-01 08:00:00', 4, 80)",
+            (added["data"]["knowledge_id"],),
+        )
+
+    config = Config(os.path.join(os.path.dirname(__file__), "..", "alembic.ini"))
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.upgrade(config, "head")
+        command.upgrade(config, "head")
+
+    columns = {c["name"]: c for c in inspect(engine).get_columns("review_records")}
+    index_names = {i["name"] for i in inspect(engine).get_indexes("review_records")}
+    with engine.connect() as conn:
+        backfilled = conn.exec_driver_sql("SELECT user_id FROM review_records").scalar()
+    engine.dispose()
+
+    assert columns["user_id"]["nullable"] is False
+    assert "ix_review_records_user_date" in index_names
+    assert backfilled == user_id
+
+
+def test_alembic_upgrade_creates_knowledge_fts(tmp_path):
+    """测试迁移脚本为旧数据库创建全文索引并回填已有知识点"""
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import create_engine
+
+    from src.database.fts import DROP_STATEMENTS
+
+    db_path = tmp_path / "legacy.db"
+    db_manager = DatabaseManager(str(db_path))
+    session = db_manager.get_session()
+    user = User(username="legacy", email="legacy@example.com", password_hash="x")
+    session.add(user)
+    session.commit()
+    db_manager.add_knowledge(user.id, "旧知识", "艾宾浩斯遗忘曲线")
+    session.close()
+    db_manager.engine.dispose()
+
+    # 模拟没有全文索引的旧版本数据库
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE alembic_version")  # 未标记版本的旧数据库
+        for statement in DROP_STATEMENTS:
+            conn.exec_driver_sql(statement)
+
+    config = Config(os.path.join(os.path.dirname(__file__), "..", "alembic.ini"))
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.upgrade(config, "head")
+        command.upgrade(config, "head")
+
+    with engine.connect() as conn:
+        matched = conn.exec_driver_sql(
+            "SELECT rowid FROM knowledge_fts WHERE knowledge_fts MATCH '\"遗忘曲\"'"
+        ).all()
+    engine.dispose()
+    assert len(matched) == 1
+
+
+# 初始版本（迁移 0001 之前）models.py 建出的表结构
+BASELINE_SCHEMA = [
+    """
+    CREATE TABLE users (
+        id INTEGER NOT NULL PRIMARY KEY,
+        username VARCHAR(50) NOT NULL UNIQUE,
+        email VARCHAR(100) NOT NULL UNIQUE,
+        password_hash VARCHAR(128) NOT NULL,
+        created_at DATETIME,
+        enable_reminder BOOLEAN,
+        reminder_channel VARCHAR(20)
+    )
+    """,
+    """
+    CREATE TABLE knowledge_items (
+        id INTEGER NOT NULL PRIMARY KEY,
+        user_id INTEGER NOT NULL REFERENCES users (id),
+        title VARCHAR(200) NOT NULL,
+        content TEXT NOT NULL,
+        category VARCHAR(50),
+        created_at DATETIME,
+        is_active BOOLEAN,
+        initial_interval INTEGER,
+        initial_interval_unit VARCHAR(6)
+    )
+    """,
+    """
+    CREATE TABLE review_schedules (
+        id INTEGER NOT NULL PRIMARY KEY,
+        knowledge_item_id INTEGER NOT NULL REFERENCES knowledge_items (id),
+        user_id INTEGER NOT NULL REFERENCES users (id),
+        scheduled_date DATETIME NOT NULL,
+        completed BOOLEAN,
+        interval_index INTEGER,
+        current_interval INTEGER,
+        current_interval_unit VARCHAR(6),
+        created_at DATETIME
+    )
+    """,
+    """
+    CREATE TABLE review_records (
+        id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+        knowledge_item_id INTEGER NOT NULL REFERENCES knowledge_items (id),
+        schedule_id INTEGER REFERENCES review_schedules (id),
+        review_date DATETIME,
+        effectiveness INTEGER NOT NULL,
+        recall_score FLOAT NOT NULL,
+        notes TEXT
+    )
+    """,
+]
+
+
+def test_opens_baseline_database(tmp_path):
+    """测试直接打开初始版本创建的数据库：启动时自动升级到最新迁移"""
+    from sqlalchemy import Float, create_engine, inspect
+
+    from src.database.migrate import current_revision, head_revision, upgrade_schema
+
+    db_path = tmp_path / "baseline.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.exec_driver_sql(statement)
+        conn.exec_driver_sql(
+            "INSERT INTO users (id, username, email, password_hash, enable_reminder) "
+            "VALUES (1, 'old', 'old@example.com', 'x', 1)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO knowledge_items (id, user_id, title, content, is_active) "
+            "VALUES (1, 1, '旧知识', '内容', 1)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO review_schedules (id, knowledge_item_id, user_id, scheduled_date, "
+            "completed, interval_index, current_interval) VALUES "
+            "(1, 1, 1, '2026-01-01 08:00:00.000000', 1, 0, 1), "
+            "(2, 1, 1, '2026-01-01 09:00:00.000000', 0, 1, 1)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO review_records (knowledge_item_id, schedule_id, review_date, "
+            "effectiveness, recall_score) VALUES (1, 1, '2026-01-01 08:05:00.000000', 4, 80)"
+        )
+    engine.dispose()
+
+    db_manager = DatabaseManager(str(db_path))
+    try:
+        with db_manager.engine.connect() as conn:
+            assert current_revision(conn) == head_revision()
+            stats = conn.exec_driver_sql(
+                "SELECT user_id, review_count FROM daily_user_stats").all()
+            record_user = conn.exec_driver_sql("SELECT user_id FROM review_records").scalar()
+            columns = {
+                table: {c["name"]: c["type"] for c in inspect(conn).get_columns(table)}
+                for table in ("users", "review_schedules")
+            }
+            schedule_indexes = {
+                index["name"] for index in inspect(conn).get_indexes("review_schedules")
+            }
+        assert stats == [(1, 1)]
+        assert isinstance(columns["review_schedules"]["current_interval"], Float)
+        assert "ix_review_schedules_user_completed_date" in schedule_indexes
+        assert record_user == 1
+        assert {"scheduling_algorithm", "daily_review_cap"} <= columns["users"].keys()
+        assert {"ease_factor", "stability", "difficulty"} <= (
+            columns["review_schedules"].keys()
+        )
+
+        # 升级后的数据库可直接完成复习；再次启动无需迁移
+        assert db_manager.complete_review(2, 1, 5, 90)["success"]
+        assert upgrade_schema(db_manager.engine) is None
+    finally:
+        db_manager.engine.dispose()
+
+
+def test_upgrade_merges_desktop_delivery_channels(tmp_path):
+    """测试迁移把桌面通知的 system 投递记录合并到 app，同一计划保留最近一次"""
+    from src.database.migrate import upgrade_schema
+
+    db_manager = DatabaseManager(str(tmp_path / "channels.db"))
+    session = db_manager.get_session()
+    user = User(username="channels", email="channels@example.com", password_hash="x")
+    session.add(user)
+    session.commit()
+    user_id = user.id
+    session.close()
+    schedule_ids = [
+        db_manager.add_knowledge(user_id, f"知识{i}", "内容")["data"]["first_schedule_id"]
+        for i in range(3)
+    ]
+    scheduled_for = datetime(2026, 1, 1, 8)
+    for channel, ids, sent_at in [
+        ("system", schedule_ids, datetime(2026, 1, 1, 10)),
+        ("app", schedule_ids[:1], datetime(2026, 1, 1, 9)),  # 较早：被 system 行取代
+        ("app", schedule_ids[1:2], datetime(2026, 1, 1, 11)),  # 较晚：保留
+        ("email", schedule_ids[:1], datetime(2026, 1, 1, 12)),
+    ]:
+        db_manager.record_reminder_deliveries(
+            user_id, channel, dict.fromkeys(ids, scheduled_for), sent_at=sent_at
+        )
+    with db_manager.engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE alembic_version SET version_num = '0008'")
+
+    try:
+        assert upgrade_schema(db_manager.engine) == "upgraded"
+        assert db_manager.get_reminder_deliveries(user_id, "system") == {}
+        app = db_manager.get_reminder_deliveries(user_id, "app")
+        assert {schedule_id: row.last_sent_at for schedule_id, row in app.items()} == {
+            schedule_ids[0]: datetime(2026, 1, 1, 10),
+            schedule_ids[1]: datetime(2026, 1, 1, 11),
+            schedule_ids[2]: datetime(2026, 1, 1, 10),
+        }
+        assert list(db_manager.get_reminder_deliveries(user_id, "email")) == schedule_ids[:1]
+    finally:
+        db_manager.engine.dispose()
+
+
+def test_new_database_is_stamped_head(tmp_path):
+    """测试新数据库标记为最新迁移版本，版本号与 alembic 脚本一致"""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    from src.database.migrate import MIGRATIONS_DIR, current_revision, head_revision
+
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    assert head_revision() == ScriptDirectory.from_config(config).get_current_head()
+
+    db_manager = DatabaseManager(str(tmp_path / "fresh.db"))
+    with db_manager.engine.connect() as conn:
+        assert current_revision(conn) == head_revision()
+    db_manager.engine.dispose()
+
+
+def test_engine_profile_applies_pragmas(tmp_path):
+    """测试文件数据库连接启用 WAL 等调优参数，外键约束默认保持关闭"""
+    from src.database.engine import SQLiteEngineProfile
+
+    db_manager = DatabaseManager(str(tmp_path / "tuned.db"))
+    with db_manager.engine.connect() as conn:
+        journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        foreign_keys = conn.exec_driver_sql("PRAGMA foreign_keys").scalar()
+        busy_timeout = conn.exec_driver_sql("PRAGMA busy_timeout").scalar()
+    db_manager.engine.dispose()
+
+    assert journal_mode == "wal"
+    assert foreign_keys == 0
+    assert busy_timeout == 5000
+
+    strict = DatabaseManager(
+        str(tmp_path / "strict.db"), SQLiteEngineProfile(foreign_keys=True)
+    )
+    with strict.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+    strict.engine.dispose()
+
+
+class TestReviewStats:
+    """复习统计测试"""
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建内存数据库"""
+        return DatabaseManager(":memory:")
+
+    def test_review_stats_single_query(self, db_manager):
+        """测试今日统计与逾期数量由一次查询得出"""
+        session = db_manager.get_session()
+        user = User(username="stats", email="stats@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+        session.close()
+
+        for i in range(4):
+            db_manager.add_knowledge(user_id, f"知识{i}", "内容")
+
+        session = db_manager.get_session()
+        schedules = session.query(ReviewSchedule).order_by(ReviewSchedule.id).all()
+        # 一条逾期两天，一条明天，两条今日（其中一条完成）
+        schedules[0].scheduled_date = datetime.now() - timedelta(days=2)
+        schedules[1].scheduled_date = datetime.now() + timedelta(days=1)
+        schedules[3].completed = True
+        session.commit()
+        session.close()
+
+        statements = []
+
+        def before_execute(conn, cursor, statement, *_):
+            statements.append(statement)
+
+        event.listen(db_manager.engine, "before_cursor_execute", before_execute)
+        stats = db_manager.get_review_stats(user_id)
+        event.remove(db_manager.engine, "before_cursor_execute", before_execute)
+
+        assert len(statements) == 1
+        assert stats["total_today"] == 2
+        assert stats["completed_today"] == 1
+        assert stats["overdue_count"] == db_manager.get_overdue_reviews_count(user_id)
+        assert stats["completion_rate"] == 50.0
+
+        overall = db_manager.get_overall_stats(user_id)
+        assert overall["today_stats"] == stats
+        assert overall["total_knowledge"] == 4
+
+
+class TestDailyUserStats:
+    """每日汇总表测试"""
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建内存数据库"""
+        return DatabaseManager(":memory:")
+
+    @pytest.fixture
+    def user_id(self, db_manager):
+        """创建测试用户并返回ID"""
+        session = db_manager.get_session()
+        user = User(username="daily", email="daily@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+        session.close()
+        return user_id
+
+    def _snapshot(self, db_manager, user_id):
+        """汇总行转为可比较的元组"""
+        return [
+            (
+                row.date,
+                row.review_count,
+                round(row.recall_sum, 6),
+                round(row.efficiency_sum, 6),
+                row.effectiveness_1,
+                row.effectiveness_4,
+                row.effectiveness_5,
+                row.mastered_count,
+            )
+            for row in db_manager.get_daily_user_stats(user_id)
+        ]
+
+    def test_complete_review_maintains_rollup(self, db_manager, user_id):
+        """测试完成复习时同步累加当日汇总，且与全量重建一致"""
+        for i, (effectiveness, score) in enumerate([(5, 90), (4, 70), (1, 10)]):
+            added = db_manager.add_knowledge(user_id, f"知识{i}", "内容")
+            result = db_manager.complete_review(
+                added["data"]["first_schedule_id"], user_id, effectiveness, score
+            )
+            assert result["success"]
+
+        incremental = self._snapshot(db_manager, user_id)
+        assert len(incremental) == 1
+        day, count, recall_sum, _, eff_1, eff_4, eff_5, mastered = incremental[0]
+        assert day == datetime.now().date()
+        assert (count, recall_sum, eff_1, eff_4, eff_5, mastered) == (3, 170, 1, 1, 1, 0)
+
+        assert db_manager.rebuild_daily_user_stats(user_id) == 1
+        assert self._snapshot(db_manager, user_id) == incremental
+
+        daily = db_manager.get_daily_review_stats(user_id)
+        assert daily == [
+            {
+                "date": datetime.now().strftime("%Y-%m-%d"),
+                "avg_recall_score": 56.7,
+                "review_count": 3,
+            }
+        ]
+
+    def test_mastered_rule_is_shared(self, db_manager, user_id):
+        """测试知识点列表、整体统计与每日汇总对“已掌握”的判定一致"""
+        from src.scheduler.ebbinghaus_config import EbbinghausConfig
+
+        added = db_manager.add_knowledge(user_id, "掌握", "内容")
+        db_manager.add_knowledge(user_id, "未掌握", "内容")
+        schedule_id = added["data"]["first_schedule_id"]
+        for _ in range(EbbinghausConfig.get_total_stages()):
+            result = db_manager.complete_review(schedule_id, user_id, 5, 95)
+            assert result["success"]
+            schedule_id = result.get("data", {}).get("next_schedule_id")
+        assert schedule_id is None
+
+        items = {i["title"]: i for i in db_manager.get_knowledge_with_review_status(user_id)}
+        assert items["掌握"]["review_status"] == "✅ 已掌握"
+        assert items["未掌握"]["review_status"] != "✅ 已掌握"
+        assert db_manager.get_overall_stats(user_id)["mastered_knowledge"] == 1
+        assert sum(row[-1] for row in self._snapshot(db_manager, user_id)) == 1
+        db_manager.rebuild_daily_user_stats(user_id)
+        assert sum(row[-1] for row in self._snapshot(db_manager, user_id)) == 1
+
+    def test_analytics_overview_reads_rollup(self, db_manager, user_id):
+        """测试统计概览的复习次数来自汇总表"""
+        from src.analytics.service import AnalyticsService
+
+        added = db_manager.add_knowledge(user_id, "知识", "内容")
+        db_manager.complete_review(added["data"]["first_schedule_id"], user_id, 4, 80)
+
+        overview = AnalyticsService(db_manager).calculate_user_overview(user_id)
+        assert overview["completed_reviews"] == 1
+
+    def test_streak_info_islands(self, db_manager, user_id):
+        """测试连续天数：当前连续、历史最长与最近复习日期"""
+        today = datetime.now().date()
+        session = db_manager.get_session()
+        for offset in [0, 1, 2, 5, 6, 7, 8, 9, 20]:
+            session.add(
+                DailyUserStat(
+                    user_id=user_id,
+                    date=today - timedelta(days=offset),
+                    review_count=1,
+                )
+            )
+        session.commit()
+        session.close()
+
+        assert db_manager.get_streak_info(user_id) == {
+            "current_streak": 3,
+            "longest_streak": 5,
+            "last_active_date": today,
+        }
+
+        overall = db_manager.get_overall_stats(user_id)
+        assert overall["streak_days"] == 3
+        assert overall["longest_streak"] == 5
+        assert overall["last_review_date"] == today.strftime("%Y-%m-%d")
+
+        from src.analytics.service import AnalyticsService
+
+        overview = AnalyticsService(db_manager).calculate_user_overview(user_id)
+        assert overview["streak_days"] == 3
+
+    def test_streak_info_broken_today(self, db_manager, user_id):
+        """测试今日未复习时当前连续天数为0"""
+        yesterday = datetime.now().date() - timedelta(days=1)
+        session = db_manager.get_session()
+        session.add(DailyUserStat(user_id=user_id, date=yesterday, review_count=2))
+        session.commit()
+        session.close()
+
+        info = db_manager.get_streak_info(user_id)
+        assert info["current_streak"] == 0
+        assert info["longest_streak"] == 1
+        assert info["last_active_date"] == yesterday
+        assert db_manager.get_streak_info(user_id + 1)["last_active_date"] is None
+
+
+class TestChangeEvents:
+    """数据变更事件测试"""
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建内存数据库"""
+        return DatabaseManager(":memory:")
+
+    @pytest.fixture
+    def user_id(self, db_manager):
+        """创建测试用户并返回ID"""
+        session = db_manager.get_session()
+        user = User(username="events", email="events@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+        session.close()
+        return user_id
+
+    def test_mutations_emit_typed_events(self, db_manager, user_id):
+        """测试写操作提交后发出带知识点/计划ID的事件"""
+        from src.database.events import ChangeType
+
+        events = []
+        db_manager.subscribe(events.append)
+
+        added = db_manager.add_knowledge(user_id, "知识", "内容")
+        knowledge_id = added["data"]["knowledge_id"]
+        first_schedule_id = added["data"]["first_schedule_id"]
+        result = db_manager.complete_review(first_schedule_id, user_id, 4, 80)
+        next_schedule_id = result["data"]["next_schedule_id"]
+        db_manager.update_review_schedule_time(next_schedule_id, datetime.now())
+        db_manager.add_to_today_review(knowledge_id, user_id)
+        db_manager.cancel_review_schedule(knowledge_id, user_id)
+
+        assert [e.type for e in events] == [
+            ChangeType.KNOWLEDGE_ADDED,
+            ChangeType.REVIEW_COMPLETED,
+            ChangeType.SCHEDULE_RESCHEDULED,
+            ChangeType.SCHEDULE_ADDED,
+            ChangeType.SCHEDULE_CANCELLED,
+        ]
+        assert all(e.user_id == user_id for e in events)
+        assert all(e.knowledge_id == knowledge_id for e in events)
+        assert events[1].schedule_id == first_schedule_id
+        assert events[1].next_schedule_id == next_schedule_id
+
+        # 失败的写操作不发事件
+        db_manager.complete_review(first_schedule_id, user_id, 4, 80)
+        assert len(events) == 5
+
+    def test_knowledge_service_events_and_unsubscribe(self, db_manager, user_id):
+        """测试知识服务增删改事件、类型过滤与取消订阅"""
+        from src.database.events import ChangeType
+        from src.knowledge.service import KnowledgeService
+
+        service = KnowledgeService(db_manager)
+        deleted = []
+        unsubscribe = db_manager.subscribe(
+            deleted.append, [ChangeType.KNOWLEDGE_DELETED]
+        )
+        db_manager.subscribe(lambda event: 1 / 0)  # 出错的订阅者不影响写操作
+
+        item = service.add_knowledge_item(user_id, "知识", "内容")
+        service.update_knowledge_item(item.id, title="新标题")
+        assert service.delete_knowledge_item(item.id)
+        assert [e.knowledge_id for e in deleted] == [item.id]
+
+        unsubscribe()
+        other = service.add_knowledge_item(user_id, "知识2", "内容")
+        service.delete_knowledge_item(other.id)
+        assert len(deleted) == 1
+
+    def test_status_for_selected_knowledge(self, db_manager, user_id):
+        """测试增量刷新所用的按知识点ID查询"""
+        first = db_manager.add_knowledge(user_id, "知识1", "内容")["data"]
+        db_manager.add_knowledge(user_id, "知识2", "内容")
+
+        items = db_manager.get_knowledge_with_review_status(
+            user_id, knowledge_ids=[first["knowledge_id"]]
+        )
+        assert [i["title"] for i in items] == ["知识1"]
+
+        reviews = db_manager.get_today_reviews(
+            user_id, knowledge_ids=[first["knowledge_id"]]
+        )
+        assert [r["schedule_id"] for r in reviews] == [first["first_schedule_id"]]
+
+
+class TestHistoryExport:
+    """学习历史流式导出测试"""
+
+    @pytest.fixture
+    def db_manager(self):
+        return DatabaseManager(":memory:")
+
+    @pytest.fixture
+    def user_id(self, db_manager):
+        session = db_manager.get_session()
+        users = [
+            User(username=name, email=f"{name}@example.com", password_hash="x")
+            for name in ("exporter", "other")
+        ]
+        session.add_all(users)
+        session.commit()
+        user_id = users[0].id
+        db_manager.add_knowledge(users[1].id, "其他用户", "内容")
+        session.close()
+        return user_id
+
+    def test_incremental_export_with_watermark(self, db_manager, user_id, tmp_path):
+        """测试分批导出三张表，增量导出只包含水位线之后的新行"""
+        from src.database.exporter import export_user_history, read_export
+
+        for i in range(5):
+            added = db_manager.add_knowledge(user_id, f"知识{i}", "内容")
+        db_manager.complete_review(added["data"]["first_schedule_id"], user_id, 4, 80)
+
+        full = export_user_history(db_manager, user_id, str(tmp_path / "full.jsonl"),
+                                   batch_size=2)
+        assert full["rows"] == {
+            "knowledge_items": 5, "review_schedules": 6, "review_records": 1,
+        }
+        records = list(read_export(str(tmp_path / "full.jsonl")))
+        assert len(records) == 12
+        assert {r["user_id"] for r in records} == {user_id}
+        item = next(r for r in records if r["table"] == "knowledge_items")
+        assert item["title"] == "知识0" and item["initial_interval_unit"] == "day"
+        datetime.fromisoformat(item["created_at"])
+
+        # 增量：新增知识点并完成一次复习
+        added = db_manager.add_knowledge(user_id, "新知识", "内容")
+        db_manager.complete_review(added["data"]["first_schedule_id"], user_id, 5, 90)
+        delta = export_user_history(db_manager, user_id, str(tmp_path / "delta.jsonl"),
+                                    watermark=full["watermark"])
+        assert delta["rows"] == {
+            "knowledge_items": 1, "review_schedules": 2, "review_records": 1,
+        }
+        assert all(
+            delta["watermark"][table] > full["watermark"][table] for table in full["rows"]
+        )
+        empty = export_user_history(db_manager, user_id, str(tmp_path / "empty.jsonl"),
+                                    watermark=delta["watermark"])
+        assert sum(empty["rows"].values()) == 0
+        assert empty["watermark"] == delta["watermark"]
+
+    def test_columnar_matches_jsonl(self, db_manager, user_id, tmp_path):
+        """测试列式格式读回的记录与逐行 JSON 一致"""
+        from src.database.exporter import export_user_history, read_export
+
+        for i in range(7):
+            db_manager.add_knowledge(user_id, f"知识{i}", f"内容{i}")
+        jsonl, columnar = str(tmp_path / "a.jsonl"), str(tmp_path / "a.gz")
+        export_user_history(db_manager, user_id, jsonl, batch_size=3)
+        export_user_history(db_manager, user_id, columnar, "columnar", batch_size=3)
+        assert list(read_export(columnar)) == list(read_export(jsonl))
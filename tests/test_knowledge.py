@@ -0,0 +1,194 @@
+"""
+知识管理模块测试
+"""
+import sqlite3
+import zipfile
+from datetime import datetime
+
+import pytest
+
+from src.database.events import ChangeType
+from src.database.manager import DatabaseManager
+from src.database.models import IntervalUnit, KnowledgeItem, ReviewSchedule, User
+from src.knowledge.importer import iter_records
+from src.knowledge.search import SearchCancelled
+from src.knowledge.service import KnowledgeService
+
+
+class TestKnowledgeSearch:
+    """知识点搜索管道测试"""
+
+    @pytest.fixture
+    def service(self):
+        """创建带测试用户和知识点的知识服务"""
+        db_manager = DatabaseManager(":memory:")
+        session = db_manager.get_session()
+        user = User(username="search", email="search@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        self.user_id = user.id
+        session.close()
+
+        service = KnowledgeService(db_manager)
+        service.add_knowledge_item(self.user_id, "Python 装饰器", "函数包装与闭包", "编程")
+        service.add_knowledge_item(self.user_id, "Python 生成器", "yield 惰性求值", "编程")
+        service.add_knowledge_item(self.user_id, "艾宾浩斯曲线", "记忆随时间衰减", "心理学")
+        return service
+
+    def test_typing_refines_cached_results(self, service):
+        """测试逐字输入只查询两次数据库（首字符 LIKE、第三个字符全文索引），其余在内存中细化"""
+        term = "Python 装饰器"
+        for i in range(1, len(term) + 1):
+            results = service.search_knowledge_items(self.user_id, term[:i])
+        assert [r["title"] for r in results] == ["Python 装饰器"]
+        assert service.search.db_scans == 2
+
+        # 细化结果与直接查询一致（含大小写不敏感）
+        refined = service.search_knowledge_items(self.user_id, "python 生")
+        service.search.invalidate_user(self.user_id)
+        assert service.search_knowledge_items(self.user_id, "python 生") == refined
+        assert service.search.db_scans == 3
+
+    def test_truncated_results_are_not_refined(self, service):
+        """测试全文搜索达到条数上限时结果不完整，更长的搜索词重新查询而不是细化"""
+        service.add_knowledge_item(self.user_id, "Python 协程", "async", "编程")
+        service.search.MAX_RANKED_RESULTS = 2
+        assert len(service.search_knowledge_items(self.user_id, "Python")) == 2
+        assert service.search.db_scans == 1
+
+        results = service.search_knowledge_items(self.user_id, "Python 协")
+        assert [r["title"] for r in results] == ["Python 协程"]
+        assert service.search.db_scans == 2
+
+    def test_knowledge_changes_invalidate_cache(self, service):
+        """测试增删改知识点后缓存失效"""
+        assert len(service.search_knowledge_items(self.user_id, "Python")) == 2
+        item = service.add_knowledge_item(self.user_id, "Python 协程", "async", "编程")
+        assert len(service.search_knowledge_items(self.user_id, "Python")) == 3
+        service.delete_knowledge_item(item.id)
+        assert len(service.search_knowledge_items(self.user_id, "Python")) == 2
+        assert service.search.db_scans == 3
+
+    def test_search_released_with_manager(self):
+        """测试搜索管道挂在数据库管理器上，不再引用时两者一起回收"""
+        import gc
+        import weakref
+
+        db_manager = DatabaseManager(":memory:")
+        search = KnowledgeService(db_manager).search
+        assert KnowledgeService(db_manager).search is search
+        manager_ref, search_ref = weakref.ref(db_manager), weakref.ref(search)
+        db_manager.engine.dispose()
+        del db_manager, search
+        gc.collect()
+        assert manager_ref() is None and search_ref() is None
+
+    def test_superseded_query_is_interrupted(self, service):
+        """测试被新搜索取代的查询通过 SQLite 进度回调中断"""
+        search = service.search
+        search.PROGRESS_STEPS = 1
+        search._generation[self.user_id] = 99  # 模拟已有更新的搜索
+        with pytest.raises(SearchCancelled):
+            search._query(self.user_id, "Python", 1)
+        # 连接恢复正常，可继续搜索
+        assert len(service.search_knowledge_items(self.user_id, "曲线")) == 1
+
+    def test_full_text_ranking_and_snippet(self, service):
+        """测试全文索引按 bm25 排序（标题命中优先）并高亮正文片段"""
+        service.add_knowledge_item(self.user_id, "闭包", "闭包可以实现 Python 装饰器", "编程")
+        results = service.search_knowledge_items(self.user_id, "装饰器")
+        assert [r["title"] for r in results] == ["Python 装饰器", "闭包"]
+        assert results[1]["snippet"] == "闭包可以实现 Python 【装饰器】"
+
+        # 更新正文后触发器同步索引；两个字符的搜索词回退到 LIKE
+        item = service.add_knowledge_item(self.user_id, "记忆", "旧内容", "心理学")
+        service.update_knowledge_item(item.id, content="间隔重复")
+        assert [r["id"] for r in service.search_knowledge_items(self.user_id, "间隔重复")] == [item.id]
+        assert service.search_knowledge_items(self.user_id, "旧内容") == []
+        assert len(service.search_knowledge_items(self.user_id, "闭包")) == 2
+
+
+class TestKnowledgeImport:
+    """知识点批量导入测试"""
+
+    @pytest.fixture
+    def service(self):
+        db_manager = DatabaseManager(":memory:")
+        session = db_manager.get_session()
+        user = User(username="importer", email="importer@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        self.user_id = user.id
+        session.close()
+        return KnowledgeService(db_manager)
+
+    def test_bulk_import_batches_and_skips_duplicates(self, service):
+        """测试按批提交、跳过已有及文件内重复的标题，并生成首次复习计划"""
+        service.add_knowledge_item(self.user_id, "已有知识点", "内容")
+        records = (
+            {"title": f"知识点{i % 250}", "content": f"内容{i}"} for i in range(300)
+        )
+        records = [{"title": "已有知识点"}, {"title": "  "}, *records]
+        progress = []
+        events = []
+        service.db_manager.subscribe(events.append)
+
+        result = service.db_manager.bulk_add_knowledge(
+            self.user_id, iter(records), batch_size=100,
+            progress=lambda done, added: progress.append(added),
+        )
+
+        assert result["data"] == {"added": 250, "duplicates": 51, "invalid": 1}
+        assert progress == [100, 200, 250]
+        assert [e.type for e in events] == [ChangeType.KNOWLEDGE_IMPORTED]
+        session = service.db_manager.get_session()
+        assert session.query(KnowledgeItem).count() == 251
+        item = session.query(KnowledgeItem).filter_by(title="知识点249").one()
+        assert item.content == "内容249"
+        assert item.is_active and isinstance(item.created_at, datetime)
+        schedule = session.query(ReviewSchedule).filter_by(knowledge_item_id=item.id).one()
+        assert schedule.user_id == self.user_id and not schedule.completed
+        assert schedule.current_interval_unit is IntervalUnit.HOUR
+        assert session.query(ReviewSchedule).filter_by(interval_index=0).count() == 250
+        session.close()
+        # 导入后搜索缓存失效，且全文索引包含新知识点
+        assert len(service.search_knowledge_items(self.user_id, "知识点249")) == 1
+
+    def test_import_file_formats(self, service, tmp_path):
+        """测试 CSV、JSONL 与 Anki 纯文本导出"""
+        (tmp_path / "a.csv").write_text(
+            "title,content,category\n牛顿定律,F=ma,物理\n", encoding="utf-8"
+        )
+        (tmp_path / "b.jsonl").write_text(
+            '{"title": "欧姆定律", "content": "U=IR"}\n\n', encoding="utf-8"
+        )
+        (tmp_path / "c.txt").write_text(
+            "#separator:tab\n#html:true\n勾股定理\ta<sup>2</sup>+b<sup>2</sup>=c<sup>2</sup>"
+            "<br>直角三角形\t数学 几何\n",
+            encoding="utf-8",
+        )
+        for name in ("a.csv", "b.jsonl", "c.txt"):
+            result = service.import_knowledge_file(self.user_id, str(tmp_path / name))
+            assert result["data"]["added"] == 1
+
+        items = {i.title: i for i in service.get_user_knowledge_items(self.user_id)}
+        assert items["牛顿定律"].category == "物理"
+        assert items["欧姆定律"].content == "U=IR"
+        assert items["勾股定理"].content == "a2+b2=c2\n直角三角形"
+        assert items["勾股定理"].category == "数学"
+
+    def test_import_apkg(self, service, tmp_path):
+        """测试读取 Anki 牌组包中的笔记"""
+        collection = tmp_path / "collection.anki2"
+        connection = sqlite3.connect(collection)
+        connection.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, flds TEXT, tags TEXT)")
+        connection.execute(
+            "INSERT INTO notes VALUES (1, ?, ?)", ("光合作用\x1f植物&amp;阳光", " 生物 ")
+        )
+        connection.commit()
+        connection.close()
+        with zipfile.ZipFile(tmp_path / "deck.apkg", "w") as archive:
+            archive.write(collection, "collection.anki2")
+
+        records = list(iter_records(str(tmp_path / "deck.apkg")))
+        assert records == [{"title": "光合作用", "content": "植物&阳光", "category": "生物"}]
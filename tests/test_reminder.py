@@ -5,6 +5,11 @@
 
 
 import os
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+import pytest
 
 
 def test_reminder():
@@ -53,3 +58,903 @@ def test_reminder():
 
 if __name__ == "__main__":
     test_reminder()
+
+
+class TestReminderScheduler:
+    """到期时间最小堆调度测试"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        """文件数据库（提醒线程使用独立连接）与记录发送时间的提醒服务"""
+        from src.database.manager import DatabaseManager
+        from src.database.models import User
+        from src.scheduler.notifications import FakeBackend
+        from src.scheduler.reminder import ReminderService, SystemNotifier
+
+        db_manager = DatabaseManager(str(tmp_path / "reminder.db"))
+        session = db_manager.get_session()
+        user = User(username="remind", email="remind@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        self.user_id = user.id
+        session.close()
+
+        service = ReminderService(db_manager)
+        service.system_notifier = SystemNotifier(backends=[FakeBackend()])
+        self.sent = service.system_notifier.dispatcher.backends[0].sent
+        yield service
+        service.stop_reminder()
+        db_manager.engine.dispose()
+
+    def _wait_for(self, count, timeout=5):
+        deadline = time.monotonic() + timeout
+        while len(self.sent) < count and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+    def test_fires_on_time_and_wakes_on_changes(self, service):
+        """测试改期后被唤醒并在计划时间准时提醒，且只提醒一次"""
+        db_manager = service.db_manager
+        added = db_manager.add_knowledge(self.user_id, "知识", "内容")["data"]
+        db_manager.update_review_schedule_time(
+            added["first_schedule_id"], datetime.now() + timedelta(hours=1)
+        )
+        service.start_reminder(self.user_id)
+        time.sleep(0.2)
+        assert self.sent == []
+
+        due_at = datetime.now() + timedelta(seconds=0.5)
+        db_manager.update_review_schedule_time(added["first_schedule_id"], due_at)
+        self._wait_for(1)
+
+        assert len(self.sent) == 1 and "知识" in self.sent[0][1]
+        delay = (self.sent[0][2] - due_at).total_seconds()
+        assert 0 <= delay < 0.5
+
+        # 已提醒的计划不重复提醒；同步后也不会
+        service.request_resync()
+        time.sleep(0.3)
+        assert len(self.sent) == 1
+
+    def test_idle_loop_does_not_query(self, service):
+        """测试没有计划到期时提醒线程不查询数据库"""
+        from sqlalchemy import event
+
+        added = service.db_manager.add_knowledge(self.user_id, "知识", "内容")["data"]
+        service.db_manager.update_review_schedule_time(
+            added["first_schedule_id"], datetime.now() + timedelta(hours=1)
+        )
+        service.start_reminder(self.user_id)
+        time.sleep(0.3)  # 等待首次全量同步
+
+        statements = []
+        event.listen(
+            service.db_manager.engine, "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        time.sleep(1)
+        assert statements == []
+        assert service.get_service_status()["scheduled_count"] == 1
+
+
+class TestReminderDeliveryLedger:
+    """提醒投递记录去重、退避重复提醒与合并通知测试"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        """文件数据库（投递记录在通知分发线程中写入）与假通知后端的提醒服务"""
+        from src.database.manager import DatabaseManager
+        from src.database.models import User
+        from src.scheduler.notifications import FakeBackend
+        from src.scheduler.reminder import ReminderService
+
+        db_manager = DatabaseManager(str(tmp_path / "ledger.db"))
+        session = db_manager.get_session()
+        user = User(username="ledger", email="ledger@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        self.user_id = user.id
+        session.close()
+
+        self.backend = FakeBackend()
+        yield self._make_service(ReminderService, db_manager)
+        db_manager.engine.dispose()
+
+    @property
+    def notifications(self):
+        return [(title, message) for title, message, _ in self.backend.sent]
+
+    def _make_service(self, service_class, db_manager):
+        from src.scheduler.reminder import SystemNotifier
+
+        service = service_class(db_manager)
+        service.current_user_id = self.user_id
+        service.system_notifier = SystemNotifier(backends=[self.backend])
+        original = service._check_and_send_reminders
+
+        def check_and_wait():
+            original()
+            service.system_notifier.dispatcher.wait_idle(5)
+
+        service._check_and_send_reminders = check_and_wait
+        return service
+
+    def _ledger(self, db_manager):
+        from src.scheduler.reminder_policy import DESKTOP_CHANNEL
+
+        return db_manager.get_reminder_deliveries(self.user_id, DESKTOP_CHANNEL)
+
+    def test_overdue_schedule_notified_once_per_window(self, service):
+        """测试逾期计划在退避窗口内只提醒一次，记录持久化，改期后重新计数"""
+        from src.scheduler.reminder import ReminderService
+        from src.scheduler.reminder_policy import ReminderBackoff
+
+        db_manager = service.db_manager
+        added = db_manager.add_knowledge(self.user_id, "知识", "内容")["data"]
+        schedule_id = added["first_schedule_id"]
+
+        service._check_and_send_reminders()
+        service._check_and_send_reminders()
+        # 新的服务实例（如重启后）读取持久化记录，同样不重复提醒
+        self._make_service(ReminderService, db_manager)._check_and_send_reminders()
+        assert len(self.notifications) == 1
+        assert self._ledger(db_manager)[schedule_id].attempts == 1
+
+        # 退避窗口过后再次提醒并累加次数
+        service.backoff = ReminderBackoff(initial=timedelta(0))
+        service._check_and_send_reminders()
+        assert len(self.notifications) == 2
+        assert self._ledger(db_manager)[schedule_id].attempts == 2
+
+        # 改期后按新的计划时间重新计数
+        service.backoff = ReminderBackoff()
+        new_time = datetime.now() - timedelta(minutes=1)
+        db_manager.update_review_schedule_time(schedule_id, new_time)
+        service._check_and_send_reminders()
+        service._check_and_send_reminders()
+        assert len(self.notifications) == 3
+        delivery = self._ledger(db_manager)[schedule_id]
+        assert (delivery.attempts, delivery.scheduled_for) == (1, new_time)
+
+    def test_simultaneous_reminders_coalesced(self, service):
+        """测试同时到期的多个计划合并为一条汇总通知，并分别记录投递"""
+        db_manager = service.db_manager
+        for i in range(4):
+            db_manager.add_knowledge(self.user_id, f"知识{i}", "内容")
+
+        service._check_and_send_reminders()
+        assert len(self.notifications) == 1
+        title, message = self.notifications[0]
+        assert "4 个复习计划到期" in title
+        assert message.count("知识") == 4
+        assert len(self._ledger(db_manager)) == 4
+
+        service._check_and_send_reminders()
+        assert len(self.notifications) == 1
+
+    def test_backoff_policy(self):
+        """测试重复提醒间隔按倍数增长、有上限，且可限制最多提醒次数"""
+        from src.scheduler.reminder_policy import Delivery, ReminderBackoff
+
+        backoff = ReminderBackoff(max_attempts=3)
+        assert [backoff.delay_after(n).total_seconds() / 3600 for n in (1, 2, 3, 4)] == [
+            1, 4, 16, 24
+        ]
+        due = datetime(2026, 1, 1, 8)
+        assert backoff.next_due(due) == due
+        sent = backoff.after_sent(due, None, due)
+        assert backoff.next_due(due, sent) == due + timedelta(hours=1)
+        assert backoff.next_due(due, Delivery(due, due, 3)) is None
+        # 改期后视为新的提醒
+        assert backoff.next_due(due + timedelta(days=1), sent) == due + timedelta(days=1)
+
+
+class TestNotificationDispatcher:
+    """通知异步分发测试"""
+
+    def test_successful_backend_is_cached(self):
+        """测试记住本机可用的后端，失败的后端不再每次重试"""
+        from src.scheduler.notifications import FakeBackend, NotificationDispatcher
+
+        broken, working = FakeBackend("broken", succeed=False), FakeBackend("working")
+        dispatcher = NotificationDispatcher([broken, working])
+        assert dispatcher.notify("标题", "内容1")
+        assert dispatcher.notify("标题", "内容2")
+        dispatcher.shutdown()
+
+        assert (broken.calls, working.calls) == (1, 2)
+        metrics = dispatcher.metrics()
+        assert metrics["preferred_backend"] == "working"
+        assert (metrics["sent"], metrics["failed"]) == (2, 0)
+
+    def test_slow_backend_times_out(self):
+        """测试单条通知超时后放弃卡住的后端，之后直接使用其他后端"""
+        from src.scheduler.notifications import FakeBackend, NotificationDispatcher
+
+        slow, fast = FakeBackend("slow", delay=1.0), FakeBackend("fast")
+        dispatcher = NotificationDispatcher([slow, fast], default_timeout=0.2)
+        started = time.monotonic()
+        assert dispatcher.notify("标题", "内容") is False
+        assert time.monotonic() - started < 0.8
+        assert dispatcher.notify("标题", "内容") is True
+        dispatcher.shutdown()
+
+        assert (slow.calls, len(fast.sent)) == (1, 1)
+        assert dispatcher.metrics()["timed_out"] == 1
+
+    def test_bounded_queue_and_metrics(self):
+        """测试提交不阻塞调用方；队列满时丢弃并计数，指标包含队列深度与延迟"""
+        import threading
+
+        from src.scheduler.notifications import FunctionBackend, NotificationDispatcher
+
+        entered, release = threading.Event(), threading.Event()
+
+        def blocking(title, message, timeout):
+            entered.set()
+            return release.wait(5)
+
+        dispatcher = NotificationDispatcher(
+            [FunctionBackend("blocking", blocking)], max_queue=1
+        )
+        first = dispatcher.submit("标题", "1")
+        assert entered.wait(5)
+        second = dispatcher.submit("标题", "2")
+        dropped = dispatcher.submit("标题", "3")
+        assert dropped.done() and dropped.result() is False
+        metrics = dispatcher.metrics()
+        assert (metrics["queue_depth"], metrics["dropped"]) == (1, 1)
+
+        release.set()
+        assert dispatcher.wait_idle(5)
+        assert first.result() and second.result()
+        metrics = dispatcher.metrics()
+        dispatcher.shutdown()
+        assert (metrics["queue_depth"], metrics["sent"]) == (0, 2)
+        assert metrics["max_latency_ms"] > 0
+
+
+class TestReminderDaemon:
+    """多用户提醒守护进程测试"""
+
+    class RecordingChannel:
+        """记录每次发送的用户、计划与线程"""
+
+        def __init__(self):
+            self.sent = []
+
+        def send(self, reminders):
+            import threading
+
+            self.sent.append((
+                reminders[0]["user_id"],
+                [r["schedule_id"] for r in reminders],
+                threading.current_thread().name,
+            ))
+            return True
+
+    @pytest.fixture
+    def db_manager(self, tmp_path):
+        """多个用户：两个桌面提醒、一个邮件提醒、一个关闭提醒"""
+        from src.database.manager import DatabaseManager
+        from src.database.models import User
+
+        db_manager = DatabaseManager(str(tmp_path / "daemon.db"))
+        session = db_manager.get_session()
+        users = [
+            User(username=f"user{i}", email=f"user{i}@example.com", password_hash="x",
+                 reminder_channel=channel, enable_reminder=enabled)
+            for i, (channel, enabled) in enumerate(
+                [("app", True), ("app", True), ("email", True), ("app", False)]
+            )
+        ]
+        session.add_all(users)
+        session.commit()
+        self.user_ids = [user.id for user in users]
+        session.close()
+        for user_id in self.user_ids:
+            for i in range(3):
+                db_manager.add_knowledge(user_id, f"知识{i}", "内容")
+        yield db_manager
+        db_manager.engine.dispose()
+
+    def test_batched_fanout_and_dedup(self, db_manager):
+        """测试按批查询（与用户数无关）、按渠道扇出、按用户分片且不重复提醒"""
+        from sqlalchemy import event
+
+        from src.scheduler.daemon import ReminderDaemon
+
+        app, email = self.RecordingChannel(), self.RecordingChannel()
+        daemon = ReminderDaemon(
+            db_manager, {"app": app, "email": email}, workers=2, batch_size=4
+        )
+        pending_queries = []
+        event.listen(
+            db_manager.engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: pending_queries.append(statement)
+            if "enable_reminder" in statement else None,
+        )
+        stats = daemon.run_once(datetime.now() + timedelta(seconds=1))
+
+        # 9 条到期提醒（关闭提醒的用户除外），每批 4 条共 3 次查询
+        assert (stats["due"], stats["sent"], stats["batches"]) == (9, 9, 3)
+        assert len(pending_queries) == 3
+        sent_by_user = defaultdict(list)
+        threads_by_user = defaultdict(set)
+        for channel in (app, email):
+            for user_id, schedule_ids, thread in channel.sent:
+                sent_by_user[user_id].extend(schedule_ids)
+                threads_by_user[user_id].add(thread)
+        assert sorted(sent_by_user) == self.user_ids[:3]
+        assert all(len(ids) == 3 for ids in sent_by_user.values())
+        assert {user_id for user_id, _, _ in email.sent} == {self.user_ids[2]}
+        assert all(len(threads) == 1 for threads in threads_by_user.values())
+
+        # 投递记录去重：退避窗口内的提醒在查询中排除，下一轮一批即结束
+        again = daemon.run_once(datetime.now() + timedelta(seconds=1))
+        daemon.stop()
+        assert (again["due"], again["sent"], again["batches"]) == (0, 0, 1)
+
+    def test_backoff_in_query_shared_with_gui(self, db_manager):
+        """测试退避规则在查询中与 next_due 一致；图形界面发过的桌面提醒守护进程不再重复"""
+        from src.scheduler.daemon import ReminderDaemon
+        from src.scheduler.reminder_policy import ReminderBackoff, delivery_channel
+
+        now = datetime.now() + timedelta(seconds=1)
+        gui_user = self.user_ids[0]
+        gui_sent = {
+            r["schedule_id"]: r["scheduled_at"]
+            for r in db_manager.get_pending_reminders(within=timedelta(0), now=now)
+            if r["user_id"] == gui_user
+        }
+        # 图形界面的提醒服务（渠道 system）已为第一个用户发过提醒
+        db_manager.record_reminder_deliveries(
+            gui_user, delivery_channel("system"), gui_sent, sent_at=now
+        )
+
+        app = self.RecordingChannel()
+        daemon = ReminderDaemon(
+            db_manager, {"app": app, "email": self.RecordingChannel()}, workers=1
+        )
+        try:
+            assert daemon.run_once(now)["sent"] == 6
+            assert gui_user not in {user_id for user_id, _, _ in app.sent}
+
+            def due(at, backoff=ReminderBackoff()):
+                return len(db_manager.get_pending_reminders(
+                    within=timedelta(0), now=at, backoff=backoff))
+
+            # 第 1 次提醒后间隔 1 小时，第 2 次后 4 小时
+            assert due(now + timedelta(minutes=59)) == 0
+            later = now + timedelta(hours=1, seconds=1)
+            assert due(later) == 9
+            assert daemon.run_once(later)["sent"] == 9
+            assert due(later + timedelta(hours=3)) == 0
+            assert due(later + timedelta(hours=4, seconds=1)) == 9
+            assert due(later + timedelta(hours=4, seconds=1), ReminderBackoff(max_attempts=2)) == 0
+        finally:
+            daemon.stop()
+
+    def test_unconfigured_channel_is_skipped(self, db_manager):
+        """测试未配置的渠道不发送也不记录投递"""
+        from src.scheduler.daemon import ReminderDaemon
+
+        daemon = ReminderDaemon(db_manager, {"app": self.RecordingChannel()}, workers=1)
+        stats = daemon.run_once(datetime.now() + timedelta(seconds=1))
+        daemon.stop()
+        assert (stats["sent"], stats["unsupported"]) == (6, 3)
+        assert db_manager.get_reminder_deliveries(None, "email") == {}
+
+
+class TestSchedulingAlgorithms:
+    """可插拔调度算法测试"""
+
+    def test_ebbinghaus_matches_interval_table(self):
+        """艾宾浩斯算法与固定间隔表及阶段规则一致"""
+        from src.scheduler.algorithms import get_algorithm
+        from src.scheduler.ebbinghaus_config import EbbinghausConfig
+
+        algorithm = get_algorithm(None)
+        assert algorithm.name == "ebbinghaus"
+        intervals = EbbinghausConfig.INTERVALS_HOURS
+        assert algorithm.next_interval(5, stage=0)["interval"] == intervals[1]
+        assert algorithm.next_interval(3, stage=2)["stage"] == 2
+        assert algorithm.next_interval(1, stage=0)["stage"] == 0
+        assert intervals[1] == pytest.approx(20 / 60)  # 20分钟阶段不取整
+        last = EbbinghausConfig.get_total_stages() - 1
+        assert algorithm.next_interval(4, stage=last)["mastered"] is True
+
+    def test_sm2_intervals_and_ease(self):
+        """SM-2：1天、6天，之后按难度系数放大；未通过回到1天"""
+        from src.scheduler.algorithms import get_algorithm
+
+        sm2 = get_algorithm("sm2")
+        first = sm2.next_interval(5)
+        assert first["interval"] == 24 and first["ease"] == pytest.approx(2.6)
+        second = sm2.next_interval(5, interval=first["interval"], ease=first["ease"])
+        assert second["interval"] == 6 * 24
+        third = sm2.next_interval(4, interval=second["interval"], ease=second["ease"])
+        assert third["interval"] == pytest.approx(6 * 24 * 2.7)
+        assert sm2.next_interval(2, interval=third["interval"], ease=2.7)["interval"] == 24
+
+    def test_fsrs_stability(self):
+        """FSRS：回忆成功稳定性增长，遗忘时下降"""
+        from src.scheduler.algorithms import get_algorithm
+
+        fsrs = get_algorithm("fsrs")
+        card = fsrs.next_interval(4)
+        assert card["stability"] == pytest.approx(fsrs.WEIGHTS[2])
+        state = dict(stability=card["stability"], difficulty=card["difficulty"],
+                     interval=card["interval"], elapsed=card["interval"])
+        assert fsrs.next_interval(4, **state)["stability"] > card["stability"]
+        assert fsrs.next_interval(1, **state)["stability"] < card["stability"]
+        with pytest.raises(ValueError):
+            get_algorithm("unknown")
+
+    def test_batch_matches_scalar(self):
+        """批量接口与单张卡片接口结果一致"""
+        import numpy as np
+
+        from src.scheduler.algorithms import ALGORITHMS, make_states
+
+        grades = np.array([1, 2, 3, 4, 5, 5])
+        states = make_states(6, stage=[0, 1, 2, 3, 4, 0], interval=[0, 24, 48, 144, 400, 0],
+                             elapsed=[0, 30, 48, 200, 400, 0])
+        for algorithm in ALGORITHMS.values():
+            intervals, _ = algorithm.next_intervals(states, grades)
+            for i, grade in enumerate(grades):
+                scalar = algorithm.next_interval(
+                    int(grade), stage=int(states["stage"][i]),
+                    interval=float(states["interval"][i]),
+                    elapsed=float(states["elapsed"][i]),
+                )
+                assert scalar["interval"] == pytest.approx(intervals[i])
+
+    def test_complete_review_uses_user_algorithm(self, tmp_path):
+        """完成复习按用户选择的算法安排间隔，并保存算法状态"""
+        from src.database.manager import DatabaseManager
+        from src.database.models import ReviewSchedule, User
+
+        db_manager = DatabaseManager(str(tmp_path / "algorithms.db"))
+        session = db_manager.get_session()
+        user = User(username="fsrs", email="fsrs@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+        session.close()
+
+        assert not db_manager.set_scheduling_algorithm(user_id, "unknown")["success"]
+        assert db_manager.set_scheduling_algorithm(user_id, "fsrs")["success"]
+        assert db_manager.get_scheduling_algorithm(user_id) == "fsrs"
+
+        db_manager.add_knowledge(user_id, "知识点", "内容")
+        schedule_id = db_manager.get_today_reviews(user_id)[0]["schedule_id"]
+        assert db_manager.complete_review(schedule_id, user_id, 4, 80)["success"]
+
+        session = db_manager.get_session()
+        schedule = session.query(ReviewSchedule).filter(~ReviewSchedule.completed).one()
+        assert schedule.stability is not None and schedule.difficulty is not None
+        hours = (schedule.scheduled_date - schedule.created_at).total_seconds() / 3600
+        assert hours == pytest.approx(schedule.current_interval, abs=0.01)
+        assert schedule.current_interval >= 24
+        session.close()
+        db_manager.engine.dispose()
+
+    def test_complete_review_keeps_sub_hour_interval(self):
+        """第1阶段复习通过后20分钟再复习，不取整为1小时"""
+        from src.database.manager import DatabaseManager
+        from src.database.models import ReviewSchedule, User
+
+        db_manager = DatabaseManager(":memory:")
+        session = db_manager.get_session()
+        user = User(username="minutes", email="minutes@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+        session.close()
+
+        added = db_manager.add_knowledge(user_id, "知识点", "内容")
+        before = datetime.now()
+        result = db_manager.complete_review(
+            added["data"]["first_schedule_id"], user_id, 4, 80)
+        assert result["success"]
+
+        session = db_manager.get_session()
+        schedule = session.get(ReviewSchedule, result["data"]["next_schedule_id"])
+        minutes = (schedule.scheduled_date - before).total_seconds() / 60
+        assert schedule.interval_index == 1
+        assert minutes == pytest.approx(20, abs=1)
+        assert schedule.current_interval == pytest.approx(20 / 60)
+        session.close()
+
+
+class TestReviewForecast:
+    """复习负荷预测测试"""
+
+    def test_simulation_follows_algorithm(self):
+        """评分恒为5分时，模拟结果与艾宾浩斯间隔表逐日一致"""
+        import numpy as np
+
+        from src.scheduler.algorithms import get_algorithm, make_states
+        from src.scheduler.forecast import simulate_workload
+
+        expected = simulate_workload(
+            get_algorithm("ebbinghaus"), make_states(1, stage=3), np.array([1.0]),
+            [0, 0, 0, 0, 1], days=30,
+        )
+        # 第1小时复习后依次间隔 24、96、168、360 小时，之后已掌握
+        assert np.flatnonzero(expected).tolist() == [0, 1, 5, 12, 27]
+        assert expected.sum() == 4 + 1
+
+    def test_forecast_from_pending_schedules(self, tmp_path):
+        """逾期与今日到期的计划计入今天，复习后的后续计划计入之后的天数"""
+        from src.database.manager import DatabaseManager
+        from src.database.models import User
+        from src.scheduler.forecast import get_review_forecast
+
+        db_manager = DatabaseManager(str(tmp_path / "forecast.db"))
+        session = db_manager.get_session()
+        user = User(username="forecast", email="forecast@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+        session.close()
+        for i in range(3):
+            db_manager.add_knowledge(user_id, f"知识{i}", "内容")
+
+        forecast = get_review_forecast(db_manager, user_id, days=7)
+        db_manager.engine.dispose()
+        assert forecast["cards"] == 3 and forecast["algorithm"] == "ebbinghaus"
+        assert len(forecast["dates"]) == len(forecast["expected"]) == 7
+        assert forecast["expected"][0] >= 3
+        assert sum(forecast["expected"][1:]) > 0
+
+
+class TestLoadBalancer:
+    """复习负荷均衡测试"""
+
+    def test_choose_date(self):
+        """窗口内取最空闲的一天，短间隔不调整，全部满额时顺延"""
+        from src.scheduler.load_balancer import LoadBalancer
+
+        balancer = LoadBalancer()
+        review_date = datetime(2026, 1, 1, 9, 0)
+        target = review_date + timedelta(days=4)
+        histogram = Counter({target.date(): 5, (target - timedelta(days=1)).date(): 3,
+                             (target + timedelta(days=1)).date(): 2})
+        assert balancer.choose_date(histogram, review_date, 96) == target + timedelta(days=1)
+        assert balancer.choose_date(histogram, review_date, 12) == review_date + timedelta(hours=12)
+        # 上限2：窗口内每天都已满，顺延到窗口后第一天
+        assert balancer.choose_date(histogram, review_date, 96, daily_cap=2) == (
+            target + timedelta(days=2)
+        )
+
+    def test_complete_review_spreads_load(self, tmp_path):
+        """同时学习的知识点分散到窗口内各天；直方图只统计一次"""
+        from sqlalchemy import event
+
+        from src.database.manager import DatabaseManager
+        from src.database.models import ReviewSchedule, User
+
+        db_manager = DatabaseManager(str(tmp_path / "balance.db"))
+        session = db_manager.get_session()
+        user = User(username="balance", email="balance@example.com", password_hash="x",
+                    daily_review_cap=8)
+        session.add(user)
+        session.commit()
+        user_id = user.id
+        session.close()
+        for i in range(30):
+            db_manager.add_knowledge(user_id, f"知识{i}", "内容")
+        session = db_manager.get_session()
+        # 第4阶段完成后间隔96小时，可在前后1天内调整
+        session.query(ReviewSchedule).update({"interval_index": 4})
+        session.commit()
+        schedule_ids = [row.id for row in session.query(ReviewSchedule.id)]
+        session.close()
+
+        group_queries = []
+        event.listen(
+            db_manager.engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: group_queries.append(statement)
+            if "GROUP BY" in statement else None,
+        )
+        for schedule_id in schedule_ids:
+            assert db_manager.complete_review(schedule_id, user_id, 5, 90)["success"]
+
+        session = db_manager.get_session()
+        dates = [row.scheduled_date.date() for row in session.query(
+            ReviewSchedule.scheduled_date).filter(~ReviewSchedule.completed)]
+        session.close()
+        db_manager.engine.dispose()
+        per_day = sorted(Counter(dates).values())
+        assert len(group_queries) == 1
+        # 3天窗口每天8个，其余6个顺延
+        assert per_day == [6, 8, 8, 8]
+
+    def test_soft_delete_leaves_histogram(self):
+        """删除知识点后直方图失效并不再计入其计划，复习已删除的知识点不改动直方图"""
+        from src.database.manager import DatabaseManager
+        from src.database.models import User
+        from src.knowledge.service import KnowledgeService
+        from src.scheduler.load_balancer import get_load_balancer
+
+        db_manager = DatabaseManager(":memory:")
+        session = db_manager.get_session()
+        user = User(username="deleted", email="deleted@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+        session.close()
+        added = [db_manager.add_knowledge(user_id, f"知识{i}", "内容")["data"]
+                 for i in range(3)]
+
+        balancer = get_load_balancer(db_manager)
+        session = db_manager.get_session()
+        assert sum(balancer.histogram(session, user_id).values()) == 3
+        KnowledgeService(db_manager).delete_knowledge_item(added[0]["knowledge_id"])
+        histogram = balancer.histogram(session, user_id)
+        session.close()
+        assert sum(histogram.values()) == 2
+
+        assert db_manager.complete_review(
+            added[0]["first_schedule_id"], user_id, 5, 90)["success"]
+        assert sum(histogram.values()) == 2
+
+
+class TestTodayReviewPatch:
+    """今日复习列表增量刷新测试"""
+
+    class FakeList:
+        def __init__(self, items):
+            self.items = list(items)
+
+        def __len__(self):
+            return len(self.items)
+
+        def remove(self, schedule_id):
+            self.items = [r for r in self.items if r["schedule_id"] != schedule_id]
+
+        def insert(self, index, review):
+            self.items.insert(index, review)
+
+    def test_patched_list_matches_reload(self, tmp_path):
+        """增量插入的计划按计划时间排序，与整页加载结果一致；统计按列表实际内容"""
+        from types import MethodType, SimpleNamespace
+
+        from src.database.manager import DatabaseManager
+        from src.database.models import User
+        from src.scheduler.ui import ReviewSchedulerFrame
+
+        db_manager = DatabaseManager(str(tmp_path / "patch.db"))
+        session = db_manager.get_session()
+        user = User(username="patch", email="patch@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+        session.close()
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        added = [db_manager.add_knowledge(user_id, f"知识{i}", "内容")["data"]
+                 for i in range(3)]
+        for hour, item in enumerate(added, start=1):
+            db_manager.update_review_schedule_time(
+                item["first_schedule_id"], today + timedelta(hours=hour))
+
+        labels = []
+        frame = SimpleNamespace(
+            list_view=self.FakeList(db_manager.get_today_reviews(user_id)),
+            current_user=SimpleNamespace(id=user_id),
+            scheduler_service=SimpleNamespace(get_pending_review_ids=lambda uid: set()),
+            _update_stats_label=lambda completed, total: labels.append((completed, total)),
+        )
+        frame._knowledge_id_of = ReviewSchedulerFrame._knowledge_id_of
+        frame._review_order = ReviewSchedulerFrame._review_order
+        for name in ("_get_completed_status", "_update_list_stats"):
+            setattr(frame, name, MethodType(getattr(ReviewSchedulerFrame, name), frame))
+
+        # 最晚的计划改到前两者之间
+        moved = added[2]
+        db_manager.update_review_schedule_time(
+            moved["first_schedule_id"], today + timedelta(hours=1, minutes=30))
+        try:
+            ReviewSchedulerFrame._apply_dirty(
+                frame, {moved["knowledge_id"]},
+                db_manager.get_today_reviews(user_id, knowledge_ids=[moved["knowledge_id"]]),
+            )
+            reloaded = db_manager.get_today_reviews(user_id)
+        finally:
+            db_manager.engine.dispose()
+        assert [r["schedule_id"] for r in frame.list_view.items] == [
+            r["schedule_id"] for r in reloaded]
+        assert [r["knowledge_id"] for r in reloaded] == [
+            added[0]["knowledge_id"], added[2]["knowledge_id"], added[1]["knowledge_id"]]
+        assert labels == [(0, 3)]
+
+
+class TestReviewBatch:
+    """批量完成复习与写后缓冲测试"""
+
+    @staticmethod
+    def _seed(db_manager, count):
+        from src.database.models import ReviewSchedule, User
+
+        session = db_manager.get_session()
+        user = User(username="batch", email="batch@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+        session.close()
+        for i in range(count):
+            db_manager.add_knowledge(user_id, f"知识{i}", "内容")
+        session = db_manager.get_session()
+        schedule_ids = [row.id for row in session.query(ReviewSchedule.id)
+                        .order_by(ReviewSchedule.id)]
+        session.close()
+        return user_id, schedule_ids
+
+    @staticmethod
+    def _snapshot(db_manager):
+        """下次计划（阶段、间隔）、复习记录与每日汇总"""
+        from src.database.models import DailyUserStat, ReviewRecord, ReviewSchedule
+
+        session = db_manager.get_session()
+        pending = sorted(
+            (row.knowledge_item_id, row.interval_index, row.current_interval)
+            for row in session.query(ReviewSchedule).filter(~ReviewSchedule.completed)
+        )
+        records = sorted(
+            (row.knowledge_item_id, row.effectiveness, row.recall_score)
+            for row in session.query(ReviewRecord)
+        )
+        stats = [(row.review_count, row.recall_sum, row.effectiveness_4)
+                 for row in session.query(DailyUserStat)]
+        session.close()
+        return pending, records, stats
+
+    def test_batch_matches_single_reviews(self, tmp_path):
+        """整批完成与逐张完成结果一致，重复、已完成和越界的条目跳过"""
+        from src.database.events import ChangeType
+        from src.database.manager import DatabaseManager
+
+        single = DatabaseManager(str(tmp_path / "single.db"))
+        user_id, schedule_ids = self._seed(single, 5)
+        for schedule_id in schedule_ids:
+            assert single.complete_review(schedule_id, user_id, 4, 80)["success"]
+
+        batch = DatabaseManager(str(tmp_path / "batch.db"))
+        user_id, schedule_ids = self._seed(batch, 5)
+        events = []
+        batch.subscribe(events.append, [ChangeType.REVIEW_COMPLETED])
+        reviews = [{"schedule_id": schedule_id, "effectiveness": 4, "recall_score": 80}
+                   for schedule_id in schedule_ids]
+        invalid = {"schedule_id": schedule_ids[0], "effectiveness": 9, "recall_score": 80}
+        result = batch.complete_reviews_batch(user_id, reviews + reviews[:1] + [invalid])
+        assert result["success"]
+        assert result["data"]["completed"] == 5
+        assert len(result["data"]["skipped"]) == 2
+        assert sorted(result["data"]["next_schedule_ids"]) == schedule_ids
+        assert len(events) == 5
+        assert all(event.next_review_at is not None for event in events)
+
+        # 重复提交整批：全部跳过，不重复计分
+        again = batch.complete_reviews_batch(user_id, reviews)
+        assert again["success"] and again["data"]["completed"] == 0
+
+        try:
+            assert self._snapshot(batch) == self._snapshot(single)
+        finally:
+            single.engine.dispose()
+            batch.engine.dispose()
+
+    def test_buffer_failure_notifies_once(self, tmp_path, monkeypatch):
+        """整批写入失败：评分放回缓冲，连续失败只通知界面一次，恢复后照常写入"""
+        from src.database.events import ChangeType
+        from src.database.manager import DatabaseManager
+        from src.scheduler.review_buffer import ReviewBuffer
+
+        db_manager = DatabaseManager(str(tmp_path / "failing.db"))
+        user_id, schedule_ids = self._seed(db_manager, 2)
+        events = []
+        db_manager.subscribe(events.append, [ChangeType.REVIEW_FAILED])
+        buffer = ReviewBuffer(db_manager, user_id, str(tmp_path / "journal"), flush_delay=3600)
+        buffer.add(schedule_ids[0], 4, 80)
+
+        def locked(user_id, reviews):
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(db_manager, "complete_reviews_batch", locked)
+        assert not buffer.flush()["success"]
+        assert not buffer.flush()["success"]
+        assert buffer.pending_schedule_ids() == {schedule_ids[0]}
+        assert len(events) == 1 and events[0].schedule_id is None
+        assert "database is locked" in events[0].message
+
+        monkeypatch.undo()
+        buffer.add(schedule_ids[1], 4, 80)
+        result = buffer.close()
+        try:
+            assert result["data"]["completed"] == 2
+            assert len(events) == 1
+        finally:
+            db_manager.engine.dispose()
+
+    def test_buffer_thread_exits_when_idle(self, tmp_path):
+        """写入线程只在有待写评分时运行；空闲的缓冲随数据库管理器一起回收"""
+        import gc
+        import weakref
+
+        from src.database.manager import DatabaseManager
+        from src.scheduler.review_buffer import get_review_buffer
+
+        db_manager = DatabaseManager(str(tmp_path / "idle.db"))
+        user_id, schedule_ids = self._seed(db_manager, 1)
+        buffer = get_review_buffer(db_manager, user_id)
+        assert get_review_buffer(db_manager, user_id) is buffer
+        assert buffer._thread is None
+
+        buffer.flush_delay = 0
+        buffer.add(schedule_ids[0], 4, 80)
+        thread = buffer._thread
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+        assert buffer._thread is None and buffer.pending_count() == 0
+
+        manager_ref = weakref.ref(db_manager)
+        db_manager.engine.dispose()
+        del db_manager, buffer
+        gc.collect()
+        assert manager_ref() is None
+
+    def test_buffer_replays_journal_after_crash(self, tmp_path):
+        """未写入数据库的评分在下次创建缓冲时从日志回放，写了一半的行丢弃"""
+        from src.database.manager import DatabaseManager
+        from src.database.events import ChangeType
+        from src.database.models import ReviewRecord
+        from src.scheduler.review_buffer import ReviewBuffer
+
+        db_manager = DatabaseManager(str(tmp_path / "buffer.db"))
+        user_id, schedule_ids = self._seed(db_manager, 4)
+        journal_dir = str(tmp_path / "journal")
+
+        # 进程在后台写入前崩溃：评分只在日志里，末行写了一半
+        crashed = ReviewBuffer(db_manager, user_id, journal_dir, flush_delay=3600)
+        for schedule_id in schedule_ids[:3]:
+            crashed.add(schedule_id, 5, 95)
+        assert crashed.pending_schedule_ids() == set(schedule_ids[:3])
+        with open(crashed.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"schedule_id": %d, "effect' % schedule_ids[3])
+        crashed._closed = True  # 模拟崩溃：丢弃内存中的缓冲，不写数据库
+        with crashed._cond:
+            crashed._cond.notify_all()
+        crashed._thread.join()
+        crashed._journal.close()
+
+        session = db_manager.get_session()
+        assert session.query(ReviewRecord).count() == 0
+        session.close()
+
+        events = []
+        db_manager.subscribe(events.append, [ChangeType.REVIEW_FAILED])
+        # 创建缓冲只读回日志，不访问数据库；recover() 才写入
+        buffer = ReviewBuffer(db_manager, user_id, journal_dir, flush_delay=3600)
+        assert buffer.pending_schedule_ids() == set(schedule_ids[:3])
+        session = db_manager.get_session()
+        assert session.query(ReviewRecord).count() == 0
+        session.close()
+        assert buffer.recover() == 3
+
+        buffer.add(schedule_ids[3], 3, 60)
+        buffer.add(schedule_ids[0], 3, 60)  # 已由回放完成，跳过
+        result = buffer.close()
+        assert result["data"]["completed"] == 1
+        assert not os.path.exists(buffer.journal_path)
+        # 跳过的评分通知界面
+        assert [(e.schedule_id, e.message) for e in events] == [
+            (schedule_ids[0], "复习计划不存在或已完成")
+        ]
+
+        session = db_manager.get_session()
+        try:
+            assert session.query(ReviewRecord).count() == 4
+        finally:
+            session.close()
+            db_manager.engine.dispose()